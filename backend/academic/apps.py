@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AcademicConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'academic'
+
+    def ready(self):
+        # Invalidación de la verificación pública de matrícula (academic/signals.py)
+        from . import signals  # noqa: F401
@@ -6,9 +6,21 @@ Auditoría completa de datos académicos.
     python manage.py auditar_datos --detalle           # lista cada caso
     python manage.py auditar_datos --csv ./informe     # un CSV por hallazgo
     python manage.py auditar_datos --arreglar          # aplica las correcciones seguras
+    python manage.py auditar_datos --paralelo 4        # bloques en 4 procesos
+    python manage.py auditar_datos --incremental       # solo los bloques con cambios
 
 Sin `--arreglar` es de SOLO LECTURA.
 
+Cada bloque (A, B, C, D) es una unidad independiente: declara las tablas que
+lee (UNIDADES) y su resultado queda guardado en DataAuditResult, que es lo
+que muestra Mesa de Control (GET mesa-control/auditoria) sin volver a correr
+nada. `--paralelo N` reparte los bloques en N procesos. `--incremental`
+reutiliza el resultado guardado de un bloque si ninguna de sus tablas cambió
+desde entonces (contadores de catalogs.TableVersion, ver common/condicional.py);
+la auditoría nocturna puede ser incremental y la semanal completa, por si
+alguna carga escribió por SQL directo sin avisar. Con `--arreglar` o
+`--restaurar-matriculas` todo corre completo y en serie.
+
 Revisa:
   A) Nombres        · campos con espacios/minúsculas sin normalizar
                     · `User.full_name` desactualizado respecto de la ficha
@@ -33,16 +45,23 @@ Correcciones que aplica `--arreglar` (todas reversibles con los datos de origen)
      sección en el período (si hay varias no toca nada: lo decide Secretaría).
 """
 import csv
+import multiprocessing
 import os
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connections, transaction
+from django.db.models import Count, F
+from django.utils import timezone
 
 from academic.models import (
-    AttendanceRow, AttendanceSession, EnrollmentItem, Section,
+    AttendanceRow, AttendanceSession, DataAuditResult, EnrollmentItem, Section,
     SectionScheduleSlot,
 )
+from common import condicional
 from students.models import Student
 from students.name_utils import (
     apellidos_de, nombre_oficial, nombres_de, normalizar,
@@ -51,6 +70,29 @@ from students.name_utils import (
 
 CONFIRMED = "CONFIRMED"
 
+# Bloques de la auditoría: clave → (título, método, tablas que lee). Si un bloque
+# pasa a leer otra tabla, agregarla aquí (y a condicional.RASTREADAS), o
+# --incremental reutilizaría un resultado viejo.
+UNIDADES = {
+    "A": ("A) NOMBRES DE ESTUDIANTES", "bloque_nombres",
+          ("students.Student", "accounts.User", "academic.Enrollment", "academic.Section",
+           "academic.AcademicPeriod")),
+    "B": ("B) MATRÍCULA Y SECCIONES", "bloque_matricula",
+          ("academic.EnrollmentItem", "academic.Enrollment", "students.Student",
+           "academic.PlanCourse", "academic.Course", "academic.Section",
+           "academic.AcademicGradeRecord")),
+    "C": ("C) COBERTURA DE ACTAS (matriculados vs. los que ve el acta)", "bloque_cobertura",
+          ("academic.Section", "academic.PlanCourse", "academic.Course", "academic.Teacher",
+           "accounts.User", "academic.EnrollmentItem", "academic.Enrollment")),
+    "D": ("D) ASISTENCIA", "bloque_asistencia",
+          ("academic.Section", "academic.PlanCourse", "academic.Course",
+           "academic.SectionScheduleSlot", "academic.AttendanceSession",
+           "academic.AttendanceRow")),
+}
+
+# Sube si cambia la lógica de algún bloque: invalida los resultados guardados
+VERSION_REGLAS = 1
+
 
 def _periodo_limpio(valor) -> str:
     """'2026- I' → '2026-I'. Los códigos de período no llevan espacios."""
@@ -110,6 +152,24 @@ def _diagnostico_periodo(limpio, validos) -> str:
     return f"revisar a mano — ¿quiso decir {cerca[0]}?" if cerca else "revisar a mano"
 
 
+def marca(clave, period=""):
+    """Versiones actuales de las tablas del bloque (antes de leerlas)."""
+    token, _u = condicional.versiones(UNIDADES[clave][2])
+    return f"v{VERSION_REGLAS}|{period}|{token}"
+
+
+def _correr_en_proceso(clave, estado):
+    """Corre un bloque en un proceso de --paralelo → (clave, salida, registros, ms)."""
+    buf = StringIO()
+    cmd = Command(stdout=buf)
+    cmd.__dict__.update(estado)
+    try:
+        registros, ms = cmd.correr_unidad(clave)
+    finally:
+        connections.close_all()
+    return clave, buf.getvalue(), registros, ms
+
+
 class Command(BaseCommand):
     help = "Audita la base académica (nombres, matrícula, actas) y repara lo seguro."
 
@@ -153,6 +213,11 @@ class Command(BaseCommand):
                             help="CSV de la nómina oficial (hoja;dni;apellidos_nombres) "
                                  "para cruzarlo contra la base: quién falta, quién sobra "
                                  "y qué nombres no coinciden")
+        parser.add_argument("--paralelo", type=int, default=1,
+                            help="Procesos para correr los bloques A-D a la vez (1 = en serie)")
+        parser.add_argument("--incremental", action="store_true",
+                            help="Reutilizar el resultado guardado de los bloques cuyas "
+                                 "tablas no cambiaron desde la última revisión")
 
     # ────────────────────────────────────────────────────────────
     def handle(self, *args, **o):
@@ -163,6 +228,7 @@ class Command(BaseCommand):
         self.restaurar = o["restaurar"]
         self.csv_dir = o["csv"]
         self.hallazgos = {}
+        self.registros = {}
         self.restaurables = []
         self.fichas_a_sincronizar = []
 
@@ -194,12 +260,81 @@ class Command(BaseCommand):
                 "Modo SOLO LECTURA. Agrega --arreglar para aplicar las correcciones "
                 "seguras, o --restaurar-matriculas para devolver los cursos borrados.\n"))
 
-        self.bloque_nombres()
-        self.bloque_matricula()
-        self.bloque_cobertura()
-        self.bloque_asistencia()
+        self.bloques(o["paralelo"], o["incremental"])
         self.resumen()
 
+    # ──────────────────────────────────────────── bloques A-D
+    def bloques(self, procesos, incremental):
+        """Corre (o reutiliza) cada bloque, en orden, y guarda su resultado."""
+        completo = self.arreglar or self.restaurar
+        marcas = {c: marca(c, self.period) for c in UNIDADES}
+        guardados = {r.unit: r for r in DataAuditResult.objects.filter(period=self.period)}
+        vigentes = {c for c, r in guardados.items()
+                    if incremental and not completo and marcas.get(c) == r.watermark}
+        pendientes = [c for c in UNIDADES if c not in vigentes]
+
+        if self._paralelo_posible(procesos, pendientes):
+            corridas = self._en_paralelo(pendientes, procesos)
+        else:
+            corridas = ((c, None, *self.correr_unidad(c)) for c in pendientes)
+
+        for clave in UNIDADES:
+            if clave in vigentes:
+                self._repetir(clave, guardados[clave])
+                continue
+            _c, salida, registros, ms = next(corridas)
+            if salida is not None:           # corrió en otro proceso
+                self.stdout.write(salida, ending="")
+                for k, r in registros.items():
+                    self.hallazgos[k] = len(r["filas"])
+            DataAuditResult.objects.update_or_create(
+                unit=clave, period=self.period,
+                defaults={"watermark": marcas[clave], "findings": registros,
+                          "total": sum(len(r["filas"]) for r in registros.values()),
+                          "duration_ms": ms, "checked_at": timezone.now()})
+
+    def correr_unidad(self, clave):
+        """Corre un bloque → (registros, ms). `registros` = lo que anotó `_h`."""
+        titulo, metodo, _tablas = UNIDADES[clave]
+        self.registros = {}
+        t0 = time.monotonic()
+        self._t(titulo)
+        getattr(self, metodo)()
+        return self.registros, int((time.monotonic() - t0) * 1000)
+
+    def _repetir(self, clave, res):
+        """Muestra el resultado guardado de un bloque cuyas tablas no cambiaron."""
+        self.registros = {}
+        self._t(UNIDADES[clave][0])
+        self.stdout.write(f"  Sin cambios desde la revisión del "
+                          f"{timezone.localtime(res.checked_at):%Y-%m-%d %H:%M} "
+                          f"(resultado guardado)\n")
+        for k, r in (res.findings or {}).items():
+            self._h(k, r["titulo"], [tuple(f) for f in r["filas"]], r["cabecera"], r["grave"])
+
+    def _paralelo_posible(self, procesos, claves):
+        if procesos < 2 or len(claves) < 2 or self.arreglar or self.restaurar:
+            return False
+        if "fork" not in multiprocessing.get_all_start_methods():
+            return False
+        db = connections["default"]
+        # Otro proceso no ve una base SQLite en memoria ni una transacción abierta
+        if db.in_atomic_block or (db.vendor == "sqlite" and db.is_in_memory_db()):
+            return False
+        return True
+
+    def _en_paralelo(self, claves, procesos):
+        """(clave, salida, registros, ms) de cada bloque, en el orden de `claves`."""
+        estado = {"period": self.period, "detalle": self.detalle, "limite": self.limite,
+                  "csv_dir": self.csv_dir, "arreglar": False, "restaurar": False,
+                  "hallazgos": {}, "restaurables": [], "fichas_a_sincronizar": []}
+        connections.close_all()   # cada proceso abre su propia conexión
+        with ProcessPoolExecutor(max_workers=min(procesos, len(claves)),
+                                 mp_context=multiprocessing.get_context("fork")) as pool:
+            futuros = [pool.submit(_correr_en_proceso, c, estado) for c in claves]
+            for f in futuros:
+                yield f.result()
+
     # ────────────────────────────────────────── utilidades de salida
     def _t(self, txt):
         self.stdout.write("")
@@ -210,6 +345,8 @@ class Command(BaseCommand):
     def _h(self, clave, titulo, filas, cabecera, grave=True):
         """Registra un hallazgo: `filas` es una lista de tuplas."""
         self.hallazgos[clave] = len(filas)
+        self.registros[clave] = {"titulo": titulo, "cabecera": list(cabecera),
+                                 "filas": [list(f) for f in filas], "grave": grave}
         estilo = self.style.ERROR if (grave and filas) else (
             self.style.WARNING if filas else self.style.SUCCESS)
         self.stdout.write(estilo(f"  [{len(filas):>5}]  {titulo}"))
@@ -370,8 +507,8 @@ class Command(BaseCommand):
         Antes de quitar avisa si ya hay notas o asistencia registradas para ese
         alumno en esa sección, porque ahí perdería la referencia en el acta.
         """
-        from academic.models import (AttendanceRow, AttendanceSession,
-                                     Enrollment, SectionGrades)
+        from academic.models import AttendanceRow, AttendanceSession, Enrollment
+        from academic.services import actas
 
         partes = [p.strip() for p in str(arg).replace(" ", ",").split(",") if p.strip()]
         st = Student.objects.filter(num_documento=partes[0]).first()
@@ -423,11 +560,8 @@ class Command(BaseCommand):
         # ¿Hay notas o asistencia que se quedarían huérfanas?
         avisos = []
         if it.section_id:
-            bundle = SectionGrades.objects.filter(section_id=it.section_id).first()
-            if bundle and isinstance(bundle.grades, dict):
-                claves = {str(st.id), str(st.user_id or "")}
-                if claves & set(bundle.grades.keys()):
-                    avisos.append("tiene NOTAS registradas en el acta de esa sección")
+            if actas.secciones_con([st.id, st.user_id], section_ids=[it.section_id]):
+                avisos.append("tiene NOTAS registradas en el acta de esa sección")
             sesiones = AttendanceSession.objects.filter(section_id=it.section_id)
             n_marcas = AttendanceRow.objects.filter(
                 session__in=sesiones,
@@ -845,7 +979,6 @@ class Command(BaseCommand):
 
     # ══════════════════════════════════════════════════════ A) NOMBRES
     def bloque_nombres(self):
-        self._t("A) NOMBRES DE ESTUDIANTES")
         alumnos = list(Student.objects.select_related("user").all())
         self.stdout.write(f"  Fichas de estudiante: {len(alumnos)}\n")
 
@@ -952,7 +1085,6 @@ class Command(BaseCommand):
         return qs
 
     def bloque_matricula(self):
-        self._t("B) MATRÍCULA Y SECCIONES")
         items = list(self._items())
         self.stdout.write(f"  Ítems de matrícula confirmados: {len(items)}\n")
 
@@ -1212,6 +1344,7 @@ class Command(BaseCommand):
                                            enrollment__status=CONFIRMED,
                                            enrollment__period=periodo)
                                    .update(section=lista[0]))
+                condicional.tocar(EnrollmentItem)
             self.stdout.write(self.style.SUCCESS(
                 f"  ✔ ARREGLADO: {arreglados} ítem(s) asignado(s) a su única sección"))
             ambiguos = sum(1 for f in sin_sec_con_sec if f[-1].startswith("AMBIGUO"))
@@ -1222,22 +1355,31 @@ class Command(BaseCommand):
 
     # ═══════════════════════════════════════════════════ C) COBERTURA
     def bloque_cobertura(self):
-        self._t("C) COBERTURA DE ACTAS (matriculados vs. los que ve el acta)")
-        from academic.views.acta_excel import _items_de_seccion
+        from academic.views.acta_excel import repartir_items
 
         sqs = (Section.objects
                .select_related("plan_course", "plan_course__course", "teacher__user"))
+        iqs = EnrollmentItem.objects.filter(enrollment__status=CONFIRMED)
         if self.period:
             sqs = sqs.filter(period=self.period)
+            iqs = iqs.filter(enrollment__period=self.period)
+
+        # Una pasada por tabla (antes eran tres consultas por sección): los
+        # ítems y el número de secciones por (curso del plan, período)
+        items = defaultdict(list)
+        for it in (iqs.annotate(periodo=F("enrollment__period"))
+                   .only("id", "plan_course_id", "section_id")):
+            items[(it.plan_course_id, it.periodo)].append(it)
+        n_secciones = {(pc, per): n for pc, per, n in
+                       sqs.order_by().values_list("plan_course_id", "period")
+                       .annotate(n=Count("id"))}
 
         filas = []
         for sec in sqs:
-            total = (EnrollmentItem.objects
-                     .filter(plan_course_id=sec.plan_course_id,
-                             enrollment__status=CONFIRMED,
-                             enrollment__period=sec.period)
-                     .count())
-            base, ambiguos = _items_de_seccion(sec)
+            del_curso = items.get((sec.plan_course_id, sec.period), [])
+            total = len(del_curso)
+            base, ambiguos = repartir_items(
+                sec, del_curso, n_secciones.get((sec.plan_course_id, sec.period), 0))
             asignados_otras = total - len(base) - len(ambiguos)
             if ambiguos:
                 filas.append((
@@ -1253,7 +1395,6 @@ class Command(BaseCommand):
 
     # ══════════════════════════════════════════════════ D) ASISTENCIA
     def bloque_asistencia(self):
-        self._t("D) ASISTENCIA")
         sqs = Section.objects.select_related("plan_course", "plan_course__course")
         if self.period:
             sqs = sqs.filter(period=self.period)
@@ -22,6 +22,7 @@ from django.db import transaction
 
 from academic.models import Teacher as AcademicTeacher, Section
 from catalogs.models import Teacher as CatalogTeacher
+from common import condicional
 
 User = get_user_model()
 
@@ -175,6 +176,7 @@ class Command(BaseCommand):
 
         with transaction.atomic():
             Section.objects.filter(teacher__user_id=user_id).update(teacher=None)
+            condicional.tocar(Section)
             AcademicTeacher.objects.filter(user_id=user_id).delete()
             CatalogTeacher.objects.filter(user_id=user_id).delete()
             try:
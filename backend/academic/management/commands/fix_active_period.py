@@ -23,6 +23,7 @@ from django.db import transaction
 from catalogs.models import Period
 from catalogs.views.utils import _ensure_period
 from academic.models import Section, EnrollmentItem
+from common import condicional
 
 
 class Command(BaseCommand):
@@ -69,6 +70,7 @@ class Command(BaseCommand):
         if apply_changes:
             Period.objects.filter(is_active=True).exclude(code=code).update(is_active=False)
             Period.objects.filter(code=code).update(is_active=True)
+            condicional.tocar(Period)
             self.stdout.write(self.style.SUCCESS(f"    ✔ {code} marcado como vigente."))
 
     # ── 2. secciones fantasma ──────────────────────────────────
@@ -0,0 +1,74 @@
+"""
+generar_horario — arma automáticamente el horario de las secciones de un
+período (academic/services/generador_horario.py): sin choques de docente,
+aula ni bloque plan-ciclo, y con la menor cantidad de horas libres.
+
+Sin --apply solo muestra el resumen (no escribe nada).
+
+Uso:
+    python manage.py generar_horario 2026-I
+    python manage.py generar_horario 2026-I --apply
+    python manage.py generar_horario 2026-I --days MON TUE WED THU FRI SAT \\
+        --start 07:30 --end 13:30 --block 2 --replace --apply
+    python manage.py generar_horario 2026-I --availability disponibilidad.json
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academic.services.generador_horario import DEFAULTS, generar
+
+
+class Command(BaseCommand):
+    help = "Genera el horario de las secciones de un período."
+
+    def add_arguments(self, parser):
+        parser.add_argument("period", help="Período, p.ej. 2026-I")
+        parser.add_argument("--apply", action="store_true", help="Guarda el horario generado.")
+        parser.add_argument("--replace", action="store_true",
+                            help="Regenera también las secciones que ya tienen horario.")
+        parser.add_argument("--days", nargs="+", default=DEFAULTS["days"])
+        parser.add_argument("--start", default=DEFAULTS["day_start"])
+        parser.add_argument("--end", default=DEFAULTS["day_end"])
+        parser.add_argument("--block", type=int, default=DEFAULTS["block_hours"],
+                            help="Horas seguidas por sesión.")
+        parser.add_argument("--slot-minutes", type=int, default=DEFAULTS["slot_minutes"])
+        parser.add_argument("--availability", default="",
+                            help='JSON {user_id: {"MON": [["08:00", "12:00"]]}} con la disponibilidad docente.')
+
+    def handle(self, *args, **opts):
+        disponibilidad = {}
+        if opts["availability"]:
+            try:
+                with open(opts["availability"], encoding="utf-8") as fh:
+                    disponibilidad = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"No se pudo leer la disponibilidad: {exc}")
+
+        r = generar(opts["period"], {
+            "days": opts["days"],
+            "day_start": opts["start"],
+            "day_end": opts["end"],
+            "block_hours": opts["block"],
+            "slot_minutes": opts["slot_minutes"],
+            "replace": opts["replace"],
+            "availability": disponibilidad,
+        }, aplicar=opts["apply"])
+
+        self.stdout.write(
+            f"Secciones: {r['sections']} (fijas: {r['fixed_sections']}) · bloques: {r['blocks']} · "
+            f"horas libres: {r['gaps']} · choques: {r['conflicts']} · {r['elapsed_ms']} ms"
+        )
+        for u in r["unassigned"]:
+            self.stdout.write(self.style.WARNING(
+                f"  Sin ubicar: sección {u['section_id']} {u['label']} {u['course']} "
+                f"({u['hours_missing']} h)"
+            ))
+        if r["applied"]:
+            self.stdout.write(self.style.SUCCESS("Horario guardado."))
+        elif opts["apply"]:
+            self.stdout.write(self.style.ERROR(
+                "No se guardó: hay secciones sin ubicar o la verificación encontró choques."
+            ))
+        else:
+            self.stdout.write("Simulación: use --apply para guardar.")
@@ -0,0 +1,30 @@
+"""
+rebuild_attendance_tallies — recalcula los contadores de asistencia
+(AttendanceTally) por sección y alumno.
+
+Las vistas que graban marcas los mantienen en su transacción; este comando
+es para después de cargas o correcciones que tocan AttendanceRow por fuera
+(scripts, SQL directo) o para verificar.
+
+Uso:
+    python manage.py rebuild_attendance_tallies
+    python manage.py rebuild_attendance_tallies --section 12 --section 15
+"""
+from django.core.management.base import BaseCommand
+
+from academic.services.asistencia import recalcular, reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula los contadores de asistencia por sección y alumno."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--section", type=int, action="append", default=[],
+                            help="Solo estas secciones (id, repetible).")
+
+    def handle(self, *args, **opts):
+        if opts["section"]:
+            n = recalcular(opts["section"])
+        else:
+            n = reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"Contadores recalculados: {n} alumno(s)-sección."))
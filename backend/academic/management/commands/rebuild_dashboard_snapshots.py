@@ -0,0 +1,29 @@
+"""
+rebuild_dashboard_snapshots — recalcula el snapshot del dashboard y los
+puntajes de mérito por período de todos los alumnos.
+
+Las señales los mantienen al guardar notas; este comando es para después de
+cargas que se saltan save() (queryset.update, SQL directo) o para verificar.
+
+Uso:
+    python manage.py rebuild_dashboard_snapshots
+    python manage.py rebuild_dashboard_snapshots --student 123 --student 456
+"""
+from django.core.management.base import BaseCommand
+
+from academic.services.dashboard_snapshot import actualizar, reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula los snapshots del dashboard del alumno y el mérito por período."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--student", type=int, action="append", default=[],
+                            help="Solo estos alumnos (id, repetible).")
+
+    def handle(self, *args, **opts):
+        if opts["student"]:
+            n = actualizar(opts["student"])
+        else:
+            n = reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"Snapshots recalculados: {n} alumnos."))
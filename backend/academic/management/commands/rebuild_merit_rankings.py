@@ -0,0 +1,31 @@
+"""
+rebuild_merit_rankings — recalcula el orden de mérito precalculado
+(aula / especialidad / instituto) de los períodos.
+
+Las señales lo invalidan al guardar notas y la lectura lo reconstruye;
+este comando es para después de cargas que se saltan save() (queryset.update,
+SQL directo) o para dejarlo listo antes de publicar resultados.
+
+Uso:
+    python manage.py rebuild_merit_rankings
+    python manage.py rebuild_merit_rankings --period 2026-I
+"""
+from django.core.management.base import BaseCommand
+
+from academic.models import AcademicGradeRecord
+from academic.services.ranking_merito import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula el orden de mérito precalculado por período."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", action="append", default=[],
+                            help="Solo estos períodos (p. ej. 2026-I, repetible).")
+
+    def handle(self, *args, **opts):
+        terms = [p.strip().upper() for p in opts["period"] if p.strip()] or sorted(
+            t for t in AcademicGradeRecord.objects.values_list("term", flat=True).distinct() if t)
+        filas = sum(reconstruir(t) for t in terms)
+        self.stdout.write(self.style.SUCCESS(
+            f"Orden de mérito recalculado: {len(terms)} período(s), {filas} fila(s)."))
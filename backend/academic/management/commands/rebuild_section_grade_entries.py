@@ -0,0 +1,35 @@
+"""
+rebuild_section_grade_entries — recalcula las celdas de notas del acta
+(SectionGradeEntry) desde el JSON de compatibilidad SectionGrades.grades.
+
+Los guardados del acta y la señal post_save las mantienen; este comando es
+para después de cargas que se saltan save() (queryset.update, bulk_update,
+SQL directo) o para verificar.
+
+Uso:
+    python manage.py rebuild_section_grade_entries
+    python manage.py rebuild_section_grade_entries --section 12 --section 15
+"""
+from django.core.management.base import BaseCommand
+
+from academic.models import SectionGradeEntry, SectionGrades
+from academic.services.actas import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula las celdas de notas de las actas desde su JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--section", type=int, action="append", default=[],
+                            help="Solo estas secciones (id, repetible).")
+
+    def handle(self, *args, **opts):
+        qs = SectionGrades.objects.all()
+        if opts["section"]:
+            qs = qs.filter(section_id__in=opts["section"])
+        else:
+            # Celdas de secciones cuyo acta ya no existe
+            SectionGradeEntry.objects.exclude(
+                section_id__in=SectionGrades.objects.values("section_id")).delete()
+        n = reconstruir(qs.iterator(chunk_size=200))
+        self.stdout.write(self.style.SUCCESS(f"Celdas recalculadas: {n} acta(s)."))
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.10 on 2026-10-19 02:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar(apps, schema_editor):
+    from academic.services.dashboard_snapshot import reconstruir
+    reconstruir(get_model=apps.get_model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0023_academicperiod_ventana_subsanacion'),
+        ('students', '0005_student_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentDashboardSnapshot',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_snapshot', serialize=False, to='students.student')),
+                ('programa', models.CharField(blank=True, default='', max_length=255)),
+                ('ppa', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('credits_approved', models.PositiveIntegerField(default=0)),
+                ('has_prior_enrollment', models.BooleanField(default=False)),
+                ('active_since', models.CharField(blank=True, default='', max_length=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['programa', 'ppa'], name='dash_snap_rank_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TermMeritScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('programa', models.CharField(blank=True, default='', max_length=255)),
+                ('term', models.CharField(max_length=20)),
+                ('ppa', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('credits', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_scores', to='students.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['programa', 'term', 'ppa'], name='term_merit_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'term'), name='uniq_term_merit_score')],
+            },
+        ),
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-19 02:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0024_dashboard_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimetableJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=20)),
+                ('options', models.JSONField(blank=True, default=dict)),
+                ('apply', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('QUEUED', 'En cola'), ('RUNNING', 'Calculando'), ('DONE', 'Terminado'), ('FAILED', 'Falló')], default='QUEUED', max_length=10)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='timetable_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-19 02:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar(apps, schema_editor):
+    from academic.services.asistencia import reconstruir
+    reconstruir(get_model=apps.get_model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0025_timetable_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendancerow',
+            name='student_id',
+            field=models.IntegerField(db_index=True),
+        ),
+        migrations.CreateModel(
+            name='AttendanceTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_id', models.IntegerField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('excused', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('last_session', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_tallies', to='academic.section')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['section', 'absent'], name='att_tally_absent_idx'), models.Index(fields=['student_id'], name='att_tally_student_idx')],
+                'constraints': [models.UniqueConstraint(fields=('section', 'student_id'), name='uniq_attendance_tally')],
+            },
+        ),
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
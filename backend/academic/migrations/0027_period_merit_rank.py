@@ -0,0 +1,43 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0026_attendance_tally'),
+        ('students', '0005_student_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodMeritBuild',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=20, unique=True)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('built_version', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PeriodMeritRank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=20)),
+                ('career_id', models.PositiveIntegerField(default=0)),
+                ('semester', models.PositiveSmallIntegerField(default=0)),
+                ('promedio', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('puesto', models.PositiveIntegerField()),
+                ('orden', models.PositiveIntegerField()),
+                ('total', models.PositiveIntegerField()),
+                ('ciclo', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='merit_ranks', to='students.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'career_id', 'semester', 'orden'], name='merit_rank_cohort_idx'), models.Index(fields=['student', 'term'], name='merit_rank_student_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _numero(valor):
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str) and valor.strip():
+        try:
+            return float(valor)
+        except ValueError:
+            return None
+    return None
+
+
+def poblar_celdas(apps, schema_editor):
+    """Celdas (alumno, componente) desde el JSON de cada acta existente."""
+    SectionGrades = apps.get_model("academic", "SectionGrades")
+    SectionGradeEntry = apps.get_model("academic", "SectionGradeEntry")
+    filas = []
+    for section_id, grades in SectionGrades.objects.values_list("section_id", "grades").iterator():
+        if not isinstance(grades, dict):
+            continue
+        for key, entry in grades.items():
+            comps = ({str(k)[:40]: v for k, v in entry.items()}
+                     if isinstance(entry, dict) else {"": entry})
+            for comp, val in comps.items():
+                filas.append(SectionGradeEntry(section_id=section_id, student_key=str(key)[:20],
+                                               component=comp, value=val, numeric=_numero(val)))
+        if len(filas) >= 2000:
+            SectionGradeEntry.objects.bulk_create(filas, batch_size=500)
+            filas = []
+    SectionGradeEntry.objects.bulk_create(filas, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0027_period_merit_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionGradeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_key', models.CharField(max_length=20)),
+                ('component', models.CharField(max_length=40)),
+                ('value', models.JSONField(blank=True, null=True)),
+                ('numeric', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grade_entries', to='academic.section')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student_key', 'component'], name='academic_se_student_1af7ff_idx')],
+                'constraints': [models.UniqueConstraint(fields=('section', 'student_key', 'component'), name='uniq_section_grade_cell')],
+            },
+        ),
+        migrations.RunPython(poblar_celdas, migrations.RunPython.noop),
+    ]
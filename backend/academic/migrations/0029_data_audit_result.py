@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:56
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0028_section_grade_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataAuditResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit', models.CharField(max_length=2)),
+                ('period', models.CharField(blank=True, default='', max_length=20)),
+                ('watermark', models.TextField(blank=True, default='')),
+                ('findings', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('checked_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('unit', 'period'), name='uniq_data_audit_unit_period')],
+            },
+        ),
+    ]
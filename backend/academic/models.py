@@ -2,6 +2,7 @@
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Q
 from catalogs.models import Career
 
@@ -500,11 +501,41 @@ class AttendanceSession(models.Model):
 
 class AttendanceRow(models.Model):
     session    = models.ForeignKey(AttendanceSession, on_delete=models.CASCADE, related_name="rows")
-    student_id = models.IntegerField()
+    student_id = models.IntegerField(db_index=True)
     status     = models.CharField(max_length=10)
 
 
+class AttendanceTally(models.Model):
+    """
+    Conteo de marcas de asistencia por (sección, alumno). `student_id` usa la
+    misma clave que AttendanceRow. Lo mantiene academic/services/asistencia.py
+    en la misma transacción que graba las marcas; los porcentajes y las listas
+    de riesgo (30 % de faltas) se leen de aquí en vez de contar filas.
+    """
+    section      = models.ForeignKey(Section, on_delete=models.CASCADE, related_name="attendance_tallies")
+    student_id   = models.IntegerField()
+    present      = models.PositiveIntegerField(default=0)
+    late         = models.PositiveIntegerField(default=0)
+    absent       = models.PositiveIntegerField(default=0)
+    excused      = models.PositiveIntegerField(default=0)
+    total        = models.PositiveIntegerField(default=0)   # todas las marcas (incluye feriados)
+    last_session = models.DateField(null=True, blank=True)
+    updated_at   = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["section", "student_id"], name="uniq_attendance_tally"),
+        ]
+        indexes = [
+            models.Index(fields=["section", "absent"], name="att_tally_absent_idx"),
+            models.Index(fields=["student_id"], name="att_tally_student_idx"),
+        ]
+
+
 class SectionGrades(models.Model):
+    """Acta del docente. `grades` ({clave_alumno: {componente: valor}}) es la
+    vista JSON de compatibilidad que leen acta, Excel y PDF; las notas viven
+    en SectionGradeEntry (academic/services/actas.py)."""
     section      = models.OneToOneField(Section, on_delete=models.CASCADE, related_name="grades_bundle")
     grades       = models.JSONField(default=dict)
     submitted    = models.BooleanField(default=False)
@@ -512,6 +543,28 @@ class SectionGrades(models.Model):
     updated_at   = models.DateTimeField(auto_now=True)
 
 
+class SectionGradeEntry(models.Model):
+    """Una celda del acta: (sección, alumno, componente) → valor.
+
+    `student_key` es la clave del acta tal cual (user_id o pk del alumno,
+    como texto); `numeric` repite el valor si es número, para filtrar en SQL
+    (p.ej. PROMEDIO_FINAL < 11). Componente "" = entrada que no era objeto.
+    """
+    section     = models.ForeignKey(Section, on_delete=models.CASCADE, related_name="grade_entries")
+    student_key = models.CharField(max_length=20)
+    component   = models.CharField(max_length=40)
+    value       = models.JSONField(null=True, blank=True)
+    numeric     = models.FloatField(null=True, blank=True)
+    updated_at  = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["section", "student_key", "component"],
+                                    name="uniq_section_grade_cell"),
+        ]
+        indexes = [models.Index(fields=["student_key", "component"])]
+
+
 # ══════════════════════════════════════════════════════════════
 #  PROCESOS ACADÉMICOS
 # ══════════════════════════════════════════════════════════════
@@ -543,6 +596,124 @@ class AcademicGradeRecord(models.Model):
     created_at  = models.DateTimeField(auto_now_add=True)
 
 
+class StudentDashboardSnapshot(models.Model):
+    """
+    Resumen precalculado del dashboard del alumno (stint activo).
+    Lo mantiene academic/services/dashboard_snapshot.py cada vez que cambian
+    sus AcademicGradeRecord; el puesto de mérito sale de contar, sobre el
+    índice (programa, ppa), cuántos compañeros tienen un PPA mayor.
+    """
+    student              = models.OneToOneField("students.Student", on_delete=models.CASCADE,
+                                                primary_key=True, related_name="dashboard_snapshot")
+    programa             = models.CharField(max_length=255, blank=True, default="")
+    ppa                  = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    credits_approved     = models.PositiveIntegerField(default=0)
+    has_prior_enrollment = models.BooleanField(default=False)
+    active_since         = models.CharField(max_length=20, blank=True, default="")
+    updated_at           = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["programa", "ppa"], name="dash_snap_rank_idx")]
+
+
+class TermMeritScore(models.Model):
+    """PPA ponderado del alumno en UN período, para el puesto por programa y período."""
+    student  = models.ForeignKey("students.Student", on_delete=models.CASCADE, related_name="term_scores")
+    programa = models.CharField(max_length=255, blank=True, default="")
+    term     = models.CharField(max_length=20)
+    ppa      = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    credits  = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "term"], name="uniq_term_merit_score"),
+        ]
+        indexes = [models.Index(fields=["programa", "term", "ppa"], name="term_merit_rank_idx")]
+
+
+class PeriodMeritRank(models.Model):
+    """
+    Puesto precalculado del alumno en una cohorte del orden de mérito de un
+    período (academic/services/ranking_merito.py). La cohorte es el par
+    (career_id, semester), con 0 = sin filtro:
+      (c, s) aula · (c, 0) especialidad · (0, s) ciclo en todo el instituto ·
+      (0, 0) todo el instituto.
+    `orden` es la posición en el listado (puesto y luego apellidos).
+    """
+    term      = models.CharField(max_length=20)
+    career_id = models.PositiveIntegerField(default=0)
+    semester  = models.PositiveSmallIntegerField(default=0)
+    student   = models.ForeignKey("students.Student", on_delete=models.CASCADE,
+                                  related_name="merit_ranks")
+    promedio  = models.DecimalField(max_digits=5, decimal_places=2)
+    puesto    = models.PositiveIntegerField()
+    orden     = models.PositiveIntegerField()
+    total     = models.PositiveIntegerField()
+    ciclo     = models.PositiveSmallIntegerField(null=True, blank=True)   # ciclo cursado en el período
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["term", "career_id", "semester", "orden"], name="merit_rank_cohort_idx"),
+            models.Index(fields=["student", "term"], name="merit_rank_student_idx"),
+        ]
+
+
+class PeriodMeritBuild(models.Model):
+    """
+    Estado del orden de mérito precalculado de un período: las señales suben
+    `version` al cambiar notas o alumnos; está vigente si `built_version`
+    (la versión que vio la última reconstrucción) la alcanza.
+    """
+    term          = models.CharField(max_length=20, unique=True)
+    version       = models.PositiveIntegerField(default=1)
+    built_version = models.PositiveIntegerField(default=0)
+    built_at      = models.DateTimeField(null=True, blank=True)
+
+
+class TimetableJob(models.Model):
+    """
+    Corrida del generador de horarios (academic/services/generador_horario.py)
+    lanzada desde la API; `result` guarda el resumen que devuelve `generar`.
+    """
+    STATUS_CHOICES = [
+        ("QUEUED", "En cola"),
+        ("RUNNING", "Calculando"),
+        ("DONE", "Terminado"),
+        ("FAILED", "Falló"),
+    ]
+    period      = models.CharField(max_length=20)
+    options     = models.JSONField(default=dict, blank=True)
+    apply       = models.BooleanField(default=False)
+    status      = models.CharField(max_length=10, choices=STATUS_CHOICES, default="QUEUED")
+    result      = models.JSONField(default=dict, blank=True)
+    error       = models.TextField(blank=True, default="")
+    created_by  = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+                                    null=True, blank=True, related_name="timetable_jobs")
+    created_at  = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+
+class DataAuditResult(models.Model):
+    """
+    Último resultado de un bloque de `manage.py auditar_datos` (A, B, C, D)
+    para un período ("" = todos). `watermark` son las versiones de las tablas
+    que lee el bloque al momento de revisarlas: con --incremental, si no
+    cambiaron, se reutilizan `findings` sin volver a recorrerlas.
+    """
+    unit        = models.CharField(max_length=2)
+    period      = models.CharField(max_length=20, blank=True, default="")
+    watermark   = models.TextField(blank=True, default="")
+    findings    = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    total       = models.PositiveIntegerField(default=0)
+    duration_ms = models.PositiveIntegerField(default=0)
+    checked_at  = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["unit", "period"], name="uniq_data_audit_unit_period"),
+        ]
+
+
 # ══════════════════════════════════════════════════════════════
 #  CONFIGURACIÓN INSTITUCIONAL
 # ══════════════════════════════════════════════════════════════
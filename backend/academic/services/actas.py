@@ -0,0 +1,173 @@
+"""
+Notas del acta por celdas: (sección, alumno, componente) → valor.
+
+El acta de una sección era un solo JSON (SectionGrades.grades) con la clave
+del alumno (user_id o pk) → {C1, C1_LEVEL, …, PROMEDIO_FINAL, status}.
+Guardar reescribía el JSON completo, así que dos docentes guardando la misma
+acta se pisaban, y toda lectura entre secciones (pendientes, boletas del
+alumno, purgas) tenía que traer y parsear todos los JSON. Ahora las notas
+viven en SectionGradeEntry, una fila indexada por celda:
+
+    guardar(sec, {clave: {componente: valor}})   # upsert solo de esos alumnos
+    leer([section_id, ...])                      # {section_id: {clave: entrada}}
+    entrada(section_id, claves)                  # la del alumno (user_id o pk)
+    secciones_con(claves)                        # ids de actas donde figura
+
+SectionGrades.grades se mantiene como vista de compatibilidad (acta, Excel,
+PDF y el proceso de calificaciones la siguen leyendo): `guardar` reescribe
+en ella solo las claves que tocó, releída con la fila bloqueada, y los
+escritores que todavía asignan `bundle.grades` y hacen save() se reflejan en
+las celdas por la señal post_save (`sincronizar`, academic/signals.py).
+"""
+from collections import defaultdict
+
+from django.utils import timezone
+
+from common.sqlite import escritura
+
+CHUNK = 500
+
+_CAMPOS_CELDA = ["value", "numeric", "updated_at"]
+
+
+def _numero(valor):
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str) and valor.strip():
+        try:
+            return float(valor)
+        except ValueError:
+            return None
+    return None
+
+
+def _componentes(entry):
+    """{componente: valor} de una entrada del acta ("" si no es objeto)."""
+    if isinstance(entry, dict):
+        return {str(k)[:40]: v for k, v in entry.items()}
+    return {"": entry}
+
+
+def _entrada(componentes):
+    if set(componentes) == {""}:
+        return componentes[""]
+    return dict(componentes)
+
+
+def _escribir(section_id, entradas):
+    """Deja las celdas de esas claves iguales a `entradas` (upsert + borrado)."""
+    from academic.models import SectionGradeEntry
+
+    if not entradas:
+        return
+    claves = list(entradas)
+    actuales = defaultdict(dict)
+    for key, comp, val in (SectionGradeEntry.objects
+                           .filter(section_id=section_id, student_key__in=claves)
+                           .values_list("student_key", "component", "value")):
+        actuales[key][comp] = val
+
+    ahora = timezone.now()
+    nuevas, sobran = [], []
+    for key, entry in entradas.items():
+        comps = _componentes(entry)
+        previas = actuales.get(key, {})
+        sobran.extend((key, c) for c in previas if c not in comps)
+        for comp, val in comps.items():
+            if comp in previas and previas[comp] == val:
+                continue
+            nuevas.append(SectionGradeEntry(
+                section_id=section_id, student_key=key, component=comp,
+                value=val, numeric=_numero(val), updated_at=ahora))
+
+    for key in {k for k, _c in sobran}:
+        SectionGradeEntry.objects.filter(
+            section_id=section_id, student_key=key,
+            component__in=[c for k, c in sobran if k == key]).delete()
+    SectionGradeEntry.objects.bulk_create(
+        nuevas, batch_size=CHUNK, update_conflicts=True,
+        unique_fields=["section", "student_key", "component"], update_fields=_CAMPOS_CELDA)
+
+
+def guardar(section, entradas, **campos):
+    """
+    Guarda las entradas {clave: {componente: valor}} del acta (cada alumno
+    enviado queda exactamente como viene; los demás no se tocan) y actualiza
+    la vista JSON. `campos` = otros campos del SectionGrades (submitted, …).
+    Retorna el SectionGrades.
+    """
+    from academic.models import SectionGrades
+
+    entradas = {str(k): v for k, v in (entradas or {}).items()}
+    with escritura():
+        SectionGrades.objects.get_or_create(section=section)
+        bundle = SectionGrades.objects.select_for_update().get(section=section)
+        _escribir(section.id, entradas)
+        bundle.grades = {**(bundle.grades if isinstance(bundle.grades, dict) else {}),
+                         **leer([section.id], claves=list(entradas)).get(section.id, {})}
+        for campo, valor in campos.items():
+            setattr(bundle, campo, valor)
+        bundle._celdas_al_dia = True   # la señal no vuelve a sincronizar
+        try:
+            bundle.save()
+        finally:
+            del bundle._celdas_al_dia
+    return bundle
+
+
+def sincronizar(bundle):
+    """Celdas = bundle.grades (para los escritores que guardan el JSON directo)."""
+    from academic.models import SectionGradeEntry
+
+    grades = bundle.grades if isinstance(bundle.grades, dict) else {}
+    with escritura():
+        (SectionGradeEntry.objects.filter(section_id=bundle.section_id)
+         .exclude(student_key__in=[str(k) for k in grades]).delete())
+        _escribir(bundle.section_id, {str(k): v for k, v in grades.items()})
+
+
+def leer(section_ids, claves=None):
+    """{section_id: {clave: entrada}} desde las celdas (una consulta por tanda)."""
+    from academic.models import SectionGradeEntry
+
+    celdas = defaultdict(lambda: defaultdict(dict))
+    ids = list(section_ids)
+    for i in range(0, len(ids), CHUNK):
+        qs = SectionGradeEntry.objects.filter(section_id__in=ids[i:i + CHUNK])
+        if claves is not None:
+            qs = qs.filter(student_key__in=[str(k) for k in claves])
+        for sid, key, comp, val in qs.values_list("section_id", "student_key", "component", "value"):
+            celdas[sid][key][comp] = val
+    return {sid: {key: _entrada(comps) for key, comps in por_clave.items()}
+            for sid, por_clave in celdas.items()}
+
+
+def entrada(section_id, claves):
+    """Entrada del alumno en el acta (la primera clave que tenga un objeto), o {}."""
+    claves = [str(k) for k in claves if k is not None]
+    por_clave = leer([section_id], claves=claves).get(section_id, {})
+    for k in claves:
+        if isinstance(por_clave.get(k), dict):
+            return por_clave[k]
+    return {}
+
+
+def secciones_con(claves, section_ids=None):
+    """Ids de las secciones cuya acta tiene alguna de esas claves (consulta indexada)."""
+    from academic.models import SectionGradeEntry
+
+    qs = SectionGradeEntry.objects.filter(student_key__in=[str(k) for k in claves if k is not None])
+    if section_ids is not None:
+        qs = qs.filter(section_id__in=section_ids)
+    return set(qs.values_list("section_id", flat=True).distinct())
+
+
+def reconstruir(bundles):
+    """Celdas desde la vista JSON de esas actas (manage.py rebuild_section_grade_entries)."""
+    n = 0
+    for bundle in bundles:
+        sincronizar(bundle)
+        n += 1
+    return n
@@ -0,0 +1,94 @@
+"""
+Contadores de asistencia por (sección, alumno): AttendanceTally.
+
+El monitoreo de asistencias, el DPI (30 % de faltas) y el dashboard del
+alumno contaban AttendanceRow en cada lectura, una tabla que crece con cada
+sesión de cada sección. Ahora cada vista que graba marcas llama a
+`recalcular(section_id)` dentro de su transacción: un único GROUP BY sobre
+las filas de esa sección reemplaza sus contadores. Leer el porcentaje o la
+lista de riesgo de una sección pasa a ser una consulta indexada:
+
+    AttendanceTally.objects.filter(section_id=s, absent__gt=umbral)
+
+`manage.py rebuild_attendance_tallies` reconstruye todo (cargas por SQL,
+scripts de corrección).
+"""
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Upper
+
+# Mismo criterio que tenían las lecturas sobre AttendanceRow
+PRESENTE = ("PRESENT", "P", "A")
+TARDE = ("LATE",)
+FALTA = ("ABSENT",)
+JUSTIFICADA = ("EXCUSED",)
+
+
+def _models(get_model=None):
+    if get_model is None:
+        from django.apps import apps
+        get_model = apps.get_model
+    return get_model("academic", "AttendanceRow"), get_model("academic", "AttendanceTally")
+
+
+def _conteos(section_ids, get_model=None):
+    AttendanceRow, AttendanceTally = _models(get_model)
+    filas = (
+        AttendanceRow.objects
+        .filter(session__section_id__in=section_ids)
+        .annotate(st=Upper("status"))
+        .values("session__section_id", "student_id")
+        .annotate(
+            present=Count("id", filter=Q(st__in=PRESENTE)),
+            late=Count("id", filter=Q(st__in=TARDE)),
+            absent=Count("id", filter=Q(st__in=FALTA)),
+            excused=Count("id", filter=Q(st__in=JUSTIFICADA)),
+            total=Count("id"),
+            last_session=Max("session__date"),
+        )
+    )
+    return [
+        AttendanceTally(
+            section_id=f["session__section_id"], student_id=f["student_id"],
+            present=f["present"], late=f["late"], absent=f["absent"],
+            excused=f["excused"], total=f["total"], last_session=f["last_session"],
+        )
+        for f in filas
+    ]
+
+
+def recalcular(section_ids, get_model=None):
+    """Reemplaza los contadores de esas secciones. Retorna cuántos quedaron."""
+    if isinstance(section_ids, int):
+        section_ids = [section_ids]
+    section_ids = [int(s) for s in section_ids if s]
+    if not section_ids:
+        return 0
+    _AttendanceRow, AttendanceTally = _models(get_model)
+    with transaction.atomic():
+        nuevos = _conteos(section_ids, get_model)
+        AttendanceTally.objects.filter(section_id__in=section_ids).delete()
+        AttendanceTally.objects.bulk_create(nuevos, batch_size=1000)
+    return len(nuevos)
+
+
+def reconstruir(get_model=None, lote=200):
+    """Recalcula los contadores de todas las secciones con asistencia."""
+    AttendanceRow, AttendanceTally = _models(get_model)
+    con_marcas = AttendanceRow.objects.values("session__section_id")
+    AttendanceTally.objects.exclude(section_id__in=con_marcas).delete()
+    ids = sorted(set(con_marcas.values_list("session__section_id", flat=True)))
+    n = 0
+    for i in range(0, len(ids), lote):
+        n += recalcular(ids[i:i + lote], get_model)
+    return n
+
+
+def por_alumno(section_id, student_ids=None):
+    """{student_id: AttendanceTally} de una sección."""
+    from academic.models import AttendanceTally
+
+    qs = AttendanceTally.objects.filter(section_id=section_id)
+    if student_ids is not None:
+        qs = qs.filter(student_id__in=list(student_ids))
+    return {t.student_id: t for t in qs}
@@ -0,0 +1,166 @@
+"""
+Snapshot del dashboard del alumno + puesto de mérito por programa y período.
+
+El dashboard recorría TODOS los AcademicGradeRecord del programa en cada
+request para calcular el puesto (O(tamaño de la carrera), y crece con cada
+promoción). Ahora cada alumno tiene un StudentDashboardSnapshot con su PPA del
+stint activo y un TermMeritScore por período; se recalculan solo los alumnos
+cuyas notas cambiaron (señales en academic/signals.py, al confirmar la
+transacción) y el puesto es un conteo sobre el índice (programa, ppa):
+
+    puesto = 1 + #{compañeros del programa con PPA mayor}
+
+`manage.py rebuild_dashboard_snapshots` reconstruye todo (cargas masivas).
+"""
+import threading
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+
+PASSING_GRADE = 11
+_local = threading.local()
+
+
+def _models(get_model=None):
+    if get_model is None:
+        from django.apps import apps
+        get_model = apps.get_model
+    return (
+        get_model("students", "Student"),
+        get_model("academic", "AcademicGradeRecord"),
+        get_model("academic", "StudentDashboardSnapshot"),
+        get_model("academic", "TermMeritScore"),
+    )
+
+
+def _d2(x) -> Decimal:
+    return Decimal(str(round(float(x), 2))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def calcular(terms_recs):
+    """
+    terms_recs: [(term, final_grade, credits)] de un alumno.
+    Retorna (resumen del stint activo, {term: (ppa, créditos)}).
+    Mismo criterio que el dashboard: PPA = Σ(nota·créditos)/Σcréditos sobre
+    el stint activo (ver kardex._detect_active_stint_periods).
+    """
+    from academic.views.kardex import _detect_active_stint_periods
+    from academic.views.utils import _term_sort_key
+
+    all_terms = {t for t, _g, _c in terms_recs}
+    active = _detect_active_stint_periods(all_terms)
+    activos = sorted(active, key=_term_sort_key) if active else []
+
+    sum_w, sum_c, aprobados = 0.0, 0, 0
+    por_term = defaultdict(lambda: [0.0, 0])
+    for term, g, cr in terms_recs:
+        cr = int(cr or 0)
+        if g is None or cr <= 0:
+            continue
+        por_term[term][0] += float(g) * cr
+        por_term[term][1] += cr
+        if term in active:
+            sum_w += float(g) * cr
+            sum_c += cr
+            if float(g) >= PASSING_GRADE:
+                aprobados += cr
+
+    resumen = {
+        "ppa": _d2(sum_w / sum_c) if sum_c else _d2(0),
+        "credits_approved": aprobados,
+        "has_prior_enrollment": len(all_terms - active) > 0,
+        "active_since": activos[0] if activos else "",
+    }
+    terms = {t: (_d2(w / c), c) for t, (w, c) in por_term.items() if c}
+    return resumen, terms
+
+
+def actualizar(student_ids, get_model=None):
+    """Recalcula el snapshot y los puntajes por período de esos alumnos."""
+    Student, Record, Snapshot, TermScore = _models(get_model)
+    ids = [i for i in set(student_ids) if i]
+    if not ids:
+        return 0
+
+    programas = dict(Student.objects.filter(id__in=ids).values_list("id", "programa_carrera"))
+    recs = defaultdict(list)
+    for sid, term, g, cr in (Record.objects.filter(student_id__in=list(programas))
+                             .values_list("student_id", "term", "final_grade", "plan_course__credits")):
+        recs[sid].append((term, g, cr))
+
+    with transaction.atomic():
+        TermScore.objects.filter(student_id__in=list(programas)).delete()
+        nuevos = []
+        for sid, programa in programas.items():
+            programa = programa or ""
+            resumen, terms = calcular(recs.get(sid, []))
+            Snapshot.objects.update_or_create(student_id=sid, defaults={"programa": programa, **resumen})
+            nuevos += [TermScore(student_id=sid, programa=programa, term=t, ppa=ppa, credits=c)
+                       for t, (ppa, c) in terms.items()]
+        TermScore.objects.bulk_create(nuevos)
+    return len(programas)
+
+
+def reconstruir(get_model=None, chunk=500):
+    Student = _models(get_model)[0]
+    ids = list(Student.objects.values_list("id", flat=True).order_by("id"))
+    for i in range(0, len(ids), chunk):
+        actualizar(ids[i:i + chunk], get_model=get_model)
+    return len(ids)
+
+
+# ── Señales ──────────────────────────────────────────────────
+
+def _flush():
+    pend = getattr(_local, "ids", None)
+    _local.ids = set()
+    if pend:
+        actualizar(pend)
+
+
+def marcar(student_id):
+    """
+    Agenda el recálculo del alumno para cuando se confirme la transacción.
+    Una consolidación o importación que toca muchas notas del mismo alumno
+    lo recalcula una sola vez.
+    """
+    if not student_id:
+        return
+    if getattr(_local, "ids", None) is None:
+        _local.ids = set()
+    _local.ids.add(student_id)
+    transaction.on_commit(_flush)
+
+
+# ── Lectura ──────────────────────────────────────────────────
+
+def snapshot_de(student):
+    from academic.models import StudentDashboardSnapshot
+
+    snap = StudentDashboardSnapshot.objects.filter(student_id=student.id).first()
+    if snap is None:
+        actualizar([student.id])
+        snap = StudentDashboardSnapshot.objects.get(student_id=student.id)
+    return snap
+
+
+def puesto(snap):
+    """(puesto, total) en el programa; (None, 0) si no tiene programa."""
+    from academic.models import StudentDashboardSnapshot
+
+    if not snap.programa:
+        return None, 0
+    qs = StudentDashboardSnapshot.objects.filter(programa=snap.programa)
+    return qs.filter(ppa__gt=snap.ppa).count() + 1, qs.count()
+
+
+def puesto_en_periodo(student_id, term):
+    """(puesto, total, ppa) del alumno en el período dentro de su programa."""
+    from academic.models import TermMeritScore
+
+    mine = TermMeritScore.objects.filter(student_id=student_id, term=term).first()
+    if mine is None or not mine.programa:
+        return None, 0, None
+    qs = TermMeritScore.objects.filter(programa=mine.programa, term=term)
+    return qs.filter(ppa__gt=mine.ppa).count() + 1, qs.count(), float(mine.ppa)
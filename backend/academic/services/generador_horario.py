@@ -0,0 +1,418 @@
+"""
+Generador automático del horario de un período.
+
+Arma las franjas de las secciones del período respetando:
+  * docente: no dicta dos cosas a la vez y solo en su disponibilidad;
+  * aula: una sección a la vez, con capacidad suficiente (si la sección ya
+    tiene aula, se respeta);
+  * bloque plan-ciclo: las secciones de un mismo plan, ciclo y letra
+    (p.ej. Inicial · ciclo III · "A") son el mismo grupo de alumnos y no
+    pueden cruzarse;
+  * la sección no repite día y cubre sus horas semanales (PlanCourse.weekly_hours)
+    en bloques de `block_hours`.
+
+Entre las franjas válidas prefiere las que no dejan horas libres en medio
+del día del grupo ni del docente, y las más tempranas. La búsqueda es un
+backtracking con las secciones más restringidas primero; la ocupación de
+cada docente/aula/grupo por día es una máscara de bits, así que verificar
+una franja es un AND. Cada intento tiene un presupuesto de retrocesos; si
+algo queda fuera se reintenta con esas secciones al frente (`restarts`), y
+lo que aun así no entra se reporta en `unassigned` en vez de colgarse.
+El esfuerzo que piden las opciones se acota con `LIMITES` (`acotar`): la API
+corre el generador en un hilo del propio worker.
+
+Lo ya guardado del período que no se regenera (secciones con horario si
+`replace=False`) entra como ocupación fija. La escritura es en bloque
+(bulk_create de SectionScheduleSlot) dentro de una transacción, y solo si el
+resultado es completo: sin choques y sin secciones en `unassigned` (si no, lo
+guardado queda intacto y `applied` es False).
+
+    r = generar("2026-I", {"days": ["MON", "TUE", "WED", "THU", "FRI"],
+                           "day_start": "08:00", "day_end": "14:00"}, aplicar=True)
+"""
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from common import condicional
+
+from .horarios import AULA, DOCENTE, Franja, IndiceHorario, hhmm, minutos
+
+DEFAULTS = {
+    "days": ["MON", "TUE", "WED", "THU", "FRI"],
+    "day_start": "08:00",
+    "day_end": "14:00",
+    "slot_minutes": 60,          # duración de una hora de clase
+    "block_hours": 2,            # horas seguidas por sesión
+    "replace": False,            # True: regenera también las secciones con horario
+    "availability": {},          # {teacher user_id: {"MON": [["08:00", "12:00"]], ...}}
+    "max_backtracks": 3000,      # por intento
+    "candidates": 12,            # franjas a probar por bloque (las mejores)
+    "restarts": 10,              # reintentos con lo no asignado al frente
+}
+
+# Topes del esfuerzo de búsqueda que se aceptan desde fuera (API)
+LIMITES = {
+    "max_backtracks": 20000,
+    "candidates": 40,
+    "restarts": 30,
+}
+
+
+def acotar(opciones):
+    """Copia de `opciones` con el esfuerzo de búsqueda dentro de LIMITES.
+
+    Lanza ValueError si alguno no es un entero.
+    """
+    opts = dict(opciones or {})
+    for clave, tope in LIMITES.items():
+        if clave in opts:
+            opts[clave] = min(max(1, int(opts[clave])), tope)
+    return opts
+
+
+@dataclass
+class _Tarea:
+    section_id: int
+    largo: int                   # en horas de clase
+    grupo: tuple
+    teacher_id: int = None
+    aulas: list = field(default_factory=list)   # candidatas (fija si la sección ya tiene)
+    orden: int = 0               # n.º de bloque dentro de la sección
+
+
+def _huecos(bits: int) -> int:
+    """Horas libres entre la primera y la última ocupada."""
+    if not bits:
+        return 0
+    bits >>= (bits & -bits).bit_length() - 1
+    return bits.bit_length() - bin(bits).count("1")
+
+
+def _bloques(horas, largo):
+    out = []
+    while horas > 0:
+        out.append(min(largo, horas))
+        horas -= largo
+    return out
+
+
+class _Estado:
+    def __init__(self):
+        self.ocup = defaultdict(int)          # (recurso, día) → bits
+        self.dias_seccion = defaultdict(set)  # section_id → días usados
+        self.aula_seccion = {}                # section_id → [aula, bloques]: todos en la misma aula
+
+    def poner(self, recursos, dia, mask):
+        for r in recursos:
+            self.ocup[(r, dia)] |= mask
+
+    def quitar(self, recursos, dia, mask):
+        for r in recursos:
+            self.ocup[(r, dia)] &= ~mask
+
+    def asignar(self, t, dia, s, aula):
+        self.poner(_recursos(t, aula), dia, ((1 << t.largo) - 1) << s)
+        self.dias_seccion[t.section_id].add(dia)
+        self.aula_seccion.setdefault(t.section_id, [aula, 0])[1] += 1
+
+    def liberar(self, t, dia, s, aula):
+        self.quitar(_recursos(t, aula), dia, ((1 << t.largo) - 1) << s)
+        self.dias_seccion[t.section_id].discard(dia)
+        par = self.aula_seccion[t.section_id]
+        par[1] -= 1
+        if not par[1]:
+            del self.aula_seccion[t.section_id]
+
+    def copia(self):
+        otro = _Estado()
+        otro.ocup.update(self.ocup)
+        for sid, dias in self.dias_seccion.items():
+            otro.dias_seccion[sid] = set(dias)
+        return otro
+
+
+def _recursos(t, aula):
+    rec = [("g", t.grupo)]
+    if t.teacher_id:
+        rec.append(("t", t.teacher_id))
+    if aula:
+        rec.append(("r", aula))
+    return rec
+
+
+def _disponibilidad(opts, n_slots, dias, t0, paso):
+    """{academic teacher_id: {día: bits permitidos}} desde user_id → rangos."""
+    from academic.models import Teacher
+
+    raw = opts.get("availability") or {}
+    if not raw:
+        return {}
+    por_user = dict(Teacher.objects.filter(user_id__in=[int(k) for k in raw]).values_list("user_id", "id"))
+    out = {}
+    for uid, por_dia in raw.items():
+        tid = por_user.get(int(uid))
+        if not tid:
+            continue
+        out[tid] = {}
+        for d_idx, dia in enumerate(dias):
+            bits = 0
+            for ini, fin in por_dia.get(dia, []):
+                a, b = minutos(ini), minutos(fin)
+                if a is None or b is None:
+                    continue
+                for s in range(n_slots):
+                    if a <= t0 + s * paso and t0 + (s + 1) * paso <= b:
+                        bits |= 1 << s
+            out[tid][d_idx] = bits
+    return out
+
+
+def _faltante(sin_asignar):
+    return sum(t.largo for t in sin_asignar)
+
+
+def _buscar(tareas, estado, opts, n_slots, n_dias, disp):
+    """
+    Backtracking iterativo con presupuesto sobre `tareas` en ese orden.
+    Retorna (tareas, asignado {índice: (día, inicio, aula)}, sin_asignar,
+    retrocesos, estado).
+    """
+    todo = (1 << n_slots) - 1
+
+    def candidatas(t):
+        out = []
+        fija = estado.aula_seccion.get(t.section_id)
+        for d in range(n_dias):
+            if d in estado.dias_seccion[t.section_id]:
+                continue
+            permitido = disp[t.teacher_id][d] if t.teacher_id in disp else todo
+            g = estado.ocup[(("g", t.grupo), d)]
+            doc = estado.ocup[(("t", t.teacher_id), d)] if t.teacher_id else 0
+            for s in range(n_slots - t.largo + 1):
+                mask = ((1 << t.largo) - 1) << s
+                if mask & ~permitido or g & mask or doc & mask:
+                    continue
+                aula = None
+                for a in ([fija[0]] if fija else (t.aulas or [None])):
+                    if a is None or not (estado.ocup[(("r", a), d)] & mask):
+                        aula = a
+                        break
+                else:
+                    continue
+                costo = (
+                    10 * (_huecos(g | mask) - _huecos(g))
+                    + 3 * ((_huecos(doc | mask) - _huecos(doc)) if t.teacher_id else 0)
+                    + bin(g).count("1")          # reparte la carga del grupo entre días
+                    + s * 0.1                    # temprano
+                )
+                out.append((costo, d, s, aula))
+        out.sort()
+        return out[: int(opts["candidates"])]
+
+    asignado = {}                     # índice de tarea → (d, s, aula)
+    pila = []                         # [(índice, candidatas, siguiente)]
+    sin_asignar = []
+    retrocesos = 0
+    presupuesto = int(opts["max_backtracks"])
+    i = 0
+    while i < len(tareas):
+        t = tareas[i]
+        if pila and pila[-1][0] == i:
+            _, cands, k = pila.pop()
+        else:
+            cands, k = candidatas(t), 0
+        if k < len(cands):
+            _, d, s, aula = cands[k]
+            estado.asignar(t, d, s, aula)
+            asignado[i] = (d, s, aula)
+            pila.append((i, cands, k + 1))
+            i += 1
+            continue
+        # Sin lugar: retroceder (o, agotado el presupuesto, dejarla fuera)
+        if retrocesos >= presupuesto or not pila:
+            sin_asignar.append(t)
+            i += 1
+            continue
+        retrocesos += 1
+        j = pila[-1][0]
+        estado.liberar(tareas[j], *asignado.pop(j))
+        i = j
+        # La siguiente vuelta toma la pila de j y prueba su siguiente candidata
+    return tareas, asignado, sin_asignar, retrocesos, estado
+
+
+def generar(period, opciones=None, aplicar=False):
+    """Calcula (y si `aplicar`, guarda) el horario del período. Retorna un resumen."""
+    from academic.models import Classroom, Section, SectionScheduleSlot
+    from academic.views.utils import DAY_TO_INT, INT_TO_DAY
+
+    t_inicio = time.monotonic()
+    opts = {**DEFAULTS, **(opciones or {})}
+    dias = [d for d in opts["days"] if d in DAY_TO_INT]
+    paso = int(opts["slot_minutes"])
+    t0, t1 = minutos(opts["day_start"]), minutos(opts["day_end"])
+    n_slots = max(0, (t1 - t0) // paso)
+    dia_idx = {DAY_TO_INT[d]: i for i, d in enumerate(dias)}
+
+    secciones = list(
+        Section.objects.filter(period=period)
+        .select_related("plan_course__course", "plan_course__plan")
+        .prefetch_related("schedule_slots")
+        .order_by("id")
+    )
+    aulas = sorted(Classroom.objects.values_list("id", "capacity"), key=lambda a: (a[1], a[0]))
+    disp = _disponibilidad(opts, n_slots, dias, t0, paso)
+    estado_fijo = _Estado()
+
+    def grupo_de(sec):
+        pc = sec.plan_course
+        return (pc.plan_id, pc.semester, (sec.label or "").upper())
+
+    # ── Ocupación fija (lo que no se regenera) ──
+    regenerar, fijas = [], []
+    for sec in secciones:
+        slots = list(sec.schedule_slots.all())
+        if slots and not opts["replace"]:
+            fijas.append(sec)
+            for sl in slots:
+                d = dia_idx.get(sl.weekday)
+                ini, fin = minutos(sl.start), minutos(sl.end)
+                if d is None:
+                    continue
+                a = max(0, (ini - t0) // paso)
+                b = min(n_slots, -(-(fin - t0) // paso))
+                if b <= a:
+                    continue
+                mask = ((1 << (b - a)) - 1) << a
+                estado_fijo.poner(_recursos(_Tarea(sec.id, 0, grupo_de(sec), sec.teacher_id), sec.classroom_id), d, mask)
+                estado_fijo.dias_seccion[sec.id].add(d)
+        else:
+            regenerar.append(sec)
+
+    # ── Tareas: un bloque por sesión semanal ──
+    tareas = []
+    for sec in regenerar:
+        horas = int(sec.plan_course.weekly_hours or 0)
+        if sec.classroom_id:
+            cand = [sec.classroom_id]
+        else:
+            cand = [a for a, cap in aulas if cap >= (sec.capacity or 0)] or [a for a, _ in aulas]
+        for i, largo in enumerate(_bloques(horas, int(opts["block_hours"]))):
+            tareas.append(_Tarea(sec.id, largo, grupo_de(sec), sec.teacher_id, cand, i))
+
+    # Más restringidas primero: docentes con más carga, bloques largos, pocas aulas
+    carga = defaultdict(int)
+    for t in tareas:
+        if t.teacher_id:
+            carga[t.teacher_id] += t.largo
+    tareas.sort(key=lambda t: (-carga.get(t.teacher_id, 0), -t.largo, len(t.aulas) or 99, t.section_id, t.orden))
+
+    # Reinicios: lo que quedó fuera pasa adelante (con los demás bloques de su
+    # sección) y se vuelve a buscar desde la ocupación fija; gana el intento
+    # con menos horas sin asignar.
+    mejor = None
+    for _ in range(max(1, int(opts["restarts"]))):
+        intento = _buscar(tareas, estado_fijo.copia(), opts, n_slots, len(dias), disp)
+        if mejor is None or _faltante(intento[2]) < _faltante(mejor[2]):
+            mejor = intento
+        if not intento[2]:
+            break
+        fuera = {t.section_id for t in intento[2]}
+        tareas = [t for t in tareas if t.section_id in fuera] + [t for t in tareas if t.section_id not in fuera]
+    tareas, asignado, sin_asignar, retrocesos, estado = mejor
+
+    # ── Resultado ──
+    nuevas = defaultdict(list)        # section_id → [(weekday, ini, fin)]
+    aula_de = {}
+    for idx, (d, s, aula) in asignado.items():
+        t = tareas[idx]
+        ini = t0 + s * paso
+        nuevas[t.section_id].append((DAY_TO_INT[dias[d]], ini, ini + t.largo * paso))
+        if aula:
+            aula_de[t.section_id] = aula
+
+    por_id = {s.id: s for s in secciones}
+    huecos = sum(_huecos(bits) for (rec, _d), bits in estado.ocup.items() if rec[0] == "g")
+
+    # Verificación independiente con el motor de choques (aula / docente)
+    franjas = [Franja(sid, wd, a, b, por_id[sid].teacher_id, aula_de.get(sid) or por_id[sid].classroom_id)
+               for sid, lst in nuevas.items() for wd, a, b in lst]
+    for sec in fijas:
+        franjas += [Franja(sec.id, sl.weekday, minutos(sl.start), minutos(sl.end), sec.teacher_id, sec.classroom_id)
+                    for sl in sec.schedule_slots.all()]
+    choques = IndiceHorario(franjas).choques(tipos=(AULA, DOCENTE))
+
+    faltan = defaultdict(int)
+    for t in sin_asignar:
+        faltan[t.section_id] += t.largo
+    resumen = {
+        "period": period,
+        "sections": len(regenerar),
+        "fixed_sections": len(fijas),
+        "blocks": len(asignado),
+        "gaps": huecos,
+        "conflicts": len(choques),
+        "backtracks": retrocesos,
+        "unassigned": [
+            {
+                "section_id": sid,
+                "label": por_id[sid].label,
+                "course": por_id[sid].plan_course.display_name or por_id[sid].plan_course.course.name,
+                "hours_missing": h,
+            }
+            for sid, h in sorted(faltan.items())
+        ],
+        "schedule": [
+            {
+                "section_id": sid,
+                "classroom_id": aula_de.get(sid) or por_id[sid].classroom_id,
+                "slots": [{"day": INT_TO_DAY[wd], "start": hhmm(a), "end": hhmm(b)} for wd, a, b in sorted(lst)],
+            }
+            for sid, lst in sorted(nuevas.items())
+        ],
+        "applied": False,
+    }
+
+    if aplicar and not choques and not sin_asignar:
+        with transaction.atomic():
+            ids = [s.id for s in regenerar]
+            SectionScheduleSlot.objects.filter(section_id__in=ids).delete()
+            SectionScheduleSlot.objects.bulk_create([
+                SectionScheduleSlot(section_id=sid, weekday=wd, start=hhmm(a), end=hhmm(b))
+                for sid, lst in nuevas.items() for wd, a, b in lst
+            ], batch_size=1000)
+            sin_aula = [por_id[sid] for sid, aula in aula_de.items() if not por_id[sid].classroom_id]
+            for sec in sin_aula:
+                sec.classroom_id = aula_de[sec.id]
+            Section.objects.bulk_update(sin_aula, ["classroom"], batch_size=500)
+            condicional.tocar(SectionScheduleSlot, Section)
+        resumen["applied"] = True
+
+    resumen["elapsed_ms"] = int((time.monotonic() - t_inicio) * 1000)
+    return resumen
+
+
+def ejecutar_job(job_id):
+    """Corre un TimetableJob (hilo de la API o consola) y guarda su resultado."""
+    from django.db import close_old_connections
+    from django.utils import timezone
+
+    from academic.models import TimetableJob
+
+    close_old_connections()
+    job = TimetableJob.objects.get(pk=job_id)
+    job.status = "RUNNING"
+    job.save(update_fields=["status"])
+    try:
+        job.result = generar(job.period, job.options, aplicar=job.apply)
+        job.status = "DONE"
+    except Exception as exc:
+        job.status = "FAILED"
+        job.error = str(exc)[:2000]
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "error", "finished_at"])
+    close_old_connections()
+    return job
@@ -26,12 +26,14 @@ divergir; no se hizo aún porque el comando está en uso activo.
 from collections import defaultdict
 
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Sum
 
 from academic.models import (
-    AttendanceRow, AttendanceSession, Enrollment, EnrollmentItem, PlanCourse,
-    Section, SectionGrades,
+    AttendanceTally, DataAuditResult, Enrollment, EnrollmentItem, PlanCourse, Section,
 )
+from academic.services import actas, dashboard_snapshot, ranking_merito
+from common import condicional
+from common.busqueda import filtrar_terminos
 from students.models import Student
 from students.name_utils import nombre_oficial
 
@@ -58,12 +60,8 @@ def buscar_alumnos(q, limite=20):
     if q.isdigit():
         qs = qs.filter(num_documento__startswith=q)
     else:
-        for p in q.upper().split():
-            qs = qs.filter(
-                Q(apellido_paterno__icontains=p)
-                | Q(apellido_materno__icontains=p)
-                | Q(nombres__icontains=p)
-            )
+        # Columna normalizada: "nuñez" encuentra "NUNEZ" y viceversa
+        qs = filtrar_terminos(qs, q)
     return [{
         "student_id": st.id,
         "dni": st.num_documento,
@@ -319,6 +317,35 @@ def roster_seccion(section_id):
     }
 
 
+def auditoria(period, limite=200):
+    """Último resultado guardado de cada bloque de `manage.py auditar_datos`
+    para el período ("" = la corrida de todos los períodos). `vigente` es
+    False si alguna tabla del bloque cambió desde esa revisión."""
+    from academic.management.commands.auditar_datos import UNIDADES, marca
+
+    period = (period or "").strip()
+    bloques = []
+    for r in DataAuditResult.objects.filter(period=period):
+        if r.unit not in UNIDADES:
+            continue
+        bloques.append({
+            "unidad": r.unit,
+            "titulo": UNIDADES[r.unit][0],
+            "revisado": r.checked_at,
+            "duracion_ms": r.duration_ms,
+            "total": r.total,
+            "vigente": r.watermark == marca(r.unit, period),
+            "hallazgos": [
+                {"clave": k, "titulo": h["titulo"], "grave": h["grave"],
+                 "cabecera": h["cabecera"], "n": len(h["filas"]),
+                 "filas": h["filas"][:limite] if limite else h["filas"]}
+                for k, h in (r.findings or {}).items()
+            ],
+        })
+    bloques.sort(key=lambda b: b["unidad"])
+    return {"period": period, "bloques": bloques}
+
+
 # ══════════════════════════════════════════════════════════════
 #  ESCRITURA
 # ══════════════════════════════════════════════════════════════
@@ -398,13 +425,11 @@ def avisos_quitar(st, item):
     if not item.section_id:
         return avisos
     claves = _claves_alumno(st)
-    bundle = SectionGrades.objects.filter(section_id=item.section_id).first()
-    if bundle and isinstance(bundle.grades, dict):
-        if {str(k) for k in claves} & set(bundle.grades.keys()):
-            avisos.append("Tiene NOTAS registradas en el acta de esa sección")
-    n = AttendanceRow.objects.filter(
-        session__in=AttendanceSession.objects.filter(section_id=item.section_id),
-        student_id__in=claves).count()
+    if actas.secciones_con(claves, section_ids=[item.section_id]):
+        avisos.append("Tiene NOTAS registradas en el acta de esa sección")
+    n = AttendanceTally.objects.filter(
+        section_id=item.section_id, student_id__in=claves,
+    ).aggregate(n=Sum("total"))["n"] or 0
     if n:
         avisos.append(f"Tiene {n} marca(s) de asistencia en esa sección")
     return avisos
@@ -522,6 +547,12 @@ def fusionar_kardex(dni_origen, dni_destino, aplicar=False):
     with transaction.atomic():
         origen.grade_records.filter(id__in=[m["id"] for m in mover]).update(
             student=destino)
+        # El update() no dispara las señales de AcademicGradeRecord
+        condicional.tocar("academic.AcademicGradeRecord")
+        dashboard_snapshot.marcar(origen.id)
+        dashboard_snapshot.marcar(destino.id)
+        for term in {m["term"] for m in mover}:
+            ranking_merito.marcar(term)
     detalle["aplicado"] = True
     detalle["origen"]["notas"] = origen.grade_records.count()
     return True, (f"{len(mover)} nota(s) movida(s) a {destino.num_documento}. "
@@ -689,6 +720,7 @@ def asignar_secciones_unicas(period, aplicar=False):
         for c in candidatos:
             n += EnrollmentItem.objects.filter(id=c["item_id"]).update(
                 section_id=c["secciones"][0]["section_id"])
+        condicional.tocar(EnrollmentItem)
     return n, candidatos
 
 
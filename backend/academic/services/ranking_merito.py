@@ -0,0 +1,155 @@
+"""
+Orden de mérito precalculado por período: aula, especialidad e instituto.
+
+La página "Mi mérito" filtraba tres cohortes, recalculaba el promedio
+ponderado de TODOS sus alumnos y recorría el ranking para encontrar al
+alumno; un solo alumno abriendo la página costaba un cálculo de notas de
+todo el instituto. Ahora `reconstruir(term)` calcula una vez los rankings
+de todas las cohortes del período (PeriodMeritRank) y las lecturas son por
+índice:
+
+    fila = PeriodMeritRank(term, career_id, semester, student) → puesto, total
+
+Vigencia: las señales (academic/signals.py) suben PeriodMeritBuild.version
+al confirmar cambios de notas o de alumnos (`invalidar`); `asegurar(term)`
+reconstruye el período solo si la versión construida quedó atrás. Procesar
+calificaciones (EvaluationProcessView) reconstruye en el acto. Quien escribe
+notas en bloque sin save() (queryset.update, bulk_*) no dispara las señales y
+debe llamar a `marcar(term)` a mano; hoy: mesa_control.fusionar_kardex.
+
+Mismas reglas que academic/views/merito.py: promedio de
+_promedios_por_alumno, ranking de competencia (1, 2, 2, 4) con desempate
+por apellidos, cohorte de ciclo según los cursos del kárdex del período.
+"""
+import threading
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+_local = threading.local()
+
+
+def _entero(valor) -> int:
+    """Filtro de query param → int (0 = sin filtro), como _filtrar_students."""
+    try:
+        return int(valor or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def reconstruir(term):
+    """Recalcula todas las cohortes del período. Retorna el número de filas."""
+    from academic.models import AcademicGradeRecord, PeriodMeritBuild, PeriodMeritRank
+    from academic.views.evaluation_pdf import _promedios_por_alumno
+    from academic.views.merito import _ranking
+    from students.models import Student
+
+    build, _ = PeriodMeritBuild.objects.get_or_create(term=term)
+    version = build.version
+
+    semestres = defaultdict(set)
+    for sid, sem in (AcademicGradeRecord.objects.filter(term=term)
+                     .values_list("student_id", "plan_course__semester")):
+        sems = semestres[sid]          # el alumno cuenta aunque no tenga ciclo
+        if sem:
+            sems.add(sem)
+    students = list(Student.objects.filter(id__in=list(semestres)).select_related("plan"))
+    proms = _promedios_por_alumno(term=term)
+
+    cohortes = defaultdict(list)
+    for st in students:
+        career_id = (st.plan.career_id if st.plan else None) or 0
+        claves = [(0, 0)] + [(0, s) for s in semestres[st.id]]
+        if career_id:
+            claves += [(career_id, 0)] + [(career_id, s) for s in semestres[st.id]]
+        for clave in claves:
+            cohortes[clave].append(st)
+
+    filas = []
+    for (career_id, semester), cohorte in cohortes.items():
+        ranking = _ranking(cohorte, proms)
+        for orden, (puesto, st, prom) in enumerate(ranking, 1):
+            sems = semestres[st.id]
+            filas.append(PeriodMeritRank(
+                term=term, career_id=career_id, semester=semester, student=st,
+                promedio=Decimal(str(prom)), puesto=puesto, orden=orden,
+                total=len(ranking), ciclo=max(sems) if sems else None,
+            ))
+
+    with transaction.atomic():
+        PeriodMeritRank.objects.filter(term=term).delete()
+        PeriodMeritRank.objects.bulk_create(filas, batch_size=1000)
+        PeriodMeritBuild.objects.filter(pk=build.pk).update(
+            built_version=version, built_at=timezone.now())
+    return len(filas)
+
+
+def asegurar(term):
+    """Reconstruye el período si no está construido o quedó desactualizado."""
+    from academic.models import PeriodMeritBuild
+
+    build = PeriodMeritBuild.objects.filter(term=term).first()
+    if build is None or build.built_version < build.version:
+        reconstruir(term)
+
+
+def invalidar(terms):
+    """Marca desactualizados los períodos (los que nunca se construyeron no tienen fila)."""
+    from academic.models import PeriodMeritBuild
+
+    terms = [t for t in set(terms) if t]
+    if terms:
+        PeriodMeritBuild.objects.filter(term__in=terms).update(version=F("version") + 1)
+
+
+# ── Señales ──────────────────────────────────────────────────
+
+def _flush():
+    pend = getattr(_local, "terms", None)
+    _local.terms = set()
+    if pend:
+        invalidar(pend)
+
+
+def marcar(term):
+    """Agenda la invalidación del período para cuando se confirme la transacción."""
+    if not term:
+        return
+    if getattr(_local, "terms", None) is None:
+        _local.terms = set()
+    _local.terms.add(term)
+    transaction.on_commit(_flush)
+
+
+def marcar_alumno(student_id):
+    """Cambió el plan o el nombre del alumno: sus períodos se reordenan."""
+    from academic.models import PeriodMeritRank
+
+    for term in (PeriodMeritRank.objects.filter(student_id=student_id)
+                 .values_list("term", flat=True).distinct()):
+        marcar(term)
+
+
+# ── Lectura ──────────────────────────────────────────────────
+
+def cohorte(term, career_id=None, semester=None):
+    """Filas del ranking de la cohorte, en orden de listado (con el alumno cargado)."""
+    from academic.models import PeriodMeritRank
+
+    asegurar(term)
+    return list(PeriodMeritRank.objects
+                .filter(term=term, career_id=_entero(career_id), semester=_entero(semester))
+                .select_related("student", "student__plan", "student__plan__career")
+                .order_by("orden"))
+
+
+def posiciones(student_id, term):
+    """{(career_id, semester): fila} del alumno en el período ({} si no tiene promedio)."""
+    from academic.models import PeriodMeritRank
+
+    asegurar(term)
+    return {(r.career_id, r.semester): r
+            for r in PeriodMeritRank.objects.filter(student_id=student_id, term=term)}
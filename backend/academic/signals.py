@@ -0,0 +1,104 @@
+"""
+Señales del módulo académico.
+
+1) Invalida la página pública de verificación de matrícula (QR de la ficha,
+   academic/views/enrollment_verify.py) cuando cambia lo que muestra: la
+   matrícula, sus cursos o los datos del estudiante. Corre al confirmar la
+   transacción: si se hiciera antes, un escaneo concurrente podría leer los
+   datos viejos y cachearlos con la versión nueva.
+
+2) Mantiene el snapshot del dashboard del alumno y su puntaje de mérito
+   (academic/services/dashboard_snapshot.py) cuando cambian sus notas o su
+   programa.
+
+3) Invalida el orden de mérito precalculado del período
+   (academic/services/ranking_merito.py) cuando cambian sus notas, o el plan
+   o el nombre de un alumno ranqueado.
+
+4) Refleja en las celdas del acta (SectionGradeEntry, academic/services/
+   actas.py) los guardados que todavía escriben el JSON SectionGrades.grades
+   completo (importación Excel, DPI por asistencia, purgas).
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.public_cache import invalidar
+from students.models import Student
+
+from .models import AcademicGradeRecord, Enrollment, EnrollmentItem, SectionGrades
+from .services import actas, dashboard_snapshot, ranking_merito
+from .views.enrollment_verify import CACHE_NS
+
+
+def _invalidar_dni(dni):
+    if dni:
+        transaction.on_commit(lambda: invalidar(CACHE_NS, dni))
+
+
+@receiver([post_save, post_delete], sender=Enrollment, dispatch_uid="academic_verify_enrollment")
+def _enrollment_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _invalidar_dni(
+        Student.objects.filter(pk=instance.student_id).values_list("num_documento", flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=EnrollmentItem, dispatch_uid="academic_verify_enrollment_item")
+def _item_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _invalidar_dni(
+        Enrollment.objects.filter(pk=instance.enrollment_id)
+        .values_list("student__num_documento", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Student, dispatch_uid="academic_verify_enrollment_student")
+def _student_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _invalidar_dni(instance.num_documento)
+
+
+# ── Snapshot del dashboard / mérito ──────────────────────────
+
+@receiver([post_save, post_delete], sender=AcademicGradeRecord, dispatch_uid="academic_dashboard_snapshot_grade")
+def _grade_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dashboard_snapshot.marcar(instance.student_id)
+
+
+@receiver(post_save, sender=Student, dispatch_uid="academic_dashboard_snapshot_student")
+def _student_snapshot(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if created or update_fields is None or "programa_carrera" in update_fields:
+        dashboard_snapshot.marcar(instance.id)
+
+
+# ── Orden de mérito del período ──────────────────────────────
+
+@receiver([post_save, post_delete], sender=AcademicGradeRecord, dispatch_uid="academic_merit_rank_grade")
+def _grade_merit(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ranking_merito.marcar(instance.term)
+
+
+@receiver(post_save, sender=Student, dispatch_uid="academic_merit_rank_student")
+def _student_merit(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    campos = {"plan", "plan_id", "apellido_paterno", "apellido_materno", "nombres"}
+    if update_fields is None or campos & set(update_fields):
+        ranking_merito.marcar_alumno(instance.id)
+
+
+# ── Celdas del acta ──────────────────────────────────────────
+
+@receiver(post_save, sender=SectionGrades, dispatch_uid="academic_section_grade_entries")
+def _acta_guardada(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or getattr(instance, "_celdas_al_dia", False):
+        return
+    if update_fields is None or "grades" in update_fields:
+        actas.sincronizar(instance)
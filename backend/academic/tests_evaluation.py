@@ -970,6 +970,46 @@ class AsistenciaMensualTests(BaseEvalTest):
         self.assertFalse(AttendanceSession.objects.filter(
             section=self.sec1, date="2026-06-04").exists())
 
+    def test_contadores_por_alumno(self):
+        from academic.views.attendance import (AdminAttendanceOverviewView,
+                                               AdminAttendanceSectionDetailView,
+                                               AttendanceMonthView)
+        from academic.models import AttendanceTally
+        from academic.services.asistencia import reconstruir
+
+        def grabar(body):
+            req = self.factory.post("/x", {"month": "2026-06", **body}, format="json")
+            force_authenticate(req, user=self.tuser)
+            return AttendanceMonthView.as_view()(req, section_id=self.sec1.id)
+
+        def contadores():
+            return sorted(AttendanceTally.objects.filter(section=self.sec1).values_list(
+                "student_id", "present", "late", "absent", "total"))
+
+        grabar({"marks": {
+            str(self.st1.user_id): {"1": "P", "2": "T", "3": "P"},
+            str(self.st2.id): {"1": "F", "2": "F", "3": "P"},
+        }})
+        esperado = sorted([(self.st1.user_id, 2, 1, 0, 3), (self.st2.id, 1, 0, 2, 3)])
+        self.assertEqual(contadores(), esperado)
+
+        # Detalle y monitoreo leen los contadores: st2 con 2/3 faltas en riesgo
+        req = self.factory.get("/x")
+        force_authenticate(req, user=self.admin)
+        res = AdminAttendanceSectionDetailView.as_view()(req, section_id=self.sec1.id)
+        fila = next(s for s in res.data["students"] if s["student_id"] == self.st2.id)
+        self.assertEqual((fila["absent"], fila["present"], fila["at_risk"]), (2, 1, True))
+        res = self._get(AdminAttendanceOverviewView, "/x", {"period": PERIOD})
+        sec = next(s for s in res.data["sections"] if s["section_id"] == self.sec1.id)
+        self.assertEqual(sec["n_at_risk"], 1)
+
+        # Vaciar el día 2 actualiza los contadores en la misma grabación
+        grabar({"marks": {}, "days": [2]})
+        esperado = sorted([(self.st1.user_id, 2, 0, 0, 2), (self.st2.id, 1, 0, 1, 2)])
+        self.assertEqual(contadores(), esperado)
+        reconstruir()
+        self.assertEqual(contadores(), esperado)
+
     def test_docente_ajeno_403(self):
         from academic.views.attendance import AttendanceMonthView
         otro = User.objects.create_user("otro_doc2", "otro2@t.pe", "x")
@@ -13,6 +13,7 @@ from .views.mesa_control import (
     AlumnoCursoSeccionView as MC_AlumnoCursoSeccionView,
     SeccionRosterView as MC_SeccionRosterView,
     FusionarView as MC_FusionarView,
+    AuditoriaView as MC_AuditoriaView,
 )
 from .views import (
     PlansViewSet, SectionsViewSet, TeachersViewSet, ClassroomsViewSet,
@@ -22,7 +23,7 @@ from .views import (
     KardexRecordNotasPDFView, KardexFichaRendimientoPDFView,
     FichaRendimientoBulkZipView,
 
-    SectionsScheduleConflictsView,
+    SectionsScheduleConflictsView, SectionsTimetableCheckView, SectionsTimetableGenerateView,
     AvailableCoursesView,
 
     EnrollmentValidateView, EnrollmentSuggestionsView, EnrollmentCommitView,
@@ -184,6 +185,9 @@ urlpatterns = [
     re_path(r"^sections/?$",                  sections_list,   name="sections-list-hard"),
     re_path(r"^sections/(?P<pk>[^/.]+)/?$",   sections_detail, name="sections-detail-hard"),
     path("sections/schedule/conflicts",       SectionsScheduleConflictsView.as_view()),
+    path("sections/schedule/check",           SectionsTimetableCheckView.as_view()),
+    path("sections/schedule/generate",        SectionsTimetableGenerateView.as_view()),
+    path("sections/schedule/generate/<int:job_id>", SectionsTimetableGenerateView.as_view()),
 
     # ── Asistencia ───────────────────────────────────────────────
     path("sections/<int:section_id>/attendance/mes",
@@ -385,4 +389,5 @@ urlpatterns = [
          MC_AlumnoCursoSeccionView.as_view()),
     path("mesa-control/seccion/<int:section_id>", MC_SeccionRosterView.as_view()),
     path("mesa-control/fusionar",              MC_FusionarView.as_view()),
+    path("mesa-control/auditoria",             MC_AuditoriaView.as_view()),
 ]
\ No newline at end of file
@@ -10,6 +10,8 @@ from .plans import PlansViewSet
 from .sections import (
     SectionsViewSet,
     SectionsScheduleConflictsView,
+    SectionsTimetableCheckView,
+    SectionsTimetableGenerateView,
 )
 
 # ── Matrícula ──────────────────────────────────────────────────────────────
@@ -167,6 +169,8 @@ __all__ = [
     # Sections
     "SectionsViewSet",
     "SectionsScheduleConflictsView",
+    "SectionsTimetableCheckView",
+    "SectionsTimetableGenerateView",
     # Enrollment
     "AvailableCoursesView",
     "EnrollmentValidateView",
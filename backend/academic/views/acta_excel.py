@@ -42,6 +42,8 @@ from academic.models import (
     Section, SectionGrades, AttendanceSession, AttendanceRow,
     EnrollmentItem,
 )
+from academic.services.asistencia import recalcular
+from common import condicional
 from students.name_utils import (apellidos_de, clave_orden, nombre_oficial,
                                  nombres_de)
 from .utils import ok
@@ -116,13 +118,18 @@ def _items_de_seccion(sec):
             enrollment__period=sec.period,
         )
     )
-    de_esta = [i for i in items if i.section_id == sec.id]
-    sin_sec = [i for i in items if i.section_id is None]
-    de_otras = [i for i in items if i.section_id not in (None, sec.id)]
-
     n_secciones = (Section.objects
                    .filter(plan_course_id=sec.plan_course_id, period=sec.period)
                    .count())
+    return repartir_items(sec, items, n_secciones)
+
+
+def repartir_items(sec, items, n_secciones):
+    """Las reglas de `_items_de_seccion` sobre ítems ya cargados (los del curso
+    y período de la sección) — para recorrer muchas secciones en una pasada."""
+    de_esta = [i for i in items if i.section_id == sec.id]
+    sin_sec = [i for i in items if i.section_id is None]
+    de_otras = [i for i in items if i.section_id not in (None, sec.id)]
 
     if n_secciones <= 1 or not (de_esta or de_otras):
         return de_esta + sin_sec, []
@@ -1365,7 +1372,9 @@ class SectionAttendanceImportView(APIView):
                     AttendanceRow(session=sess, student_id=int(k), status=v)
                     for k, v in marcas.items()
                 ])
+                condicional.tocar(AttendanceRow)
                 sesiones_ok += 1
+            recalcular(sec.id)
 
         msg = f"{sesiones_ok} día(s) de asistencia importado(s) para {y}-{mo:02d}"
         if cerradas:
@@ -4,8 +4,6 @@ Vistas para Asistencia, Sílabos y Configuración de Evaluación
 import csv
 import mimetypes
 from datetime import datetime
-from django.db import transaction
-from django.http import FileResponse
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -16,10 +14,14 @@ from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from academic.models import (
-    Section, AttendanceSession, AttendanceRow,
+    Section, AttendanceSession, AttendanceRow, AttendanceTally,
     SectionScheduleSlot, Syllabus, EvaluationConfig
 )
 from academic.serializers import AttendanceSessionSerializer
+from academic.services.asistencia import por_alumno, recalcular
+from common import condicional
+from common.entrega import entregar
+from common.sqlite import escritura
 from .utils import ok, ALLOWED_ATT
 
 
@@ -170,7 +172,7 @@ class AttendanceSessionSetView(APIView):
         from .teachers import _licencia_students
         lic_keys = set(_licencia_students(sess.section).keys())
 
-        with transaction.atomic():
+        with escritura():
             AttendanceRow.objects.filter(session=sess).delete()
             for r in rows:
                 sid = r.get("student_id")
@@ -182,7 +184,8 @@ class AttendanceSessionSetView(APIView):
                     continue
                 st = (r.get("status") or "").upper().strip()
                 AttendanceRow.objects.create(session=sess, student_id=sid, status=st)
-        
+            recalcular(section_id)
+
         return ok(success=True)
 
 
@@ -356,7 +359,7 @@ class AttendanceMonthView(APIView):
                 continue
 
         guardados, cerrados = 0, []
-        with transaction.atomic():
+        with escritura():
             for d in sorted(dias):
                 fecha = date_cls(y, m, d)
                 if not _es_dia_dictado(d):
@@ -393,10 +396,13 @@ class AttendanceMonthView(APIView):
                     except (TypeError, ValueError):
                         continue
                 AttendanceRow.objects.bulk_create(nuevos)
+                condicional.tocar(AttendanceRow)
                 if not nuevos:
                     sess.delete()   # día quedó vacío → quitar la sesión
                 else:
                     guardados += 1
+            # Contadores por alumno en la misma transacción que las marcas
+            recalcular(section_id)
 
         msg = f"Asistencia grabada: {guardados} día(s)"
         if cerrados:
@@ -489,7 +495,7 @@ class AttendanceImportSaveView(APIView):
                 continue
             by_date.setdefault(dt, []).append((sid, st))
         
-        with transaction.atomic():
+        with escritura():
             for dt, rows in by_date.items():
                 d = datetime.strptime(dt, "%Y-%m-%d").date()
                 sess, _ = AttendanceSession.objects.get_or_create(section=section, date=d)
@@ -500,6 +506,7 @@ class AttendanceImportSaveView(APIView):
                     except Exception:
                         sid_int = 0
                     AttendanceRow.objects.create(session=sess, student_id=sid_int, status=st)
+            recalcular(section.id)
         
         return ok(success=True)
 
@@ -547,9 +554,7 @@ def syllabus_download(request, section_id):
     s = get_object_or_404(Syllabus, section_id=section_id)
     filename = s.file.name.split("/")[-1]
     content_type, _ = mimetypes.guess_type(filename)
-    resp = FileResponse(s.file.open("rb"), content_type=content_type or "application/pdf")
-    resp["Content-Disposition"] = f'inline; filename="{filename}"'
-    return resp
+    return entregar(s.file, filename=filename, content_type=content_type or "application/pdf")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -692,30 +697,15 @@ class AdminAttendanceOverviewView(APIView):
             )
             n_students = len(students_in_section)
 
-            # % de inasistencia por alumno
-            absences_by_student = {}
-            presents_by_student = {}
+            # Alumnos con > DPI_THRESHOLD de faltas: lectura indexada de los
+            # contadores (section, absent) en vez de contar AttendanceRow
+            n_at_risk = 0
             if n_sessions and students_in_section:
-                rows = AttendanceRow.objects.filter(
-                    session__in=sessions,
+                n_at_risk = AttendanceTally.objects.filter(
+                    section=sec,
                     student_id__in=students_in_section,
-                ).values("student_id", "status")
-                for r in rows:
-                    sid = r["student_id"]
-                    s = (r["status"] or "").upper()
-                    if s == "ABSENT":
-                        absences_by_student[sid] = absences_by_student.get(sid, 0) + 1
-                    elif s == "PRESENT" or s == "LATE":
-                        presents_by_student[sid] = presents_by_student.get(sid, 0) + 1
-
-            at_risk = []  # alumnos con > DPI_THRESHOLD de faltas
-            for sid in students_in_section:
-                a = absences_by_student.get(sid, 0)
-                if n_sessions:
-                    pct = a / n_sessions
-                    if pct > DPI_THRESHOLD:
-                        at_risk.append({"student_id": sid, "absences": a,
-                                        "sessions": n_sessions, "pct": round(pct*100, 1)})
+                    absent__gt=DPI_THRESHOLD * n_sessions,
+                ).count()
 
             teacher_name = ""
             if sec.teacher and sec.teacher.user:
@@ -736,7 +726,7 @@ class AdminAttendanceOverviewView(APIView):
                 "n_students": n_students,
                 "n_sessions": n_sessions,
                 "n_sessions_closed": n_closed,
-                "n_at_risk": len(at_risk),
+                "n_at_risk": n_at_risk,
                 "has_no_attendance": n_sessions == 0,
             })
 
@@ -782,21 +772,14 @@ class AdminAttendanceSectionDetailView(APIView):
             "apellido_paterno", "apellido_materno", "nombres"
         )
 
-        # Contar por alumno
-        rows = AttendanceRow.objects.filter(
-            session__in=sessions, student_id__in=st_ids,
-        ).values("student_id", "status")
-        counts = {}
-        for r in rows:
-            sid = r["student_id"]
-            s = (r["status"] or "").upper()
-            d = counts.setdefault(sid, {"PRESENT":0, "ABSENT":0, "LATE":0, "EXCUSED":0})
-            if s in d:
-                d[s] += 1
+        # Conteo por alumno desde los contadores mantenidos al grabar
+        tallies = por_alumno(sec.id, st_ids)
 
         out = []
         for st in students:
-            c = counts.get(st.id, {"PRESENT":0,"ABSENT":0,"LATE":0,"EXCUSED":0})
+            t = tallies.get(st.id)
+            c = ({"PRESENT": t.present, "ABSENT": t.absent, "LATE": t.late, "EXCUSED": t.excused}
+                 if t else {"PRESENT": 0, "ABSENT": 0, "LATE": 0, "EXCUSED": 0})
             abs_n = c["ABSENT"]
             pct = (abs_n / n_sessions) if n_sessions else 0
             out.append({
@@ -874,14 +857,8 @@ class AdminAttendanceApplyDpiView(APIView):
             .distinct()
         )
 
-        # Contar faltas por alumno
-        absences = {}
-        for r in AttendanceRow.objects.filter(
-                session__in=sessions, student_id__in=st_ids,
-        ).values("student_id", "status"):
-            if (r["status"] or "").upper() == "ABSENT":
-                sid = r["student_id"]
-                absences[sid] = absences.get(sid, 0) + 1
+        # Faltas por alumno (contadores)
+        absences = {sid: t.absent for sid, t in por_alumno(sec.id, st_ids).items()}
 
         at_risk = []
         for sid in st_ids:
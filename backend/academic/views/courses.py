@@ -8,12 +8,14 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from academic.models import Course
+from common.condicional import condicional
 
 
 class CoursesListView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    @condicional("academic.Course")
     def get(self, request):
         q = (request.query_params.get("q") or "").strip()
         qs = Course.objects.all().order_by("code", "name")
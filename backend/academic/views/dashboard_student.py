@@ -4,6 +4,7 @@ Dashboard del estudiante — 3 endpoints.
 Usa modelos reales:
   students.Student, catalogs.Period, academic.AcademicGradeRecord,
   academic.Enrollment/EnrollmentItem, academic.AttendanceSession/AttendanceRow,
+  academic.AttendanceTally,
   academic.SectionScheduleSlot, academic.Section
 """
 
@@ -19,11 +20,11 @@ from students.models import Student
 from catalogs.models import Period
 from academic.models import (
     PlanCourse, Section, Enrollment, EnrollmentItem,
-    AcademicGradeRecord, AttendanceSession, AttendanceRow,
+    AcademicGradeRecord, AttendanceTally,
     SectionScheduleSlot,
 )
-from .kardex import _detect_active_stint_periods
-from .utils import _term_sort_key
+from academic.services import actas
+from academic.services.dashboard_snapshot import puesto, puesto_en_periodo, snapshot_de
 
 PASSING_GRADE = 11
 WEEKDAY_NAMES = {1: "Lunes", 2: "Martes", 3: "Miércoles", 4: "Jueves", 5: "Viernes", 6: "Sábado", 7: "Domingo"}
@@ -112,30 +113,10 @@ def student_dashboard(request):
 
     period = _current_period()
 
-    # ── Detección de stint activo (reingreso) ──
-    all_terms = set(
-        AcademicGradeRecord.objects.filter(student=student)
-        .values_list("term", flat=True).distinct()
-    )
-    active_periods = _detect_active_stint_periods(all_terms)
-    has_prior_enrollment = len(all_terms - active_periods) > 0
-    active_sorted = sorted(active_periods, key=_term_sort_key) if active_periods else []
-    active_since = active_sorted[0] if active_sorted else None
-
-    # ── Registros académicos del stint activo ──
-    all_records = AcademicGradeRecord.objects.filter(
-        student=student
-    ).select_related("plan_course")
-
-    # Filtrar solo períodos del stint activo
-    active_records = all_records.filter(term__in=active_periods) if active_periods else all_records
-
-    # Créditos aprobados (solo stint activo)
-    credits_approved = sum(
-        getattr(gr.plan_course, "credits", 0) or 0
-        for gr in active_records.filter(final_grade__gte=PASSING_GRADE)
-        if gr.plan_course
-    )
+    # ── PPA, créditos aprobados y reingreso: snapshot precalculado ──
+    # (academic/services/dashboard_snapshot.py; se actualiza al guardar notas)
+    snap = snapshot_de(student)
+    avg = float(snap.ppa)
 
     # Créditos totales del plan
     plan = getattr(student, "plan", None)
@@ -143,18 +124,6 @@ def student_dashboard(request):
         total=Coalesce(Sum("credits"), 0)
     )["total"] if plan else 0
 
-    # ── PPA ponderado (solo stint activo) ──
-    # PPA = sum(nota * créditos) / sum(créditos)
-    sum_w = 0.0
-    sum_c = 0
-    for gr in active_records:
-        g = gr.final_grade
-        cr = int(getattr(gr.plan_course, "credits", 0) or 0) if gr.plan_course else 0
-        if g is not None and cr > 0:
-            sum_w += float(g) * cr
-            sum_c += cr
-    avg = round(sum_w / sum_c, 2) if sum_c > 0 else 0.0
-
     # Cursos matriculados
     section_ids = _enrolled_section_ids(student, period)
     enrolled_courses = len(section_ids)
@@ -162,62 +131,23 @@ def student_dashboard(request):
     # Asistencia
     attendance_rate = 0
     if section_ids:
-        sess_ids = AttendanceSession.objects.filter(
-            section_id__in=section_ids
-        ).values_list("id", flat=True)
-        total_att = AttendanceRow.objects.filter(session_id__in=sess_ids, student_id=student.id).count()
-        present_att = AttendanceRow.objects.filter(
-            session_id__in=sess_ids, student_id=student.id, status__in=["PRESENT", "P", "A"]
-        ).count()
+        agg = AttendanceTally.objects.filter(
+            section_id__in=section_ids, student_id=student.id
+        ).aggregate(total=Coalesce(Sum("total"), 0), present=Coalesce(Sum("present"), 0))
+        total_att, present_att = agg["total"], agg["present"]
         if total_att > 0:
             attendance_rate = round((present_att / total_att) * 100, 1)
 
-    # ── Mérito por programa (PPA ponderado con stint, bulk) ──
+    # ── Mérito por programa: conteo sobre el índice (programa, ppa) ──
     programa = getattr(student, "programa_carrera", "") or ""
-    merit = None
-    total_in_career = 0
-    if programa:
-        career_students = list(
-            Student.objects.filter(programa_carrera=programa).values_list("id", flat=True)
-        )
-        total_in_career = len(career_students)
-
-        # Traer TODOS los registros de la carrera en una sola query
-        career_records = (
-            AcademicGradeRecord.objects
-            .filter(student_id__in=career_students)
-            .select_related("plan_course")
-            .values_list("student_id", "term", "final_grade", "plan_course__credits")
-        )
-
-        # Agrupar por estudiante: {student_id: {terms: set, records: [(grade, credits)]}}
-        by_student = defaultdict(lambda: {"terms": set(), "recs": []})
-        for sid, term, grade, credits in career_records:
-            by_student[sid]["terms"].add(term)
-            by_student[sid]["recs"].append((term, grade, int(credits or 0)))
-
-        # Calcular PPA ponderado con stint para cada estudiante
-        better_count = 0
-        for sid in career_students:
-            if sid == student.id:
-                continue
-            info = by_student.get(sid)
-            if not info or not info["terms"]:
-                continue
-            peer_active = _detect_active_stint_periods(info["terms"])
-            pw, pc_ = 0.0, 0
-            for term, g, cr in info["recs"]:
-                if term in peer_active and g is not None and cr > 0:
-                    pw += float(g) * cr
-                    pc_ += cr
-            peer_avg = round(pw / pc_, 2) if pc_ > 0 else 0.0
-            if peer_avg > avg:
-                better_count += 1
-        merit = better_count + 1
+    merit, total_in_career = puesto(snap)
+    period_code = (getattr(period, "code", None) or "") if period else ""
+    merit_term, total_in_term, _ = (
+        puesto_en_periodo(student.id, period_code) if period_code else (None, 0, None))
 
     return Response({
         "avg_grade": avg,
-        "credits_approved": credits_approved,
+        "credits_approved": snap.credits_approved,
         "credits_total": credits_total,
         "current_semester": getattr(student, "ciclo", None),
         "career": programa,
@@ -226,9 +156,11 @@ def student_dashboard(request):
         "attendance_rate": attendance_rate,
         "merit": merit,
         "total_in_career": total_in_career,
+        "merit_term": merit_term,
+        "total_in_term": total_in_term,
         # ── Reingreso ──
-        "has_prior_enrollment": has_prior_enrollment,
-        "active_since": active_since,
+        "has_prior_enrollment": snap.has_prior_enrollment,
+        "active_since": snap.active_since or None,
     })
 
 
@@ -294,7 +226,7 @@ def student_courses_detail(request):
     promedio ponderado del período. Para la boleta del alumno y su dashboard.
     """
     from academic.models import (
-        EnrollmentItem, Enrollment, Section, SectionGrades,
+        EnrollmentItem, Enrollment, Section,
         AttendanceSession, AttendanceRow,
     )
 
@@ -332,13 +264,7 @@ def student_courses_detail(request):
             if sec.teacher and sec.teacher.user:
                 teacher_name = (getattr(sec.teacher.user, "full_name", "")
                                 or sec.teacher.user.username or "")
-            bundle = SectionGrades.objects.filter(section=sec).first()
-            grades = (bundle.grades or {}) if bundle else {}
-            for k in keys:
-                e = grades.get(str(k))
-                if isinstance(e, dict):
-                    entry = e
-                    break
+            entry = actas.entrada(sec.id, keys)
             # Con LICENCIA no se computa asistencia (ni faltas ni % ni riesgo)
             if (getattr(student, "estado_academico", "") or "").upper() != "LICENCIA":
                 sess_ids = list(AttendanceSession.objects
@@ -460,14 +386,8 @@ def student_course_detail(request, section_id: int):
                          "closed": bool(sess.closed)})
 
     # ── Acta completa del alumno ──
-    bundle = SectionGrades.objects.filter(section=sec).first()
-    grades = (bundle.grades or {}) if bundle else {}
-    entry = {}
-    for k in keys:
-        e = grades.get(str(k))
-        if isinstance(e, dict):
-            entry = e
-            break
+    bundle = SectionGrades.objects.filter(section=sec).only("submitted").first()
+    entry = actas.entrada(sec.id, keys)
     acta = {
         "c1_level": entry.get("C1_LEVEL", ""), "c1_rec": entry.get("C1_REC", ""),
         "c2_level": entry.get("C2_LEVEL", ""), "c2_rec": entry.get("C2_REC", ""),
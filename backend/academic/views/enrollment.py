@@ -29,6 +29,7 @@ from rest_framework import permissions
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from .enrollment_payment import check_enrollment_payment
 
+from common.sqlite import escritura
 from students.models import Student as StudentProfile
 from academic.models import (
     AcademicPeriod, Enrollment, EnrollmentItem,
@@ -458,39 +459,37 @@ def _current_semester(student: StudentProfile) -> int:
     return max(computed, ciclo_val)
 
 
-def _overlaps(a_start, a_end, b_start, b_end):
-    return a_end > b_start and b_end > a_start
-
-
 def _detect_schedule_conflicts(sections):
-    events = []
-    for sec in sections:
-        for sl in sec.schedule_slots.all():
-            events.append((int(sl.weekday), sl.start, sl.end, sec.id))
+    """
+    Choques entre las secciones elegidas (mismo día, horas cruzadas), un
+    aviso por par de secciones y día. Usa el índice de intervalos de
+    academic/services/horarios.py: compara contra TODAS las franjas que se
+    cruzan, no solo contra la vecina al ordenar.
+    """
+    from academic.services.horarios import DIA, Franja, IndiceHorario, minutos
 
+    franjas = [
+        Franja(sec.id, int(sl.weekday), minutos(sl.start), minutos(sl.end))
+        for sec in sections
+        for sl in sec.schedule_slots.all()
+    ]
     conflicts = []
-    by_day    = {}
-    for wd, st, en, sid in events:
-        by_day.setdefault(wd, []).append((st, en, sid))
-
-    for wd, items in by_day.items():
-        items.sort(key=lambda x: x[0])
-        for i in range(len(items) - 1):
-            st1, en1, s1 = items[i]
-            st2, en2, s2 = items[i + 1]
-            if s1 == s2:
-                continue
-            if _overlaps(st1, en1, st2, en2):
-                conflicts.append({
-                    "type":    "OVERLAP",
-                    "weekday": wd,
-                    "a":       s1,
-                    "b":       s2,
-                    "message": (
-                        f"Choque de horario (día {INT_TO_DAY.get(wd, wd)}) "
-                        f"entre secciones {s1} y {s2}"
-                    ),
-                })
+    vistos = set()
+    for _tipo, a, b in IndiceHorario(franjas).choques(tipos=(DIA,)):
+        par = (a.weekday, min(a.section_id, b.section_id), max(a.section_id, b.section_id))
+        if par in vistos:
+            continue
+        vistos.add(par)
+        conflicts.append({
+            "type":    "OVERLAP",
+            "weekday": a.weekday,
+            "a":       a.section_id,
+            "b":       b.section_id,
+            "message": (
+                f"Choque de horario (día {INT_TO_DAY.get(a.weekday, a.weekday)}) "
+                f"entre secciones {a.section_id} y {b.section_id}"
+            ),
+        })
     return conflicts
 
 
@@ -1630,7 +1629,7 @@ class EnrollmentCommitView(APIView):
                     status=409,
                 )
 
-        with transaction.atomic():
+        with escritura():
             enrollment, _ = Enrollment.objects.get_or_create(student=st, period=academic_period)
             if enrollment.status == Enrollment.STATUS_CONFIRMED:
                 return Response(
@@ -30,6 +30,7 @@ from academic.models import (
     AcademicPeriod, Section, SectionGrades, AcademicGradeRecord,
     EnrollmentItem, Enrollment,
 )
+from academic.services import ranking_merito
 from students.models import Student
 from students.name_utils import clave_orden
 
@@ -462,6 +463,10 @@ class EvaluationProcessView(APIView):
                                 "claves_sin_alumno": huerfanas,
                                 "submitted": True if close_actas else row["submitted"]})
 
+        # Orden de mérito del período al día para los alumnos (ver ranking_merito)
+        if total_processed:
+            ranking_merito.reconstruir(period)
+
         total_huerfanas = sum(r.get("notas_sin_alumno", 0) for r in results)
         return Response({
             "success": True,
@@ -18,6 +18,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from openpyxl import load_workbook
 from pypdf import PdfReader, PdfWriter
 
+from common.pdf_templates import get_pdf_template
 from students.models import Student as StudentProfile
 from academic.models import AcademicGradeRecord, PlanCourse
 from academic.pdf_render import html_to_pdf_bytes
@@ -564,7 +565,7 @@ class KardexConstanciaPDFView(APIView):
         if not os.path.exists(template_path):
             template_path = os.path.join(settings.BASE_DIR, "templates", "kardex", "inicial.pdf")
         
-        tpl_pages = len(PdfReader(template_path).pages)
+        tpl_pages = get_pdf_template(template_path).page_count
         
         def draw_fn(c, page_i):
             if page_i == 0:
@@ -9,10 +9,11 @@ from io import BytesIO
 from django.conf import settings
 from django.db.models import Q
 from openpyxl import load_workbook
-from pypdf import PdfReader, PdfWriter
+from pypdf import PdfReader
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 
+from common.pdf_templates import get_pdf_template
 from students.models import Student as StudentProfile
 from academic.models import (
     Plan, PlanCourse, Course,
@@ -1393,17 +1394,5 @@ def _make_overlay_pdf(num_pages: int, draw_fn):
 
 
 def _merge_overlay(template_pdf_path: str, overlay_reader: PdfReader) -> bytes:
-    """Fusiona overlay con template PDF"""
-    tpl = PdfReader(template_pdf_path)
-    out = PdfWriter()
-    n = min(len(tpl.pages), len(overlay_reader.pages))
-    for i in range(n):
-        base = tpl.pages[i]
-        base.merge_page(overlay_reader.pages[i])
-        out.add_page(base)
-    for i in range(n, len(tpl.pages)):
-        out.add_page(tpl.pages[i])
-    bio = BytesIO()
-    out.write(bio)
-    bio.seek(0)
-    return bio.getvalue()
\ No newline at end of file
+    """Fusiona overlay con template PDF (plantilla parseada una vez por proceso)"""
+    return get_pdf_template(template_pdf_path).merge(overlay_reader)
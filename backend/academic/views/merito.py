@@ -19,6 +19,9 @@ Orden de mérito por promedio ponderado del período.
 El puesto usa ranking de competencia (empates comparten puesto: 1,2,2,4).
 El "ciclo cursado" del alumno sale de los cursos de su kárdex del período,
 no de Student.ciclo (que ya avanzó al ciclo siguiente al promover).
+
+Los rankings se leen precalculados (academic/services/ranking_merito.py);
+solo el filtro por año (`anio`) se calcula al vuelo.
 """
 from django.http import HttpResponse
 from django.utils import timezone
@@ -28,6 +31,7 @@ from rest_framework import permissions
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from academic.models import AcademicGradeRecord
+from academic.services import ranking_merito
 from students.models import Student
 from students.name_utils import clave_orden
 
@@ -62,14 +66,6 @@ def _ranking(students, proms):
     return out
 
 
-def _puesto_de(ranking, student_id):
-    """(puesto, total) del alumno dentro de un ranking, o (None, total)."""
-    for puesto, st, _prom in ranking:
-        if st.id == student_id:
-            return puesto, len(ranking)
-    return None, len(ranking)
-
-
 def _fecha_emision():
     return timezone.localtime(timezone.now()).strftime(
         "Documento generado el %d/%m/%Y a las %H:%M")
@@ -94,35 +90,42 @@ class EvaluationMeritoView(APIView):
             return Response({"detail": "period es requerido"}, status=400)
         career_id, semester = q.get("career_id"), q.get("semester")
 
-        students = _filtrar_students(period, career_id, semester,
-                                     q.get("anio"))
-        if not students:
-            return Response(
-                {"detail": f"No hay alumnos con notas procesadas en {period} "
-                           "con los filtros elegidos."}, status=404)
-        proms = _promedios_por_alumno(term=period,
-                                      student_ids=[s.id for s in students])
-        ranking = _ranking(students, proms)
+        # [(puesto, student, promedio, ciclo cursado)]
+        ranking = []
+        if not q.get("anio"):
+            ranking = [(r.puesto, r.student, float(r.promedio), r.ciclo)
+                       for r in ranking_merito.cohorte(period, career_id, semester)]
         if not ranking:
-            return Response({"detail": "Ningún alumno tiene promedio."},
-                            status=404)
+            # Filtro por año, o cohorte vacía: al vuelo (y con el motivo del 404)
+            students = _filtrar_students(period, career_id, semester,
+                                         q.get("anio"))
+            if not students:
+                return Response(
+                    {"detail": f"No hay alumnos con notas procesadas en {period} "
+                               "con los filtros elegidos."}, status=404)
+            proms = _promedios_por_alumno(term=period,
+                                          student_ids=[s.id for s in students])
+            ranking = [(puesto, st, prom, _ciclo_cursado(st.id, period))
+                       for puesto, st, prom in _ranking(students, proms)]
+            if not ranking:
+                return Response({"detail": "Ningún alumno tiene promedio."},
+                                status=404)
 
         if career_id and semester:
-            carrera = next((s.plan.career.name for s in students
-                            if s.plan and s.plan.career), "")
+            carrera = next((st.plan.career.name for _p, st, _m, _c in ranking
+                            if st.plan and st.plan.career), "")
             alcance = f"AULA — {carrera.upper()} CICLO {_roman(semester)}"
         elif career_id:
-            carrera = next((s.plan.career.name for s in students
-                            if s.plan and s.plan.career), "")
+            carrera = next((st.plan.career.name for _p, st, _m, _c in ranking
+                            if st.plan and st.plan.career), "")
             alcance = f"ESPECIALIDAD — {carrera.upper()}"
         else:
             alcance = "TODO EL INSTITUTO"
 
         filas = []
-        for puesto, st, prom in ranking:
+        for puesto, st, prom, ciclo in ranking:
             carrera_st = (st.plan.career.name
                           if st.plan and st.plan.career else "")
-            ciclo = _ciclo_cursado(st.id, period)
             filas.append([puesto, st.num_documento or "", _nombre(st),
                           carrera_st.upper(), _roman(ciclo) if ciclo else "",
                           f"{prom:.2f}",
@@ -252,25 +255,24 @@ def _periodos_candidatos(student, explicito=""):
 def _merito_del_estudiante(student, period):
     """Puesto del alumno en aula/especialidad/instituto. None si no tiene
     notas procesadas en el período."""
-    prom_propio = _promedios_por_alumno(
-        term=period, student_ids=[student.id]).get(student.id)
-    if prom_propio is None:
+    filas = ranking_merito.posiciones(student.id, period)
+    propia = filas.get((0, 0))
+    if propia is None:
         return None
+    prom_propio = float(propia.promedio)
 
-    ciclo = _ciclo_cursado(student.id, period)
-    career_id = student.plan.career_id if student.plan_id and student.plan else None
+    ciclo = propia.ciclo
+    career_id = (student.plan.career_id if student.plan_id and student.plan else None) or 0
 
     niveles = {}
-    for clave, (cid, sem) in {
-        "aula": (career_id, ciclo),
-        "especialidad": (career_id, None),
-        "instituto": (None, None),
+    for clave, cohorte in {
+        "aula": (career_id, ciclo or 0),
+        "especialidad": (career_id, 0),
+        "instituto": (0, 0),
     }.items():
-        cohorte = _filtrar_students(period, cid, sem)
-        proms = _promedios_por_alumno(term=period,
-                                      student_ids=[s.id for s in cohorte])
-        puesto, total = _puesto_de(_ranking(cohorte, proms), student.id)
-        niveles[clave] = {"puesto": puesto, "total": total}
+        fila = filas.get(cohorte)
+        niveles[clave] = ({"puesto": fila.puesto, "total": fila.total} if fila
+                          else {"puesto": None, "total": 0})
 
     return {
         "period": period,
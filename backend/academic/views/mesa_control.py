@@ -18,6 +18,7 @@ Endpoints (todos bajo /api/academic/mesa-control/):
     POST alumno/<dni>/curso/<item_id>/seccion   asignar/cambiar sección
     GET  seccion/<id>                      acta vs nómina del ciclo
     POST fusionar                          fusionar kárdex de fichas duplicadas
+    GET  auditoria?period=2026-I           último resultado de `auditar_datos`
 """
 from rest_framework import permissions
 from rest_framework.response import Response
@@ -190,3 +191,21 @@ class FusionarView(_MesaControlBase):
         if not okey:
             return Response({"detail": msg}, status=400)
         return ok(message=msg, **detalle)
+
+
+# ══════════════════════════════════════════════════════════════
+#  AUDITORÍA
+# ══════════════════════════════════════════════════════════════
+
+class AuditoriaView(_MesaControlBase):
+    """Hallazgos guardados por la última corrida de `manage.py auditar_datos`
+    (no la vuelve a correr). ?limite= filas por hallazgo (0 = todas)."""
+
+    def get(self, request):
+        if err := self._denegado(request):
+            return err
+        try:
+            limite = max(0, int(request.query_params.get("limite", 200)))
+        except (TypeError, ValueError):
+            limite = 200
+        return Response(svc.auditoria(request.query_params.get("period"), limite=limite))
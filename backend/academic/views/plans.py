@@ -18,6 +18,7 @@ from academic.serializers import (
     PlanSerializer, PlanCreateSerializer,
     PlanCourseOutSerializer, PlanCourseCreateSerializer,
 )
+from common.condicional import condicional
 from .utils import _can_delete_plans, ok
 
 
@@ -43,6 +44,7 @@ class PlansViewSet(viewsets.ModelViewSet):
             return PlanCreateSerializer
         return PlanSerializer
 
+    @condicional("academic.Plan", "catalogs.Career")
     def list(self, request, *args, **kwargs):
         return ok(plans=PlanSerializer(self.get_queryset(), many=True).data)
 
@@ -124,6 +126,7 @@ class PlansViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=True, methods=["get", "post"], url_path="courses")
+    @condicional("academic.Plan", "academic.PlanCourse", "academic.Course", "academic.CoursePrereq")
     def courses(self, request, pk=None):
         plan = self.get_object()
 
@@ -4,7 +4,8 @@ Generación automática de documentos académicos
 IESPP "Gustavo Allende Llavería" — Tarma, Junín
 
 Documentos basados en las plantillas REALES de la institución:
-  1. Constancia de Estudios → plantilla .docx + LibreOffice (diseño fiel)
+  1. Constancia de Estudios → plantilla .docx + LibreOffice (diseño fiel;
+     pool de instancias en common/libreoffice.py)
   2. Constancia de Orden de Mérito  → ReportLab
   3. Constancia de Tercio Superior  → ReportLab
   4. Certificado de Egresado (SIA)  → ReportLab
@@ -35,8 +36,6 @@ import io
 import json
 import logging
 import os
-import shutil
-import subprocess
 import tempfile
 import urllib.request
 from datetime import datetime
@@ -52,6 +51,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from academic.models import AcademicProcess, ProcessFile
+from common import libreoffice
 from .utils import ok, _can_admin_enroll
 
 logger = logging.getLogger("academic.processes")
@@ -471,54 +471,13 @@ def _replace_in_docx(doc, replacements: dict):
 
 
 def _find_libreoffice() -> str | None:
-    candidates = [
-        "libreoffice", "soffice",
-        "/usr/bin/libreoffice", "/usr/bin/soffice",
-        "/usr/lib/libreoffice/program/soffice",
-        "/Applications/LibreOffice.app/Contents/MacOS/soffice",
-    ]
-    for cmd in candidates:
-        if shutil.which(cmd):
-            return cmd
-    return None
+    return libreoffice.binario()
 
 
 def _docx_bytes_to_pdf_bytes(docx_bytes: bytes) -> bytes:
-    """Convierte bytes de un .docx a bytes de PDF usando LibreOffice."""
-    lo = _find_libreoffice()
-    if not lo:
-        raise RuntimeError(
-            "LibreOffice no está instalado. "
-            "Instala con: sudo apt install libreoffice"
-        )
-    with tempfile.TemporaryDirectory() as tmpdir:
-        docx_path = os.path.join(tmpdir, "constancia.docx")
-        pdf_path  = os.path.join(tmpdir, "constancia.pdf")
-
-        with open(docx_path, "wb") as f:
-            f.write(docx_bytes)
-
-        result = subprocess.run(
-            [lo, "--headless", "--norestore",
-             "--convert-to", "pdf",
-             "--outdir", tmpdir, docx_path],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(
-                f"LibreOffice falló: {result.stderr or result.stdout}"
-            )
-
-        if not os.path.exists(pdf_path):
-            raise RuntimeError(
-                f"LibreOffice no generó el PDF. stdout: {result.stdout}"
-            )
-
-        with open(pdf_path, "rb") as f:
-            return f.read()
+    """Convierte bytes de un .docx a bytes de PDF con el pool de LibreOffice
+    (common/libreoffice.py: instancias de larga vida, una por ranura)."""
+    return libreoffice.convertir(docx_bytes)
 
 
 def _generate_constancia_docx(process, student: dict, extra: dict, inst: dict) -> tuple:
@@ -51,6 +51,7 @@ from django.db.models import Count, Q
 from django.utils import timezone
 
 from academic.models import AcademicProcess, ProcessFile
+from common import condicional
 from .utils import ok, _to_int, _to_str, _can_admin_enroll
 
 logger = logging.getLogger("academic.processes")
@@ -660,6 +661,7 @@ class ProcessStatusView(APIView):
                     Enrollment.objects.filter(
                         student_id=process.student_id, period=period
                     ).update(status="RETIRADO")
+                    condicional.tocar(Enrollment)
 
             elif ptype == "ANULACION_MATRICULA":
                 period = meta.get("period", "")
@@ -667,11 +669,13 @@ class ProcessStatusView(APIView):
                     Enrollment.objects.filter(
                         student_id=process.student_id, period=period
                     ).update(status="ANULADO")
+                    condicional.tocar(Enrollment)
 
             elif ptype == "REAPERTURA_ACTA":
                 section_id = meta.get("section_id")
                 if section_id and Section:
                     Section.objects.filter(id=section_id).update(grades_submitted=False)
+                    condicional.tocar(Section)
 
             elif ptype == "RECTIFICACION_NOTA":
                 corrections = meta.get("grade_corrections", [])
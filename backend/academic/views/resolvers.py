@@ -11,7 +11,7 @@ from django.contrib.auth import get_user_model
 from academic.models import (
     Teacher as AcademicTeacher,
     Classroom as AcademicClassroom,
-    Section, SectionScheduleSlot,
+    Section,
 )
 from catalogs.models import (
     Teacher as CatalogTeacher,
@@ -180,72 +180,60 @@ def check_schedule_conflicts(
     classroom: AcademicClassroom = None,
     period: str = "",
     exclude_section_id: int = None,
+    indice=None,
 ) -> list:
     """
     Verifica conflictos REALES contra la BD:
       - Mismo docente, misma hora, mismo día, mismo período
       - Misma aula, misma hora, mismo día, mismo período
+
+    Las franjas del período se cargan una vez en un IndiceHorario
+    (academic/services/horarios.py); `indice` permite reutilizar uno ya
+    construido al validar varias secciones seguidas.
     """
-    from datetime import datetime as _dt
+    from academic.services.horarios import AULA, DOCENTE, IndiceHorario, franja_de_slot, hhmm
 
     if not period or not slots:
         return []
 
-    conflicts = []
-
-    existing_qs = (
-        SectionScheduleSlot.objects
-        .select_related("section__teacher", "section__classroom")
-        .filter(section__period=period)
-    )
-    if exclude_section_id:
-        existing_qs = existing_qs.exclude(section_id=exclude_section_id)
+    if indice is None:
+        indice = IndiceHorario.del_periodo(period, excluir=[exclude_section_id])
 
+    conflicts = []
     for new_slot in slots:
-        day_str = new_slot.get("day", "")
-        day_int = DAY_TO_INT.get(day_str, new_slot.get("weekday"))
-        if day_int is None:
-            continue
-
-        try:
-            new_start = _dt.strptime(str(new_slot["start"]).strip()[:5], "%H:%M").time()
-            new_end = _dt.strptime(str(new_slot["end"]).strip()[:5], "%H:%M").time()
-        except (ValueError, KeyError):
+        f = franja_de_slot(new_slot, exclude_section_id)
+        if f is None:
             continue
+        day_str = new_slot.get("day", "")
 
-        day_slots = existing_qs.filter(weekday=day_int)
-
-        for existing in day_slots:
-            if existing.start < new_end and new_start < existing.end:
-                sec = existing.section
-
-                if teacher and sec.teacher_id and sec.teacher_id == teacher.id:
-                    pc = getattr(sec, "plan_course", None)
-                    course_name = ""
-                    if pc:
-                        course_name = (
-                            getattr(pc, "display_name", "") or
-                            (getattr(pc.course, "name", "") if pc.course else "")
-                        )
-                    conflicts.append({
-                        "type": "teacher",
-                        "message": (
-                            f"Docente ya asignado en {day_str} "
-                            f"{existing.start:%H:%M}-{existing.end:%H:%M} "
-                            f"(sección {sec.label} - {course_name})"
-                        ),
-                        "section_id": sec.id,
-                    })
-
-                if classroom and sec.classroom_id and sec.classroom_id == classroom.id:
-                    conflicts.append({
-                        "type": "classroom",
-                        "message": (
-                            f"Aula {classroom.code} ocupada en {day_str} "
-                            f"{existing.start:%H:%M}-{existing.end:%H:%M} "
-                            f"(sección {sec.label})"
-                        ),
-                        "section_id": sec.id,
-                    })
-
-    return conflicts
\ No newline at end of file
+        if teacher:
+            for ex in indice.solapados((DOCENTE, f.weekday, teacher.id), f.ini, f.fin):
+                if ex.section_id == exclude_section_id:
+                    continue
+                sec = indice.secciones.get(ex.section_id, {})
+                conflicts.append({
+                    "type": "teacher",
+                    "message": (
+                        f"Docente ya asignado en {day_str} "
+                        f"{hhmm(ex.ini)}-{hhmm(ex.fin)} "
+                        f"(sección {sec.get('label', '')} - {sec.get('course', '')})"
+                    ),
+                    "section_id": ex.section_id,
+                })
+
+        if classroom:
+            for ex in indice.solapados((AULA, f.weekday, classroom.id), f.ini, f.fin):
+                if ex.section_id == exclude_section_id:
+                    continue
+                sec = indice.secciones.get(ex.section_id, {})
+                conflicts.append({
+                    "type": "classroom",
+                    "message": (
+                        f"Aula {classroom.code} ocupada en {day_str} "
+                        f"{hhmm(ex.ini)}-{hhmm(ex.fin)} "
+                        f"(sección {sec.get('label', '')})"
+                    ),
+                    "section_id": ex.section_id,
+                })
+
+    return conflicts
@@ -21,10 +21,11 @@ from academic.models import (
 from academic.serializers import (
     SectionOutSerializer, SectionCreateUpdateSerializer,
 )
+from common.condicional import condicional, tocar
 from .utils import (
     ok, DAY_TO_INT, INT_TO_DAY,
     _get_full_name, validate_period_format,
-    assert_enrollment_window,
+    assert_enrollment_window, _can_admin_enroll,
 )
 from .resolvers import (
     resolve_teacher,
@@ -107,6 +108,7 @@ def _adoptar_matriculados_sin_seccion(sec) -> int:
                 .count())
     if hermanas:
         return 0
+    tocar(EnrollmentItem)
     return (EnrollmentItem.objects
             .filter(plan_course_id=sec.plan_course_id,
                     section__isnull=True,
@@ -133,6 +135,9 @@ class SectionsViewSet(viewsets.ModelViewSet):
 
     # ── LIST / RETRIEVE ────────────────────────────────────────
 
+    @condicional("academic.Section", "academic.SectionScheduleSlot", "academic.PlanCourse",
+                 "academic.Course", "academic.Plan", "catalogs.Career", "academic.Teacher",
+                 "accounts.User", "academic.Classroom")
     def list(self, request, *args, **kwargs):
         return ok(sections=SectionOutSerializer(self.get_queryset(), many=True).data)
 
@@ -305,6 +310,7 @@ class SectionsViewSet(viewsets.ModelViewSet):
                 desvinculados = (EnrollmentItem.objects
                                  .filter(section=sec)
                                  .update(section=None))
+                tocar(EnrollmentItem)
                 sec.delete()
         except Exception as exc:
             return Response(
@@ -421,4 +427,144 @@ class SectionsScheduleConflictsView(APIView):
         return ok(
             conflicts=intra_conflicts + db_conflicts,
             window=window_info,
-        )
\ No newline at end of file
+        )
+
+class SectionsTimetableCheckView(APIView):
+    """
+    Revisión de TODO el horario de un período en una pasada (índice de
+    intervalos, academic/services/horarios.py): choques de aula y de docente.
+
+    GET  ?period=2026-I  → lo guardado en la BD.
+    POST { period, sections: [{ id?, teacher_id, room_id, label?, slots: [...] }] }
+         → el horario propuesto; reemplaza a las secciones con ese id y se
+           revisa junto con el resto del período.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes     = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        from academic.services.horarios import IndiceHorario
+
+        period = (request.query_params.get("period") or "").strip()
+        if not period:
+            return Response({"detail": "period es requerido"}, status=400)
+        return self._respuesta(period, IndiceHorario.del_periodo(period))
+
+    def post(self, request):
+        from academic.services.horarios import IndiceHorario, franja_de_slot
+
+        payload = request.data or {}
+        period  = (payload.get("period") or "").strip()
+        if not period:
+            return Response({"detail": "period es requerido"}, status=400)
+
+        propuestas = payload.get("sections") or []
+        ids = []
+        for s in propuestas:
+            try:
+                ids.append(int(s.get("id")))
+            except (TypeError, ValueError):
+                pass
+        base = IndiceHorario.del_periodo(period, excluir=ids)
+
+        franjas = base.franjas()
+        secciones = dict(base.secciones)
+        for n, s in enumerate(propuestas, start=1):
+            try:
+                sid = int(s.get("id"))
+            except (TypeError, ValueError):
+                sid = -n                 # sección nueva (aún sin id)
+            teacher = resolve_teacher(s.get("teacher_id"))
+            room    = resolve_classroom(s.get("room_id"))
+            secciones[sid] = {"label": s.get("label") or "", "course": s.get("course") or ""}
+            for sl in s.get("slots") or []:
+                f = franja_de_slot(sl, sid, teacher.id if teacher else None, room.id if room else None)
+                if f:
+                    franjas.append(f)
+        return self._respuesta(period, IndiceHorario(franjas, secciones))
+
+    @staticmethod
+    def _respuesta(period, indice):
+        from academic.services.horarios import AULA, hhmm
+
+        aulas = dict(Classroom.objects.values_list("id", "code"))
+        conflicts = []
+        for tipo, a, b in indice.choques():
+            sa = indice.secciones.get(a.section_id, {})
+            sb = indice.secciones.get(b.section_id, {})
+            dia = INT_TO_DAY.get(a.weekday, a.weekday)
+            quien = f"Aula {aulas.get(a.classroom_id, a.classroom_id)}" if tipo == AULA else "Docente"
+            conflicts.append({
+                "type":    "classroom" if tipo == AULA else "teacher",
+                "weekday": a.weekday,
+                "day":     dia,
+                "a": {"section_id": a.section_id, "label": sa.get("label", ""), "course": sa.get("course", ""),
+                      "start": hhmm(a.ini), "end": hhmm(a.fin)},
+                "b": {"section_id": b.section_id, "label": sb.get("label", ""), "course": sb.get("course", ""),
+                      "start": hhmm(b.ini), "end": hhmm(b.fin)},
+                "message": (
+                    f"{quien}: {dia} {hhmm(a.ini)}-{hhmm(a.fin)} "
+                    f"(sección {sa.get('label', '')}) se cruza con "
+                    f"{hhmm(b.ini)}-{hhmm(b.fin)} (sección {sb.get('label', '')})"
+                ),
+            })
+        return ok(period=period, total=len(conflicts), sections=len(indice.secciones), conflicts=conflicts)
+
+
+class SectionsTimetableGenerateView(APIView):
+    """
+    Generador automático del horario (academic/services/generador_horario.py).
+
+    POST { period, apply?: bool, options?: {days, day_start, day_end, block_hours,
+           replace, availability, ...} } → 202 { job_id }; corre en segundo plano.
+    GET  /sections/schedule/generate/<job_id> → estado y resumen.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes     = [permissions.IsAuthenticated]
+
+    def post(self, request, job_id=None):
+        import threading
+
+        from academic.models import TimetableJob
+        from academic.services.generador_horario import acotar, ejecutar_job
+
+        if not _can_admin_enroll(request.user):
+            return Response({"detail": "No autorizado."}, status=403)
+        if job_id is not None:
+            return Response({"detail": "Método no permitido."}, status=405)
+        payload = request.data or {}
+        period  = (payload.get("period") or "").strip()
+        if not period or not validate_period_format(period):
+            return Response({"detail": f"Período inválido: {period!r}"}, status=400)
+        options = payload.get("options") or {}
+        if not isinstance(options, dict):
+            return Response({"detail": "options debe ser un objeto"}, status=400)
+        try:
+            options = acotar(options)
+        except (TypeError, ValueError):
+            return Response({"detail": "max_backtracks, candidates y restarts deben ser enteros"}, status=400)
+
+        job = TimetableJob.objects.create(
+            period=period, options=options, apply=bool(payload.get("apply")),
+            created_by=request.user,
+        )
+        transaction.on_commit(lambda: threading.Thread(
+            target=ejecutar_job, args=(job.id,), daemon=True,
+        ).start())
+        return Response({"job_id": job.id}, status=202)
+
+    def get(self, request, job_id=None):
+        from academic.models import TimetableJob
+
+        if not _can_admin_enroll(request.user):
+            return Response({"detail": "No autorizado."}, status=403)
+        if job_id is None:
+            jobs = TimetableJob.objects.order_by("-id").values(
+                "id", "period", "status", "apply", "created_at", "finished_at")[:20]
+            return ok(jobs=list(jobs))
+        job = get_object_or_404(TimetableJob, pk=job_id)
+        return ok(
+            id=job.id, period=job.period, status=job.status, apply=job.apply,
+            result=job.result, error=job.error,
+            created_at=job.created_at, finished_at=job.finished_at,
+        )
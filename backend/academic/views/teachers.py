@@ -21,6 +21,7 @@ from students.models import Student
 from students.name_utils import nombre_oficial
 from catalogs.models import Teacher as CatalogTeacher
 from academic.serializers import smart_title
+from academic.services import actas
 
 # ✅ CAMBIO: importar desde resolvers en vez de sections
 from .resolvers import resolve_teacher
@@ -1189,8 +1190,8 @@ class GradesSaveView(APIView):
         # ── Auto-DPI: alumnos con >30% inasistencias forzados a 0/DPI ──
         normalized, dpi_info = _apply_dpi_override(sec, normalized)
 
-        bundle.grades = normalized
-        bundle.save()
+        # Upsert por alumno: los que no vienen en el envío no se tocan
+        bundle = actas.guardar(sec, normalized)
         msg = (
             "Acta modificada por administrador (acta permanece cerrada)"
             if bundle.submitted else
@@ -1219,7 +1220,6 @@ class GradesSubmitView(APIView):
         sec = get_object_or_404(Section, id=int(section_id))
         if err := _grades_section_access_denied(request, sec):
             return err
-        bundle, _ = SectionGrades.objects.get_or_create(section=sec)
 
         # Ventana
         ok_win, err = _check_grades_window(sec, request.user)
@@ -1240,10 +1240,7 @@ class GradesSubmitView(APIView):
         # Auto-DPI antes de cerrar
         normalized, dpi_info = _apply_dpi_override(sec, normalized)
 
-        bundle.grades = normalized
-        bundle.submitted = True
-        bundle.submitted_at = timezone.now()
-        bundle.save()
+        actas.guardar(sec, normalized, submitted=True, submitted_at=timezone.now())
 
         msg = "Acta enviada y cerrada correctamente"
         if dpi_info:
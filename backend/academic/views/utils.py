@@ -11,6 +11,8 @@ from datetime import datetime, date
 from typing import Optional, Tuple
 from django.conf import settings
 from django.utils import timezone
+from acl.authz import contexto
+from common.imagenes import ruta_derivado
 from acl.models import Role, UserRole
 from django.contrib.auth import get_user_model
 
@@ -296,6 +298,10 @@ def _file_to_data_uri(abs_path: str):
         if not abs_path or not os.path.exists(abs_path):
             return None
         mime, _ = mimetypes.guess_type(abs_path)
+        if mime and mime.startswith("image/"):
+            # Derivado de impresión en vez de la foto original a tamaño completo
+            abs_path = ruta_derivado(abs_path, "print")
+            mime = mimetypes.guess_type(abs_path)[0] or mime
         mime = mime or "application/octet-stream"
         with open(abs_path, "rb") as f:
             b64 = base64.b64encode(f.read()).decode("utf-8")
@@ -413,16 +419,8 @@ def user_has_any_role(user, names) -> bool:
         return False
     if getattr(user, "is_superuser", False):
         return True
-    try:
-        if UserRole.objects.filter(user=user, role__name__in=names).exists():
-            return True
-    except Exception:
-        pass
-    try:
-        # M2M directa User.roles (accounts_user_roles)
-        return user.roles.filter(name__in=list(names)).exists()
-    except Exception:
-        return False
+    # acl.UserRole + M2M User.roles, resuelto una vez por usuario (acl/authz.py)
+    return contexto(user).tiene_alguno(names)
 
 
 def _can_admin_enroll(user) -> bool:
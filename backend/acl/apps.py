@@ -2,3 +2,7 @@ from django.apps import AppConfig
 class AclConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'acl'
+
+    def ready(self):
+        # Invalidación del contexto de autorización (ver acl/signals.py)
+        from . import signals  # noqa: F401
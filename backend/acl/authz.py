@@ -0,0 +1,120 @@
+"""
+Contexto de autorización por usuario: nombres de rol + códigos de permiso.
+
+Los chequeos de rol (`user_has_any_role`, `tiene_rol`, los `_require_staff`
+de cada app) consultaban acl.UserRole y la M2M User.roles en CADA llamada,
+varias veces por request; `auth_me` y `user_effective_perm_codes` volvían a
+derivar los permisos por su cuenta. Ahora todo sale de un único contexto:
+
+  * dentro del request se memoriza en el propio objeto `user`;
+  * entre requests se guarda en el cache de Django bajo la versión de las
+    tablas de acl (catalogs.TableVersion, ver common/condicional.py), que
+    está en la base: un rol o permiso revocado en un worker deja obsoleto
+    el contexto en todos los demás desde el siguiente request, con el cache
+    por defecto (LocMem, uno por proceso) o con uno compartido;
+  * las señales de acl (acl/signals.py) además suben una generación local
+    para que el propio proceso lo note antes de confirmar la transacción.
+
+    ctx = contexto(request.user)
+    ctx.tiene_alguno(["ADMIN_SYSTEM", "REGISTRAR"])
+    "academic.grades.edit" in ctx.permisos
+"""
+from dataclasses import dataclass
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+
+from common import condicional
+
+# Tablas que componen el contexto (deben estar en condicional.RASTREADAS);
+# la M2M User.roles sube la versión de acl.Role
+TABLAS = ("acl.Permission", "acl.Role", "acl.RolePermission", "acl.UserRole")
+
+# Generación local: la sube `invalidar` en este proceso, sin esperar al commit
+_generacion = 0
+
+
+@dataclass(frozen=True)
+class AuthzContext:
+    roles: frozenset
+    permisos: frozenset
+
+    @property
+    def roles_upper(self) -> frozenset:
+        return frozenset(r.upper() for r in self.roles)
+
+    def tiene_alguno(self, nombres) -> bool:
+        """Coincidencia exacta con alguno de los nombres de rol."""
+        return not self.roles.isdisjoint(nombres)
+
+    def tiene_alguno_iexact(self, nombres) -> bool:
+        return not self.roles_upper.isdisjoint(n.upper() for n in nombres)
+
+
+VACIO = AuthzContext(frozenset(), frozenset())
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "AUTHZ_CACHE_SECONDS", 300))
+
+
+def version() -> str:
+    """Versión confirmada de las tablas de acl (una consulta indexada)."""
+    token, _u = condicional.versiones(TABLAS)
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()[:16]
+
+
+def invalidar():
+    """Deja obsoletos los contextos de este proceso; los demás lo ven por
+    la versión en la base cuando la transacción se confirma."""
+    global _generacion
+    _generacion += 1
+
+
+def _calcular(user) -> AuthzContext:
+    from rbac.services import expand_aliases
+
+    from .models import Role, RolePermission
+
+    # Los roles viven en DOS tablas (acl.UserRole y la M2M User.roles)
+    roles = dict(
+        Role.objects.filter(Q(role_users__user_id=user.pk) | Q(members__id=user.pk))
+        .distinct()
+        .values_list("id", "name")
+    )
+    codigos = set()
+    if roles:
+        codigos = set(
+            RolePermission.objects.filter(role_id__in=list(roles))
+            .values_list("permission__code", flat=True)
+        )
+    return AuthzContext(frozenset(roles.values()), frozenset(expand_aliases(codigos)))
+
+
+def contexto(user) -> AuthzContext:
+    """Contexto del usuario (vacío si es anónimo)."""
+    if not user or not getattr(user, "is_authenticated", False) or not user.pk:
+        return VACIO
+
+    gen = _generacion
+    memo = getattr(user, "_authz_ctx", None)
+    if memo is not None and memo[0] == gen:
+        return memo[1]
+
+    key = f"authz:{version()}:{gen}:{user.pk}"
+    ctx = cache.get(key)
+    if ctx is None:
+        ctx = _calcular(user)
+        # Lo leído dentro de una transacción abierta puede revertirse:
+        # solo se comparte entre requests lo que ya está confirmado.
+        if not connection.in_atomic_block:
+            cache.set(key, ctx, _ttl())
+    try:
+        user._authz_ctx = (gen, ctx)
+    except AttributeError:
+        pass
+    return ctx
@@ -0,0 +1,33 @@
+"""
+Invalida el contexto de autorización cacheado (acl/authz.py) cuando cambia
+algo que lo compone: asignaciones de rol (acl.UserRole o la M2M User.roles),
+permisos de un rol, o el nombre/código de un rol o permiso.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .authz import invalidar
+from .models import Permission, Role, RolePermission, UserRole
+
+
+def _invalidar(sender, **kwargs):
+    invalidar()
+
+
+def _invalidar_m2m(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidar()
+
+
+def connect():
+    for model in (UserRole, RolePermission, Role, Permission):
+        uid = f"acl_authz_{model.__name__.lower()}"
+        post_save.connect(_invalidar, sender=model, dispatch_uid=f"{uid}_save")
+        post_delete.connect(_invalidar, sender=model, dispatch_uid=f"{uid}_delete")
+
+    for through in (get_user_model().roles.through, Role.permissions.through):
+        m2m_changed.connect(_invalidar_m2m, sender=through,
+                            dispatch_uid=f"acl_authz_m2m_{through._meta.db_table}")
+
+
+connect()
@@ -1,3 +1,70 @@
+"""Tests del contexto de autorización cacheado (acl/authz.py)."""
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from academic.views.utils import user_has_any_role
+from personal.views.comun import tiene_rol
+
+from .authz import contexto, version
+from .models import Permission, Role, RolePermission, UserRole
+from .utils import user_effective_perm_codes
+
+User = get_user_model()
+
+
+class AuthzContextTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("authz_u", "authz_u@t.pe", "x")
+        cls.registrar = Role.objects.create(name="REGISTRAR")
+        cls.docente = Role.objects.create(name="TEACHER")
+        perm = Permission.objects.create(code="academic.grades.manage")
+        RolePermission.objects.create(role=cls.registrar, permission=perm)
+
+    def test_junta_ambas_tablas_y_expande_alias(self):
+        self.user.roles.add(self.docente)
+        UserRole.objects.create(user=self.user, role=self.registrar)
+        ctx = contexto(self.user)
+        self.assertEqual(ctx.roles, {"TEACHER", "REGISTRAR"})
+        # "academic.grades.manage" → "academic.grades.edit" (rbac.PERM_ALIASES)
+        self.assertIn("academic.grades.edit", user_effective_perm_codes(self.user))
+
+    def test_se_calcula_una_vez_por_request(self):
+        self.user.roles.add(self.registrar)
+        self.assertTrue(user_has_any_role(self.user, ["REGISTRAR"]))
+        with self.assertNumQueries(0):
+            self.assertTrue(tiene_rol(self.user, ["ADMIN_SYSTEM", "REGISTRAR"]))
+            self.assertFalse(user_has_any_role(self.user, ["ADMIN_SYSTEM"]))
+
+    def test_cambios_de_rol_invalidan(self):
+        self.assertFalse(user_has_any_role(self.user, ["TEACHER"]))
+        ur = UserRole.objects.create(user=self.user, role=self.docente)
+        self.assertTrue(user_has_any_role(self.user, ["TEACHER"]))
+        ur.delete()
+        self.assertFalse(user_has_any_role(self.user, ["TEACHER"]))
+
+        self.user.roles.add(self.registrar)
+        self.assertIn("academic.grades.manage", user_effective_perm_codes(self.user))
+        RolePermission.objects.filter(role=self.registrar).delete()
+        self.assertEqual(user_effective_perm_codes(self.user), set())
+
+    def test_la_version_vive_en_la_base(self):
+        # Otro worker (con su propio cache) la lee de catalogs.TableVersion
+        v = version()
+        with self.captureOnCommitCallbacks(execute=True):
+            UserRole.objects.create(user=self.user, role=self.docente)
+        self.assertNotEqual(version(), v)
+        v = version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.roles.remove(self.registrar)
+        self.assertNotEqual(version(), v)
+
+    def test_auth_me_usa_el_contexto(self):
+        UserRole.objects.create(user=self.user, role=self.registrar)
+        cli = APIClient()
+        cli.force_authenticate(self.user)
+        r = cli.get("/api/auth/me")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["roles"], ["REGISTRAR"])
+        self.assertEqual(r.data["permissions"], ["academic.grades.edit", "academic.grades.manage"])
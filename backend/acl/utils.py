@@ -1,10 +1,7 @@
-from .models import RolePermission
+from .authz import contexto
 
 def user_effective_perm_codes(user) -> set[str]:
+    """Códigos de permiso de todos los roles del usuario (con alias expandidos)."""
     if not user or not user.is_authenticated:
         return set()
-    role_ids = list(user.roles.values_list("id", flat=True))
-    if not role_ids:
-        return set()
-    qs = RolePermission.objects.filter(role_id__in=role_ids).select_related("permission")
-    return {rp.permission.code for rp in qs}
\ No newline at end of file
+    return set(contexto(user).permisos)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AdmissionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admission'
+
+    def ready(self):
+        # Perfil normalizado de la postulación (admission/signals.py)
+        from . import signals  # noqa: F401
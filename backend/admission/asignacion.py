@@ -0,0 +1,221 @@
+"""
+Motor de asignación de vacantes de una convocatoria.
+
+Antes `results_publish` rankeaba una sola carrera con dos consultas de
+puntaje por postulación y el mismo postulante podía quedar ADMITTED en una
+carrera y NOT_ADMITTED en otra según el orden de publicación. Ahora la
+convocatoria completa se carga en tres consultas (postulaciones,
+preferencias, puntajes) y se asigna en un solo paso:
+
+  * orden de mérito: puntaje final desc, luego Fase 1 desc, luego Fase 2
+    desc y por último la postulación más antigua (id) — determinista, la
+    misma entrada produce siempre el mismo resultado;
+  * cada postulante, en ese orden, toma su preferencia de mayor prioridad
+    que aún tenga vacante en su modalidad. Como todas las carreras usan el
+    mismo orden de mérito, esto es la asignación estable (aceptación
+    diferida) y nadie queda fuera de una carrera que tomó alguien con menos
+    puntaje;
+  * sin el puntaje mínimo (meta.min_score, 60 por defecto) no se asigna.
+
+Vacantes: meta.careers[i].vacancies por carrera; si la carrera trae
+`modality_vacancies` ({"ORDINARIO": 25, "EXONERADOS": 5}) cada modalidad
+(data.profile.modalidad_admision) tiene su propio cupo.
+
+    plan = asignar(call)           # sin escribir
+    aplicar(plan)                  # bulk_update de status + data.placement
+"""
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db import connection, transaction
+
+from admission.models import Application, ApplicationPreference, EvaluationScore
+from catalogs.models import Career
+
+MIN_SCORE = 60
+MODALIDAD_DEFECTO = "ORDINARIO"
+
+
+@dataclass
+class Postulante:
+    application_id: int
+    modalidad: str
+    phase1: float
+    phase2: float
+    preferencias: list = field(default_factory=list)   # [career_id] por prioridad
+    admitido: bool = False
+    career_id: int = None                             # asignada
+    preferencia: int = None                           # n.º de la preferencia asignada
+    orden: int = 0                                    # puesto de mérito en la convocatoria
+
+    @property
+    def final(self):
+        return round(self.phase1 + self.phase2, 2)
+
+
+def puntajes(apps):
+    """{application_id: (fase1, fase2)} de un queryset de postulaciones, en una consulta."""
+    from admission.views.utils import compute_phase_totals
+
+    por_app = defaultdict(dict)
+    for s in EvaluationScore.objects.filter(application__in=apps.values("id")).only(
+            "application_id", "phase", "rubric", "total"):
+        por_app[s.application_id][s.phase] = s
+    return defaultdict(lambda: (0.0, 0.0), {
+        aid: compute_phase_totals(f.get("WRITTEN"), f.get("INTERVIEW"))
+        for aid, f in por_app.items()
+    })
+
+
+def _modalidad(data):
+    data = data if isinstance(data, dict) else {}
+    valor = (data.get("profile") or {}).get("modalidad_admision") or data.get("modalidad_admision")
+    return (str(valor or "").strip().upper()) or MODALIDAD_DEFECTO
+
+
+def vacantes(call):
+    """{(career_id, modalidad|None): vacantes} desde call.meta.careers."""
+    out = {}
+    for cm in (call.meta or {}).get("careers") or []:
+        try:
+            cid = int(cm.get("career_id") or cm.get("id"))
+        except (TypeError, ValueError):
+            continue
+        por_mod = cm.get("modality_vacancies") or {}
+        if por_mod:
+            for mod, n in por_mod.items():
+                out[(cid, str(mod).strip().upper())] = int(n or 0)
+        else:
+            out[(cid, None)] = int(cm.get("vacancies") or 0)
+    if not out and call.vacants_total:
+        # Convocatoria sin carreras configuradas: un solo cupo general
+        out[(None, None)] = int(call.vacants_total)
+    return out
+
+
+def _preferencias_por_nombre(call, sin_pref):
+    """Postulaciones sin ApplicationPreference: carrera por career_name."""
+    from admission.views.results import _norm_key
+
+    if not sin_pref:
+        return {}
+    ids = []
+    for cm in (call.meta or {}).get("careers") or []:
+        try:
+            ids.append(int(cm.get("career_id") or cm.get("id")))
+        except (TypeError, ValueError):
+            continue
+    nombres = {_norm_key(n): cid for cid, n in Career.objects.filter(id__in=ids).values_list("id", "name")}
+    out = {}
+    for aid, cname in sin_pref.items():
+        k = _norm_key(cname or "")
+        if not k:
+            continue
+        cid = nombres.get(k) or next((c for n, c in nombres.items() if n and (n in k or k in n)), None)
+        if cid:
+            out[aid] = [cid]
+    return out
+
+
+def cargar(call):
+    """Postulantes de la convocatoria con puntajes y preferencias (3 consultas)."""
+    apps = Application.objects.filter(call=call)
+    filas = list(apps.values_list("id", "career_name", "data"))
+    prefs = defaultdict(list)
+    for aid, cid in (ApplicationPreference.objects
+                     .filter(application__call=call)
+                     .order_by("application_id", "rank", "id")
+                     .values_list("application_id", "career_id")):
+        prefs[aid].append(cid)
+    por_nombre = _preferencias_por_nombre(call, {aid: cn for aid, cn, _ in filas if aid not in prefs})
+    notas = puntajes(apps)
+    return [
+        Postulante(aid, _modalidad(data), *notas[aid], preferencias=prefs.get(aid) or por_nombre.get(aid, []))
+        for aid, _cname, data in filas
+    ]
+
+
+def asignar(call, min_score=None):
+    """Calcula la asignación sin escribir. Retorna el plan (dict)."""
+    t0 = time.monotonic()
+    if min_score is None:
+        min_score = float((call.meta or {}).get("min_score") or MIN_SCORE)
+    postulantes = cargar(call)
+    postulantes.sort(key=lambda p: (-p.final, -p.phase1, -p.phase2, p.application_id))
+
+    cupos = vacantes(call)
+    usados = defaultdict(int)
+    for i, p in enumerate(postulantes, start=1):
+        p.orden = i
+        if p.final < min_score:
+            continue
+        for n, cid in enumerate(p.preferencias or [None], start=1):
+            clave = next((k for k in ((cid, p.modalidad), (cid, None), (None, None)) if k in cupos), None)
+            if clave and usados[clave] < cupos[clave]:
+                usados[clave] += 1
+                p.admitido, p.career_id, p.preferencia = True, cid, n
+                break
+
+    nombres = dict(Career.objects.filter(id__in={c for c, _ in cupos if c}).values_list("id", "name"))
+    return {
+        "call_id": call.id,
+        "min_score": min_score,
+        "postulantes": postulantes,
+        "careers": [
+            {"career_id": cid, "career_name": nombres.get(cid, ""), "modality": mod,
+             "vacancies": n, "filled": usados[(cid, mod)]}
+            for (cid, mod), n in sorted(cupos.items(), key=lambda x: (x[0][0] or 0, x[0][1] or ""))
+        ],
+        "admitted": sum(1 for p in postulantes if p.admitido),
+        "total": len(postulantes),
+        "nombres": nombres,
+        "elapsed_ms": int((time.monotonic() - t0) * 1000),
+    }
+
+
+def aplicar(plan, solo=None, lote=1000):
+    """
+    Escribe el plan: status ADMITTED/NOT_ADMITTED y data.placement
+    (carrera, preferencia, puntaje, orden de mérito). `solo`: conjunto de
+    application_id a escribir (publicación por carrera). Retorna cuántas.
+
+    Un UPDATE parametrizado por fila con executemany: bulk_update arma un
+    CASE de todo el lote y con decenas de miles de filas JSON tarda segundos.
+    """
+    por_id = {p.application_id: p for p in plan["postulantes"]
+              if solo is None or p.application_id in solo}
+    campo = Application._meta.get_field("data")
+    tabla = connection.ops.quote_name(Application._meta.db_table)
+    sql = f"UPDATE {tabla} SET status = %s, data = %s WHERE id = %s"
+    filas = []
+    for aid, data in Application.objects.filter(call_id=plan["call_id"]).values_list("id", "data"):
+        p = por_id.get(aid)
+        if p is None:
+            continue
+        data = data if isinstance(data, dict) else {}
+        data["placement"] = {
+            "career_id": p.career_id,
+            "career_name": plan["nombres"].get(p.career_id, "") if p.career_id else "",
+            "preference": p.preferencia,
+            "modality": p.modalidad,
+            "score": p.final,
+            "merit_order": p.orden,
+        }
+        filas.append(("ADMITTED" if p.admitido else "NOT_ADMITTED",
+                      campo.get_db_prep_save(data, connection), aid))
+    with transaction.atomic(), connection.cursor() as cur:
+        for i in range(0, len(filas), lote):
+            cur.executemany(sql, filas[i:i + lote])
+    return len(filas)
+
+
+def resumen(plan):
+    """Lo que se guarda en ResultPublication.payload y se responde."""
+    return {
+        "total": plan["total"],
+        "admitted": plan["admitted"],
+        "min_score": plan["min_score"],
+        "careers": plan["careers"],
+        "elapsed_ms": plan["elapsed_ms"],
+    }
@@ -0,0 +1,36 @@
+"""
+backfill_application_profiles — proyecta Application.data a las columnas
+normalizadas del postulante (ApplicationProfile).
+
+Las señales lo mantienen al guardar; este comando es para las postulaciones
+anteriores a la tabla y para después de cargas que se saltan save()
+(restauración de backups, SQL directo).
+
+Uso:
+    python manage.py backfill_application_profiles
+    python manage.py backfill_application_profiles --call 3 --missing
+"""
+from django.core.management.base import BaseCommand
+
+from admission.models import Application
+from admission.perfil import proyectar_lote
+
+
+class Command(BaseCommand):
+    help = "Proyecta los datos del postulante de Application.data a ApplicationProfile."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--call", type=int, action="append", default=[],
+                            help="Solo estas convocatorias (id, repetible).")
+        parser.add_argument("--missing", action="store_true",
+                            help="Solo las postulaciones que aún no tienen perfil.")
+        parser.add_argument("--batch", type=int, default=500, help="Tamaño de tanda (500).")
+
+    def handle(self, *args, **opts):
+        qs = Application.objects.all()
+        if opts["call"]:
+            qs = qs.filter(call_id__in=opts["call"])
+        if opts["missing"]:
+            qs = qs.filter(perfil__isnull=True)
+        n = proyectar_lote(qs, lote=max(1, opts["batch"]))
+        self.stdout.write(self.style.SUCCESS(f"Perfiles proyectados: {n} postulación(es)."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:06
+
+import common.imagenes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admission', '0008_admissionmodality'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='applicationdocument',
+            name='file',
+            field=models.FileField(storage=common.imagenes.almacen, upload_to='admission/docs/'),
+        ),
+        migrations.AlterField(
+            model_name='institutionsetting',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=common.imagenes.almacen, upload_to='institution/'),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='voucher',
+            field=models.FileField(blank=True, null=True, storage=common.imagenes.almacen, upload_to='admission/vouchers/'),
+        ),
+    ]
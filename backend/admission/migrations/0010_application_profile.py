@@ -0,0 +1,42 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admission', '0009_upload_pipeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationProfile',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='perfil', serialize=False, to='admission.application')),
+                ('dni', models.CharField(blank=True, db_index=True, default='', max_length=12)),
+                ('apellido_paterno', models.CharField(blank=True, db_index=True, default='', max_length=80)),
+                ('apellido_materno', models.CharField(blank=True, default='', max_length=80)),
+                ('nombres', models.CharField(blank=True, default='', max_length=120)),
+                ('sexo', models.CharField(blank=True, db_index=True, default='', max_length=12)),
+                ('fecha_nacimiento', models.DateField(blank=True, null=True)),
+                ('nacionalidad', models.CharField(blank=True, default='', max_length=60)),
+                ('email', models.CharField(blank=True, default='', max_length=254)),
+                ('phone', models.CharField(blank=True, default='', max_length=30)),
+                ('direccion', models.CharField(blank=True, default='', max_length=255)),
+                ('estado_civil', models.CharField(blank=True, default='', max_length=30)),
+                ('lengua_materna', models.CharField(blank=True, default='', max_length=60)),
+                ('autoidentificacion_etnica', models.CharField(blank=True, default='', max_length=80)),
+                ('discapacidad', models.CharField(blank=True, default='', max_length=30)),
+                ('tipo_discapacidad', models.CharField(blank=True, default='', max_length=80)),
+                ('colegio_procedencia', models.CharField(blank=True, db_index=True, default='', max_length=200)),
+                ('anio_egreso', models.PositiveSmallIntegerField(blank=True, db_index=True, null=True)),
+                ('modalidad_admision', models.CharField(blank=True, db_index=True, default='', max_length=60)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['apellido_paterno', 'apellido_materno', 'nombres'], name='adm_perfil_apellidos_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from catalogs.models import Career
+from common.imagenes import almacen
 
 User = get_user_model()
 
@@ -71,6 +72,48 @@ class Application(models.Model):
 
     def __str__(self):
         return f"App#{self.id} - {self.applicant} → {self.career_name}"
+
+
+class ApplicationProfile(models.Model):
+    """
+    Datos canónicos del postulante proyectados desde Application.data
+    (profile / school, con los alias de ambos wizards) a columnas tipadas e
+    indexadas. Se mantiene al guardar la postulación o el Applicant
+    (admission/signals.py); ver admission/perfil.py.
+    """
+    application = models.OneToOneField(
+        Application, on_delete=models.CASCADE, primary_key=True, related_name="perfil"
+    )
+    dni = models.CharField(max_length=12, blank=True, default="", db_index=True)
+    apellido_paterno = models.CharField(max_length=80, blank=True, default="", db_index=True)
+    apellido_materno = models.CharField(max_length=80, blank=True, default="")
+    nombres = models.CharField(max_length=120, blank=True, default="")
+    sexo = models.CharField(max_length=12, blank=True, default="", db_index=True)
+    fecha_nacimiento = models.DateField(null=True, blank=True)
+    nacionalidad = models.CharField(max_length=60, blank=True, default="")
+    email = models.CharField(max_length=254, blank=True, default="")
+    phone = models.CharField(max_length=30, blank=True, default="")
+    direccion = models.CharField(max_length=255, blank=True, default="")
+    estado_civil = models.CharField(max_length=30, blank=True, default="")
+    lengua_materna = models.CharField(max_length=60, blank=True, default="")
+    autoidentificacion_etnica = models.CharField(max_length=80, blank=True, default="")
+    discapacidad = models.CharField(max_length=30, blank=True, default="")
+    tipo_discapacidad = models.CharField(max_length=80, blank=True, default="")
+    colegio_procedencia = models.CharField(max_length=200, blank=True, default="", db_index=True)
+    anio_egreso = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
+    modalidad_admision = models.CharField(max_length=60, blank=True, default="", db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["apellido_paterno", "apellido_materno", "nombres"],
+                         name="adm_perfil_apellidos_idx"),
+        ]
+
+    def __str__(self):
+        return f"Perfil App#{self.application_id} ({self.dni})"
+
+
 class ApplicationPreference(models.Model):
     application = models.ForeignKey(
         Application, on_delete=models.CASCADE, related_name="preferences"
@@ -88,7 +131,7 @@ class ApplicationDocument(models.Model):
         Application, on_delete=models.CASCADE, related_name="documents"
     )
     document_type = models.CharField(max_length=60)
-    file = models.FileField(upload_to="admission/docs/")
+    file = models.FileField(upload_to="admission/docs/", storage=almacen)
     original_name = models.CharField(max_length=255, blank=True, default="")
     status = models.CharField(max_length=20, default="PENDING")
     note = models.CharField(max_length=200, blank=True, default="")
@@ -113,7 +156,7 @@ class Payment(models.Model):
     codigo_caja = models.CharField(max_length=20, blank=True, default="")
     fecha_movimiento = models.DateField(null=True, blank=True)
     voucher = models.FileField(
-        upload_to="admission/vouchers/", null=True, blank=True
+        upload_to="admission/vouchers/", storage=almacen, null=True, blank=True
     )
     meta = models.JSONField(default=dict)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -155,7 +198,7 @@ class InstitutionSetting(models.Model):
     """Logo, firma, sello, datos institucionales para constancias."""
     key = models.CharField(max_length=100, unique=True)
     value = models.TextField(blank=True, default="")
-    file = models.FileField(upload_to="institution/", blank=True, null=True)
+    file = models.FileField(upload_to="institution/", storage=almacen, blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -0,0 +1,185 @@
+"""
+Columnas normalizadas del postulante (ApplicationProfile).
+
+Los reportes buscaban cada columna fila por fila dentro del JSON anidado de
+Application.data (profile → school → raíz, con los alias del wizard en
+inglés y en español), así que filtrar u ordenar por DNI, sexo, colegio o
+modalidad solo podía hacerse en Python después de cargar toda la
+convocatoria. Ahora esos campos se proyectan una vez, al escribir, a una
+tabla con columnas tipadas e indexadas:
+
+    proyectar(app)             # al guardar la postulación (admission/signals.py)
+    proyectar_lote(qs)         # backfill (manage.py backfill_application_profiles)
+    de(app)                    # perfil guardado, o calculado al vuelo si falta
+
+y los reportes filtran y recorren directamente desde la base de datos.
+"""
+import re
+from datetime import date, datetime
+
+from django.db.models import Q
+
+from admission.models import ApplicationProfile
+
+# Aliases: el PublicApplicationWizard puede usar nombres en ingles,
+# pero el reporte MINEDU necesita nombres en espanol
+_ALIASES = {
+    "nombres":          ["nombres", "first_names", "names"],
+    "apellido_paterno": ["apellido_paterno", "last_name_father"],
+    "apellido_materno": ["apellido_materno", "last_name_mother"],
+    "dni":              ["dni", "document_number", "numero_documento_identidad"],
+    "sexo":             ["sexo", "sex"],
+    "fecha_nacimiento": ["fecha_nacimiento", "birth_date"],
+    "nacionalidad":     ["nacionalidad", "nationality"],
+    "email":            ["email"],
+    "phone":            ["phone", "mobile", "telefono"],
+    "direccion":        ["direccion", "direccion_domicilio", "address"],
+    "lengua_materna":   ["lengua_materna", "mother_tongue"],
+    "estado_civil":     ["estado_civil"],
+    "autoidentificacion_etnica": ["autoidentificacion_etnica", "ethnic_identity"],
+    "discapacidad":     ["discapacidad"],
+    "tipo_discapacidad": ["tipo_discapacidad"],
+    "colegio_procedencia": ["colegio_procedencia", "school_name"],
+    "anio_egreso":      ["anio_egreso", "promotion_year", "anio_finalizo_estudios_secundarios"],
+    "modalidad_admision": ["modalidad_admision"],
+}
+
+CAMPOS = tuple(_ALIASES)
+
+# Campos que, si el JSON no los trae, se toman del Applicant
+_DEL_APPLICANT = ("dni", "email", "phone")
+
+_FORMATOS_FECHA = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
+
+
+def _valor(data, key):
+    """Primer valor no vacío de la clave (o sus alias) en profile / school / raíz."""
+    profile = data.get("profile") or {}
+    school = data.get("school") or {}
+    profile = profile if isinstance(profile, dict) else {}
+    school = school if isinstance(school, dict) else {}
+    for k in _ALIASES.get(key, [key]):
+        for fuente in (profile, school):
+            val = fuente.get(k)
+            if val not in (None, ""):
+                return str(val).strip()
+        val = data.get(k)
+        if val not in (None, "") and not isinstance(val, (dict, list)):
+            return str(val).strip()
+    return ""
+
+
+def _fecha(texto):
+    if not texto:
+        return None
+    texto = texto.strip()
+    for fmt in _FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto[:10], fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _anio(texto):
+    m = re.search(r"(19|20)\d{2}", texto or "")
+    return int(m.group(0)) if m else None
+
+
+def extraer(app):
+    """{campo: valor} de la postulación, ya tipado y recortado al largo de la columna."""
+    data = app.data if isinstance(getattr(app, "data", None), dict) else {}
+    applicant = app.applicant if app.applicant_id else None
+    out = {}
+    for campo in CAMPOS:
+        val = _valor(data, campo)
+        if not val and campo in _DEL_APPLICANT and applicant is not None:
+            val = str(getattr(applicant, campo, "") or "").strip()
+        out[campo] = val
+    out["fecha_nacimiento"] = _fecha(out["fecha_nacimiento"])
+    out["anio_egreso"] = _anio(out["anio_egreso"])
+    out["sexo"] = out["sexo"].upper()
+    out["modalidad_admision"] = out["modalidad_admision"].upper()
+    for campo, val in out.items():
+        if isinstance(val, str):
+            out[campo] = val[:ApplicationProfile._meta.get_field(campo).max_length]
+    return out
+
+
+def proyectar(app):
+    """Crea o actualiza el perfil normalizado de la postulación."""
+    ApplicationProfile.objects.update_or_create(application_id=app.pk, defaults=extraer(app))
+
+
+def proyectar_lote(apps, lote=500):
+    """Proyecta un queryset de postulaciones por tandas. Retorna cuántas."""
+    campos = list(CAMPOS)
+    n = 0
+    qs = apps.select_related("applicant").order_by("pk")
+    ultimo = 0
+    while True:
+        tanda = list(qs.filter(pk__gt=ultimo)[:lote])
+        if not tanda:
+            return n
+        existentes = set(ApplicationProfile.objects.filter(
+            application_id__in=[a.pk for a in tanda]).values_list("application_id", flat=True))
+        nuevos, cambiados = [], []
+        for app in tanda:
+            perfil = ApplicationProfile(application_id=app.pk, **extraer(app))
+            (cambiados if app.pk in existentes else nuevos).append(perfil)
+        ApplicationProfile.objects.bulk_create(nuevos)
+        ApplicationProfile.objects.bulk_update(cambiados, campos)
+        n += len(tanda)
+        ultimo = tanda[-1].pk
+
+
+def de(app):
+    """Perfil de la postulación; si aún no se proyectó, uno sin guardar."""
+    try:
+        return app.perfil
+    except ApplicationProfile.DoesNotExist:
+        return ApplicationProfile(application_id=app.pk, **extraer(app))
+
+
+def texto(valor):
+    """Valor de columna como lo muestran los reportes."""
+    if valor is None:
+        return ""
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return str(valor)
+
+
+def filtrar(qs, params, prefijo=""):
+    """
+    Filtros de la query string sobre las columnas normalizadas:
+    dni, sexo, modalidad, colegio, anio_egreso y q (apellidos, nombres o DNI).
+    `prefijo` es la ruta al perfil desde el modelo del queryset.
+    """
+    p = prefijo
+    dni = (params.get("dni") or "").strip()
+    if dni:
+        qs = qs.filter(**{f"{p}dni__startswith": dni})
+    sexo = (params.get("sexo") or "").strip().upper()
+    if sexo:
+        qs = qs.filter(**{f"{p}sexo": sexo})
+    modalidad = (params.get("modalidad") or "").strip().upper()
+    if modalidad:
+        qs = qs.filter(**{f"{p}modalidad_admision": modalidad})
+    colegio = (params.get("colegio") or "").strip()
+    if colegio:
+        qs = qs.filter(**{f"{p}colegio_procedencia__icontains": colegio})
+    anio = _anio(params.get("anio_egreso") or "")
+    if anio:
+        qs = qs.filter(**{f"{p}anio_egreso": anio})
+    q = (params.get("q") or "").strip()
+    if q:
+        cond = Q()
+        for palabra in q.split():
+            cond &= (Q(**{f"{p}dni__startswith": palabra})
+                     | Q(**{f"{p}apellido_paterno__icontains": palabra})
+                     | Q(**{f"{p}apellido_materno__icontains": palabra})
+                     | Q(**{f"{p}nombres__icontains": palabra}))
+        qs = qs.filter(cond)
+    return qs
+
@@ -0,0 +1,33 @@
+"""
+Señales de admisión.
+
+Mantienen el perfil normalizado de la postulación (ApplicationProfile,
+admission/perfil.py) al escribir: al guardar la postulación (public_apply,
+el PATCH del detalle, la importación de ingresantes) y al cambiar el
+Applicant (DNI / email / teléfono son el respaldo cuando el JSON no los
+trae). Las escrituras que se saltan save()
+(asignacion.aplicar solo toca status y data.placement) no cambian el perfil;
+para cargas masivas está `manage.py backfill_application_profiles`.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import perfil
+from .models import Applicant, Application
+
+# Columnas de Application de las que depende el perfil
+_CAMPOS_FUENTE = {"data", "applicant"}
+
+
+@receiver(post_save, sender=Application, dispatch_uid="admission_perfil_application")
+def _application_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not _CAMPOS_FUENTE & set(update_fields)):
+        return
+    perfil.proyectar(instance)
+
+
+@receiver(post_save, sender=Applicant, dispatch_uid="admission_perfil_applicant")
+def _applicant_saved(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    perfil.proyectar_lote(Application.objects.filter(applicant=instance))
@@ -1,3 +1,143 @@
+import io
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from catalogs.models import Career
+
+from .models import (AdmissionCall, Applicant, Application, ApplicationPreference,
+                     EvaluationScore, ResultPublication)
+
+User = get_user_model()
+
+
+class AsignacionVacantesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("adm_admin", "adm@t.pe", "x")
+        cls.inicial = Career.objects.create(name="Educación Inicial", code="EI")
+        cls.primaria = Career.objects.create(name="Educación Primaria", code="EP")
+        cls.call = AdmissionCall.objects.create(title="Admisión 2026", meta={"careers": [
+            {"career_id": cls.inicial.id, "vacancies": 2},
+            {"career_id": cls.primaria.id, "vacancies": 1},
+        ]})
+
+    def setUp(self):
+        self.cli = APIClient()
+        self.cli.force_authenticate(self.user)
+
+    def _postulante(self, dni, escrito, entrevista, carreras):
+        app = Application.objects.create(
+            call=self.call,
+            applicant=Applicant.objects.create(dni=dni, names=dni, email=f"{dni}@t.pe"))
+        EvaluationScore.objects.create(application=app, phase="WRITTEN", total=escrito)
+        EvaluationScore.objects.create(application=app, phase="INTERVIEW", total=entrevista)
+        for rank, c in enumerate(carreras, start=1):
+            ApplicationPreference.objects.create(application=app, career=c, rank=rank)
+        return app
+
+    def test_asignacion_por_merito_y_preferencias(self):
+        i, p = self.inicial, self.primaria
+        a1 = self._postulante("1", 60, 30, [i, p])
+        a2 = self._postulante("2", 55, 30, [i])
+        a3 = self._postulante("3", 70, 10, [i, p])    # empata 80 con a4, gana por Fase 1
+        a4 = self._postulante("4", 60, 20, [p])
+        a5 = self._postulante("5", 40, 10, [i])       # bajo el mínimo
+
+        r = self.cli.post("/api/results/publish", {"call_id": self.call.id, "assign": True}, format="json")
+        self.assertEqual(r.status_code, 200, r.data)
+        self.assertEqual(r.data["placement"]["admitted"], 3)
+
+        estado = {a.id: (a.status, (a.data.get("placement") or {}).get("career_id"))
+                  for a in Application.objects.all()}
+        self.assertEqual(estado[a1.id], ("ADMITTED", i.id))
+        self.assertEqual(estado[a2.id], ("ADMITTED", i.id))
+        self.assertEqual(estado[a3.id], ("ADMITTED", p.id))   # Inicial ya llena: su 2.ª opción
+        self.assertEqual(estado[a4.id], ("NOT_ADMITTED", None))
+        self.assertEqual(estado[a5.id], ("NOT_ADMITTED", None))
+        self.assertEqual(ResultPublication.objects.get(call=self.call).payload["placement"]["careers"][1]["filled"], 1)
+
+        # Reproducible: la simulación da lo mismo que lo publicado
+        r = self.cli.get("/api/results/placement", {"call_id": self.call.id})
+        self.assertEqual([c["filled"] for c in r.data["careers"]], [2, 1])
+
+    def test_publicar_una_carrera_solo_escribe_sus_postulantes(self):
+        a1 = self._postulante("1", 70, 20, [self.inicial])
+        a2 = self._postulante("2", 70, 20, [self.primaria])
+        self.cli.post("/api/results/publish",
+                      {"call_id": self.call.id, "career_id": self.primaria.id}, format="json")
+        a1.refresh_from_db()
+        a2.refresh_from_db()
+        self.assertEqual((a1.status, a2.status), ("CREATED", "ADMITTED"))
+
+    def test_reportes_ranking_y_vacantes(self):
+        import openpyxl
+
+        i, p = self.inicial, self.primaria
+        self._postulante("1", 60, 30, [i, p])
+        self._postulante("2", 70, 10, [p])
+        r = self.cli.get("/api/reports/admission/ranking.xlsx", {"call_id": self.call.id})
+        filas = list(openpyxl.load_workbook(io.BytesIO(r.content)).active.iter_rows(min_row=2, values_only=True))
+        self.assertEqual([(f[0], f[1], f[9]) for f in filas], [(1, "1", 90.0), (2, "2", 80.0)])
+
+        r = self.cli.get("/api/reports/admission/vacants-vs.xlsx", {"call_id": self.call.id})
+        filas = list(openpyxl.load_workbook(io.BytesIO(r.content)).active.iter_rows(min_row=2, values_only=True))
+        self.assertEqual([f[2:] for f in filas], [(2, 1, 0.5, 1), (1, 1, 1, 1)])
+
+
+class PerfilNormalizadoTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("adm_rep", "rep@t.pe", "x")
+        cls.call = AdmissionCall.objects.create(title="Admisión 2026")
+
+    def setUp(self):
+        self.cli = APIClient()
+        self.cli.force_authenticate(self.user)
+
+    def _app(self, dni, data):
+        return Application.objects.create(
+            call=self.call, data=data,
+            applicant=Applicant.objects.create(dni=dni, names=dni, email=f"{dni}@t.pe"))
+
+    def test_proyeccion_al_guardar_y_backfill(self):
+        from django.core.management import call_command
+
+        from .models import ApplicationProfile
+
+        app = self._app("40000001", {"profile": {
+            "last_name_father": "QUISPE", "first_names": "Rosa", "sex": "f",
+            "birth_date": "05/03/2007", "modalidad_admision": "exonerados"},
+            "school": {"promotion_year": "Promoción 2024", "school_name": "IE 3045"}})
+        p = app.perfil
+        self.assertEqual((p.dni, p.apellido_paterno, p.nombres, p.sexo), ("40000001", "QUISPE", "Rosa", "F"))
+        self.assertEqual((str(p.fecha_nacimiento), p.anio_egreso), ("2007-03-05", 2024))
+        self.assertEqual((p.modalidad_admision, p.email), ("EXONERADOS", "40000001@t.pe"))
+
+        # Cambios del JSON y del Applicant se reflejan
+        app.data["profile"]["sexo"] = "M"
+        app.save(update_fields=["data"])
+        app.applicant.email = "nuevo@t.pe"
+        app.applicant.save()
+        p.refresh_from_db()
+        self.assertEqual((p.sexo, p.email), ("M", "nuevo@t.pe"))
+
+        ApplicationProfile.objects.all().delete()
+        call_command("backfill_application_profiles", "--missing", stdout=io.StringIO())
+        self.assertEqual(ApplicationProfile.objects.get(application=app).colegio_procedencia, "IE 3045")
+
+    def test_reporte_filtra_en_sql(self):
+        self._app("40000002", {"profile": {"apellido_paterno": "ROJAS", "sexo": "F"}})
+        self._app("40000003", {"profile": {"apellido_paterno": "ALVA", "sexo": "M"}})
+        self._app("40000004", {"profile": {"apellido_paterno": "BRAVO", "sexo": "F"}})
+
+        r = self.cli.get("/api/reports/admission.xlsx",
+                         {"call_id": self.call.id, "sexo": "f", "order": "apellidos"})
+        self.assertEqual(r.status_code, 200)
+        import openpyxl
+        ws = openpyxl.load_workbook(io.BytesIO(r.content)).active
+        self.assertEqual([row[2] for row in ws.iter_rows(min_row=2, values_only=True)], ["BRAVO", "ROJAS"])
 
-# Create your tests here.
+        r = self.cli.get("/api/applications", {"q": "alva"})
+        self.assertEqual([a["id"] for a in r.data], [Application.objects.get(perfil__dni="40000003").id])
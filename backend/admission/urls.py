@@ -86,6 +86,7 @@ urlpatterns = [
     # ══════════════════════════════════════════════════════════
     path("results", v.results_list),
     path("results/publish", v.results_publish),
+    path("results/placement", v.results_placement_preview),
     path("results/close", v.results_close),
     path("results/acta.pdf", v.results_acta_pdf),
 
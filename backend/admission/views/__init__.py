@@ -59,6 +59,7 @@ from .results import (
     public_results,
     public_results_by_path,
     results_publish,
+    results_placement_preview,
     results_close,
     results_acta_pdf,
 )
@@ -150,6 +151,7 @@ __all__ = [
     'public_results',
     'public_results_by_path',
     'results_publish',
+    'results_placement_preview',
     'results_close',
     'results_acta_pdf',
     # Reports
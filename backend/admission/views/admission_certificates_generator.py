@@ -34,6 +34,8 @@ import base64
 import logging
 from datetime import datetime
 
+from common.imagenes import ruta_derivado
+
 logger = logging.getLogger("admission.certificates")
 
 try:
@@ -82,6 +84,7 @@ def _img_b64(path_or_url: str, media_root: str = "") -> str:
         p = os.path.join(media_root, p.lstrip("/"))
     if not os.path.exists(p):
         return ""
+    p = ruta_derivado(p, "print")
     try:
         with open(p, "rb") as f:
             data = base64.b64encode(f.read()).decode()
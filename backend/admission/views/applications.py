@@ -18,6 +18,7 @@ from rest_framework.decorators import (
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
+from admission import perfil
 from admission.models import (
     AdmissionCall,
     Applicant,
@@ -31,6 +32,7 @@ from admission.serializers import (
     ApplicationSerializer,
 )
 from catalogs.models import Career
+from common.imagenes import normalizar_data_uri
 from .utils import _has_field, _is_active_call, _call_to_fe
 
 logger = logging.getLogger(__name__)
@@ -91,6 +93,9 @@ def applications_collection(request):
         if career_id:
             qs = qs.filter(preferences__career_id=career_id).distinct()
 
+        # Búsqueda por columnas normalizadas (dni, sexo, modalidad, colegio, q)
+        qs = perfil.filtrar(qs, request.query_params, prefijo="perfil__")
+
         return Response(ApplicationSerializer(qs, many=True).data)
 
     # POST
@@ -305,7 +310,8 @@ def public_apply(request):
 
         profile = payload.get("profile") or {}
         school = payload.get("school") or {}
-        photo_base64 = payload.get("photo_base64")
+        # Foto carné acotada: se incrusta en cada ficha/constancia PDF
+        photo_base64 = normalizar_data_uri(payload.get("photo_base64"), 600)
 
         try:
             first_pref = int(prefs[0])
@@ -20,6 +20,7 @@ from rest_framework.response import Response
 
 from admission.models import Application, ApplicationDocument
 from admission.models import InstitutionSetting as AdmissionSetting
+from common.imagenes import ruta_derivado
 
 from .admission_certificates_generator import (
     generate_inscripcion_pdf,
@@ -773,7 +774,7 @@ def _fallback_inscripcion_reportlab(app, app_data: dict, inst: dict) -> bytes:
             p = os.path.join(mr, p.split("/media/")[-1])
         elif not os.path.isabs(p):
             p = os.path.join(mr, p.lstrip("/"))
-        return p if os.path.exists(p) else None
+        return ruta_derivado(p, "print") if os.path.exists(p) else None
 
     # ── Datos ──
     call_name   = (app_data.get("call_name", "") or "").upper()
@@ -1190,7 +1191,7 @@ def _fallback_vacante_reportlab(app, app_data: dict, inst: dict) -> bytes:
             p = os.path.join(mr, p.split("/media/")[-1])
         elif not os.path.isabs(p):
             p = os.path.join(mr, p.lstrip("/"))
-        return p if os.path.exists(p) else None
+        return ruta_derivado(p, "print") if os.path.exists(p) else None
 
     # ── Datos ──
     full_name    = (app_data.get("full_name", "") or "").upper()
@@ -8,14 +8,16 @@ Incluye:
   - POST      /applications/{id}/documents/{doc_id}/review
   - GET       /applications/{id}/documents/{doc_id}/download  (sirve archivo)
 """
-import mimetypes
-from django.http import FileResponse, Http404
+import os
+from django.http import Http404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
 from admission.models import Application, ApplicationDocument
 from admission.serializers import ApplicationDocumentSerializer
+from common import imagenes
+from common.entrega import entregar
 
 
 def serialize_doc(obj, data=None, request=None):
@@ -35,6 +37,8 @@ def serialize_doc(obj, data=None, request=None):
             data["file_url"] = api_url
     else:
         data["file_url"] = None
+    # Miniatura para listados (en archivos que no son imagen sirve el original)
+    data["thumb_url"] = f"{data['file_url']}?size=thumb" if data["file_url"] else None
 
     data["file_name"] = (
         getattr(obj, "original_name", "")
@@ -94,11 +98,12 @@ def application_doc_delete(request, application_id: int, document_id: int):
             status=400,
         )
 
-    # Eliminar archivo físico
-    if doc.file:
-        doc.file.delete(save=False)
-
+    # Eliminar la fila y luego el archivo físico (el storage solo lo borra
+    # si ya nadie más lo referencia)
+    nombre = doc.file.name
     doc.delete()
+    if nombre:
+        doc.file.storage.delete(nombre)
     return Response({"detail": "Documento eliminado"})
 
 
@@ -148,13 +153,10 @@ def application_doc_download(request, application_id: int, document_id: int):
     if not doc.file:
         raise Http404("Sin archivo asociado")
 
-    # Detectar tipo MIME
-    filename = doc.original_name or doc.file.name.split("/")[-1]
-    content_type, _ = mimetypes.guess_type(filename)
-    if not content_type:
-        content_type = "application/octet-stream"
+    # ?size=thumb|print → derivado reducido (solo imágenes; ver common/imagenes.py)
+    ruta = imagenes.ruta(doc.file, request.GET.get("size"))
 
-    # Servir el archivo (streaming para archivos grandes)
-    response = FileResponse(doc.file.open("rb"), content_type=content_type)
-    response["Content-Disposition"] = f'inline; filename="{filename}"'
-    return response
\ No newline at end of file
+    # Tipo MIME del archivo guardado (las imágenes se normalizan a JPEG/PNG);
+    # la transferencia la hace nginx si está configurado (common/entrega.py)
+    filename = doc.original_name or os.path.basename(ruta)
+    return entregar(ruta, filename=filename)
@@ -13,13 +13,12 @@ Flujo:
   4. Postulante consulta resultado público y ve sus credenciales
 """
 import logging
-import mimetypes
 import secrets
 import string
 from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.http import FileResponse, Http404, HttpResponse
+from django.http import Http404, HttpResponse
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -27,6 +26,8 @@ from rest_framework.response import Response
 
 from admission.models import Payment, Application, Applicant
 from admission.serializers import PaymentSerializer
+from common import imagenes
+from common.entrega import entregar
 from .utils import _ensure_media_tmp, _write_stub_pdf
 
 User = get_user_model()
@@ -86,6 +87,10 @@ def _payment_to_dict(payment, request=None):
             else None
         ),
         "voucher_url": voucher_url,
+        "voucher_thumb_url": (
+            f"/api/admission-payments/{payment.id}/voucher?size=thumb"
+            if payment.voucher else None
+        ),
         "created_at": payment.created_at.isoformat() if payment.created_at else None,
         "order_id": (payment.meta or {}).get("order_id"),
         "applicant_name": applicant.names if applicant else "—",
@@ -555,15 +560,8 @@ def payment_voucher_file(request, payment_id: int):
     if not payment.voucher:
         raise Http404("El pago no tiene voucher adjunto")
 
-    filename = payment.voucher.name.split("/")[-1]
-    content_type, _ = mimetypes.guess_type(filename)
-
-    resp = FileResponse(
-        payment.voucher.open("rb"),
-        content_type=content_type or "application/octet-stream",
-    )
-    resp["Content-Disposition"] = f'inline; filename="{filename}"'
-    return resp
+    # ?size=thumb|print → derivado reducido del voucher (si es imagen)
+    return entregar(imagenes.ruta(payment.voucher, request.GET.get("size")))
 
 
 # ═══════════════════════════════════════════════════════
@@ -10,18 +10,24 @@ FIX:
      con aliases para soportar ambos wizards (espanol e ingles)
   3. Fallback a CSV si openpyxl no esta instalado
   4. select_related + prefetch_related para evitar N+1
+  5. Las columnas del postulante salen de ApplicationProfile (columnas
+     indexadas, admission/perfil.py): filtros y orden en SQL y filas
+     recorridas por tandas
 """
 import io
 import csv
 from datetime import timedelta
-from django.db.models import Count
-from django.http import HttpResponse
+from django.db.models import Count, Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from admission.models import AdmissionCall, Application, ApplicationDocument, ApplicationPreference
+from admission import perfil
+from admission.models import (
+    AdmissionCall, Application, ApplicationDocument, ApplicationPreference, ApplicationProfile,
+)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -53,82 +59,6 @@ def admission_dashboard(request):
     })
 
 
-# ══════════════════════════════════════════════════════════════
-# HELPER: extraer datos del JSON anidado de Application.data
-# ══════════════════════════════════════════════════════════════
-
-# Aliases: el PublicApplicationWizard puede usar nombres en ingles,
-# pero el reporte MINEDU necesita nombres en espanol
-_ALIASES = {
-    "nombres":          ["nombres", "first_names", "names"],
-    "apellido_paterno": ["apellido_paterno", "last_name_father"],
-    "apellido_materno": ["apellido_materno", "last_name_mother"],
-    "dni":              ["dni", "document_number", "numero_documento_identidad"],
-    "sexo":             ["sexo", "sex"],
-    "fecha_nacimiento": ["fecha_nacimiento", "birth_date"],
-    "nacionalidad":     ["nacionalidad", "nationality"],
-    "email":            ["email"],
-    "phone":            ["phone", "mobile", "telefono"],
-    "direccion":        ["direccion", "direccion_domicilio", "address"],
-    "lengua_materna":   ["lengua_materna", "mother_tongue"],
-    "estado_civil":     ["estado_civil"],
-    "autoidentificacion_etnica": ["autoidentificacion_etnica", "ethnic_identity"],
-    "discapacidad":     ["discapacidad"],
-    "tipo_discapacidad": ["tipo_discapacidad"],
-    "colegio_procedencia": ["colegio_procedencia", "school_name"],
-    "anio_egreso":      ["anio_egreso", "promotion_year", "anio_finalizo_estudios_secundarios"],
-    "modalidad_admision": ["modalidad_admision"],
-}
-
-
-def _get_app_field(app, key, fallback=""):
-    """
-    Busca un campo en la estructura anidada de Application:
-      1. data.profile[key]   <- donde public_apply guarda campos MINEDU
-      2. data.school[key]    <- datos escolares
-      3. data[key]           <- nivel raiz (compatibilidad)
-      4. applicant.{key}     <- FK al modelo Applicant
-      5. app.{key}           <- campo directo del modelo Application
-
-    Usa aliases para soportar ambos wizards (espanol e ingles).
-    """
-    data = app.data if isinstance(getattr(app, "data", None), dict) else {}
-    profile = data.get("profile") or {}
-    school = data.get("school") or {}
-    applicant = app.applicant
-
-    # Lista de keys a buscar (con aliases)
-    keys_to_try = _ALIASES.get(key, [key])
-
-    for k in keys_to_try:
-        # 1) profile
-        val = profile.get(k)
-        if val not in (None, ""):
-            return str(val)
-        # 2) school
-        val = school.get(k)
-        if val not in (None, ""):
-            return str(val)
-        # 3) data raiz (solo valores simples)
-        val = data.get(k)
-        if val not in (None, "") and not isinstance(val, (dict, list)):
-            return str(val)
-
-    # 4) applicant FK (solo key original)
-    if applicant and hasattr(applicant, key):
-        val = getattr(applicant, key, None)
-        if val not in (None, ""):
-            return str(val)
-
-    # 5) app directo (solo key original)
-    if hasattr(app, key):
-        val = getattr(app, key, None)
-        if val not in (None, "") and not isinstance(val, (dict, list)):
-            return str(val)
-
-    return fallback
-
-
 # ══════════════════════════════════════════════════════════════
 # Columnas MINEDU para el reporte Excel
 # ══════════════════════════════════════════════════════════════
@@ -161,53 +91,43 @@ REPORT_COLUMNS = [
 
 
 def _get_filtered_qs(request):
-    """Queryset de Applications filtrado por call_id y career_id."""
+    """
+    Queryset de Applications filtrado por call_id y career_id, y por las
+    columnas normalizadas del postulante (dni, sexo, modalidad, colegio,
+    anio_egreso, q; ver admission/perfil.py). order=apellidos ordena por
+    apellidos y nombres.
+    """
     call_id = request.query_params.get("call_id")
     career_id = request.query_params.get("career_id")
 
     qs = (
         Application.objects
-        .select_related("applicant", "call")
+        .select_related("applicant", "call", "perfil")
         .prefetch_related("preferences__career")
-        .order_by("id")
     )
     if call_id:
         qs = qs.filter(call_id=call_id)
     if career_id:
         qs = qs.filter(preferences__career_id=career_id).distinct()
+    qs = perfil.filtrar(qs, request.query_params, prefijo="perfil__")
+
+    if request.query_params.get("order") == "apellidos":
+        return qs.order_by("perfil__apellido_paterno", "perfil__apellido_materno",
+                           "perfil__nombres", "id")
+    return qs.order_by("id")
+
 
-    return qs
+def _career_name(app):
+    """career_name o la primera preferencia (prefetch ya ordenado por rank)."""
+    if app.career_name:
+        return app.career_name
+    prefs = list(app.preferences.all())
+    return prefs[0].career.name if prefs and prefs[0].career else ""
 
 
 def _build_row(idx, app):
     """Construye una fila de datos para el reporte."""
-    # DNI
-    dni = _get_app_field(app, "dni")
-    if not dni and app.applicant:
-        dni = app.applicant.dni or ""
-
-    # Nombre separado
-    ap_pat = _get_app_field(app, "apellido_paterno")
-    ap_mat = _get_app_field(app, "apellido_materno")
-    nombres = _get_app_field(app, "nombres")
-
-    # Email y telefono (fallback a applicant)
-    email = _get_app_field(app, "email")
-    if not email and app.applicant:
-        email = app.applicant.email or ""
-    phone = _get_app_field(app, "phone")
-    if not phone and app.applicant:
-        phone = app.applicant.phone or ""
-
-    # Carrera (primera preferencia o career_name)
-    career_name = app.career_name or ""
-    if not career_name:
-        try:
-            first_pref = app.preferences.order_by("rank").first()
-            if first_pref and first_pref.career:
-                career_name = first_pref.career.name
-        except Exception:
-            pass
+    p = perfil.de(app)
 
     # Fecha de registro
     created = ""
@@ -221,25 +141,25 @@ def _build_row(idx, app):
 
     return [
         idx,
-        dni,
-        ap_pat,
-        ap_mat,
-        nombres,
-        _get_app_field(app, "sexo"),
-        _get_app_field(app, "fecha_nacimiento"),
-        _get_app_field(app, "nacionalidad"),
-        email,
-        phone,
-        _get_app_field(app, "direccion"),
-        _get_app_field(app, "estado_civil"),
-        _get_app_field(app, "lengua_materna"),
-        _get_app_field(app, "autoidentificacion_etnica"),
-        _get_app_field(app, "discapacidad"),
-        _get_app_field(app, "tipo_discapacidad"),
-        _get_app_field(app, "colegio_procedencia"),
-        _get_app_field(app, "anio_egreso"),
-        career_name,
-        _get_app_field(app, "modalidad_admision"),
+        p.dni,
+        p.apellido_paterno,
+        p.apellido_materno,
+        p.nombres,
+        p.sexo,
+        perfil.texto(p.fecha_nacimiento),
+        p.nacionalidad,
+        p.email,
+        p.phone,
+        p.direccion,
+        p.estado_civil,
+        p.lengua_materna,
+        p.autoidentificacion_etnica,
+        p.discapacidad,
+        p.tipo_discapacidad,
+        p.colegio_procedencia,
+        perfil.texto(p.anio_egreso),
+        _career_name(app),
+        p.modalidad_admision,
         call_title,
         app.status or "",
         created,
@@ -256,15 +176,14 @@ def reports_admission_xlsx(request):
     """
     Reporte general de admision en formato Excel (.xlsx).
     Con fallback a CSV si openpyxl no esta instalado.
+
+    Las filas se leen de las columnas normalizadas (ApplicationProfile) y se
+    recorren por tandas desde la base de datos, sin cargar la convocatoria
+    completa en memoria.
     """
     qs = _get_filtered_qs(request)
     headers = [col[0] for col in REPORT_COLUMNS]
 
-    # Construir filas
-    rows_data = []
-    for idx, app in enumerate(qs, start=1):
-        rows_data.append(_build_row(idx, app))
-
     # ── Intentar generar Excel con openpyxl ──
     try:
         import openpyxl
@@ -303,7 +222,10 @@ def reports_admission_xlsx(request):
         ws.row_dimensions[1].height = 30
 
         # ── Datos con filas alternadas ──
-        for row_idx, row_data in enumerate(rows_data, start=2):
+        n_rows = 0
+        for n_rows, app in enumerate(_iter_apps(qs), start=1):
+            row_idx = n_rows + 1
+            row_data = _build_row(n_rows, app)
             row_fill = stripe_fill if (row_idx % 2 == 0) else white_fill
             for col_idx, value in enumerate(row_data, start=1):
                 cell = ws.cell(row=row_idx, column=col_idx, value=value)
@@ -317,10 +239,10 @@ def reports_admission_xlsx(request):
 
         # ── Tabla con formato + auto-filter (compatibilidad cross-version) ──
         last_col = get_column_letter(len(REPORT_COLUMNS))
-        last_row = len(rows_data) + 1
+        last_row = n_rows + 1
         table_added = False
 
-        if rows_data:
+        if n_rows:
             try:
                 tab = Table(
                     displayName="PostulantesAdmision",
@@ -381,17 +303,33 @@ def reports_admission_xlsx(request):
         import logging
         logging.getLogger(__name__).warning("Error generando XLSX, fallback CSV: %s", exc)
 
-    # ── Fallback: CSV ──
-    response = HttpResponse(content_type="text/csv; charset=utf-8")
+    # ── Fallback: CSV (en streaming) ──
+    response = StreamingHttpResponse(
+        _csv_lines(headers, (_build_row(idx, app) for idx, app in enumerate(_iter_apps(qs), start=1))),
+        content_type="text/csv; charset=utf-8",
+    )
     response["Content-Disposition"] = 'attachment; filename="reporte_admision.csv"'
-    response.write("\ufeff")  # BOM para Excel
+    return response
 
-    writer = csv.writer(response)
-    writer.writerow(headers)
-    for row_data in rows_data:
-        writer.writerow(row_data)
 
-    return response
+def _iter_apps(qs, chunk_size=500):
+    """Recorre el queryset por tandas (con sus prefetch por tanda)."""
+    return qs.iterator(chunk_size=chunk_size)
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: devuelve la línea en vez de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(headers, rows):
+    writer = csv.writer(_Echo())
+    yield "\ufeff"  # BOM para Excel
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -424,60 +362,42 @@ def reports_aulas_pdf(request):
     except AdmissionCall.DoesNotExist:
         return Response({"detail": "Convocatoria no encontrada"}, status=404)
 
-    # Filtrar postulaciones
+    # Filtrar postulaciones (columnas normalizadas: filtros y orden en SQL)
+    fotos = Prefetch("documents", to_attr="fotos",
+                     queryset=ApplicationDocument.objects.filter(document_type="FOTO_CARNET"))
     qs = (
         Application.objects
-        .select_related("applicant", "call")
-        .prefetch_related("preferences__career", "documents")
+        .select_related("applicant", "call", "perfil")
+        .prefetch_related("preferences__career", fotos)
         .filter(call_id=call_id)
-        .order_by("applicant__dni")
+        .order_by("perfil__dni", "applicant__dni")
     )
     career_id = request.query_params.get("career_id")
     if career_id:
         qs = qs.filter(preferences__career_id=career_id).distinct()
+    qs = perfil.filtrar(qs, request.query_params, prefijo="perfil__")
 
     # Construir lista de postulantes
     applicants = []
-    for app in qs:
-        # Datos del profile
-        data = app.data if isinstance(getattr(app, "data", None), dict) else {}
-        profile = data.get("profile") or {}
-
-        dni = _get_app_field(app, "dni")
-        if not dni and app.applicant:
-            dni = app.applicant.dni or ""
-
-        nombres = _get_app_field(app, "nombres")
-        ap_pat = _get_app_field(app, "apellido_paterno")
-        ap_mat = _get_app_field(app, "apellido_materno")
-        modalidad = _get_app_field(app, "modalidad_admision") or "ORDINARIO"
-
-        # Carrera
-        especialidad = app.career_name or ""
-        if not especialidad:
-            try:
-                fp = app.preferences.order_by("rank").first()
-                if fp and fp.career:
-                    especialidad = fp.career.name
-            except Exception:
-                pass
+    for app in _iter_apps(qs):
+        p = perfil.de(app)
 
         # Foto
         foto_path = ""
         try:
-            doc = app.documents.filter(document_type="FOTO_CARNET").first()
+            doc = app.fotos[0] if app.fotos else None
             if doc and doc.file:
                 foto_path = doc.file.path
         except Exception:
             pass
 
         applicants.append({
-            "dni": dni,
-            "nombres": nombres,
-            "apellido_paterno": ap_pat,
-            "apellido_materno": ap_mat,
-            "especialidad": especialidad,
-            "modalidad_admision": modalidad,
+            "dni": p.dni,
+            "nombres": p.nombres,
+            "apellido_paterno": p.apellido_paterno,
+            "apellido_materno": p.apellido_materno,
+            "especialidad": _career_name(app),
+            "modalidad_admision": p.modalidad_admision or "ORDINARIO",
             "foto_path": foto_path,
         })
 
@@ -519,15 +439,159 @@ def reports_aulas_pdf(request):
     return response
 
 
+def _tabla_response(filename, titulo, columnas, filas):
+    """
+    Hoja simple (cabecera + filas) en modo write_only de openpyxl, o CSV en
+    streaming si openpyxl no esta instalado.
+    """
+    try:
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+        from openpyxl.utils import get_column_letter
+    except ImportError:
+        response = StreamingHttpResponse(
+            _csv_lines([c for c, _w in columnas], filas), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+        return response
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(titulo)
+    for i, (_c, ancho) in enumerate(columnas, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = ancho
+    ws.freeze_panes = "A2"
+    hdr_font = Font(name="Calibri", bold=True, size=10, color="FFFFFF")
+    hdr_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
+    cabecera = []
+    for col_name, _w in columnas:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.font, cell.fill = hdr_font, hdr_fill
+        cabecera.append(cell)
+    ws.append(cabecera)
+    for fila in filas:
+        ws.append(fila)
+
+    buf = io.BytesIO()
+    wb.save(buf)
+    content = buf.getvalue()
+    response = HttpResponse(
+        content,
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.xlsx"'
+    response["Content-Length"] = len(content)
+    return response
+
+
+def _call_o_error(request):
+    call_id = request.query_params.get("call_id")
+    if not call_id:
+        return None, Response({"detail": "Falta call_id"}, status=400)
+    call = AdmissionCall.objects.filter(pk=call_id).first()
+    if call is None:
+        return None, Response({"detail": "Convocatoria no encontrada"}, status=404)
+    return call, None
+
+
+RANKING_COLUMNS = [
+    ("Orden",             8),
+    ("DNI",              12),
+    ("Apellido Paterno", 18),
+    ("Apellido Materno", 18),
+    ("Nombres",          20),
+    ("Sexo",             10),
+    ("Modalidad",        18),
+    ("Fase 1",           10),
+    ("Fase 2",           10),
+    ("Puntaje Final",    12),
+    ("Carrera Asignada", 28),
+    ("Preferencia",      12),
+    ("Resultado",        14),
+]
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def reports_ranking_xlsx(request):
-    """Ranking de postulantes (TODO)"""
-    return Response({"detail": "No implementado aun"}, status=501)
+    """
+    Orden de merito de la convocatoria con la asignacion de vacantes
+    simulada (admission/asignacion.py, sin escribir). Query params: call_id
+    (obligatorio), career_id y los filtros del perfil normalizado.
+    """
+    from admission import asignacion
+
+    call, error = _call_o_error(request)
+    if error:
+        return error
+
+    plan = asignacion.asignar(call)
+    qs = perfil.filtrar(Application.objects.filter(call=call), request.query_params, prefijo="perfil__")
+    career_id = request.query_params.get("career_id")
+    if career_id:
+        qs = qs.filter(preferences__career_id=career_id)
+    ids = set(qs.values_list("id", flat=True))
+    perfiles = {p.application_id: p for p in
+                ApplicationProfile.objects.filter(application__call=call)}
+
+    def filas():
+        for pos in plan["postulantes"]:
+            if pos.application_id not in ids:
+                continue
+            p = perfiles.get(pos.application_id) or ApplicationProfile()
+            yield [
+                pos.orden, p.dni, p.apellido_paterno, p.apellido_materno, p.nombres, p.sexo,
+                pos.modalidad, pos.phase1, pos.phase2, pos.final,
+                plan["nombres"].get(pos.career_id, "") if pos.career_id else "",
+                pos.preferencia or "",
+                "ADMITIDO" if pos.admitido else "NO ADMITIDO",
+            ]
+
+    return _tabla_response("ranking_admision", "Ranking", RANKING_COLUMNS, filas())
+
+
+VACANTS_COLUMNS = [
+    ("Programa de Estudios", 32),
+    ("Modalidad",            18),
+    ("Vacantes",             10),
+    ("Postulantes (1.a opcion)", 14),
+    ("Postulantes por vacante",  14),
+    ("Admitidos",            12),
+]
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def reports_vacants_vs_xlsx(request):
-    """Vacantes vs postulantes (TODO)"""
-    return Response({"detail": "No implementado aun"}, status=501)
\ No newline at end of file
+    """
+    Vacantes vs postulantes por programa y modalidad. Los postulantes se
+    cuentan en SQL por su primera preferencia y la modalidad normalizada;
+    los admitidos son los de la asignacion simulada.
+    """
+    from admission import asignacion
+
+    call, error = _call_o_error(request)
+    if error:
+        return error
+
+    plan = asignacion.asignar(call)
+    conteo = {}
+    for r in (ApplicationPreference.objects
+              .filter(application__call=call, rank=1)
+              .values("career_id", "application__perfil__modalidad_admision")
+              .annotate(n=Count("application_id", distinct=True))):
+        mod = r["application__perfil__modalidad_admision"] or asignacion.MODALIDAD_DEFECTO
+        clave = (r["career_id"], mod)
+        conteo[clave] = conteo.get(clave, 0) + r["n"]
+
+    def filas():
+        for c in plan["careers"]:
+            if c["modality"]:
+                postulantes = conteo.get((c["career_id"], c["modality"]), 0)
+            else:
+                postulantes = sum(n for (cid, _m), n in conteo.items()
+                                  if c["career_id"] is None or cid == c["career_id"])
+            ratio = round(postulantes / c["vacancies"], 2) if c["vacancies"] else ""
+            yield [c["career_name"] or "General", c["modality"] or "TODAS",
+                   c["vacancies"], postulantes, ratio, c["filled"]]
+
+    return _tabla_response("vacantes_vs_postulantes", "Vacantes", VACANTS_COLUMNS, filas())
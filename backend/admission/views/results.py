@@ -61,6 +61,7 @@ def _applications_matching_career(call_qs, career_id):
                 name_ids.append(app_id)
 
     return pref_ids | set(name_ids)
+from admission import asignacion
 from admission.serializers import ApplicationSerializer
 from .utils import _ensure_media_tmp, _write_stub_pdf, compute_phase_totals
 
@@ -87,18 +88,11 @@ def results_list(request):
         matching_ids = _applications_matching_career(qs, career_id)
         qs = qs.filter(id__in=matching_ids)
 
-    # Construir respuesta con scores
+    # Construir respuesta con scores (todos los puntajes en una consulta)
+    notas = asignacion.puntajes(qs)
     results = []
     for app in qs.select_related("applicant"):
-        # FIX: EvaluationScore ahora tiene campo 'phase' y es ForeignKey
-        written = EvaluationScore.objects.filter(
-            application=app, phase="WRITTEN"
-        ).first()
-        interview = EvaluationScore.objects.filter(
-            application=app, phase="INTERVIEW"
-        ).first()
-
-        phase1_total, phase2_total = compute_phase_totals(written, interview)
+        phase1_total, phase2_total = notas[app.id]
         final_score = phase1_total + phase2_total
 
         results.append({
@@ -182,6 +176,9 @@ def _build_public_result(call_id, dni):
             "status": payment_obj.status,
         }
 
+    # Carrera asignada por el motor de vacantes (admission/asignacion.py)
+    placement = (app.data.get("placement") if isinstance(app.data, dict) else None) or {}
+
     # Credenciales de acceso (solo si pago verificado y tiene usuario)
     credentials_data = None
     if app.status == "ADMITTED" and applicant.user:
@@ -222,7 +219,10 @@ def _build_public_result(call_id, dni):
             "total": phase2_total,
             "rubric": interview.rubric if interview else None,
         },
-        "final": {"admitted": app.status == "ADMITTED"},
+        "final": {
+            "admitted": app.status == "ADMITTED",
+            "career_name": placement.get("career_name") or None,
+        },
         "payment": payment_data,
         "credentials": credentials_data,
     }, 200
@@ -279,6 +279,7 @@ def results_publish(request):
         return Response({"detail": "call not found"}, status=404)
 
     meta = call.meta or {}
+    placement = None
 
     if phase == "phase1":
         # Publicar solo resultados de Fase 1
@@ -299,42 +300,17 @@ def results_publish(request):
         call.meta = meta
         call.save(update_fields=["published", "meta"])
 
-        # Auto-asignar ADMITTED / NOT_ADMITTED según puntaje
-        if career_id:
-            apps = Application.objects.filter(
-                call_id=call_id,
-                preferences__career_id=career_id,
-            ).distinct()
-
-            # Obtener vacantes de meta de la convocatoria
-            vacancies = 0
-            try:
-                call_meta = call.meta or {}
-                careers_meta = call_meta.get("careers", [])
-                for cm in careers_meta:
-                    if str(cm.get("id", "")) == str(career_id) or str(cm.get("career_id", "")) == str(career_id):
-                        vacancies = int(cm.get("vacancies", 0))
-                        break
-                if not vacancies:
-                    vacancies = call.vacants_total or 0
-            except Exception:
-                vacancies = 0
-
-            # Rankear por puntaje final
-            scored = []
-            for app in apps:
-                w = EvaluationScore.objects.filter(application=app, phase="WRITTEN").first()
-                i = EvaluationScore.objects.filter(application=app, phase="INTERVIEW").first()
-                p1, p2 = compute_phase_totals(w, i)
-                scored.append((app, p1 + p2))
-            scored.sort(key=lambda x: x[1], reverse=True)
-
-            for idx, (app, score) in enumerate(scored):
-                if vacancies > 0 and idx < vacancies and score >= 60:
-                    app.status = "ADMITTED"
-                else:
-                    app.status = "NOT_ADMITTED"
-                app.save(update_fields=["status"])
+        # Asignar ADMITTED / NOT_ADMITTED: la asignación es siempre de toda
+        # la convocatoria (preferencias y vacantes de todas las carreras);
+        # publicando una carrera solo se escriben sus postulantes.
+        if career_id or payload.get("assign"):
+            plan = asignacion.asignar(call)
+            solo = None
+            if career_id:
+                solo = _applications_matching_career(
+                    Application.objects.filter(call=call), career_id)
+            asignacion.aplicar(plan, solo=solo)
+            placement = asignacion.resumen(plan)
 
     pub_payload = {
         "published_at": timezone.now().isoformat(),
@@ -342,6 +318,8 @@ def results_publish(request):
     }
     if career_id:
         pub_payload["career_id"] = career_id
+    if placement:
+        pub_payload["placement"] = placement
 
     ResultPublication.objects.update_or_create(
         call=call,
@@ -351,7 +329,21 @@ def results_publish(request):
         },
     )
 
-    return Response({"ok": True, "published": True, "phase": phase})
+    return Response({"ok": True, "published": True, "phase": phase, "placement": placement})
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def results_placement_preview(request):
+    """
+    Simula la asignación de vacantes de la convocatoria sin escribir nada.
+    GET /results/placement?call_id=X
+    """
+    call_id = request.query_params.get("call_id")
+    call = AdmissionCall.objects.filter(pk=call_id).first() if call_id else None
+    if not call:
+        return Response({"detail": "call not found"}, status=404)
+    return Response(asignacion.resumen(asignacion.asignar(call)))
 
 
 @api_view(["POST"])
@@ -405,16 +397,10 @@ def results_acta_pdf(request):
         qs = qs.filter(preferences__career_id=career_id).distinct()
 
     # Construir resultados con scores
+    notas = asignacion.puntajes(qs)
     results = []
     for app in qs:
-        written = EvaluationScore.objects.filter(
-            application=app, phase="WRITTEN"
-        ).first()
-        interview = EvaluationScore.objects.filter(
-            application=app, phase="INTERVIEW"
-        ).first()
-
-        p1, p2 = compute_phase_totals(written, interview)
+        p1, p2 = notas[app.id]
 
         results.append({
             "applicant_name": app.applicant.names if app.applicant else "—",
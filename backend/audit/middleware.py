@@ -45,6 +45,12 @@ class AuditLogMiddleware(MiddlewareMixin):
         "/media/",
         "/favicon.ico",
     )
+    # Lecturas públicas cacheadas (portal): se sirven sin tocar la BD y
+    # auditarlas escribiría una fila por visita anónima.
+    PUBLIC_READ_PREFIXES = (
+        "/api/portal/public/",
+        "/api/portal/announcements/",
+    )
 
     def process_request(self, request):
         request._audit_start = time.time()
@@ -61,12 +67,15 @@ class AuditLogMiddleware(MiddlewareMixin):
             if path.startswith(p):
                 return response
 
+        method = (getattr(request, "method", "") or "").upper()
+        if method in ("GET", "HEAD") and path.startswith(self.PUBLIC_READ_PREFIXES):
+            return response
+
         # tiempo
         dur_ms = None
         if hasattr(request, "_audit_start"):
             dur_ms = int((time.time() - request._audit_start) * 1000)
 
-        method = (getattr(request, "method", "") or "").upper()
         status = getattr(response, "status_code", 0)
 
         # acción por HTTP method
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CatalogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'catalogs'
+
+    def ready(self):
+        # Invalidación de las páginas públicas cacheadas (catalogs/signals.py)
+        from . import signals  # noqa: F401
+        # Contadores de cambios por tabla para el GET condicional
+        from common import condicional
+        condicional.conectar()
@@ -0,0 +1,161 @@
+"""
+Cache en disco de las Hojas de Vida en PDF (catalogs/views/hoja_vida.py).
+
+Cada descarga del CV —la del docente, la del admin y sobre todo la pública
+de transparencia— volvía a renderizar el HTML, releer todos los anexos,
+convertir las imágenes a PDF con PIL y fusionar todo con pypdf. Ahora:
+
+  * el PDF final se guarda bajo CV_PDF_CACHE_DIR con una clave que es la
+    huella (sha256) de todo lo que sale impreso: la ficha, sus ítems, sus
+    archivos (nombre, tamaño, fecha), los datos institucionales y la fecha
+    del día (la declaración jurada va fechada). Si algo cambia, cambia la
+    clave y el PDF se regenera; el anterior se borra al escribir el nuevo y
+    las señales (catalogs/signals.py) limpian el directorio del docente;
+  * la clave es también el ETag: la revalidación del navegador es un 304
+    sin tocar nada, y una descarga repetida es leer un archivo (o un
+    X-Accel-Redirect, vía common/entrega.py);
+  * cada anexo de imagen se convierte a PDF una sola vez por archivo subido
+    (`pdf_anexo`) y se reutiliza aunque cambie el resto del CV.
+
+    clave = huella(ct, items, documentado)
+    ruta = obtener(ct, clave, documentado, lambda: pdf_bytes)
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+def _dir() -> str:
+    return str(getattr(settings, "CV_PDF_CACHE_DIR", "")
+               or os.path.join(str(settings.MEDIA_ROOT), "cache", "cv"))
+
+
+def _dir_de(ct) -> str:
+    return os.path.join(_dir(), f"{ct._meta.label_lower.replace('.', '_')}_{ct.pk}")
+
+
+def _firma_archivo(campo) -> str:
+    """nombre|tamaño|mtime del archivo (sin leerlo)."""
+    if not campo:
+        return ""
+    try:
+        st = os.stat(campo.path)
+        return f"{campo.name}|{st.st_size}|{int(st.st_mtime)}"
+    except (NotImplementedError, ValueError, OSError):
+        return campo.name or ""
+
+
+def _valores(obj):
+    """Valores de las columnas del objeto (los archivos, por su firma)."""
+    return [_firma_archivo(getattr(obj, f.name)) if isinstance(f, models.FileField)
+            else str(getattr(obj, f.attname))
+            for f in obj._meta.concrete_fields]
+
+
+def _institucion():
+    """Datos institucionales del membrete y la firma de sus logos en disco."""
+    from academic.views.utils import _media_url_to_abs_path
+    from catalogs.models import InstitutionSetting
+
+    inst = InstitutionSetting.objects.filter(pk=1).first()
+    data = (inst.data or {}) if inst else {}
+    partes = [json.dumps(data, sort_keys=True, default=str)]
+    for clave in ("logo_url", "second_logo_url"):
+        ruta = _media_url_to_abs_path((data.get(clave) or "").strip())
+        try:
+            st = os.stat(ruta)
+            partes.append(f"{st.st_size}|{int(st.st_mtime)}")
+        except (TypeError, OSError):
+            partes.append("")
+    return partes
+
+
+def huella(ct, items, documentado: bool) -> str:
+    """Clave del PDF: cambia con cualquier dato que salga impreso."""
+    u = getattr(ct, "user", None)
+    partes = [
+        "v1", ct._meta.label_lower, str(ct.pk), "doc" if documentado else "desc",
+        timezone.localdate().isoformat(),
+        getattr(u, "full_name", "") or "", getattr(u, "username", "") or "",
+        *_valores(ct), *_institucion(),
+    ]
+    for it in items:
+        partes.extend(_valores(it))
+    h = hashlib.sha256()
+    for p in partes:
+        h.update(p.encode("utf-8", "replace"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def etag(clave: str) -> str:
+    return f'"{clave}"'
+
+
+def _escribir(ruta, datos: bytes):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(datos)
+        os.replace(tmp, ruta)        # atómico: nadie lee un PDF a medias
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def obtener(ct, clave: str, documentado: bool, construir) -> str:
+    """Ruta del PDF cacheado; si no existe, `construir()` → bytes y se guarda."""
+    variante = "doc" if documentado else "desc"
+    carpeta = _dir_de(ct)
+    ruta = os.path.join(carpeta, f"{variante}-{clave}.pdf")
+    if os.path.exists(ruta):
+        return ruta
+    _escribir(ruta, construir())
+    # Versiones anteriores de la misma variante ya no se sirven
+    for nombre in os.listdir(carpeta):
+        if nombre.startswith(variante + "-") and nombre != os.path.basename(ruta):
+            try:
+                os.unlink(os.path.join(carpeta, nombre))
+            except OSError:
+                pass
+    return ruta
+
+
+def invalidar(ct) -> None:
+    """Borra los PDF cacheados del docente (o personal)."""
+    shutil.rmtree(_dir_de(ct), ignore_errors=True)
+
+
+def pdf_anexo(campo):
+    """
+    Anexo como PDF (bytes): un .pdf tal cual; una imagen convertida una sola
+    vez por archivo subido y guardada junto al cache. None si no aplica.
+    """
+    nombre = (campo.name or "").lower()
+    if nombre.endswith(".pdf"):
+        with campo.open("rb") as f:
+            return f.read()
+    if not nombre.endswith((".jpg", ".jpeg", ".png")):
+        return None   # otros formatos: se omiten en silencio del anexo
+    clave = hashlib.sha256(_firma_archivo(campo).encode("utf-8")).hexdigest()
+    ruta = os.path.join(_dir(), "anexos", clave[:2], f"{clave}.pdf")
+    if os.path.exists(ruta):
+        with open(ruta, "rb") as f:
+            return f.read()
+    from PIL import Image
+    with campo.open("rb") as f:
+        img = Image.open(BytesIO(f.read())).convert("RGB")
+    buf = BytesIO()
+    img.save(buf, format="PDF")
+    datos = buf.getvalue()
+    _escribir(ruta, datos)
+    return datos
@@ -0,0 +1,139 @@
+"""
+Directorio público de docentes precalculado (TeacherDirectoryEntry).
+
+/catalogs/public/teachers es anónimo y recorría en cada visita TODAS las
+secciones de la historia (con curso, plan y carrera) para saber el período
+más reciente y los cursos de cada docente, y recién después filtraba por
+curso y especialidad en Python: la página de transparencia se volvía más
+cara con cada semestre acumulado. Ahora cada docente tiene su fila:
+
+    actualizar(teacher_ids)     # recalcula esas filas (2 consultas por tanda)
+    reconstruir()               # todo el directorio (manage.py rebuild_teacher_directory)
+
+y la vista filtra y pagina contra la tabla. Las señales
+(catalogs/signals.py) marcan al docente cuando cambian sus secciones, su
+ficha, su usuario o sus ítems de CV; la actualización corre al confirmar la
+transacción, una vez por docente aunque se guarden muchas secciones.
+Renombrar un curso o una carrera no se sigue por señales: para eso está el
+comando.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import Count
+
+from catalogs.models import Teacher, TeacherDirectoryEntry
+
+CHUNK = 500
+
+_local = threading.local()
+
+
+def _tramos(ids):
+    ids = list(ids)
+    for i in range(0, len(ids), CHUNK):
+        yield ids[i:i + CHUNK]
+
+
+def _cargas(user_ids):
+    """{user_id: (período más reciente, cursos, carreras)} desde las secciones."""
+    from academic.models import Section
+
+    por_user = {}
+    filas = (Section.objects
+             .filter(teacher__user_id__in=user_ids)
+             .values_list("teacher__user_id", "period",
+                          "plan_course__display_name", "plan_course__course__name",
+                          "plan_course__plan__career__name"))
+    for uid, per, display, curso, carrera in filas:
+        per = per or ""
+        actual = por_user.get(uid)
+        if actual is None or per > actual[0]:
+            actual = por_user[uid] = (per, set(), set())
+        elif per < actual[0]:
+            continue
+        nombre = display or curso or ""
+        if nombre:
+            actual[1].add(nombre)
+        if carrera:
+            actual[2].add(carrera)
+    return por_user
+
+
+def _fila(t, carga):
+    """TeacherDirectoryEntry del docente, o None si no va en el directorio."""
+    nombre = ((getattr(t.user, "full_name", "") or "").strip()
+              or (t.full_name or "").strip())
+    if not nombre:
+        return None
+    periodo, cursos, carreras = carga or ("", set(), set())
+    cursos, carreras = sorted(cursos), sorted(carreras)
+    especialidad = (t.specialization or "").strip() or " / ".join(carreras)
+    return TeacherDirectoryEntry(
+        teacher_id=t.id,
+        nombre=nombre.upper()[:200],
+        dni=t.document or "",
+        grado=t.grado_academico or "",
+        especialidad=especialidad[:500],
+        periodo=periodo,
+        cursos=cursos,
+        carreras=carreras,
+        cursos_busqueda="\n".join(c.lower() for c in cursos),
+        especialidad_busqueda="\n".join(s.lower() for s in [especialidad, *carreras]),
+        cv_items=t.n_cv,
+    )
+
+
+_CAMPOS = ["nombre", "dni", "grado", "especialidad", "periodo", "cursos", "carreras",
+           "cursos_busqueda", "especialidad_busqueda", "cv_items"]
+
+
+def actualizar(teacher_ids):
+    """Recalcula las filas de esos docentes (las borra si ya no van). Retorna cuántas quedan."""
+    n = 0
+    for tramo in _tramos(set(teacher_ids)):
+        teachers = list(Teacher.objects.filter(id__in=tramo, user__isnull=False)
+                        .select_related("user").annotate(n_cv=Count("cv_items")))
+        cargas = _cargas({t.user_id for t in teachers})
+        filas = [f for f in (_fila(t, cargas.get(t.user_id)) for t in teachers) if f]
+        with transaction.atomic():
+            TeacherDirectoryEntry.objects.filter(teacher_id__in=tramo).exclude(
+                teacher_id__in=[f.teacher_id for f in filas]).delete()
+            TeacherDirectoryEntry.objects.bulk_create(
+                filas, update_conflicts=True, unique_fields=["teacher"], update_fields=_CAMPOS)
+        n += len(filas)
+    return n
+
+
+def reconstruir():
+    """Todo el directorio desde cero. Retorna el número de filas."""
+    ids = list(Teacher.objects.values_list("id", flat=True))
+    TeacherDirectoryEntry.objects.exclude(teacher_id__in=ids).delete()
+    return actualizar(ids)
+
+
+# ── Señales ──────────────────────────────────────────────────
+
+def _flush():
+    pend = getattr(_local, "teachers", None)
+    _local.teachers = set()
+    if pend:
+        actualizar(pend)
+
+
+def marcar(teacher_ids):
+    """Agenda la actualización de esos docentes para cuando se confirme la transacción."""
+    ids = {t for t in teacher_ids if t}
+    if not ids:
+        return
+    if getattr(_local, "teachers", None) is None:
+        _local.teachers = set()
+    _local.teachers |= ids
+    transaction.on_commit(_flush)
+
+
+def marcar_usuarios(user_ids):
+    """Docentes (fichas de catálogo) de esos usuarios."""
+    user_ids = [u for u in user_ids if u]
+    if user_ids:
+        marcar(Teacher.objects.filter(user_id__in=user_ids).values_list("id", flat=True))
@@ -0,0 +1,22 @@
+"""
+rebuild_teacher_directory — recalcula el directorio público de docentes
+(TeacherDirectoryEntry) desde las secciones, las fichas y los ítems de CV.
+
+Las señales lo mantienen al guardar; este comando es para la primera carga,
+para después de renombrar cursos o carreras, y tras cargas que se saltan
+save() (queryset.update, SQL directo).
+
+Uso:
+    python manage.py rebuild_teacher_directory
+"""
+from django.core.management.base import BaseCommand
+
+from catalogs.directorio_docentes import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula el directorio público de docentes."
+
+    def handle(self, *args, **opts):
+        n = reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"Directorio de docentes: {n} fila(s)."))
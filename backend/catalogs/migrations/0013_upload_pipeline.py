@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:06
+
+import common.imagenes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0012_cv_item_textos_largos'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mediaasset',
+            name='file',
+            field=models.FileField(storage=common.imagenes.almacen, upload_to='institution/'),
+        ),
+    ]
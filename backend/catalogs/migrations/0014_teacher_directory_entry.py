@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-19 03:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0013_upload_pipeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeacherDirectoryEntry',
+            fields=[
+                ('teacher', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='directorio', serialize=False, to='catalogs.teacher')),
+                ('nombre', models.CharField(db_index=True, max_length=200)),
+                ('dni', models.CharField(blank=True, db_index=True, default='', max_length=30)),
+                ('grado', models.CharField(blank=True, db_index=True, default='', max_length=20)),
+                ('especialidad', models.CharField(blank=True, default='', max_length=500)),
+                ('periodo', models.CharField(blank=True, default='', max_length=20)),
+                ('cursos', models.JSONField(default=list)),
+                ('carreras', models.JSONField(default=list)),
+                ('cursos_busqueda', models.TextField(blank=True, default='')),
+                ('especialidad_busqueda', models.TextField(blank=True, default='')),
+                ('cv_items', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['nombre', 'teacher_id'],
+            },
+        ),
+    ]
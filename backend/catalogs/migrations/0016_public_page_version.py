@@ -0,0 +1,20 @@
+# Generated by Django 5.2.10 on 2026-10-19 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0015_table_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicPageVersion',
+            fields=[
+                ('key', models.CharField(max_length=120, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
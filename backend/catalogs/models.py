@@ -2,6 +2,8 @@
 from django.conf import settings
 from django.db import models, IntegrityError
 
+from common.imagenes import almacen
+
 class Period(models.Model):
     TERM_CHOICES = (
         ("I", "I"),
@@ -194,7 +196,7 @@ class InstitutionSetting(models.Model):
 class MediaAsset(models.Model):
     # ✅ LOGO | LOGO_ALT | SIGNATURE (views ya lo acepta)
     kind = models.CharField(max_length=40)
-    file = models.FileField(upload_to="institution/")
+    file = models.FileField(upload_to="institution/", storage=almacen)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
 
@@ -288,3 +290,55 @@ class TeacherCVItem(models.Model):
 
     def __str__(self):
         return f"CV<{self.teacher_id}:{self.seccion}:{self.titulo[:30]}>"
+
+
+class TeacherDirectoryEntry(models.Model):
+    """Fila del directorio público de docentes (catalogs/directorio_docentes.py).
+
+    Lo que muestra y filtra /catalogs/public/teachers, mantenido por señales
+    al cambiar las secciones, la ficha o los ítems de CV del docente: el
+    período más reciente con carga, sus cursos y carreras, y las columnas de
+    búsqueda (en minúsculas) para filtrar por curso / especialidad en SQL.
+    """
+    teacher = models.OneToOneField(Teacher, on_delete=models.CASCADE,
+                                   primary_key=True, related_name="directorio")
+    nombre = models.CharField(max_length=200, db_index=True)
+    dni = models.CharField(max_length=30, blank=True, default="", db_index=True)
+    grado = models.CharField(max_length=20, blank=True, default="", db_index=True)
+    especialidad = models.CharField(max_length=500, blank=True, default="")
+    periodo = models.CharField(max_length=20, blank=True, default="")
+    cursos = models.JSONField(default=list)
+    carreras = models.JSONField(default=list)
+    cursos_busqueda = models.TextField(blank=True, default="")
+    especialidad_busqueda = models.TextField(blank=True, default="")
+    cv_items = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["nombre", "teacher_id"]
+
+    def __str__(self):
+        return f"Directorio<{self.teacher_id}:{self.nombre}>"
+
+
+class TableVersion(models.Model):
+    """Contador de cambios por tabla para el GET condicional (common/condicional.py).
+
+    Las señales lo incrementan una vez por transacción al guardar o borrar
+    filas de las tablas rastreadas; el ETag de un listado sale de las
+    versiones de las tablas que muestra y se compara sin correr el queryset.
+    """
+    label = models.CharField(max_length=100, primary_key=True)   # "academic.section"
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+
+class PublicPageVersion(models.Model):
+    """Versión de las páginas públicas cacheadas de una clave (common/public_cache.py).
+
+    `key` es "<ns>:<hash del identificador>" o "*" para todas. Vive en la
+    base (no en el cache) para que una invalidación en un worker la vean
+    todos los demás.
+    """
+    key = models.CharField(max_length=120, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
@@ -0,0 +1,109 @@
+"""
+1) Los datos institucionales (nombre, logo) salen en todas las páginas
+   públicas de verificación: al cambiarlos se invalida todo ese cache.
+
+2) Mantienen el directorio público de docentes precalculado
+   (catalogs/directorio_docentes.py) cuando cambian las secciones que dicta
+   un docente, su ficha, su usuario o sus ítems de hoja de vida, o cuando se
+   borra su usuario (el SET_NULL de Teacher.user no dispara post_save).
+
+3) Limpian los PDF de hoja de vida cacheados (catalogs/cache_cv.py) cuando
+   cambian la ficha o los ítems del docente. La clave del cache ya cambia
+   sola; esto solo evita dejar PDFs viejos en disco.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from academic.models import Section
+from academic.models import Teacher as AcademicTeacher
+from common.public_cache import invalidar_todo
+
+from . import cache_cv, directorio_docentes
+from .models import InstitutionSetting, Teacher, TeacherCVItem
+
+
+@receiver(post_save, sender=InstitutionSetting, dispatch_uid="catalogs_public_pages_cache")
+def _institution_changed(sender, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(invalidar_todo)
+
+
+# ── Directorio público de docentes ──────────────────────────
+
+def _usuarios_de(academic_teacher_ids):
+    ids = [i for i in academic_teacher_ids if i]
+    if not ids:
+        return []
+    return list(AcademicTeacher.objects.filter(id__in=ids).values_list("user_id", flat=True))
+
+
+@receiver(pre_save, sender=Section, dispatch_uid="catalogs_directorio_section_pre")
+def _section_pre(sender, instance, raw=False, **kwargs):
+    # Si la sección cambia de docente, el anterior también se recalcula
+    instance._teacher_previo = None
+    if not raw and instance.pk:
+        instance._teacher_previo = (Section.objects.filter(pk=instance.pk)
+                                    .values_list("teacher_id", flat=True).first())
+
+
+@receiver([post_save, post_delete], sender=Section, dispatch_uid="catalogs_directorio_section")
+def _section_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    directorio_docentes.marcar_usuarios(
+        _usuarios_de({instance.teacher_id, getattr(instance, "_teacher_previo", None)}))
+
+
+@receiver(post_save, sender=AcademicTeacher, dispatch_uid="catalogs_directorio_academic_teacher")
+def _academic_teacher_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        directorio_docentes.marcar_usuarios([instance.user_id])
+
+
+@receiver(post_save, sender=Teacher, dispatch_uid="catalogs_directorio_teacher")
+def _teacher_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        directorio_docentes.marcar([instance.id])
+        transaction.on_commit(lambda: cache_cv.invalidar(instance))
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid="catalogs_directorio_user")
+def _user_changed(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    # Un usuario nuevo aún no tiene ficha; el login guarda solo last_login
+    if raw or created or (update_fields is not None and "full_name" not in update_fields):
+        return
+    directorio_docentes.marcar_usuarios([instance.id])
+
+
+@receiver(pre_delete, sender=get_user_model(), dispatch_uid="catalogs_directorio_user_pre_del")
+def _user_deleting(sender, instance, **kwargs):
+    # Después del borrado la ficha ya no apunta al usuario: se resuelve antes
+    instance._docentes_directorio = list(
+        Teacher.objects.filter(user_id=instance.pk).values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=get_user_model(), dispatch_uid="catalogs_directorio_user_del")
+def _user_deleted(sender, instance, **kwargs):
+    directorio_docentes.marcar(getattr(instance, "_docentes_directorio", ()))
+
+
+@receiver(post_save, sender=TeacherCVItem, dispatch_uid="catalogs_directorio_cv_item")
+def _cv_item_saved(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+    if created:
+        directorio_docentes.marcar([instance.teacher_id])
+    _limpiar_cv(instance)
+
+
+@receiver(post_delete, sender=TeacherCVItem, dispatch_uid="catalogs_directorio_cv_item_del")
+def _cv_item_deleted(sender, instance, **kwargs):
+    directorio_docentes.marcar([instance.teacher_id])
+    _limpiar_cv(instance)
+
+
+def _limpiar_cv(item):
+    teacher = Teacher(pk=item.teacher_id)
+    transaction.on_commit(lambda: cache_cv.invalidar(teacher))
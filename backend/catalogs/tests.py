@@ -1,3 +1,188 @@
+import os
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from academic.models import Course, Plan, PlanCourse, Section
+from academic.models import Teacher as AcademicTeacher
+
+from .models import Career, Teacher, TeacherCVItem, TeacherDirectoryEntry
+
+User = get_user_model()
+
+
+class DirectorioDocentesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        inicial = Plan.objects.create(career=Career.objects.create(name="Educación Inicial", code="EI"),
+                                      name="Plan 2020")
+        cls.pc_viejo = PlanCourse.objects.create(plan=inicial, semester=1, credits=3,
+                                                 course=Course.objects.create(code="C1", name="Psicomotricidad"))
+        cls.pc_nuevo = PlanCourse.objects.create(plan=inicial, semester=2, credits=3,
+                                                 course=Course.objects.create(code="C2", name="Arte Infantil"))
+
+    def _docente(self, username, nombre, **kw):
+        u = User.objects.create_user(username, f"{username}@t.pe", "x", full_name=nombre)
+        with self.captureOnCommitCallbacks(execute=True):
+            t = Teacher.objects.create(user=u, document=username, **kw)
+        return u, t
+
+    def _listar(self, **params):
+        r = APIClient().get("/api/catalogs/public/teachers", params)
+        self.assertEqual(r.status_code, 200)
+        return r.data
+
+    def test_fila_se_mantiene_con_secciones_y_cv(self):
+        u, t = self._docente("41000001", "Rosa Quispe", grado_academico="MAESTRO")
+        with self.captureOnCommitCallbacks(execute=True):
+            at = AcademicTeacher.objects.create(user=u)
+            Section.objects.create(plan_course=self.pc_viejo, teacher=at, period="2025-II")
+            sec = Section.objects.create(plan_course=self.pc_nuevo, teacher=at, period="2026-I")
+            TeacherCVItem.objects.create(teacher=t, seccion="FORMACION", titulo="Maestría")
+
+        e = TeacherDirectoryEntry.objects.get(teacher=t)
+        self.assertEqual((e.nombre, e.periodo, e.cursos, e.cv_items),
+                         ("ROSA QUISPE", "2026-I", ["Arte Infantil"], 1))
+        self.assertEqual(e.especialidad, "Educación Inicial")
+
+        # La sección pasa a otro docente: el directorio vuelve al período anterior
+        _u2, _t2 = self._docente("41000002", "Ana Rojas")
+        with self.captureOnCommitCallbacks(execute=True):
+            sec.teacher = AcademicTeacher.objects.create(user=_u2)
+            sec.save()
+        e.refresh_from_db()
+        self.assertEqual((e.periodo, e.cursos), ("2025-II", ["Psicomotricidad"]))
+
+    def test_filtros_y_paginacion_en_sql(self):
+        for i, nombre in enumerate(["Carla Díaz", "Beto Arce", "Ana Ruiz"]):
+            u, _t = self._docente(f"4200000{i}", nombre)
+            with self.captureOnCommitCallbacks(execute=True):
+                Section.objects.create(plan_course=self.pc_viejo if i else self.pc_nuevo,
+                                       teacher=AcademicTeacher.objects.create(user=u), period="2026-I")
+
+        d = self._listar(curso="psicomo")
+        self.assertEqual([r["nombre"] for r in d["rows"]], ["ANA RUIZ", "BETO ARCE"])
+        d = self._listar(especialidad="inicial", page=2, page_size=2)
+        self.assertEqual((d["total"], d["page"], [r["nombre"] for r in d["rows"]]), (3, 2, ["CARLA DÍAZ"]))
+
+    def test_borrar_el_usuario_saca_al_docente(self):
+        u, t = self._docente("43100001", "Rosa Quispe")
+        u2, t2 = self._docente("43100002", "Ana Rojas")
+        self.assertEqual(TeacherDirectoryEntry.objects.count(), 2)
+
+        # Teacher.user es SET_NULL: Django lo aplica con un update, sin post_save
+        with self.captureOnCommitCallbacks(execute=True):
+            u.delete()
+        self.assertFalse(TeacherDirectoryEntry.objects.filter(teacher=t).exists())
+        self.assertEqual([r["nombre"] for r in self._listar()["rows"]], ["ANA ROJAS"])
+
+        from users.services import purgar
+        with self.captureOnCommitCallbacks(execute=True):
+            purgar([u2.id])
+        self.assertFalse(TeacherDirectoryEntry.objects.exists())
+
+
+def _pdf_vacio():
+    from io import BytesIO
+
+    from pypdf import PdfWriter
+    w = PdfWriter()
+    w.add_blank_page(width=200, height=200)
+    buf = BytesIO()
+    w.write(buf)
+    return buf.getvalue()
+
+
+class CacheHojaVidaPdfTest(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from unittest import mock
+
+        from django.test import override_settings
+
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        ctx = override_settings(MEDIA_ROOT=self.media, CV_PDF_CACHE_DIR="")
+        ctx.enable()
+        self.addCleanup(ctx.disable)
+        self.render = mock.patch("academic.pdf_render.html_to_pdf_bytes", return_value=_pdf_vacio()).start()
+        self.addCleanup(mock.patch.stopall)
+
+        u = User.objects.create_user("43000001", "d@t.pe", "x", full_name="Rosa Quispe")
+        self.teacher = Teacher.objects.create(user=u, document="43000001")
+
+    def _bajar(self, **headers):
+        r = APIClient().get(f"/api/catalogs/public/teachers/{self.teacher.id}/cv.pdf", **headers)
+        body = b"".join(r.streaming_content) if r.streaming else r.content
+        return r, body
+
+    def test_descarga_repetida_sale_del_cache_con_etag(self):
+        from django.core.files.base import ContentFile
+        from PIL import Image
+
+        img = BytesIO()
+        Image.new("RGB", (20, 20), "red").save(img, format="PNG")
+        with self.captureOnCommitCallbacks(execute=True):
+            it = TeacherCVItem(teacher=self.teacher, seccion="FORMACION", titulo="Maestría")
+            it.archivo.save("titulo.png", ContentFile(img.getvalue()))
+
+        r1, pdf1 = self._bajar()
+        self.assertEqual(r1.status_code, 200)
+        self.assertTrue(pdf1.startswith(b"%PDF"))
+        r2, pdf2 = self._bajar()
+        self.assertEqual((self.render.call_count, r2["ETag"], pdf2), (1, r1["ETag"], pdf1))
+        self.assertEqual(self._bajar(HTTP_IF_NONE_MATCH=r1["ETag"])[0].status_code, 304)
+
+        # La imagen anexa se convirtió una sola vez y se reutiliza
+        anexos = os.path.join(self.media, "cache", "cv", "anexos")
+        self.assertEqual(sum(len(fs) for _r, _d, fs in os.walk(anexos)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TeacherCVItem.objects.create(teacher=self.teacher, seccion="MERITO", titulo="Resolución")
+        r3, _pdf = self._bajar()
+        self.assertNotEqual(r3["ETag"], r1["ETag"])
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(sum(len(fs) for _r, _d, fs in os.walk(anexos)), 1)
+
+
+class BorrarMediaCompartidaTest(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        from django.test import override_settings
+
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        ctx = override_settings(MEDIA_ROOT=self.media)
+        ctx.enable()
+        self.addCleanup(ctx.disable)
+
+    def test_no_borra_el_archivo_que_usa_otro_asset(self):
+        from django.core.files.base import ContentFile
+        from PIL import Image
+
+        from .models import InstitutionSetting, MediaAsset
+
+        def foto():
+            buf = BytesIO()
+            Image.new("RGB", (40, 40), (10, 120, 10)).save(buf, "PNG")
+            return ContentFile(buf.getvalue(), name="logo.png")
+
+        logo = MediaAsset.objects.create(kind="LOGO", file=foto())
+        firma = MediaAsset.objects.create(kind="SIGNATURE", file=foto())
+        self.assertEqual(logo.file.name, firma.file.name)
+        InstitutionSetting.objects.create(pk=1, data={"logo_url": f"http://testserver/media/{logo.file.name}"})
+        c = APIClient()
+        c.force_authenticate(User.objects.create_user("44000001", "a@t.pe", "x"))
+
+        r = c.delete("/api/catalogs/institution/media/LOGO")
+        self.assertEqual(r.status_code, 200)
+        self.assertFalse(MediaAsset.objects.filter(kind="LOGO").exists())
+        self.assertTrue(os.path.exists(firma.file.path))
 
-# Create your tests here.
+        c.delete("/api/catalogs/institution/media/SIGNATURE")
+        self.assertFalse(os.path.exists(firma.file.path))
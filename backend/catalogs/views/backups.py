@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.management import call_command
-from django.http import Http404, FileResponse
+from django.http import Http404
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -16,6 +16,7 @@ from rest_framework.response import Response
 
 from catalogs.models import BackupExport
 from catalogs.serializers import BackupExportSerializer
+from common.entrega import entregar
 from .utils import _require_staff, _csv_bytes
 
 # ── Imports por módulo (lazy-safe) ──
@@ -196,11 +197,8 @@ def backup_download(request, id: int):
     if not b.file:
         raise Http404
     
-    return FileResponse(
-        b.file.open("rb"),
-        as_attachment=True,
-        filename=os.path.basename(b.file.name)
-    )
+    # Los backups pesan cientos de MB: la transferencia la hace nginx
+    return entregar(b.file, as_attachment=True)
 
 
 @api_view(["DELETE"])
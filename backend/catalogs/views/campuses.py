@@ -5,6 +5,7 @@ from rest_framework import viewsets, permissions
 
 from catalogs.models import Campus
 from catalogs.serializers import CampusSerializer
+from common.condicional import condicional
 from .utils import list_items
 
 
@@ -14,5 +15,6 @@ class CampusesViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     http_method_names = ["get", "post", "patch", "delete"]
     
+    @condicional("catalogs.Campus")
     def list(self, request, *args, **kwargs):
         return list_items(self.serializer_class, self.get_queryset())
\ No newline at end of file
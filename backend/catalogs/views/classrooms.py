@@ -5,6 +5,7 @@ from rest_framework import viewsets, permissions
 
 from catalogs.models import Classroom
 from catalogs.serializers import ClassroomSerializer
+from common.condicional import condicional
 from .utils import list_items
 
 
@@ -23,5 +24,6 @@ class ClassroomsViewSet(viewsets.ModelViewSet):
             return qs.order_by("campus__name", "code")
         return qs.order_by("campus__name", "id")
     
+    @condicional("catalogs.Classroom", "catalogs.Campus")
     def list(self, request, *args, **kwargs):
         return list_items(self.serializer_class, self.get_queryset())
\ No newline at end of file
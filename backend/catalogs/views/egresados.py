@@ -18,6 +18,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from common.busqueda import filtrar_terminos
 from graduates.models import Graduate
 
 
@@ -44,11 +45,7 @@ def egresados_list(request):
 
     search = request.query_params.get("search", "").strip()
     if search:
-        for term in search.upper().split():
-            if len(term) >= 2:
-                qs = qs.filter(
-                    Q(apellidos_nombres__icontains=term) | Q(dni__icontains=term)
-                )
+        qs = filtrar_terminos(qs, search, minimo=2)
 
     sustentado = request.query_params.get("sustentado", "").strip()
     if sustentado == "1":
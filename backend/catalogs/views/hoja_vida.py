@@ -263,12 +263,47 @@ class TeacherCVPdfView(APIView):
         return self._emitir(ct, request)
 
     def _emitir(self, ct, request):
+        """PDF del CV desde el cache en disco (catalogs/cache_cv.py), con ETag."""
+        from django.utils.cache import get_conditional_response
+        from catalogs import cache_cv
+        from common.entrega import entregar
+
+        items = _items_ordenados(ct)
+        u = ct.user
+        nombre = ((getattr(u, "full_name", "") or "").strip()
+                  or (ct.full_name or "").strip()
+                  or (u.username if u else ""))
+        documentado = str(request.query_params.get("documentado", "1")).lower() \
+            not in ("0", "false", "no")
+
+        clave = cache_cv.huella(ct, items, documentado)
+        etag = cache_cv.etag(clave)
+        resp = get_conditional_response(request, etag=etag)
+        if resp is None:
+            try:
+                ruta = cache_cv.obtener(ct, clave, documentado,
+                                        lambda: self._renderizar(ct, items, nombre, documentado))
+            except Exception as exc:
+                return Response({"detail": f"No se pudo generar el PDF: {exc}"},
+                                status=500)
+
+            # ?inline=1 → el navegador lo abre en su visor en vez de
+            # descargarlo (lo usa la vista previa de la plana docente).
+            inline = str(request.query_params.get("inline", "")).lower() in ("1", "true", "si")
+            resp = entregar(ruta, filename=_cv_filename(nombre, ct),
+                            content_type="application/pdf", as_attachment=not inline)
+        resp["ETag"] = etag
+        # El navegador revalida siempre (barato: 304 mientras el CV no cambie)
+        resp["Cache-Control"] = "private, max-age=0, must-revalidate"
+        return resp
+
+    def _renderizar(self, ct, items, nombre, documentado):
+        """Bytes del PDF: parte descriptiva y, si `documentado`, los anexos."""
         from html import escape as esc
         from academic.pdf_render import html_to_pdf_bytes
         from academic.views.acta_excel import _acta_area_inst
         from academic.views.evaluation_pdf import _logo_datauris
 
-        items = _items_ordenados(ct)
         inst = _acta_area_inst()
         logo, logo2 = _logo_datauris()
 
@@ -284,10 +319,6 @@ class TeacherCVPdfView(APIView):
                         base64.b64encode(fh.read()).decode())
         except Exception:
             foto_uri = ""
-        u = ct.user
-        nombre = ((getattr(u, "full_name", "") or "").strip()
-                  or (ct.full_name or "").strip()
-                  or (u.username if u else ""))
         hoy = timezone.localtime(timezone.now())
 
         # ── I. Datos personales (perfil de postulante docente) ──
@@ -442,28 +473,12 @@ Tarma, {hoy.strftime('%d/%m/%Y')}</p>
 {cierre}
 </body></html>"""
 
-        try:
-            pdf = html_to_pdf_bytes(html)
-        except Exception as exc:
-            return Response({"detail": f"No se pudo generar el PDF: {exc}"},
-                            status=500)
+        pdf = html_to_pdf_bytes(html)
 
         # ── Parte DOCUMENTADA: anexar los archivos que acreditan ──
-        documentado = str(request.query_params.get("documentado", "1")).lower() \
-            not in ("0", "false", "no")
         if documentado and anexos:
             pdf = self._anexar_documentos(pdf, anexos)
-
-        # ?inline=1 → el navegador lo abre en su visor en vez de
-        # descargarlo (lo usa la vista previa de la plana docente).
-        modo = "inline" if str(
-            request.query_params.get("inline", "")
-        ).lower() in ("1", "true", "si") else "attachment"
-
-        return HttpResponse(
-            pdf, content_type="application/pdf",
-            headers={"Content-Disposition":
-                     f'{modo}; filename="{_cv_filename(nombre, ct)}"'})
+        return pdf
 
     @staticmethod
     def _anexar_documentos(pdf_base: bytes, anexos):
@@ -473,6 +488,7 @@ Tarma, {hoy.strftime('%d/%m/%Y')}</p>
         sin anexos (instalar con: pip install pypdf).
         """
         from io import BytesIO
+        from catalogs import cache_cv
         try:
             from pypdf import PdfReader, PdfWriter
         except ImportError:
@@ -487,20 +503,11 @@ Tarma, {hoy.strftime('%d/%m/%Y')}</p>
 
         for _titulo, it in anexos:
             try:
-                nombre = (it.archivo.name or "").lower()
-                with it.archivo.open("rb") as f:
-                    data = f.read()
-                if nombre.endswith(".pdf"):
+                # Imágenes: convertidas una sola vez por archivo (cache_cv)
+                data = cache_cv.pdf_anexo(it.archivo)
+                if data:
                     for page in PdfReader(BytesIO(data)).pages:
                         writer.add_page(page)
-                elif nombre.endswith((".jpg", ".jpeg", ".png")):
-                    from PIL import Image
-                    img = Image.open(BytesIO(data)).convert("RGB")
-                    buf = BytesIO()
-                    img.save(buf, format="PDF")
-                    for page in PdfReader(BytesIO(buf.getvalue())).pages:
-                        writer.add_page(page)
-                # otros formatos: se omiten en silencio del anexo
             except Exception:
                 continue
 
@@ -515,96 +522,83 @@ Tarma, {hoy.strftime('%d/%m/%Y')}</p>
 
 class TeacherCVPublicListView(APIView):
     """
-    GET /catalogs/public/teachers?dni=&grado=&especialidad=&curso=
+    GET /catalogs/public/teachers?dni=&grado=&especialidad=&curso=&page=&page_size=
     Directorio PÚBLICO (sin login) de los docentes: foto, nombres, grado
     académico, especialidad y cursos del período. Sin filtros lista a TODOS
     (los docentes son servidores públicos; MINEDU pide su hoja de vida en
     acceso público, al estilo de su propio directorio).
+
+    Lee el directorio precalculado (TeacherDirectoryEntry, ver
+    catalogs/directorio_docentes.py): filtros y paginación en SQL. Sin
+    `page` responde todas las filas, como antes.
     """
     authentication_classes = []
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        from django.db.models import Count
+        from catalogs import directorio_docentes
+        from catalogs.models import TeacherDirectoryEntry
+        if not TeacherDirectoryEntry.objects.exists():
+            directorio_docentes.reconstruir()   # primera visita tras migrar
         q = request.query_params
         dni = (q.get("dni") or "").strip()
         grado = (q.get("grado") or "").strip().upper()
         espec = (q.get("especialidad") or "").strip().lower()
         curso = (q.get("curso") or "").strip().lower()
 
-        qs = (Teacher.objects.select_related("user")
-              .filter(user__isnull=False)
-              .annotate(n_cv=Count("cv_items"))
-              .order_by("user__full_name", "full_name", "id"))
+        qs = (TeacherDirectoryEntry.objects.select_related("teacher")
+              .order_by("nombre", "teacher_id"))
         if dni:
-            qs = qs.filter(document__icontains=dni)
+            qs = qs.filter(dni__icontains=dni)
         if grado:
-            qs = qs.filter(grado_academico=grado)
-
-        # Cursos y carreras que dicta cada docente en su período más reciente
-        # (para mostrar y para los filtros por curso/especialidad)
-        from academic.models import Section
-        por_user = {}
-        secs = (Section.objects
-                .filter(teacher__user__isnull=False)
-                .select_related("teacher", "plan_course__course",
-                                "plan_course__plan__career"))
-        for s in secs:
-            uid = s.teacher.user_id
-            d = por_user.setdefault(uid, {})
-            per = s.period or ""
-            info = d.setdefault(per, {"cursos": set(), "carreras": set()})
-            if s.plan_course:
-                info["cursos"].add(s.plan_course.effective_name or "")
-                if s.plan_course.plan and s.plan_course.plan.career:
-                    info["carreras"].add(s.plan_course.plan.career.name)
+            qs = qs.filter(grado=grado)
+        if curso:
+            qs = qs.filter(cursos_busqueda__contains=curso)
+        if espec:
+            qs = qs.filter(especialidad_busqueda__contains=espec)
+
+        total = qs.count()
+        page = page_size = None
+        if q.get("page"):
+            try:
+                page = max(1, int(q.get("page")))
+                page_size = min(200, max(1, int(q.get("page_size") or 24)))
+            except (TypeError, ValueError):
+                page, page_size = 1, 24
+            qs = qs[(page - 1) * page_size: page * page_size]
 
+        grados = dict(Teacher.GRADOS_ACADEMICOS)
         rows = []
-        for t in qs:
-            u = t.user
-            nombre = ((getattr(u, "full_name", "") or "").strip()
-                      or (t.full_name or "").strip())
-            if not nombre:
-                continue
-            pers = por_user.get(t.user_id, {})
-            per_max = max(pers.keys()) if pers else ""
-            cursos = sorted(c for c in pers.get(per_max, {}).get("cursos", set()) if c)
-            carreras = sorted(pers.get(per_max, {}).get("carreras", set()))
-            especialidad = (t.specialization or "").strip() or " / ".join(carreras)
-
-            if curso and not any(curso in c.lower() for c in cursos):
-                continue
-            if espec and espec not in especialidad.lower() \
-                    and not any(espec in c.lower() for c in carreras):
-                continue
-
+        for e in qs:
             foto = ""
             try:
-                if t.photo:
-                    foto = request.build_absolute_uri(t.photo.url)
+                if e.teacher.photo:
+                    foto = request.build_absolute_uri(e.teacher.photo.url)
             except Exception:
                 foto = ""
             rows.append({
-                "id": t.id,
-                "nombre": nombre.upper(),
-                "dni": t.document or "",
+                "id": e.teacher_id,
+                "nombre": e.nombre,
+                "dni": e.dni,
                 "foto_url": foto,
-                "grado": t.grado_academico or "",
-                "grado_label": dict(Teacher.GRADOS_ACADEMICOS).get(
-                    t.grado_academico, ""),
-                "especialidad": especialidad,
-                "cursos": cursos,
-                "carreras": carreras,
-                "periodo": per_max,
-                "cv_items": t.n_cv,
+                "grado": e.grado,
+                "grado_label": grados.get(e.grado, ""),
+                "especialidad": e.especialidad,
+                "cursos": e.cursos,
+                "carreras": e.carreras,
+                "periodo": e.periodo,
+                "cv_items": e.cv_items,
             })
 
-        return Response({
-            "total": len(rows),
+        out = {
+            "total": total,
             "grados": [{"value": v, "label": l}
                        for v, l in Teacher.GRADOS_ACADEMICOS],
             "rows": rows,
-        })
+        }
+        if page:
+            out.update(page=page, page_size=page_size)
+        return Response(out)
 
 
 class TeacherCVPublicPdfView(APIView):
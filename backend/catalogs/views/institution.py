@@ -1,8 +1,6 @@
 """
 Institution Settings y Media Assets
 """
-import os
-from django.conf import settings
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
@@ -10,6 +8,7 @@ from rest_framework.response import Response
 
 from catalogs.models import InstitutionSetting, MediaAsset
 from catalogs.serializers import MediaAssetSerializer
+from common.imagenes import almacen
 
 # ── Kinds válidos ─────────────────────────────────────────────
 VALID_MEDIA_KINDS = (
@@ -143,22 +142,22 @@ def institution_media_delete(request, kind: str):
     try:
         asset = MediaAsset.objects.filter(kind=kind).order_by("-id").first()
         if asset:
+            nombre = asset.file.name
+            asset.delete()
             try:
-                if asset.file:
-                    asset.file.delete(save=False)
+                if nombre:
+                    asset.file.storage.delete(nombre)
             except Exception:
                 pass
-            asset.delete()
     except Exception:
         pass
 
-    # Borrar archivo físico si apunta a /media/
+    # Borrar archivo físico si apunta a /media/ (vía storage: los archivos
+    # por contenido pueden estar compartidos con otras filas)
     try:
         if url and isinstance(url, str) and "/media/" in url:
             rel = url.split("/media/")[-1]
-            fpath = os.path.join(settings.MEDIA_ROOT, rel)
-            if os.path.exists(fpath):
-                os.remove(fpath)
+            almacen().delete(rel)
     except Exception:
         pass
 
@@ -12,6 +12,7 @@ from rest_framework.response import Response
 
 from catalogs.models import Period
 from catalogs.serializers import PeriodSerializer
+from common.condicional import condicional
 from .utils import list_items
 
 logger = logging.getLogger(__name__)
@@ -100,6 +101,7 @@ class PeriodsViewSet(viewsets.ModelViewSet):
             return qs.order_by("-start_date")
         return qs.order_by("-id")
 
+    @condicional("catalogs.Period")
     def list(self, request, *args, **kwargs):
         return list_items(self.serializer_class, self.get_queryset())
 
@@ -10,6 +10,7 @@ from rest_framework.response import Response
 from catalogs.models import Teacher
 from catalogs.serializers import TeacherSerializer
 from acl.models import Role, UserRole
+from common.condicional import condicional
 from .utils import list_items
 
 User = get_user_model()
@@ -42,6 +43,7 @@ class TeachersViewSet(viewsets.ModelViewSet):
             qs = qs.filter(cond)
         return qs.order_by("user__full_name", "user__username", "id")
     
+    @condicional("catalogs.Teacher", "accounts.User", "acl.UserRole", "acl.Role")
     def list(self, request, *args, **kwargs):
         """
         Directorio de docentes: registros del catálogo (Teacher) + usuarios
@@ -21,6 +21,7 @@ from rest_framework.response import Response
 from openpyxl import load_workbook
 from openpyxl import Workbook
 
+from acl.authz import contexto
 from catalogs.models import Period, Career
 from academic.models import Course
 
@@ -448,11 +449,8 @@ def _require_staff_or_teacher(request):
     if getattr(request.user, "is_staff", False):
         return None
     
-    try:
-        if request.user.roles.filter(name__iexact="TEACHER").exists():
-            return None
-    except Exception:
-        pass
+    if contexto(request.user).tiene_alguno_iexact(["TEACHER"]):
+        return None
     
     return Response({"detail": "No autorizado."}, status=403)
 
@@ -0,0 +1,60 @@
+"""
+Texto de búsqueda normalizado (minúsculas, sin tildes, espacios simples).
+
+Los buscadores comparaban con `icontains` contra las columnas tal cual, así
+que "Nuñez" no encontraba "NUNEZ" y cada término recorría cinco columnas.
+Ahora cada modelo guarda una columna `search_text` ya normalizada e indexada
+y los filtros comparan contra esa sola columna.
+
+    texto_busqueda("Núñez", "QUISPE", "70707070")  → "nunez quispe 70707070"
+    filtrar_terminos(qs, "nuñez qui")              → AND de cada término
+"""
+import re
+import unicodedata
+
+_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar(texto) -> str:
+    """Minúsculas, sin diacríticos (la Ñ queda como N) y espacios simples."""
+    s = unicodedata.normalize("NFKD", str(texto or ""))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return _ESPACIOS.sub(" ", s).strip().lower()
+
+
+def texto_busqueda(*partes) -> str:
+    """Concatena y normaliza los campos buscables de un registro."""
+    return normalizar(" ".join(str(p or "") for p in partes))
+
+
+def terminos(q) -> list:
+    return [t for t in normalizar(q).split(" ") if t]
+
+
+def filtrar_terminos(qs, q, campo="search_text", minimo=1):
+    """AND de cada término contra la columna normalizada.
+
+    En PostgreSQL el `LIKE '%x%'` lo resuelve el índice trigram que crean
+    las migraciones; en SQLite es una sola columna corta en vez de cinco.
+    """
+    for t in terminos(q):
+        if len(t) >= minimo:
+            qs = qs.filter(**{f"{campo}__contains": t})
+    return qs
+
+
+def crear_indice_trigram(schema_editor, tabla, columna, nombre):
+    """Índice GIN trigram (solo PostgreSQL; en otros motores no hace nada)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS "{nombre}" ON "{tabla}" '
+        f'USING gin ("{columna}" gin_trgm_ops)'
+    )
+
+
+def borrar_indice_trigram(schema_editor, nombre):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS "{nombre}"')
@@ -0,0 +1,202 @@
+"""
+GET condicional (ETag / Last-Modified) para los listados de solo lectura.
+
+Cada refresco del SPA volvía a pedir los catálogos, los planes y sus cursos,
+las secciones del período, el contenido del portal o la lista de alumnos, y
+cada pedido corría las consultas y serializaba todo aunque nada hubiera
+cambiado. Ahora cada tabla rastreada tiene un contador de cambios
+(catalogs.TableVersion) que las señales incrementan una vez por transacción,
+y un listado declara de qué tablas depende:
+
+    @condicional("academic.Section", "academic.PlanCourse", ...)
+    def list(self, request, ...): ...
+
+El ETag sale de las versiones de esas tablas (una consulta indexada), de la
+URL con su query string y del usuario; si el navegador ya lo tiene, la
+respuesta es un 304 antes de tocar el queryset. Last-Modified es el último
+cambio de esas tablas.
+
+Las escrituras que se saltan las señales (queryset.update, bulk_create,
+bulk_update, SQL directo) deben avisar con `tocar(modelo, ...)`.
+"""
+import hashlib
+import threading
+from functools import wraps
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Tablas rastreadas (app_label.Model). Un listado (o un bloque de
+# `auditar_datos --incremental`) solo puede depender de estas.
+RASTREADAS = (
+    "accounts.User",
+    "acl.Permission",
+    "acl.Role",
+    "acl.RolePermission",
+    "acl.UserRole",
+    "catalogs.Campus",
+    "catalogs.Career",
+    "catalogs.Classroom",
+    "catalogs.Period",
+    "catalogs.Teacher",
+    "academic.AcademicGradeRecord",
+    "academic.AcademicPeriod",
+    "academic.AttendanceRow",
+    "academic.AttendanceSession",
+    "academic.Classroom",
+    "academic.Course",
+    "academic.CoursePrereq",
+    "academic.Enrollment",
+    "academic.EnrollmentItem",
+    "academic.Plan",
+    "academic.PlanCourse",
+    "academic.Section",
+    "academic.SectionScheduleSlot",
+    "academic.Teacher",
+    "portal.AdmissionCall",
+    "portal.Document",
+    "portal.NewsItem",
+    "portal.Page",
+    "students.Student",
+)
+
+# Guardados que no cambian ningún listado (p.ej. el last_login de cada ingreso)
+_IGNORAR = {"accounts.user": {"last_login"}}
+
+_local = threading.local()
+
+
+def _label(modelo) -> str:
+    if isinstance(modelo, str):
+        return apps.get_model(modelo)._meta.label_lower
+    return modelo._meta.label_lower
+
+
+def _rastreadas():
+    return {apps.get_model(m)._meta.label_lower for m in RASTREADAS}
+
+
+# ── Contadores ───────────────────────────────────────────────
+
+def _incrementar(labels):
+    from catalogs.models import TableVersion
+
+    labels = sorted(labels)
+    ahora = timezone.now()
+    TableVersion.objects.bulk_create([TableVersion(label=l) for l in labels],
+                                     ignore_conflicts=True)
+    TableVersion.objects.filter(label__in=labels).update(version=F("version") + 1,
+                                                         updated_at=ahora)
+
+
+def _flush():
+    pend = getattr(_local, "labels", None)
+    _local.labels = set()
+    if pend:
+        _incrementar(pend)
+
+
+def tocar(*modelos):
+    """Marca esas tablas como cambiadas al confirmar la transacción."""
+    labels = {_label(m) for m in modelos}
+    if not labels:
+        return
+    if getattr(_local, "labels", None) is None:
+        _local.labels = set()
+    _local.labels |= labels
+    transaction.on_commit(_flush)
+
+
+def versiones(modelos):
+    """(token, última modificación) de esas tablas, en una consulta."""
+    from catalogs.models import TableVersion
+
+    labels = sorted({_label(m) for m in modelos})
+    filas = dict.fromkeys(labels, (0, None))
+    filas.update({l: (v, u) for l, v, u in TableVersion.objects.filter(label__in=labels)
+                  .values_list("label", "version", "updated_at")})
+    token = ";".join(f"{l}={filas[l][0]}" for l in labels)
+    fechas = [u for _v, u in filas.values() if u is not None]
+    return token, (max(fechas) if fechas else None)
+
+
+# ── Señales (conectadas en catalogs/apps.py) ─────────────────
+
+def _guardado(sender, raw=False, update_fields=None, **kwargs):
+    label = sender._meta.label_lower
+    if update_fields and set(update_fields) <= _IGNORAR.get(label, set()):
+        return
+    tocar(sender)
+
+
+def _borrado(sender, **kwargs):
+    tocar(sender)
+
+
+def _m2m(sender, instance, action, model=None, **kwargs):
+    if not action.startswith("post_"):
+        return
+    rastreadas = _rastreadas()
+    tocar(*[m for m in (type(instance), model) if m and m._meta.label_lower in rastreadas])
+
+
+def conectar():
+    for nombre in RASTREADAS:
+        modelo = apps.get_model(nombre)
+        uid = f"condicional_{modelo._meta.label_lower}"
+        post_save.connect(_guardado, sender=modelo, dispatch_uid=uid + "_save")
+        post_delete.connect(_borrado, sender=modelo, dispatch_uid=uid + "_delete")
+    m2m_changed.connect(_m2m, dispatch_uid="condicional_m2m")
+
+
+# ── Vistas ───────────────────────────────────────────────────
+
+def _request_de(args):
+    for a in args[:2]:
+        if hasattr(a, "META") and hasattr(a, "method"):
+            return a
+    raise TypeError("condicional: la vista no recibe request")
+
+
+def condicional(*modelos):
+    """
+    Decorador de vistas (funciones o métodos) de GET: responde 304 si el
+    cliente ya tiene la versión actual de esas tablas para la misma URL y
+    el mismo usuario; si no, corre la vista y le pone ETag y Last-Modified.
+    Otros métodos (POST, …) pasan sin tocar.
+    """
+    rastreadas = _rastreadas()
+    faltan = [m for m in modelos if _label(m) not in rastreadas]
+    if faltan:
+        raise ValueError(f"condicional: tablas no rastreadas {faltan} (ver RASTREADAS)")
+
+    def deco(vista):
+        @wraps(vista)
+        def envuelta(*args, **kwargs):
+            request = _request_de(args)
+            if request.method not in ("GET", "HEAD"):
+                return vista(*args, **kwargs)
+            token, modificado = versiones(modelos)
+            user = getattr(request, "user", None)
+            base = f"{token}|{request.get_full_path()}|{getattr(user, 'pk', '')}"
+            etag = f'W/"{hashlib.sha1(base.encode("utf-8")).hexdigest()}"'
+            last_modified = int(modificado.timestamp()) if modificado else None
+
+            resp = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if resp is None:
+                resp = vista(*args, **kwargs)
+                if resp.status_code != 200:
+                    return resp
+            resp["ETag"] = etag
+            if last_modified is not None:
+                resp["Last-Modified"] = http_date(last_modified)
+            # Privado (depende del usuario) y siempre revalidado: un 304 es barato
+            resp["Cache-Control"] = "private, no-cache"
+            return resp
+        return envuelta
+    return deco
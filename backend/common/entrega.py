@@ -0,0 +1,95 @@
+"""
+Entrega de archivos protegidos: Django decide, el servidor web transfiere.
+
+Vouchers, backups, exportaciones y adjuntos se servían con FileResponse, que
+deja ocupado un worker de gunicorn mientras dura la descarga (un backup de
+cientos de MB por una conexión lenta bloquea un worker por minutos). Ahora la
+vista hace el chequeo de permisos y `entregar()` responde solo con cabeceras:
+
+  * PROTECTED_MEDIA_BACKEND=nginx    → X-Accel-Redirect: <prefijo>/<ruta>
+  * PROTECTED_MEDIA_BACKEND=sendfile → X-Sendfile: <ruta absoluta>
+    (Apache mod_xsendfile, lighttpd)
+  * vacío (por defecto, desarrollo) → FileResponse como antes.
+
+Solo se delegan archivos bajo MEDIA_ROOT; lo demás (plantillas del repo) va
+siempre por FileResponse. Con nginx, el prefijo debe ser una location
+`internal` que apunte a MEDIA_ROOT:
+
+    location /protected/ {
+        internal;
+        alias /srv/sistema/backend/media/;
+    }
+"""
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+
+
+def _backend() -> str:
+    return (getattr(settings, "PROTECTED_MEDIA_BACKEND", "") or "").strip().lower()
+
+
+def _prefijo() -> str:
+    return "/" + (getattr(settings, "PROTECTED_MEDIA_PREFIX", "/protected/") or "").strip("/") + "/"
+
+
+def _relativa_a_media(ruta: str):
+    """Ruta relativa a MEDIA_ROOT (con '/'), o None si el archivo está fuera."""
+    media = os.path.realpath(str(settings.MEDIA_ROOT))
+    real = os.path.realpath(ruta)
+    if not real.startswith(media + os.sep):
+        return None
+    return os.path.relpath(real, media).replace(os.sep, "/")
+
+
+def ruta_de(campo):
+    """Ruta absoluta de un FieldFile (None si su storage no está en disco)."""
+    try:
+        return campo.path
+    except (NotImplementedError, ValueError):
+        return None
+
+
+def entregar(origen, *, filename=None, content_type=None, as_attachment=False):
+    """
+    Respuesta de descarga para `origen` (ruta absoluta o FieldFile).
+
+    El llamador ya validó permisos y existencia. `filename` es el nombre que
+    ve el usuario; por defecto, el del archivo en disco.
+    """
+    ruta = origen if isinstance(origen, (str, os.PathLike)) else ruta_de(origen)
+    if ruta is None:
+        # Storage sin ruta local: no hay nada que delegar
+        nombre = filename or os.path.basename(origen.name)
+        return FileResponse(
+            origen.open("rb"), as_attachment=as_attachment, filename=nombre,
+            content_type=content_type or mimetypes.guess_type(nombre)[0],
+        )
+
+    ruta = str(ruta)
+    filename = filename or os.path.basename(ruta)
+    content_type = (
+        content_type
+        or mimetypes.guess_type(ruta)[0]
+        or mimetypes.guess_type(filename)[0]
+        or "application/octet-stream"
+    )
+    backend = _backend()
+    rel = _relativa_a_media(ruta) if backend in ("nginx", "sendfile") else None
+    if rel is None:
+        return FileResponse(
+            open(ruta, "rb"), as_attachment=as_attachment, filename=filename,
+            content_type=content_type,
+        )
+
+    resp = HttpResponse(content_type=content_type)
+    resp["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    if backend == "nginx":
+        resp["X-Accel-Redirect"] = quote(_prefijo() + rel)
+    else:
+        resp["X-Sendfile"] = os.path.realpath(ruta)
+    return resp
@@ -0,0 +1,232 @@
+"""
+Pipeline de archivos subidos: normalización de imágenes, almacenamiento por
+contenido y derivados de tamaño acotado.
+
+Los vouchers, fotos carné y logos se guardaban tal cual llegaban (fotos de
+celular de 4000 px y varios MB) y se servían y re-codificaban en base64 a
+tamaño completo en cada PDF. Ahora:
+
+  * `AlmacenPorContenido` (storage de los FileField que lo declaran) corrige
+    la orientación EXIF, quita metadatos y limita el lado mayor a
+    IMG_MAX_LADO antes de guardar; el nombre final es el SHA-256 del
+    contenido (`admission/docs/ab/ab12….jpg`), así que el mismo voucher
+    subido dos veces ocupa un solo archivo. Al borrar, el archivo solo se
+    elimina si ninguna otra fila lo referencia.
+  * `derivado(name, "thumb"|"print")` genera (una vez) una copia reducida
+    junto al original; los listados usan "thumb" y los PDF "print".
+  * `ruta_derivado(ruta_absoluta, variante)` hace lo mismo para los
+    generadores de PDF que trabajan con rutas (incluye archivos antiguos
+    guardados antes de este pipeline).
+
+Los archivos que no son imagen (PDF) pasan sin cambios y no tienen derivados.
+"""
+import hashlib
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+logger = logging.getLogger(__name__)
+
+VARIANTES = {"thumb": 320, "print": 1200}
+
+
+def _max_lado() -> int:
+    return int(getattr(settings, "IMG_MAX_LADO", 2400))
+
+
+def _abrir(contenido: bytes):
+    """Imagen PIL lista para procesar, o None si no es una imagen estática."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+    try:
+        img = Image.open(io.BytesIO(contenido))
+        img.load()
+    except Exception:
+        return None
+    if getattr(img, "is_animated", False):
+        return None
+    return ImageOps.exif_transpose(img)
+
+
+def _codificar(img, lado=None):
+    """(bytes, ext) en JPEG, o PNG si la imagen tiene transparencia."""
+    if lado and max(img.size) > lado:
+        img = img.copy()
+        img.thumbnail((lado, lado))
+    transparente = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    buf = io.BytesIO()
+    if transparente:
+        img.convert("RGBA").save(buf, "PNG", optimize=True)
+        return buf.getvalue(), ".png"
+    img.convert("RGB").save(buf, "JPEG", quality=85, optimize=True, progressive=True)
+    return buf.getvalue(), ".jpg"
+
+
+def normalizar(contenido: bytes):
+    """(bytes, ext) normalizados si `contenido` es una imagen; si no, None."""
+    img = _abrir(contenido)
+    if img is None:
+        return None
+    return _codificar(img, _max_lado())
+
+
+def normalizar_data_uri(valor, lado=None):
+    """data:image/...;base64 → misma imagen normalizada (y acotada a `lado`)."""
+    import base64
+
+    if not isinstance(valor, str) or not valor.startswith("data:image/") or ";base64," not in valor:
+        return valor
+    try:
+        crudo = base64.b64decode(valor.split(";base64,", 1)[1])
+    except Exception:
+        return valor
+    img = _abrir(crudo)
+    if img is None:
+        return valor
+    datos, ext = _codificar(img, lado or VARIANTES["print"])
+    mime = "image/png" if ext == ".png" else "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(datos).decode('ascii')}"
+
+
+def _nombre_derivado(name: str, variante: str, ext: str) -> str:
+    base, _ = os.path.splitext(name)
+    return f"{base}.{variante}{ext}"
+
+
+def _generar(contenido: bytes, variante: str):
+    img = _abrir(contenido)
+    if img is None:
+        return None
+    return _codificar(img, VARIANTES[variante])
+
+
+class AlmacenPorContenido(FileSystemStorage):
+    """FileSystemStorage que normaliza imágenes y nombra por hash de contenido."""
+
+    def _save(self, name, content):
+        content.seek(0)
+        datos = content.read()
+        norm = normalizar(datos)
+        if norm:
+            datos, ext = norm
+        else:
+            ext = os.path.splitext(name)[1].lower()
+        h = hashlib.sha256(datos).hexdigest()
+        carpeta = os.path.dirname(name)
+        nombre = f"{carpeta}/{h[:2]}/{h}{ext}" if carpeta else f"{h[:2]}/{h}{ext}"
+        if self.exists(nombre):
+            return nombre                     # mismo contenido: se comparte
+        return super()._save(nombre, ContentFile(datos))
+
+    def referencias(self, name) -> int:
+        """Filas (de cualquier modelo con este storage) que apuntan a `name`."""
+        from django.apps import apps
+        from django.db.models import FileField
+
+        n = 0
+        for model in apps.get_models():
+            for f in model._meta.get_fields():
+                if isinstance(f, FileField) and isinstance(f.storage, AlmacenPorContenido):
+                    n += model._default_manager.filter(**{f.name: name}).count()
+        return n
+
+    def delete(self, name):
+        # El archivo puede estar compartido: solo se elimina cuando ya ninguna
+        # fila lo referencia, así que quien borra elimina antes su propia fila.
+        if not name or self.referencias(name):
+            return
+        for variante in VARIANTES:
+            for ext in (".jpg", ".png"):
+                super().delete(_nombre_derivado(name, variante, ext))
+        super().delete(name)
+
+    def derivado(self, name, variante):
+        """Nombre del derivado `variante` de `name` (lo crea si falta); None si no es imagen."""
+        if not name or variante not in VARIANTES:
+            return None
+        for ext in (".jpg", ".png"):
+            existente = _nombre_derivado(name, variante, ext)
+            if self.exists(existente):
+                return existente
+        try:
+            with self.open(name, "rb") as fh:
+                res = _generar(fh.read(), variante)
+        except (OSError, ValueError) as exc:
+            logger.warning("No se pudo leer %s para derivado: %s", name, exc)
+            return None
+        if res is None:
+            return None
+        datos, ext = res
+        return FileSystemStorage._save(self, _nombre_derivado(name, variante, ext), ContentFile(datos))
+
+
+_almacen = None
+
+
+def almacen():
+    """Storage compartido de los FileField con deduplicación (callable para `storage=`)."""
+    global _almacen
+    if _almacen is None:
+        _almacen = AlmacenPorContenido()
+    return _almacen
+
+
+def derivado(campo, variante):
+    """Derivado de un FieldFile: (name, storage) o (None, None) si no aplica."""
+    if not campo:
+        return None, None
+    st = campo.storage
+    if not isinstance(st, AlmacenPorContenido):
+        st = almacen()
+    name = st.derivado(campo.name, variante)
+    return (name, st) if name else (None, None)
+
+
+def ruta(campo, variante=None):
+    """
+    Ruta absoluta del original o, si `variante` es válida y el archivo es
+    imagen, de su derivado. Para common.entrega.entregar().
+    """
+    if variante in VARIANTES:
+        name, st = derivado(campo, variante)
+        if name:
+            return st.path(name)
+    return campo.path
+
+
+def ruta_derivado(ruta, variante="print"):
+    """
+    Ruta absoluta del derivado de una imagen en disco (lo genera si falta o si
+    el original es más nuevo). Si no es imagen o falla, retorna `ruta`.
+    """
+    if not ruta or not os.path.exists(ruta):
+        return ruta
+    # Solo bajo MEDIA_ROOT: los recursos del repo (plantillas) no se tocan
+    media = os.path.realpath(str(settings.MEDIA_ROOT))
+    if not os.path.realpath(ruta).startswith(media + os.sep):
+        return ruta
+    try:
+        for ext in (".jpg", ".png"):
+            cand = _nombre_derivado(ruta, variante, ext)
+            if os.path.exists(cand) and os.path.getmtime(cand) >= os.path.getmtime(ruta):
+                return cand
+        with open(ruta, "rb") as fh:
+            res = _generar(fh.read(), variante)
+        if res is None:
+            return ruta
+        datos, ext = res
+        destino = _nombre_derivado(ruta, variante, ext)
+        tmp = f"{destino}.tmp{os.getpid()}"
+        with open(tmp, "wb") as fh:
+            fh.write(datos)
+        os.replace(tmp, destino)
+        return destino
+    except OSError as exc:
+        logger.warning("Derivado de %s no disponible: %s", ruta, exc)
+        return ruta
@@ -0,0 +1,289 @@
+"""
+Conversión DOCX → PDF con un pool de instancias de LibreOffice de larga vida.
+
+Cada constancia lanzaba `soffice --headless --convert-to pdf` desde cero:
+segundos de arranque por documento, y con varias conversiones a la vez
+fallaban porque todas compartían el mismo perfil de usuario (LibreOffice
+bloquea el perfil y la segunda instancia termina sin generar nada).
+
+Ahora cada proceso Django mantiene LIBREOFFICE_POOL_SIZE "ranuras"; cada
+ranura tiene su propio perfil (`-env:UserInstallation`) y, si el módulo
+`uno` está disponible (python3-uno del sistema), un soffice escuchando en un
+pipe propio al que se le piden las conversiones sin relanzarlo:
+
+    pdf = convertir(docx_bytes)
+    pdfs = convertir_lote([docx1, docx2, ...])   # reparte entre ranuras
+
+Sin `uno` la ranura lanza soffice por conversión, pero con su perfil ya
+inicializado (el arranque en frío es sobre todo crear el perfil) y un lote
+se convierte con UNA sola invocación por ranura. Una instancia que muere o
+que llega a LIBREOFFICE_MAX_CONVERSIONS (LibreOffice acumula memoria) se
+reinicia en la siguiente conversión.
+
+Las llamadas UNO no tienen timeout: un documento que cuelga a soffice
+dejaría el hilo (y la ranura) tomados para siempre. Cada documento corre con
+un perro guardián que mata al soffice a los LIBREOFFICE_TIMEOUT segundos; el
+puente falla, la conversión termina con ConversionVencida y la ranura vuelve
+al pool para arrancar limpia en la siguiente.
+"""
+import atexit
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    HAS_UNO = True
+except ImportError:
+    HAS_UNO = False
+
+_CANDIDATOS = (
+    "libreoffice", "soffice",
+    "/usr/bin/libreoffice", "/usr/bin/soffice",
+    "/usr/lib/libreoffice/program/soffice",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+)
+
+
+class ConversionVencida(RuntimeError):
+    """LibreOffice no terminó el documento a tiempo (se mató la instancia)."""
+
+
+def binario():
+    """Ejecutable de LibreOffice (LIBREOFFICE_BINARY o el primero en PATH), o None."""
+    explicito = getattr(settings, "LIBREOFFICE_BINARY", "")
+    for cmd in ((explicito,) if explicito else _CANDIDATOS):
+        ruta = shutil.which(cmd)
+        if ruta:
+            return ruta
+    return None
+
+
+def disponible() -> bool:
+    return binario() is not None
+
+
+def _prop(nombre, valor):
+    p = PropertyValue()
+    p.Name, p.Value = nombre, valor
+    return p
+
+
+class _Ranura:
+    """Un perfil de LibreOffice propio y, con UNO, su soffice escuchando."""
+
+    def __init__(self, n: int):
+        self.base = os.path.join(tempfile.gettempdir(), f"lo_pool_{os.getpid()}_{n}")
+        self.perfil = "file://" + os.path.join(self.base, "perfil")
+        self.pipe = f"lo_pool_{os.getpid()}_{n}"
+        self.proc = None
+        self.desktop = None
+        self.usos = 0
+        self.vencida = False
+
+    # ── Instancia escuchando (UNO) ───────────────────────────
+    def _arrancar(self):
+        self.cerrar()
+        self.proc = subprocess.Popen(
+            [binario(), "--headless", "--invisible", "--nologo", "--nodefault",
+             "--norestore", "--nolockcheck", f"-env:UserInstallation={self.perfil}",
+             f"--accept=pipe,name={self.pipe};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local)
+        limite = time.monotonic() + _timeout()
+        while True:
+            try:
+                ctx = resolver.resolve(f"uno:pipe,name={self.pipe};urp;StarOffice.ComponentContext")
+                break
+            except Exception:
+                if self.proc.poll() is not None or time.monotonic() > limite:
+                    self.cerrar()
+                    raise RuntimeError("LibreOffice no aceptó conexiones")
+                time.sleep(0.2)
+        self.desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+        self.usos = 0
+
+    def _matar(self):
+        """Perro guardián: el soffice no terminó a tiempo; cae el puente UNO."""
+        proc = self.proc
+        if proc is not None and proc.poll() is None:
+            self.vencida = True
+            proc.kill()
+
+    def _convertir_uno(self, entradas):
+        if self.proc is None or self.proc.poll() is not None or self.usos >= _max_usos():
+            self._arrancar()
+        salidas = []
+        for ruta in entradas:
+            destino = os.path.splitext(ruta)[0] + ".pdf"
+            self.vencida = False
+            perro = threading.Timer(_timeout(), self._matar)
+            perro.daemon = True
+            perro.start()
+            try:
+                doc = self.desktop.loadComponentFromURL(
+                    uno.systemPathToFileUrl(ruta), "_blank", 0, (_prop("Hidden", True),))
+                try:
+                    doc.storeToURL(uno.systemPathToFileUrl(destino),
+                                   (_prop("FilterName", "writer_pdf_Export"),))
+                finally:
+                    doc.close(True)
+            except Exception:
+                if self.vencida:
+                    raise ConversionVencida(
+                        f"LibreOffice no terminó el documento en {_timeout()} s") from None
+                raise
+            finally:
+                perro.cancel()
+            self.usos += 1
+            salidas.append(destino)
+        return salidas
+
+    # ── Sin UNO: soffice por lote con el perfil de la ranura ─
+    def _convertir_cli(self, entradas, tmpdir):
+        res = subprocess.run(
+            [binario(), "--headless", "--norestore", "--nolockcheck",
+             f"-env:UserInstallation={self.perfil}",
+             "--convert-to", "pdf", "--outdir", tmpdir, *entradas],
+            capture_output=True, text=True, timeout=_timeout() * max(1, len(entradas)),
+        )
+        if res.returncode != 0:
+            raise RuntimeError(f"LibreOffice falló: {res.stderr or res.stdout}")
+        return [os.path.splitext(r)[0] + ".pdf" for r in entradas]
+
+    def convertir(self, docs):
+        with tempfile.TemporaryDirectory(dir=_asegurar_dir(self.base)) as tmpdir:
+            entradas = []
+            for i, datos in enumerate(docs):
+                ruta = os.path.join(tmpdir, f"doc{i:04d}.docx")
+                with open(ruta, "wb") as fh:
+                    fh.write(datos)
+                entradas.append(ruta)
+            if HAS_UNO:
+                try:
+                    salidas = self._convertir_uno(entradas)
+                except ConversionVencida:
+                    # El documento es el que cuelga: reintentarlo volvería a colgar
+                    self.cerrar()
+                    raise
+                except Exception:
+                    # Instancia colgada o caída a mitad: se descarta y se reintenta una vez
+                    logger.warning("Reiniciando LibreOffice de %s", self.pipe, exc_info=True)
+                    self._arrancar()
+                    salidas = self._convertir_uno(entradas)
+            else:
+                salidas = self._convertir_cli(entradas, tmpdir)
+            pdfs = []
+            for ruta in salidas:
+                if not os.path.exists(ruta):
+                    raise RuntimeError("LibreOffice no generó el PDF.")
+                with open(ruta, "rb") as fh:
+                    pdfs.append(fh.read())
+            return pdfs
+
+    def cerrar(self):
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()      # cierre ordenado del soffice
+            except Exception:
+                pass
+            self.desktop = None
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.terminate()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+            self.proc = None
+
+
+def _asegurar_dir(ruta):
+    os.makedirs(ruta, exist_ok=True)
+    return ruta
+
+
+def _tamano() -> int:
+    return max(1, int(getattr(settings, "LIBREOFFICE_POOL_SIZE", 0) or min(4, os.cpu_count() or 1)))
+
+
+def _max_usos() -> int:
+    return int(getattr(settings, "LIBREOFFICE_MAX_CONVERSIONS", 200))
+
+
+def _timeout() -> int:
+    return int(getattr(settings, "LIBREOFFICE_TIMEOUT", 60))
+
+
+_lock = threading.Lock()
+_libres = None
+_ranuras = []
+
+
+def _pool():
+    global _libres
+    with _lock:
+        if _libres is None:
+            _libres = queue.Queue()
+            for n in range(_tamano()):
+                r = _Ranura(n)
+                _ranuras.append(r)
+                _libres.put(r)
+    return _libres
+
+
+def _con_ranura(docs):
+    libres = _pool()
+    try:
+        ranura = libres.get(timeout=_timeout())
+    except queue.Empty:
+        raise RuntimeError("Todas las instancias de LibreOffice están ocupadas.")
+    try:
+        return ranura.convertir(docs)
+    finally:
+        libres.put(ranura)
+
+
+def convertir(docx_bytes: bytes) -> bytes:
+    """DOCX → PDF en una ranura libre del pool (seguro entre hilos)."""
+    if not disponible():
+        raise RuntimeError("LibreOffice no está instalado. Instala con: sudo apt install libreoffice")
+    return _con_ranura([docx_bytes])[0]
+
+
+def convertir_lote(docs):
+    """[DOCX] → [PDF] en el mismo orden, repartidos entre las ranuras del pool."""
+    docs = list(docs)
+    if not docs:
+        return []
+    if not disponible():
+        raise RuntimeError("LibreOffice no está instalado. Instala con: sudo apt install libreoffice")
+    n = min(_tamano(), len(docs))
+    tramos = [docs[i::n] for i in range(n)]
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        resultados = list(ex.map(_con_ranura, tramos))
+    pdfs = [None] * len(docs)
+    for i, tramo in enumerate(resultados):
+        pdfs[i::n] = tramo
+    return pdfs
+
+
+@atexit.register
+def cerrar():
+    """Termina las instancias del pool (al salir del proceso)."""
+    for r in _ranuras:
+        r.cerrar()
@@ -0,0 +1,170 @@
+"""
+Compositor de plantillas PDF.
+
+Las plantillas (kardex, constancias) se parsean UNA vez por proceso y cada
+página se guarda como Form XObject. Al estampar, la página de salida es la
+del overlay (ReportLab) con la plantilla dibujada debajo vía ``Do``; así el
+contenido fijo no se copia dentro de cada página y, si se emiten muchos
+alumnos en un mismo PDF, todos apuntan al mismo XObject.
+
+    tpl = get_pdf_template(ruta)
+    pdf = tpl.merge(overlay_reader)              # un documento
+    pdf = compose_pdf(ruta, [ov1, ov2, ...])     # muchos alumnos, un archivo
+
+Para los generadores 100% ReportLab está ``draw_form``: lo que se repite en
+cada página (marca de agua, membrete) se define una sola vez por documento.
+"""
+import os
+import threading
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, NameObject,
+)
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class PdfTemplate:
+    """Plantilla parseada una sola vez; se invalida si cambia el mtime."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        with open(path, "rb") as fh:
+            self._reader = PdfReader(BytesIO(fh.read()))
+        self._lock = threading.Lock()
+        self.pages = []
+        for page in self._reader.pages:
+            contents = page.get_contents()
+            self.pages.append({
+                "page": page,
+                "box": [float(x) for x in page.mediabox],
+                # contenido ya descomprimido: es lo caro de parsear
+                "data": contents.get_data() if contents is not None else b"",
+            })
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def _forms_for(self, writer: PdfWriter) -> list:
+        """Form XObjects de la plantilla dentro de ``writer`` (uno por página)."""
+        forms = getattr(writer, "_tpl_forms", None)
+        if forms is None:
+            forms = writer._tpl_forms = {}
+        refs = forms.get(self.path)
+        if refs is not None:
+            return refs
+
+        refs = []
+        # El reader es perezoso (seek + read): un solo hilo clona a la vez
+        with self._lock:
+            for i, p in enumerate(self.pages):
+                form = DecodedStreamObject()
+                form.set_data(p["data"])
+                form[NameObject("/Type")] = NameObject("/XObject")
+                form[NameObject("/Subtype")] = NameObject("/Form")
+                form[NameObject("/BBox")] = ArrayObject(p["page"].mediabox)
+                res = p["page"].get("/Resources")
+                form[NameObject("/Resources")] = (
+                    res.get_object().clone(writer) if res is not None else DictionaryObject()
+                )
+                refs.append(writer._add_object(form.flate_encode()))
+        forms[self.path] = refs
+        return refs
+
+    def stamp(self, writer: PdfWriter, overlay_reader: PdfReader = None) -> int:
+        """
+        Agrega a ``writer`` las páginas de la plantilla con el overlay encima.
+        Páginas del overlay que sobran se ignoran (igual que antes).
+        Retorna el número de páginas agregadas.
+        """
+        refs = self._forms_for(writer)
+        overlay_pages = list(overlay_reader.pages) if overlay_reader is not None else []
+
+        for i, p in enumerate(self.pages):
+            x0, y0, x1, y1 = p["box"]
+            if i < len(overlay_pages):
+                out = writer.add_page(overlay_pages[i])
+                top = out.get_contents()
+                top = top.get_data() if top is not None else b""
+            else:
+                out = writer.add_blank_page(width=x1 - x0, height=y1 - y0)
+                top = b""
+
+            out.mediabox = p["page"].mediabox
+            out.cropbox = p["page"].mediabox
+
+            res = out.get("/Resources")
+            if res is None:
+                res = DictionaryObject()
+                out[NameObject("/Resources")] = res
+            res = res.get_object()
+            xobjs = res.get("/XObject")
+            if xobjs is None:
+                xobjs = DictionaryObject()
+                res[NameObject("/XObject")] = xobjs
+            xobjs = xobjs.get_object()
+
+            name = f"/Tpl{i}"
+            while name in xobjs:
+                name += "x"
+            xobjs[NameObject(name)] = refs[i]
+
+            body = DecodedStreamObject()
+            body.set_data(b"q " + name.encode() + b" Do Q\n" + top)
+            out.replace_contents(body.flate_encode())
+        return len(self.pages)
+
+    def merge(self, overlay_reader: PdfReader) -> bytes:
+        """Un solo documento: plantilla + overlay → bytes."""
+        out = PdfWriter()
+        self.stamp(out, overlay_reader)
+        bio = BytesIO()
+        out.write(bio)
+        return bio.getvalue()
+
+
+def get_pdf_template(path: str) -> PdfTemplate:
+    """Plantilla cacheada por proceso (se recarga si el archivo cambió)."""
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    tpl = _CACHE.get(path)
+    if tpl is not None and tpl.mtime == mtime:
+        return tpl
+    with _CACHE_LOCK:
+        tpl = _CACHE.get(path)
+        if tpl is None or tpl.mtime != mtime:
+            tpl = _CACHE[path] = PdfTemplate(path)
+    return tpl
+
+
+def compose_pdf(template_path: str, overlays) -> bytes:
+    """
+    Muchos overlays (uno por alumno) sobre la misma plantilla en un solo PDF.
+    El contenido de la plantilla se escribe una vez y se referencia desde
+    todas las páginas.
+    """
+    tpl = get_pdf_template(template_path)
+    out = PdfWriter()
+    for ov in overlays:
+        tpl.stamp(out, ov)
+    bio = BytesIO()
+    out.write(bio)
+    return bio.getvalue()
+
+
+def draw_form(c, name: str, draw_fn):
+    """
+    ReportLab: dibuja ``draw_fn(c)`` como Form XObject reutilizable.
+    La primera llamada del documento lo define; las siguientes solo lo
+    referencian, en vez de repetir cientos de operadores por página.
+    """
+    if not c.hasForm(name):
+        c.beginForm(name)
+        draw_fn(c)
+        c.endForm()
+    c.doForm(name)
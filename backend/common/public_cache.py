@@ -0,0 +1,108 @@
+"""
+Cache de respuestas de las páginas públicas de verificación (QR).
+
+Tras una entrega de certificados/fichas los QR se escanean en ráfaga y cada
+escaneo reconstruía la página completa contra la BD. Ahora la respuesta se
+guarda por clave (DNI, código de trámite, id de egresado) y se sirve con
+ETag/Last-Modified, así que un re-escaneo del mismo teléfono es un 304.
+
+Invalidación: cada clave tiene un número de versión que las señales
+incrementan cuando cambia la matrícula, el trámite o el egresado
+(`invalidar(ns, ident)`); `invalidar_todo()` cuando cambian los datos
+institucionales que salen en todas las páginas. Las versiones viven en la
+base (catalogs.PublicPageVersion), no en el cache: con LocMem cada worker
+tiene su propio cache y no vería lo que invalidó otro. Cuesta una consulta
+indexada por acceso.
+
+    return respuesta_cacheada(request, "enroll", dni, period, lambda: (html, "text/html"))
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+_GLOBAL = "*"
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "PUBLIC_PAGE_CACHE_SECONDS", 600))
+
+
+def _h(s) -> str:
+    return hashlib.md5(str(s).encode("utf-8")).hexdigest()
+
+
+def _versiones(claves) -> list:
+    """Versiones de esas claves (0 si nunca se invalidaron), en una consulta."""
+    from catalogs.models import PublicPageVersion
+
+    v = dict(PublicPageVersion.objects.filter(key__in=claves).values_list("key", "version"))
+    return [v.get(k, 0) for k in claves]
+
+
+def _bump(key):
+    from catalogs.models import PublicPageVersion
+
+    PublicPageVersion.objects.bulk_create([PublicPageVersion(key=key)], ignore_conflicts=True)
+    PublicPageVersion.objects.filter(key=key).update(version=F("version") + 1)
+
+
+def invalidar(ns: str, ident) -> None:
+    """Las páginas de `ident` (p.ej. un DNI) se regeneran en el próximo acceso."""
+    _bump(f"{ns}:{_h(ident)}")
+
+
+def invalidar_todo() -> None:
+    _bump(_GLOBAL)
+
+
+def respuesta_cacheada(request, ns: str, ident, variante, construir, timeout=None,
+                       version=None):
+    """
+    Respuesta de `construir()` → (body, content_type[, headers[, guardar]])
+    cacheada bajo (ns, ident, variante), con ETag y Last-Modified para GET
+    condicional. `guardar=False` sirve la respuesta sin cachearla (errores).
+    `version` reemplaza a las versiones por clave cuando el llamador ya tiene
+    su propio sello (p.ej. `condicional.versiones` de las tablas que muestra).
+    """
+    ident_h = _h(ident)
+    if version is None:
+        v_todo, v_clave = _versiones([_GLOBAL, f"{ns}:{ident_h}"])
+        version = f"{v_todo}:{v_clave}"
+    key = f"pub:{ns}:{ident_h}:{_h(version)}:{_h(variante)}"
+    entry = cache.get(key)
+    if entry is None:
+        out = construir()
+        body, ctype = out[0], out[1]
+        headers = out[2] if len(out) > 2 else {}
+        guardar = out[3] if len(out) > 3 else True
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        entry = {
+            "body": body,
+            "ctype": ctype,
+            "headers": dict(headers),
+            "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+            "modified": timezone.now().replace(microsecond=0),
+        }
+        if guardar:
+            cache.set(key, entry, _ttl() if timeout is None else timeout)
+
+    last_modified = entry["modified"].timestamp()
+    not_modified = get_conditional_response(
+        request, etag=entry["etag"], last_modified=int(last_modified),
+    )
+    resp = not_modified or HttpResponse(entry["body"], content_type=entry["ctype"])
+    if not_modified is None:
+        for k, v in entry["headers"].items():
+            resp[k] = v
+    resp["ETag"] = entry["etag"]
+    resp["Last-Modified"] = http_date(last_modified)
+    # El navegador revalida siempre (barato: 304); los datos pueden cambiar
+    resp["Cache-Control"] = "public, max-age=0, must-revalidate"
+    return resp
@@ -0,0 +1,50 @@
+"""
+SQLite para producción chica (DB_ENGINE=sqlite): backend `common.sqlite`.
+
+Con varios workers de gunicorn, el modo por defecto de SQLite (journal de
+rollback, transacciones DEFERRED) hacía que un guardado de notas bloqueara
+a todos los lectores mientras escribía y que dos transacciones que empezaban
+leyendo y luego escribían chocaran con "database is locked" sin que sirviera
+el timeout (el que ya tenía el candado de lectura no puede esperar). La
+configuración de settings.py ahora:
+
+  * abre cada conexión con los PRAGMA de SQLITE_PRAGMAS (journal WAL,
+    synchronous=NORMAL, cache y mmap): en WAL los lectores leen la última
+    versión confirmada sin esperar a la escritura en curso;
+  * las transacciones de los caminos de escritura disputados (guardar y
+    cerrar actas, matrícula, asistencia) se abren con `escritura()`, que
+    empieza con BEGIN IMMEDIATE: el candado de escritura se pide al comenzar,
+    donde el timeout sí espera. El resto de transaction.atomic sigue DEFERRED
+    y no toma el candado hasta que escribe: los bloques largos o de solo
+    lectura (generador de horarios, reconstrucción del mérito, auditoría) no
+    ponen en fila a los demás escritores;
+  * serializa, dentro de cada proceso, las transacciones de escritura con un
+    candado por archivo de base (`write_lock`, base.py): los hilos del mismo
+    worker hacen fila en Python en vez de sondear el archivo.
+
+Las escrituras siguen siendo de una a la vez (es SQLite); lo que cambia es
+que las lecturas nunca esperan y que las escrituras esperan su turno en vez
+de fallar. bench.py mide ambas cosas:
+
+    python -m common.sqlite.bench --escritores 4 --lectores 8
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+@contextmanager
+def escritura(using=None):
+    """transaction.atomic que, en SQLite, empieza con BEGIN IMMEDIATE y hace
+    fila en el candado del proceso. Dentro de otra transacción (o en otros
+    motores) es un atomic normal."""
+    conn = connections[using or DEFAULT_DB_ALIAS]
+    marcar = hasattr(conn, "escritura") and not conn.in_atomic_block
+    if marcar:
+        conn.escritura = True
+    try:
+        with transaction.atomic(using=using):
+            yield
+    finally:
+        if marcar:
+            conn.escritura = False
@@ -0,0 +1,83 @@
+"""
+Backend sqlite3 de Django con transacciones de escritura en fila por proceso.
+
+Igual que django.db.backends.sqlite3, más la opción `write_lock` (OPTIONS):
+cuando una transacción es IMMEDIATE/EXCLUSIVE (por `transaction_mode` o por
+abrirse con `common.sqlite.escritura()`), toma un candado del proceso (uno
+por archivo de base) desde el BEGIN hasta el COMMIT o ROLLBACK. Si el
+candado no llega en `timeout` segundos se sigue igual y decide el busy
+timeout de SQLite, como sin el candado. Las bases en memoria (tests) no lo
+usan.
+"""
+import threading
+
+from django.db.backends.sqlite3 import base
+
+_candados = {}
+_candados_lock = threading.Lock()
+
+
+def _candado(nombre):
+    with _candados_lock:
+        return _candados.setdefault(str(nombre), threading.Lock())
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # La próxima transacción es de escritura (la marca `escritura()`)
+    escritura = False
+
+    def _modo(self):
+        if self.escritura and self.transaction_mode in (None, "DEFERRED"):
+            return "IMMEDIATE"
+        return self.transaction_mode
+
+    def get_connection_params(self):
+        opciones = self.settings_dict["OPTIONS"]
+        self.write_lock = bool(opciones.get("write_lock", False))
+        self.lock_timeout = float(opciones.get("timeout", 5))
+        params = super().get_connection_params()
+        params.pop("write_lock", None)
+        return params
+
+    def _usa_turno(self):
+        return (getattr(self, "write_lock", False)
+                and self._modo() in ("IMMEDIATE", "EXCLUSIVE")
+                and not self.is_in_memory_db())
+
+    def _tomar_turno(self):
+        if self._usa_turno() and getattr(self, "_turno", None) is None:
+            candado = _candado(self.settings_dict["NAME"])
+            if candado.acquire(timeout=self.lock_timeout):
+                self._turno = candado
+
+    def _soltar_turno(self):
+        candado, self._turno = getattr(self, "_turno", None), None
+        if candado is not None:
+            candado.release()
+
+    def _start_transaction_under_autocommit(self):
+        self._tomar_turno()
+        try:
+            modo = self._modo()
+            self.cursor().execute(f"BEGIN {modo}" if modo else "BEGIN")
+        except BaseException:
+            self._soltar_turno()
+            raise
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self._soltar_turno()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self._soltar_turno()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self._soltar_turno()
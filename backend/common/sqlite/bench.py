@@ -0,0 +1,159 @@
+"""
+Banco de concurrencia de SQLite: lectores contra escritores.
+
+Crea una base temporal con una tabla tipo acta, lanza hilos escritores que
+toman el candado de escritura y lo retienen un rato, como un guardado de
+notas largo, y mide cuánto tarda cada lectura mientras tanto. Los escritores
+usan BEGIN EXCLUSIVE: en WAL equivale a IMMEDIATE (los lectores siguen), y
+con journal de rollback es el candado que toda escritura termina tomando al
+volcar páginas a la base (commit o desborde de caché). Con los PRAGMA de
+settings (WAL) la latencia de lectura no depende de la retención de los
+escritores; con journal de rollback sí.
+
+Uso (desde backend/):
+    python -m common.sqlite.bench
+    python -m common.sqlite.bench --escritores 4 --lectores 8 --segundos 5 --comparar
+"""
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+FILAS = 2000
+
+
+def _conectar(ruta, pragmas, timeout):
+    conn = sqlite3.connect(ruta, timeout=timeout, isolation_level=None,
+                           check_same_thread=False)
+    for p in pragmas.split(";"):
+        if p.strip():
+            conn.execute(p)
+    return conn
+
+
+def _percentil(datos, p):
+    if not datos:
+        return 0.0
+    datos = sorted(datos)
+    return datos[min(len(datos) - 1, int(round(p / 100 * (len(datos) - 1))))]
+
+
+def medir(pragmas, escritores=2, lectores=4, segundos=2.0, retencion=0.05, timeout=30.0):
+    """
+    Corre el banco y retorna un dict con lecturas/escrituras hechas, latencias
+    de lectura (ms: p50, p99, máx), espera máxima de un escritor por el
+    candado (ms) y los errores.
+    """
+    carpeta = tempfile.mkdtemp(prefix="bench_sqlite_")
+    ruta = os.path.join(carpeta, "bench.sqlite3")
+    conn = _conectar(ruta, pragmas, timeout)
+    conn.execute("CREATE TABLE celda (id INTEGER PRIMARY KEY, seccion INTEGER, valor REAL)")
+    conn.execute("BEGIN")
+    conn.executemany("INSERT INTO celda (seccion, valor) VALUES (?, ?)",
+                     [(i % 40, float(i % 20)) for i in range(FILAS)])
+    conn.execute("COMMIT")
+    journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+
+    lock = threading.Lock()
+    res = {"lecturas": [], "esperas": [], "escrituras": 0, "errores": []}
+
+    def escritor(n, c):
+        try:
+            while time.monotonic() < fin:
+                t0 = time.perf_counter()
+                c.execute("BEGIN EXCLUSIVE")
+                espera = time.perf_counter() - t0
+                c.execute("UPDATE celda SET valor = valor + 1 WHERE seccion = ?", (n % 40,))
+                time.sleep(retencion)          # trabajo con el candado tomado
+                c.execute("COMMIT")
+                with lock:
+                    res["esperas"].append(espera)
+                    res["escrituras"] += 1
+        except sqlite3.Error as e:
+            with lock:
+                res["errores"].append(f"escritor: {e}")
+        finally:
+            c.close()
+
+    def lector(c):
+        try:
+            while time.monotonic() < fin:
+                t0 = time.perf_counter()
+                c.execute("SELECT seccion, AVG(valor) FROM celda GROUP BY seccion").fetchall()
+                dt = time.perf_counter() - t0
+                with lock:
+                    res["lecturas"].append(dt)
+                time.sleep(0.002)
+        except sqlite3.Error as e:
+            with lock:
+                res["errores"].append(f"lector: {e}")
+        finally:
+            c.close()
+
+    # Conexiones abiertas antes de arrancar: lo que se mide es la consulta
+    hilos = ([threading.Thread(target=escritor, args=(i, _conectar(ruta, pragmas, timeout)))
+              for i in range(escritores)]
+             + [threading.Thread(target=lector, args=(_conectar(ruta, pragmas, timeout),))
+                for _ in range(lectores)])
+    fin = time.monotonic() + segundos
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    for nombre in os.listdir(carpeta):
+        os.unlink(os.path.join(carpeta, nombre))
+    os.rmdir(carpeta)
+
+    ms = [x * 1000 for x in res["lecturas"]]
+    return {
+        "journal": journal,
+        "lecturas": len(ms),
+        "escrituras": res["escrituras"],
+        "lectura_p50_ms": round(statistics.median(ms), 2) if ms else 0.0,
+        "lectura_p99_ms": round(_percentil(ms, 99), 2),
+        "lectura_max_ms": round(max(ms), 2) if ms else 0.0,
+        "espera_escritor_max_ms": round(max(res["esperas"], default=0) * 1000, 2),
+        "errores": res["errores"],
+    }
+
+
+def _pragmas_de_settings():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sistema_academico.settings")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    return settings.DATABASES["default"].get("OPTIONS", {}).get("init_command", "")
+
+
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--escritores", type=int, default=2)
+    ap.add_argument("--lectores", type=int, default=4)
+    ap.add_argument("--segundos", type=float, default=3.0)
+    ap.add_argument("--retencion", type=float, default=0.05,
+                    help="Segundos que cada escritor retiene el candado.")
+    ap.add_argument("--comparar", action="store_true",
+                    help="Corre también con journal de rollback (sin WAL).")
+    args = ap.parse_args()
+
+    configs = [("settings", _pragmas_de_settings())]
+    if args.comparar:
+        configs.append(("rollback", "PRAGMA journal_mode=DELETE"))
+    for nombre, pragmas in configs:
+        r = medir(pragmas, args.escritores, args.lectores, args.segundos, args.retencion)
+        print(f"[{nombre}] journal={r['journal']} lecturas={r['lecturas']} "
+              f"escrituras={r['escrituras']} lectura p50={r['lectura_p50_ms']}ms "
+              f"p99={r['lectura_p99_ms']}ms máx={r['lectura_max_ms']}ms "
+              f"espera escritor máx={r['espera_escritor_max_ms']}ms "
+              f"errores={len(r['errores'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,24 @@
 """Tests de infraestructura compartida."""
-from django.test import RequestFactory, TestCase
+import os
+import sqlite3
+import tempfile
+import time
+from io import BytesIO
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from pypdf import PdfReader
+from rest_framework.test import APIClient
+
+from common import condicional, imagenes, libreoffice
+from common.entrega import entregar
+from common.pdf_templates import compose_pdf, get_pdf_template
 from common.proxy_https import ForzarHttpsDetrasDelProxy
+from common.sqlite import base as sqlite_base
+from common.sqlite.bench import medir
 
 
 def _vista(request):
@@ -35,3 +52,340 @@ class ForzarHttpsTest(TestCase):
         r = self._pedir(False)
         self.assertFalse(r["seguro"])
         self.assertTrue(r["url"].startswith("http://"), r["url"])
+
+
+class PdfTemplateTest(TestCase):
+    """La plantilla se parsea una vez y el lote la referencia, no la copia."""
+
+    PLANTILLA = os.path.join(settings.BASE_DIR, "templates", "kardex", "inicial.pdf")
+
+    def _overlay(self, texto):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        buf = BytesIO()
+        c = canvas.Canvas(buf, pagesize=A4)
+        c.drawString(100, 700, texto)
+        c.showPage()
+        c.save()
+        buf.seek(0)
+        return PdfReader(buf)
+
+    def test_cache_por_proceso(self):
+        self.assertIs(get_pdf_template(self.PLANTILLA), get_pdf_template(self.PLANTILLA))
+
+    def test_merge_conserva_plantilla_y_overlay(self):
+        tpl = get_pdf_template(self.PLANTILLA)
+        out = PdfReader(BytesIO(tpl.merge(self._overlay("ALUMNO PRUEBA"))))
+        self.assertEqual(len(out.pages), tpl.page_count)
+        txt = out.pages[0].extract_text()
+        self.assertIn("ALUMNO PRUEBA", txt)
+        self.assertIn("ASIGNATURAS", txt)
+
+    def test_lote_comparte_xobject(self):
+        pdf = compose_pdf(self.PLANTILLA, [self._overlay(f"ALUMNO {i}") for i in range(3)])
+        out = PdfReader(BytesIO(pdf))
+        self.assertEqual(len(out.pages), 3 * get_pdf_template(self.PLANTILLA).page_count)
+        refs = {
+            out.pages[i]["/Resources"]["/XObject"].raw_get("/Tpl0").idnum
+            for i in range(0, len(out.pages), 2)
+        }
+        self.assertEqual(len(refs), 1)
+
+
+class AlmacenPorContenidoTest(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, True)
+        ctx = override_settings(MEDIA_ROOT=self.media)
+        ctx.enable()
+        self.addCleanup(ctx.disable)
+
+    def _foto(self):
+        from PIL import Image
+        buf = BytesIO()
+        Image.new("RGB", (3000, 2000), (200, 30, 30)).save(buf, "PNG")
+        return ContentFile(buf.getvalue(), name="celular.png")
+
+    def test_dedup_derivado_y_borrado_compartido(self):
+        from PIL import Image
+        from catalogs.models import MediaAsset
+
+        a = MediaAsset.objects.create(kind="LOGO", file=self._foto())
+        b = MediaAsset.objects.create(kind="LOGO_ALT", file=self._foto())
+        self.assertEqual(a.file.name, b.file.name)           # un solo archivo
+        self.assertTrue(a.file.name.endswith(".jpg"))         # normalizado
+        with Image.open(a.file.path) as img:
+            self.assertLessEqual(max(img.size), 2400)
+
+        name, st = imagenes.derivado(a.file, "thumb")
+        with Image.open(st.path(name)) as img:
+            self.assertEqual(max(img.size), 320)
+
+        a.file.delete(save=False)                             # la fila de a sigue viva
+        self.assertTrue(os.path.exists(b.file.path))
+        a.delete()
+        st.delete(b.file.name)                                # b todavía lo usa
+        self.assertTrue(os.path.exists(b.file.path))
+        nombre = b.file.name
+        b.delete()
+        st.delete(nombre)
+        self.assertFalse(os.path.exists(st.path(nombre)))
+        self.assertFalse(os.path.exists(st.path(name)))
+
+
+class EntregaProtegidaTest(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, True)
+        os.makedirs(os.path.join(self.media, "backups"))
+        self.ruta = os.path.join(self.media, "backups", "full 1.zip")
+        with open(self.ruta, "wb") as fh:
+            fh.write(b"PK\x03\x04")
+
+    def _entregar(self, backend, ruta=None):
+        with self.settings(MEDIA_ROOT=self.media, PROTECTED_MEDIA_BACKEND=backend,
+                           PROTECTED_MEDIA_PREFIX="/protected/"):
+            return entregar(ruta or self.ruta, as_attachment=True)
+
+    def test_nginx_delega_sin_cuerpo(self):
+        r = self._entregar("nginx")
+        self.assertEqual(r["X-Accel-Redirect"], "/protected/backups/full%201.zip")
+        self.assertEqual(r.content, b"")
+        self.assertEqual(r["Content-Type"], "application/zip")
+        self.assertIn("attachment", r["Content-Disposition"])
+
+    def test_sendfile_y_desarrollo(self):
+        r = self._entregar("sendfile")
+        self.assertEqual(r["X-Sendfile"], os.path.realpath(self.ruta))
+        r = self._entregar("")
+        self.assertNotIn("X-Accel-Redirect", r)
+        self.assertEqual(b"".join(r.streaming_content), b"PK\x03\x04")
+        r.close()
+
+    def test_fuera_de_media_no_se_delega(self):
+        ruta = os.path.join(settings.BASE_DIR, "manage.py")
+        r = self._entregar("nginx", ruta)
+        self.assertNotIn("X-Accel-Redirect", r)
+        r.close()
+
+
+_SOFFICE_FALSO = """#!/bin/sh
+# soffice de prueba: copia cada .docx a <outdir>/<nombre>.pdf y anota el perfil
+for a in "$@"; do
+  case "$a" in -env:UserInstallation=*) perfil="$a" ;; esac
+done
+while [ "$1" != "--outdir" ]; do shift; done
+out="$2"; shift 2
+for f in "$@"; do
+  b=$(basename "$f" .docx)
+  { printf '%%PDF-'; cat "$f"; } > "$out/$b.pdf"
+  echo "$perfil" >> "$LOG_SOFFICE"
+done
+"""
+
+
+class PoolLibreOfficeTest(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from unittest import mock
+
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+        script = os.path.join(tmp, "soffice")
+        with open(script, "w") as fh:
+            fh.write(_SOFFICE_FALSO)
+        os.chmod(script, 0o755)
+        self.log = os.path.join(tmp, "log")
+        ctx = override_settings(LIBREOFFICE_BINARY=script, LIBREOFFICE_POOL_SIZE=2)
+        ctx.enable()
+        self.addCleanup(ctx.disable)
+        # Pool nuevo para la prueba, sin UNO (modo por lote)
+        for parche in (mock.patch.dict(os.environ, {"LOG_SOFFICE": self.log}),
+                       mock.patch.object(libreoffice, "HAS_UNO", False),
+                       mock.patch.object(libreoffice, "_libres", None),
+                       mock.patch.object(libreoffice, "_ranuras", [])):
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def test_lote_en_orden_y_un_perfil_por_ranura(self):
+        docs = [f"doc-{i}".encode() for i in range(5)]
+        self.assertEqual(libreoffice.convertir_lote(docs), [b"%PDF-" + d for d in docs])
+        self.assertEqual(libreoffice.convertir(b"x"), b"%PDF-x")
+        with open(self.log) as fh:
+            perfiles = fh.read().split()
+        self.assertEqual(len(perfiles), 6)
+        self.assertEqual(len(set(perfiles)), 2)          # dos ranuras, perfiles aislados
+
+
+class _EscritorioFalso:
+    """Desktop UNO de prueba: b"cuelga" no vuelve hasta que muere el soffice."""
+
+    def __init__(self, proc):
+        self.proc = proc
+
+    def loadComponentFromURL(self, url, *args):
+        ranura = self
+
+        class Doc:
+            def storeToURL(self, destino, props):
+                with open(url) as fh:
+                    datos = fh.read()
+                while datos == "cuelga":
+                    if ranura.proc.poll() is not None:
+                        raise RuntimeError("puente UNO caído")
+                    time.sleep(0.05)
+                with open(destino, "w") as fh:
+                    fh.write("%PDF-" + datos)
+
+            def close(self, forzar):
+                pass
+
+        return Doc()
+
+    def terminate(self):
+        pass
+
+
+class PoolLibreOfficeUnoTest(TestCase):
+    def setUp(self):
+        import subprocess
+        import types
+        from unittest import mock
+
+        def arrancar(ranura):
+            ranura.cerrar()
+            ranura.proc = subprocess.Popen(["sleep", "60"])
+            ranura.desktop = _EscritorioFalso(ranura.proc)
+            ranura.usos = 0
+            self.arranques += 1
+
+        self.arranques = 0
+        ctx = override_settings(LIBREOFFICE_POOL_SIZE=1, LIBREOFFICE_TIMEOUT=1)
+        ctx.enable()
+        self.addCleanup(ctx.disable)
+        uno_falso = types.SimpleNamespace(systemPathToFileUrl=lambda ruta: ruta)
+        for parche in (mock.patch.object(libreoffice, "HAS_UNO", True),
+                       mock.patch.object(libreoffice, "uno", uno_falso, create=True),
+                       mock.patch.object(libreoffice, "_prop", lambda n, v: (n, v)),
+                       mock.patch.object(libreoffice, "disponible", lambda: True),
+                       mock.patch.object(libreoffice._Ranura, "_arrancar", arrancar),
+                       mock.patch.object(libreoffice, "_libres", None),
+                       mock.patch.object(libreoffice, "_ranuras", [])):
+            parche.start()
+            self.addCleanup(parche.stop)
+        self.addCleanup(libreoffice.cerrar)
+
+    def test_documento_colgado_no_se_queda_con_la_ranura(self):
+        t0 = time.monotonic()
+        with self.assertRaises(libreoffice.ConversionVencida):
+            libreoffice.convertir(b"cuelga")
+        self.assertLess(time.monotonic() - t0, 5)
+        self.assertEqual(self.arranques, 1)                # sin reintento del mismo documento
+        # La ranura volvió al pool y arranca limpia para el siguiente
+        self.assertEqual(libreoffice.convertir(b"ok"), b"%PDF-ok")
+        self.assertEqual(self.arranques, 2)
+
+
+class SqliteConcurrenciaTest(TestCase):
+    """Modo SQLite de producción: WAL, BEGIN IMMEDIATE y fila en los caminos de escritura."""
+
+    def _pragmas(self):
+        return settings.DATABASES["default"]["OPTIONS"]["init_command"]
+
+    def test_lecturas_no_esperan_a_los_escritores(self):
+        r = medir(self._pragmas(), escritores=2, lectores=2, segundos=0.8, retencion=0.2)
+        self.assertEqual(r["journal"], "wal")
+        self.assertEqual(r["errores"], [])
+        self.assertGreater(r["escrituras"], 0)
+        # Cada escritor retiene el candado 200 ms; ninguna lectura lo espera
+        self.assertLess(r["lectura_max_ms"], 200)
+
+    def test_transaccion_toma_y_suelta_el_turno(self):
+        ruta = os.path.join(tempfile.mkdtemp(), "turno.sqlite3")
+        db = sqlite_base.DatabaseWrapper({**connection.settings_dict, "NAME": ruta}, alias="turno")
+        try:
+            with db.cursor() as cur:
+                cur.execute("PRAGMA journal_mode")
+                self.assertEqual(cur.fetchone()[0], "wal")
+            candado = sqlite_base._candado(ruta)
+            # Un atomic cualquiera sigue DEFERRED: no hace fila
+            db._start_transaction_under_autocommit()
+            self.assertFalse(candado.locked())
+            db.rollback()
+
+            db.escritura = True                  # lo que marca common.sqlite.escritura()
+            db._start_transaction_under_autocommit()
+            self.assertTrue(candado.locked())
+            # BEGIN IMMEDIATE: el candado de escritura de SQLite ya es suyo
+            otra = sqlite3.connect(ruta, timeout=0, isolation_level=None)
+            with self.assertRaises(sqlite3.OperationalError):
+                otra.execute("BEGIN IMMEDIATE")
+            otra.close()
+            db.commit()
+            self.assertFalse(candado.locked())
+            db._start_transaction_under_autocommit()
+            db.rollback()
+            self.assertFalse(candado.locked())
+        finally:
+            db.close()
+
+    def test_escritura_dentro_de_otra_transaccion_es_un_atomic(self):
+        from common.sqlite import escritura
+
+        with escritura():
+            self.assertTrue(connection.in_atomic_block)
+            self.assertFalse(connection.escritura)
+
+
+class GetCondicionalTest(TestCase):
+    """Listados con ETag por versión de tabla (common/condicional.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        from catalogs.models import Campus
+
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser("admin", "admin@t.pe", "x")
+        cls.otro = User.objects.create_superuser("admin2", "admin2@t.pe", "x")
+        Campus.objects.create(code="S1", name="Sede Central")
+
+    def _get(self, user=None, **headers):
+        cli = APIClient()
+        cli.force_authenticate(user or self.admin)
+        return cli.get("/api/catalogs/campuses", **headers)
+
+    def test_304_sin_correr_el_listado(self):
+        r = self._get()
+        self.assertEqual(r.status_code, 200)
+        etag = r["ETag"]
+        self.assertEqual(r["Cache-Control"], "private, no-cache")
+
+        with self.assertNumQueries(2):            # las versiones y el registro de auditoría
+            r = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 304)
+        # El ETag es por usuario
+        self.assertEqual(self._get(self.otro, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_guardar_cambia_la_version(self):
+        from catalogs.models import Campus
+
+        etag = self._get()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Campus.objects.create(code="S2", name="Sede Norte")
+        r = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.data["items"]), 2)
+        self.assertNotEqual(r["ETag"], etag)
+        self.assertIn("Last-Modified", r)
+
+        # Escrituras que se saltan las señales avisan con tocar()
+        etag = r["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Campus.objects.update(address="Av. Principal")
+            condicional.tocar(Campus)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -3,6 +3,14 @@ from django.contrib import admin
 from .models import Graduate
 
 
+def reindexar(queryset):
+    # update() no dispara señales: el buscador de personas se actualiza aquí
+    from search.models import PersonEntry
+    from search.services import indexar
+    for g in queryset.model.objects.filter(pk__in=queryset.values("pk")):
+        indexar(PersonEntry.GRADUATE, g)
+
+
 @admin.register(Graduate)
 class GraduateAdmin(admin.ModelAdmin):
     list_display = [
@@ -90,9 +98,11 @@ class GraduateAdmin(admin.ModelAdmin):
     @admin.action(description="✅ Activar seleccionados")
     def activate_selected(self, request, queryset):
         updated = queryset.update(is_active=True)
+        reindexar(queryset)
         self.message_user(request, f"{updated} egresado(s) activado(s).")
 
     @admin.action(description="❌ Desactivar seleccionados")
     def deactivate_selected(self, request, queryset):
         updated = queryset.update(is_active=False)
+        reindexar(queryset)
         self.message_user(request, f"{updated} egresado(s) desactivado(s).")
\ No newline at end of file
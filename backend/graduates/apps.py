@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class GraduatesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "graduates"
-    verbose_name = "Verificador de Grados y Títulos"
\ No newline at end of file
+    verbose_name = "Verificador de Grados y Títulos"
+
+    def ready(self):
+        # Invalidación de la constancia pública cacheada (graduates/signals.py)
+        from . import signals  # noqa: F401
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+from common.busqueda import (
+    borrar_indice_trigram, crear_indice_trigram, texto_busqueda,
+)
+
+
+def backfill(apps, schema_editor):
+    Graduate = apps.get_model("graduates", "Graduate")
+    lote = []
+    for g in Graduate.objects.only("id", "dni", "apellidos_nombres").iterator(chunk_size=1000):
+        g.search_text = texto_busqueda(g.dni, g.apellidos_nombres)
+        lote.append(g)
+        if len(lote) >= 1000:
+            Graduate.objects.bulk_update(lote, ["search_text"])
+            lote = []
+    if lote:
+        Graduate.objects.bulk_update(lote, ["search_text"])
+
+
+def trigram(apps, schema_editor):
+    crear_indice_trigram(schema_editor, "graduates_graduate", "search_text",
+                         "graduate_search_trgm")
+
+
+def trigram_reverse(apps, schema_editor):
+    borrar_indice_trigram(schema_editor, "graduate_search_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("graduates", "0003_graduate_registro_pedagogico_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="graduate",
+            name="search_text",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                help_text="DNI + apellidos y nombres normalizados (ver common/busqueda.py).",
+                max_length=300,
+                verbose_name="Texto de búsqueda",
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(trigram, trigram_reverse),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from common.busqueda import texto_busqueda
+
 
 class GradoTituloType(models.Model):
     """
@@ -172,6 +174,17 @@ class Graduate(models.Model):
         default="",
     )
 
+    # ── Búsqueda ──────────────────────────────────────────────────────────
+    search_text = models.CharField(
+        "Texto de búsqueda",
+        max_length=300,
+        blank=True,
+        default="",
+        db_index=True,
+        editable=False,
+        help_text="DNI + apellidos y nombres normalizados (ver common/busqueda.py).",
+    )
+
     # ── Control ───────────────────────────────────────────────────────────
     is_active = models.BooleanField("Activo", default=True)
     created_at = models.DateTimeField("Creado", auto_now_add=True)
@@ -192,6 +205,13 @@ class Graduate(models.Model):
         dni_str = f" (DNI {self.dni})" if self.dni else ""
         return f"{self.apellidos_nombres}{dni_str} — {self.especialidad} [{self.anio_egreso}]"
 
+    def save(self, *args, **kwargs):
+        self.search_text = texto_busqueda(self.dni, self.apellidos_nombres)
+        fields = kwargs.get("update_fields")
+        if fields is not None and set(fields) & {"dni", "apellidos_nombres"}:
+            kwargs["update_fields"] = set(fields) | {"search_text"}
+        super().save(*args, **kwargs)
+
     @property
     def tiene_constancia(self):
         """True si tiene resolución o código de diploma para generar constancia."""
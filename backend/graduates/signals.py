@@ -0,0 +1,19 @@
+"""
+Invalida la constancia pública cacheada (GraduateConstanciaView) al editar
+o borrar el egresado.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.public_cache import invalidar
+
+from .models import Graduate
+from .views import CONSTANCIA_CACHE_NS
+
+
+@receiver([post_save, post_delete], sender=Graduate, dispatch_uid="graduates_constancia_cache")
+def _graduate_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        pk = instance.pk
+        transaction.on_commit(lambda: invalidar(CONSTANCIA_CACHE_NS, pk))
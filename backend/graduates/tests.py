@@ -1,3 +1,5 @@
+import datetime
+
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
@@ -79,6 +81,19 @@ class GraduateSearchAPITest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(len(resp.data["results"]), 0)
 
+    def test_search_by_name_sin_tildes(self):
+        Graduate.objects.create(
+            dni="70000003",
+            apellidos_nombres="NÚÑEZ ROJAS, ANA",
+            especialidad="EDUCACIÓN INICIAL",
+            anio_ingreso="2018",
+            anio_egreso="2022",
+            fecha_sustentacion=datetime.date(2023, 3, 15),
+        )
+        resp = self.client.get("/api/public/graduates/search/", {"nombre": "nunez"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["results"]), 1)
+
 
 class GraduateConstanciaAPITest(TestCase):
     def setUp(self):
@@ -34,6 +34,9 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.busqueda import filtrar_terminos
+from common.public_cache import respuesta_cacheada
+
 from .models import Graduate, GradoTituloType
 from .serializers import (
     GraduatePublicSerializer,
@@ -91,10 +94,7 @@ class GraduateSearchView(APIView):
                 )
             qs = qs.filter(dni=dni)
         else:
-            terms = nombre.upper().split()
-            for term in terms:
-                if len(term) >= 2:
-                    qs = qs.filter(apellidos_nombres__icontains=term)
+            qs = filtrar_terminos(qs, nombre, minimo=2)
 
         qs = qs.select_related("grado_titulo_type").order_by("apellidos_nombres")[:20]
         serializer = GraduatePublicSerializer(qs, many=True)
@@ -321,6 +321,7 @@ MESES = [
 
 DEFAULT_DIRECTOR = "MG. MARIA ELVIRA GARCIA PORRAS"
 DEFAULT_SECRETARIO = "MG. CASTRO MENDOZA, NEISY MARLENI"
+CONSTANCIA_CACHE_NS = "constancia"
 
 
 def _resolve_media_path(url_or_path):
@@ -399,11 +400,16 @@ class GraduateConstanciaView(APIView):
         except Graduate.DoesNotExist:
             return Response({"detail": "Egresado no encontrado."}, status=404)
 
-        pdf_bytes = self._generate_pdf(grad)
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
         filename = f"Constancia_Inscripcion_{grad.dni or grad.id}.pdf"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        # La constancia lleva la fecha de emisión: se cachea por egresado y día
+        # (graduates/signals.py invalida al editar el egresado).
+        return respuesta_cacheada(
+            request, CONSTANCIA_CACHE_NS, grad.pk, datetime.date.today().isoformat(),
+            lambda: (
+                self._generate_pdf(grad), "application/pdf",
+                {"Content-Disposition": f'attachment; filename="{filename}"'},
+            ),
+        )
 
     def _generate_pdf(self, grad):
         from reportlab.lib.colors import HexColor
@@ -4,3 +4,7 @@ class MesaPartesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "mesa_partes"
     verbose_name = "Mesa de Partes"
+
+    def ready(self):
+        # Invalidación del seguimiento público (mesa_partes/signals.py)
+        from . import signals  # noqa: F401
@@ -0,0 +1,141 @@
+"""
+Rollups diarios de Mesa de Partes (ProcedureDailyStat).
+
+`procedures_summary` hacía ~9 agregaciones sobre toda la tabla de trámites en
+cada llamada. Ahora cada trámite aporta a UNA fila del rollup según su día de
+registro, oficina, tipo, estado y canal:
+
+    count += 1, seconds_total += (updated_at - created_at), breached += vencido
+
+Las señales (mesa_partes/signals.py) leen la fila del trámite antes y después
+de guardarlo y aplican la diferencia dentro de la misma transacción, así que
+un rollback deshace también el rollup. Lo que se salta save()
+(queryset.update, SQL directo) se corrige con
+`manage.py rebuild_procedure_stats`.
+
+"Vencidos ahora" (abiertos con plazo < ahora) depende de la hora de la
+consulta, así que no se guarda: sale de un conteo sobre el índice
+(status, deadline_at) de Procedure.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+CERRADOS = ("COMPLETED", "REJECTED")
+_CAMPOS = ("created_at", "updated_at", "deadline_at", "status",
+           "canal_ingreso", "current_office_id", "procedure_type_id")
+
+
+def _models(get_model=None):
+    if get_model is None:
+        from django.apps import apps
+        get_model = apps.get_model
+    return (
+        get_model("mesa_partes", "Procedure"),
+        get_model("mesa_partes", "ProcedureDailyStat"),
+    )
+
+
+def _dia(dt):
+    return timezone.localdate(dt) if timezone.is_aware(dt) else dt.date()
+
+
+def aporte(row):
+    """((día, oficina, tipo, estado, canal), segundos, vencido) de un trámite."""
+    created, updated, deadline = row["created_at"], row["updated_at"], row["deadline_at"]
+    seg = int((updated - created).total_seconds()) if created and updated else 0
+    vencido = int(bool(deadline and updated and deadline < updated and row["status"] != "COMPLETED"))
+    clave = (
+        _dia(created),
+        row["current_office_id"] or 0,
+        row["procedure_type_id"],
+        row["status"],
+        row["canal_ingreso"] or "",
+    )
+    return clave, seg, vencido
+
+
+def leer(pk):
+    """Fila actual del trámite en la BD (None si no existe)."""
+    Procedure, _ = _models()
+    return Procedure.objects.filter(pk=pk).values(*_CAMPOS).first()
+
+
+def _sumar(clave, n, seg, venc):
+    _, Stat = _models()
+    day, office, ptype, status, canal = clave
+    filtro = dict(day=day, office_id=office, procedure_type_id=ptype, status=status, canal=canal)
+    cambios = dict(count=F("count") + n, seconds_total=F("seconds_total") + seg,
+                   breached=F("breached") + venc)
+    if Stat.objects.filter(**filtro).update(**cambios):
+        return
+    try:
+        with transaction.atomic():
+            Stat.objects.create(**filtro, count=n, seconds_total=seg, breached=venc)
+    except IntegrityError:      # otro proceso creó la fila entre medio
+        Stat.objects.filter(**filtro).update(**cambios)
+
+
+def aplicar(antes, despues):
+    """Pasa el aporte del trámite de `antes` a `despues` (filas de `leer`)."""
+    a = aporte(antes) if antes else None
+    d = aporte(despues) if despues else None
+    if a and d and a[0] == d[0]:
+        if a[1:] != d[1:]:
+            _sumar(a[0], 0, d[1] - a[1], d[2] - a[2])
+        return
+    if a:
+        _sumar(a[0], -1, -a[1], -a[2])
+    if d:
+        _sumar(d[0], 1, d[1], d[2])
+
+
+def reconstruir(get_model=None):
+    """Recalcula todo el rollup desde Procedure. Retorna las filas creadas."""
+    Procedure, Stat = _models(get_model)
+    acc = defaultdict(lambda: [0, 0, 0])
+    for row in Procedure.objects.values(*_CAMPOS).iterator(chunk_size=2000):
+        clave, seg, venc = aporte(row)
+        a = acc[clave]
+        a[0] += 1
+        a[1] += seg
+        a[2] += venc
+    with transaction.atomic():
+        Stat.objects.all().delete()
+        Stat.objects.bulk_create([
+            Stat(day=k[0], office_id=k[1], procedure_type_id=k[2], status=k[3], canal=k[4],
+                 count=n, seconds_total=seg, breached=venc)
+            for k, (n, seg, venc) in acc.items()
+        ], batch_size=1000)
+    return len(acc)
+
+
+# ── Lectura ──────────────────────────────────────────────────
+
+def filas(d_from=None, d_to=None, status=None):
+    """QuerySet del rollup con los mismos filtros del resumen."""
+    _, Stat = _models()
+    qs = Stat.objects.filter(count__gt=0)
+    if d_from:
+        qs = qs.filter(day__gte=d_from)
+    if d_to:
+        qs = qs.filter(day__lte=d_to)
+    if status:
+        qs = qs.filter(status=status)
+    return qs
+
+
+def vencidos_ahora(d_from=None, d_to=None, status=None):
+    """Trámites abiertos cuyo plazo ya pasó (conteo en vivo)."""
+    Procedure, _ = _models()
+    qs = Procedure.objects.filter(deadline_at__isnull=False, deadline_at__lt=timezone.now()) \
+        .exclude(status__in=CERRADOS)
+    if d_from:
+        qs = qs.filter(created_at__date__gte=d_from)
+    if d_to:
+        qs = qs.filter(created_at__date__lte=d_to)
+    if status:
+        qs = qs.filter(status=status)
+    return qs.count()
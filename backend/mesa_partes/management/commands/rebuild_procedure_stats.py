@@ -0,0 +1,22 @@
+"""
+rebuild_procedure_stats — recalcula el rollup diario de trámites
+(ProcedureDailyStat) desde la tabla de trámites.
+
+Las señales lo mantienen al guardar/borrar trámites; este comando es para
+después de cargas que se saltan save() (queryset.update, SQL directo,
+restauraciones) o para verificar.
+
+Uso:
+    python manage.py rebuild_procedure_stats
+"""
+from django.core.management.base import BaseCommand
+
+from mesa_partes.estadisticas import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula el rollup diario de trámites de Mesa de Partes."
+
+    def handle(self, *args, **opts):
+        n = reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"Rollup recalculado: {n} filas."))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.10 on 2026-10-19 02:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def poblar(apps, schema_editor):
+    from mesa_partes.estadisticas import reconstruir
+    reconstruir(get_model=apps.get_model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mesa_partes', '0003_office_head'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcedureDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('office_id', models.PositiveIntegerField(default=0)),
+                ('procedure_type_id', models.PositiveIntegerField()),
+                ('status', models.CharField(max_length=16)),
+                ('canal', models.CharField(blank=True, default='', max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('seconds_total', models.BigIntegerField(default=0)),
+                ('breached', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='procedure',
+            index=models.Index(fields=['status', 'deadline_at'], name='proc_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proceduredailystat',
+            index=models.Index(fields=['status', 'day'], name='proc_stat_status_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='proceduredailystat',
+            constraint=models.UniqueConstraint(fields=('day', 'office_id', 'procedure_type_id', 'status', 'canal'), name='uniq_procedure_daily_stat'),
+        ),
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
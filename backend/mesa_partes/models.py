@@ -82,6 +82,8 @@ class Procedure(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # "Vencidos ahora" (abiertos con plazo pasado) se cuenta en vivo
+        indexes = [models.Index(fields=["status", "deadline_at"], name="proc_status_deadline_idx")]
 
     def __str__(self):
         return self.tracking_code
@@ -119,4 +121,29 @@ class ProcedureFile(models.Model):
     uploaded_at   = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.original_name or self.file.name
\ No newline at end of file
+        return self.original_name or self.file.name
+
+class ProcedureDailyStat(models.Model):
+    """
+    Rollup diario de trámites: uno por (día de registro, oficina, tipo,
+    estado, canal). Lo mantiene mesa_partes/estadisticas.py desde las señales
+    de Procedure; el resumen y el reporte SLA leen de aquí.
+    `office_id = 0` es "sin oficina" (un NULL rompería la unicidad).
+    """
+    day               = models.DateField()
+    office_id         = models.PositiveIntegerField(default=0)
+    procedure_type_id = models.PositiveIntegerField()
+    status            = models.CharField(max_length=16)
+    canal             = models.CharField(max_length=20, blank=True, default="")
+    count             = models.IntegerField(default=0)
+    seconds_total     = models.BigIntegerField(default=0)   # Σ(updated_at - created_at)
+    breached          = models.IntegerField(default=0)      # vencidos al último movimiento
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "office_id", "procedure_type_id", "status", "canal"],
+                name="uniq_procedure_daily_stat",
+            ),
+        ]
+        indexes = [models.Index(fields=["status", "day"], name="proc_stat_status_day_idx")]
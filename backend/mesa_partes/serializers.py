@@ -34,13 +34,18 @@ class ProcedureFileSer(serializers.ModelSerializer):
         fields = ["id", "url", "filename", "original_name", "doc_type", "size"]
 
     def get_url(self, obj):
-        request = self.context.get("request")
+        # Nunca la ruta /media/: la descarga pasa por una vista con chequeo
+        # (ProcedureViewSet.download_file, o public_download_file con el código
+        # de seguimiento en el portal) y la transfiere el servidor web.
         if not obj.file:
             return None
-        try:
-            return request.build_absolute_uri(obj.file.url) if request else obj.file.url
-        except Exception:
-            return obj.file.url
+        code = self.context.get("tracking_code")
+        if code:
+            url = f"/api/public/procedures/{code}/files/{obj.id}/download"
+        else:
+            url = f"/api/procedures/{obj.procedure_id}/files/{obj.id}/download"
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
 
     def get_filename(self, obj):
         return obj.original_name or obj.file.name.split("/")[-1]
@@ -0,0 +1,66 @@
+"""
+Invalida la página pública de seguimiento (QR de la carátula) cuando cambia
+el trámite o se le agrega un evento. Corre al confirmar la transacción para
+que un escaneo concurrente no cachee el estado anterior.
+
+También mantiene el rollup diario (mesa_partes/estadisticas.py): la fila del
+trámite se lee antes y después de guardarlo y se aplica la diferencia en la
+misma transacción.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from common.public_cache import invalidar
+
+from . import estadisticas
+from .models import Office, Procedure, ProcedureEvent
+from .views import TRACK_CACHE_NS
+
+
+def _invalidar_codigo(code):
+    if code:
+        transaction.on_commit(lambda: invalidar(TRACK_CACHE_NS, code.strip().upper()))
+
+
+@receiver([post_save, post_delete], sender=Procedure, dispatch_uid="mesa_partes_track_procedure")
+def _procedure_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _invalidar_codigo(instance.tracking_code)
+
+
+@receiver([post_save, post_delete], sender=ProcedureEvent, dispatch_uid="mesa_partes_track_event")
+def _event_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _invalidar_codigo(
+        Procedure.objects.filter(pk=instance.procedure_id).values_list("tracking_code", flat=True).first()
+    )
+
+
+# ── Rollup diario ────────────────────────────────────────────
+
+@receiver([pre_save, pre_delete], sender=Procedure, dispatch_uid="mesa_partes_stat_before")
+def _stat_antes(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._stat_antes = estadisticas.leer(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=Procedure, dispatch_uid="mesa_partes_stat_saved")
+def _stat_guardado(sender, instance, raw=False, **kwargs):
+    if not raw:
+        estadisticas.aplicar(getattr(instance, "_stat_antes", None), estadisticas.leer(instance.pk))
+        instance._stat_antes = None
+
+
+@receiver(post_delete, sender=Procedure, dispatch_uid="mesa_partes_stat_deleted")
+def _stat_borrado(sender, instance, **kwargs):
+    estadisticas.aplicar(getattr(instance, "_stat_antes", None), None)
+    instance._stat_antes = None
+
+
+@receiver(post_delete, sender=Office, dispatch_uid="mesa_partes_stat_office")
+def _stat_oficina(sender, instance, **kwargs):
+    # Los trámites pasan a "sin oficina" con un UPDATE masivo (SET_NULL),
+    # que no dispara señales: se recalcula el rollup completo (es raro).
+    estadisticas.reconstruir()
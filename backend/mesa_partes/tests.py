@@ -1,5 +1,144 @@
+import datetime as dt
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .estadisticas import reconstruir
+from .models import Office, Procedure, ProcedureDailyStat, ProcedureType
+
+User = get_user_model()
+
 
 class Smoke(TestCase):
     def test_ok(self):
         self.assertTrue(True)
+
+
+class ProcedureStatsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("mp_admin", "mp@t.pe", "x")
+        cls.tipo = ProcedureType.objects.create(name="Constancia")
+        cls.office = Office.objects.create(name="Secretaría")
+
+    def setUp(self):
+        self.cli = APIClient()
+        self.cli.force_authenticate(self.user)
+
+    def _crear(self, n, **kw):
+        return [Procedure.objects.create(tracking_code=f"MP-T-{i:03d}", procedure_type=self.tipo,
+                                         applicant_name=f"P{i}", **kw) for i in range(n)]
+
+    def _rollup(self):
+        return sorted(ProcedureDailyStat.objects.filter(count__gt=0)
+                      .values_list("office_id", "status", "count", "breached"))
+
+    def test_rollup_sigue_a_los_cambios(self):
+        p1, p2, p3 = self._crear(3)
+        self.assertEqual(self._rollup(), [(0, "RECEIVED", 3, 0)])
+
+        p1.current_office = self.office
+        p1.status = "IN_REVIEW"
+        p1.deadline_at = timezone.now() - dt.timedelta(days=1)
+        p1.save()
+        p2.delete()
+        esperado = [(0, "RECEIVED", 1, 0), (self.office.id, "IN_REVIEW", 1, 1)]
+        self.assertEqual(self._rollup(), esperado)
+
+        # El mantenimiento incremental coincide con recalcular desde cero
+        reconstruir()
+        self.assertEqual(self._rollup(), esperado)
+
+        self.office.delete()
+        self.assertEqual(self._rollup(), [(0, "IN_REVIEW", 1, 1), (0, "RECEIVED", 1, 0)])
+
+    def test_resumen_desde_el_rollup(self):
+        p1, *_ = self._crear(4)
+        p1.status = "COMPLETED"
+        p1.save()
+        Procedure.objects.filter(pk=p1.pk + 1).update(
+            deadline_at=timezone.now() - dt.timedelta(hours=1))
+
+        r = self.cli.get("/api/procedures/reports/summary")
+        self.assertEqual(r.status_code, 200)
+        s = r.data["summary"]
+        self.assertEqual((s["total"], s["open"], s["sla_breached"]), (4, 3, 1))
+        self.assertEqual(r.data["dashboard"]["by_type"], [{"name": "Constancia", "value": 4}])
+
+        r = self.cli.get("/api/procedures/reports/summary", {"status": "COMPLETED"})
+        self.assertEqual(r.data["summary"]["total"], 1)
+
+    def test_reporte_sla_sin_tope(self):
+        self._crear(3)
+        r = self.cli.get("/api/procedures/reports/sla.xlsx")
+        self.assertEqual(r.status_code, 200)
+        from io import BytesIO
+        from openpyxl import load_workbook
+        wb = load_workbook(BytesIO(r.content))
+        self.assertEqual(wb.sheetnames, ["SLA", "Resumen"])
+        self.assertEqual(wb["SLA"].max_row, 4)
+        self.assertEqual(wb["Resumen"]["C2"].value, 3)
+
+    def test_listado_keyset(self):
+        creados = self._crear(5)
+        r = self.cli.get("/api/procedures", {"limit": 2})
+        self.assertEqual(r.data["total"], 5)
+        ids = [p["id"] for p in r.data["procedures"]]
+        self.assertEqual(ids, [creados[4].id, creados[3].id])
+
+        vistos = list(ids)
+        cursor = r.data["next_cursor"]
+        while cursor:
+            r = self.cli.get("/api/procedures", {"limit": 2, "cursor": cursor})
+            self.assertNotIn("total", r.data)
+            vistos += [p["id"] for p in r.data["procedures"]]
+            cursor = r.data["next_cursor"]
+        self.assertEqual(vistos, [p.id for p in reversed(creados)])
+
+        # Sin limit/cursor la respuesta sigue siendo la lista completa
+        self.assertEqual(len(self.cli.get("/api/procedures").data["procedures"]), 5)
+
+        # La búsqueda del SPA se resuelve en la base, con la misma página
+        r = self.cli.get("/api/procedures", {"limit": 2, "q": "mp-t-003"})
+        self.assertEqual(([p["id"] for p in r.data["procedures"]], r.data["total"]), ([creados[3].id], 1))
+
+
+class AdjuntosProtegidosTest(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        from django.core.files.base import ContentFile
+        from django.test import override_settings
+
+        from .models import ProcedureFile
+
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        ctx = override_settings(MEDIA_ROOT=media)
+        ctx.enable()
+        self.addCleanup(ctx.disable)
+        self.p = Procedure.objects.create(tracking_code="MP-A-001", applicant_name="Ana",
+                                          procedure_type=ProcedureType.objects.create(name="Constancia"))
+        self.pf = ProcedureFile.objects.create(procedure=self.p, original_name="dni.pdf",
+                                               file=ContentFile(b"%PDF-1.4", name="dni.pdf"))
+
+    def test_url_pasa_por_la_vista_de_descarga(self):
+        cli = APIClient()
+        cli.force_authenticate(User.objects.create_user("mp_adj", "adj@t.pe", "x"))
+        f = cli.get(f"/api/procedures/{self.p.id}/files").data["files"][0]
+        self.assertNotIn("/media/", f["url"])
+        self.assertTrue(f["url"].endswith(f"/api/procedures/{self.p.id}/files/{self.pf.id}/download"))
+        self.assertEqual(APIClient().get(f["url"]).status_code, 401)
+        r = cli.get(f["url"])
+        self.assertEqual(b"".join(r.streaming_content), b"%PDF-1.4")
+
+    def test_portal_descarga_con_el_codigo(self):
+        f = APIClient().get("/api/public/procedures/track", {"code": "MP-A-001"}).data["procedure"]["files"][0]
+        self.assertNotIn("/media/", f["url"])
+        r = APIClient().get(f["url"])
+        self.assertEqual(b"".join(r.streaming_content), b"%PDF-1.4")
+        r = APIClient().get(f"/api/public/procedures/MP-OTRO/files/{self.pf.id}/download")
+        self.assertEqual(r.status_code, 404)
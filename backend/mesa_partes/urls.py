@@ -7,7 +7,7 @@ from .views import (
     ProcedureTypeViewSet, ProcedureViewSet,
     dashboard_stats,
     procedures_summary, procedures_report_sla, procedures_report_volume,
-    public_create, public_upload_file, public_track,
+    public_create, public_download_file, public_upload_file, public_track,
     public_procedure_types,
     my_procedures,
     mp_staff_view, mp_staff_detail,
@@ -41,5 +41,7 @@ urlpatterns = [
     re_path(r"^public/procedure-types/?$", public_procedure_types, name="public-procedure-types"),  # ✅ NUEVO
     re_path(r"^public/procedures/?$", public_create, name="public-create"),
     re_path(r"^public/procedures/(?P<code>[^/]+)/files/?$", public_upload_file, name="public-upload"),
+    re_path(r"^public/procedures/(?P<code>[^/]+)/files/(?P<file_id>\d+)/download/?$", public_download_file,
+            name="public-download"),
     re_path(r"^public/procedures/track/?$", public_track, name="public-track"),
 ]
@@ -4,13 +4,17 @@ import uuid
 import datetime as dt
 import io
 import csv
+from collections import Counter
 
 from django.conf import settings
-from django.db.models import F, Count, Avg, ExpressionWrapper, DurationField
+from django.db import transaction
+from django.db.models import Count, Avg, ExpressionWrapper, DurationField, Q, Sum
 from django.db.models.functions import TruncDate
 from django.utils.dateparse import parse_date
 from django.utils import timezone
 from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action, api_view, permission_classes, parser_classes
@@ -31,6 +35,10 @@ from reportlab.platypus import (
 from reportlab.graphics.barcode import qr as qr_module
 from reportlab.graphics.shapes import Drawing
 
+from common.entrega import entregar
+from common.public_cache import respuesta_cacheada
+
+from . import estadisticas
 from .models import Office, ProcedureType, Procedure, ProcedureEvent, ProcedureFile
 from .serializers import (
     OfficeSer, ProcedureTypeSer, ProcedureSer,
@@ -950,6 +958,10 @@ class ProcedureTypeViewSet(viewsets.ModelViewSet):
 #   TRÁMITES (PRIVADO)
 # ════════════════════════════════════════════════════════════════════
 
+_PAGE_DEFAULT = 50
+_PAGE_MAX = 200
+
+
 class ProcedureViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = (
@@ -970,6 +982,10 @@ class ProcedureViewSet(viewsets.ModelViewSet):
         date_from = parse_date(p.get("date_from") or "")
         date_to   = parse_date(p.get("date_to") or "")
         overdue   = p.get("overdue")   # "1" → solo vencidos
+        q         = (p.get("q") or "").strip()
+        if q:
+            qs = qs.filter(Q(tracking_code__icontains=q) | Q(applicant_name__icontains=q)
+                           | Q(applicant_document__icontains=q) | Q(procedure_type__name__icontains=q))
         if status_f:   qs = qs.filter(status=status_f)
         if urgency_f:  qs = qs.filter(urgency_level=urgency_f)
         if canal_f:    qs = qs.filter(canal_ingreso=canal_f)
@@ -983,10 +999,43 @@ class ProcedureViewSet(viewsets.ModelViewSet):
         return qs
 
     def list(self, request, *args, **kwargs):
-        qs   = self.get_queryset().prefetch_related("files")
+        qs = self.get_queryset()
+        p  = request.query_params
+        if "limit" in p or "cursor" in p:
+            return self._page(request, qs)
         data = self.get_serializer(qs, many=True, context={"request": request}).data
         return Response({"procedures": data})
 
+    def _page(self, request, qs):
+        """
+        Página keyset: ?limit=50&cursor=<último id>, del más reciente al más
+        antiguo. Trae una fila de más para saber si hay siguiente; el total
+        solo se cuenta en la primera página (sin cursor).
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get("limit") or _PAGE_DEFAULT), _PAGE_MAX))
+        except (TypeError, ValueError):
+            limit = _PAGE_DEFAULT
+        cursor = request.query_params.get("cursor")
+
+        page_qs = qs.order_by("-id")
+        if cursor:
+            try:
+                page_qs = page_qs.filter(id__lt=int(cursor))
+            except (TypeError, ValueError):
+                return Response({"detail": "cursor inválido."}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows     = list(page_qs[:limit + 1])
+        has_more = len(rows) > limit
+        rows     = rows[:limit]
+        payload  = {
+            "procedures":  self.get_serializer(rows, many=True, context={"request": request}).data,
+            "next_cursor": rows[-1].id if has_more else None,
+        }
+        if not cursor:
+            payload["total"] = qs.count()
+        return Response(payload)
+
     def create(self, request, *args, **kwargs):
         data = request.data.copy()
         data["tracking_code"] = _track_code()
@@ -1086,7 +1135,8 @@ class ProcedureViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["post"], url_path="notify")
     def notify(self, request, pk=None):
-        from django.core.mail import send_mail as django_send_mail
+        """El correo queda en el outbox (notifications/outbox.py); lo envía el worker."""
+        from notifications.outbox import encolar
 
         p        = self.get_object()
         channels = request.data.get("channels", ["EMAIL"])
@@ -1102,48 +1152,29 @@ class ProcedureViewSet(viewsets.ModelViewSet):
             )
 
         results = {}
-
-        # ── EMAIL ──
-        if "EMAIL" in channels:
-            to_email = (p.applicant_email or "").strip()
-            if not to_email:
-                results["email"] = "sin_correo"
-            else:
-                try:
-                    django_send_mail(
-                        subject=subject,
-                        message=message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[to_email],
-                        fail_silently=False,
+        with transaction.atomic():
+            # ── EMAIL ──
+            if "EMAIL" in channels:
+                to_email = (p.applicant_email or "").strip()
+                if not to_email:
+                    results["email"] = "sin_correo"
+                else:
+                    log = encolar(
+                        "MP.NOTIFY", to_email, subject, text=message,
+                        payload={"tracking_code": p.tracking_code, "message": message},
                     )
-                    results["email"] = "sent"
-                except Exception as exc:
-                    results["email"] = f"error: {exc}"
-            # Log
-            try:
-                from notifications.models import NotificationLog
-                NotificationLog.objects.create(
-                    event_key="MP.NOTIFY", channel="EMAIL",
-                    to=to_email,
-                    subject=subject,
-                    payload={"tracking_code": p.tracking_code, "message": message},
-                    rendered={"subject": subject, "html": message},
-                    status="SENT" if results.get("email") == "sent" else "ERROR",
-                    error="" if results.get("email") == "sent" else str(results.get("email", "")),
-                )
-            except Exception:
-                pass
+                    results["email"] = "queued"
+                    results["email_log_id"] = log.id
 
-        # ── SMS (requiere proveedor externo) ──
-        if "SMS" in channels:
-            results["sms"] = "no_provider"
+            # ── SMS (requiere proveedor externo) ──
+            if "SMS" in channels:
+                results["sms"] = "no_provider"
 
-        ProcedureEvent.objects.create(
-            procedure=p, type="NOTIFIED",
-            description=f"Canales: {', '.join(channels)}. Asunto: {subject}",
-            actor=request.user,
-        )
+            ProcedureEvent.objects.create(
+                procedure=p, type="NOTIFIED",
+                description=f"Canales: {', '.join(channels)}. Asunto: {subject}",
+                actor=request.user,
+            )
         return Response({"ok": True, "results": results})
 
     # ── Archivos ────────────────────────────────────────────────────
@@ -1166,7 +1197,7 @@ class ProcedureViewSet(viewsets.ModelViewSet):
             procedure=p, type="FILE_UPLOADED",
             description=pf.original_name, actor=request.user
         )
-        return Response(ProcedureFileSer(pf).data, status=201)
+        return Response(ProcedureFileSer(pf, context={"request": request}).data, status=201)
 
     @action(detail=True, methods=["delete"], url_path=r"files/(?P<file_id>\d+)")
     def delete_file(self, request, pk=None, file_id=None):
@@ -1184,6 +1215,18 @@ class ProcedureViewSet(viewsets.ModelViewSet):
         )
         return Response(status=204)
 
+    @action(detail=True, methods=["get"], url_path=r"files/(?P<file_id>\d+)/download")
+    def download_file(self, request, pk=None, file_id=None):
+        # Permiso vía get_object(); la transferencia la hace nginx (common/entrega.py)
+        p = self.get_object()
+        try:
+            pf = p.files.get(id=file_id)
+        except ProcedureFile.DoesNotExist:
+            return Response(status=404)
+        if not pf.file:
+            return Response(status=404)
+        return entregar(pf.file, filename=pf.original_name or None)
+
     # ── PDFs ────────────────────────────────────────────────────────
     @action(detail=True, methods=["get", "post"], url_path="cover",
             permission_classes=[IsAuthenticated])
@@ -1300,7 +1343,19 @@ def public_upload_file(request, code):
         procedure=p, type="FILE_UPLOADED_PUBLIC",
         description=pf.original_name
     )
-    return Response(ProcedureFileSer(pf).data, status=201)
+    return Response(ProcedureFileSer(pf, context={"request": request, "tracking_code": code}).data,
+                    status=201)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def public_download_file(request, code, file_id):
+    # El código de seguimiento es la credencial del ciudadano, como en public_track
+    pf = (ProcedureFile.objects.filter(procedure__tracking_code=code, id=file_id)
+          .only("file", "original_name").first())
+    if pf is None or not pf.file:
+        return Response(status=404)
+    return entregar(pf.file, filename=pf.original_name or None)
 
 
 @api_view(["GET"])
@@ -1318,7 +1373,8 @@ def public_track(request):
     data             = ProcedureSer(p).data
     data["timeline"] = ProcedureEventSer(p.events.order_by("-at"), many=True).data
     # Incluir archivos para que el tracking los muestre
-    data["files"]    = ProcedureFileSer(p.files.all(), many=True, context={"request": request}).data
+    data["files"]    = ProcedureFileSer(p.files.all(), many=True,
+                                        context={"request": request, "tracking_code": p.tracking_code}).data
     return Response({"procedure": data})
 
 
@@ -1326,15 +1382,25 @@ def public_track(request):
 #   PÁGINA PÚBLICA DE SEGUIMIENTO (HTML — QR de carátula)
 # ════════════════════════════════════════════════════════════════════
 
-def track_procedure_page(request, code=""):
-    """
-    Página HTML pública para seguimiento de trámite (accesible vía QR).
-    No depende del frontend React — renderiza HTML completo desde Django.
-    GET /public/procedures/track/<code>
-    """
-    from django.http import HttpResponse as HR
-
-    code = (code or request.GET.get("code", "")).strip().upper()
+TRACK_CACHE_NS = "tracking"
+
+_TRACK_IC = {k: mark_safe(v) for k, v in {
+    "file":   '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M14 2H6a2 2 0 00-2 2v16a2 2 0 002 2h12a2 2 0 002-2V8z"/><polyline points="14 2 14 8 20 8"/></svg>',
+    "search": '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="11" cy="11" r="8"/><line x1="21" y1="21" x2="16.65" y2="16.65"/></svg>',
+    "check":  '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M9 12l2 2 4-4m5.618-4.016A11.955 11.955 0 0112 2.944a11.955 11.955 0 01-8.618 3.04A12.02 12.02 0 003 9c0 5.591 3.824 10.29 9 11.622 5.176-1.332 9-6.03 9-11.622 0-1.042-.133-2.052-.382-3.016z"/></svg>',
+    "alert":  '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="12" cy="12" r="10"/><line x1="12" y1="8" x2="12" y2="12"/><line x1="12" y1="16" x2="12.01" y2="16"/></svg>',
+    "clock":  '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="12" cy="12" r="10"/><polyline points="12 6 12 12 16 14"/></svg>',
+    "user":   '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M20 21v-2a4 4 0 00-4-4H8a4 4 0 00-4 4v2"/><circle cx="12" cy="7" r="4"/></svg>',
+    "id":     '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="2" y="5" width="20" height="14" rx="2"/><line x1="2" y1="10" x2="22" y2="10"/></svg>',
+    "office": '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M3 9l9-7 9 7v11a2 2 0 01-2 2H5a2 2 0 01-2-2z"/><polyline points="9 22 9 12 15 12 15 22"/></svg>',
+    "tag":    '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M20.59 13.41l-7.17 7.17a2 2 0 01-2.83 0L2 12V2h10l8.59 8.59a2 2 0 010 2.82z"/><line x1="7" y1="7" x2="7.01" y2="7"/></svg>',
+    "cal":    '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="3" y="4" width="18" height="18" rx="2"/><line x1="16" y1="2" x2="16" y2="6"/><line x1="8" y1="2" x2="8" y2="6"/><line x1="3" y1="10" x2="21" y2="10"/></svg>',
+    "dot":    '<svg viewBox="0 0 24 24" fill="currentColor"><circle cx="12" cy="12" r="5"/></svg>',
+}.items()}
+
+
+def _datos_tramite(code):
+    """(datos del trámite, línea de tiempo, mensaje de error) del código."""
     procedure_data = None
     timeline_data = []
     error_msg = None
@@ -1388,9 +1454,10 @@ def track_procedure_page(request, code=""):
                 "NOTIFIED": ("Notificación enviada", "#059669", "#d1fae5"),
                 "COMMENT": ("Comentario", "#6b7280", "#f3f4f6"),
             }
-            for ev in events:
+            for i, ev in enumerate(events):
                 et = event_type_map.get(ev.type, (ev.type, "#6b7280", "#f3f4f6"))
                 timeline_data.append({
+                    "delay": f"{0.15 + i * 0.05:.2f}",
                     "date": ev.at.strftime("%d/%m/%Y %H:%M") if ev.at else "",
                     "label": et[0],
                     "color": et[1],
@@ -1400,313 +1467,35 @@ def track_procedure_page(request, code=""):
 
         except Procedure.DoesNotExist:
             error_msg = f"No se encontró ningún trámite con el código {code}."
-    elif request.GET.get("code"):
-        error_msg = "Código de trámite no válido."
-
-    # ── Institution info ──
-    inst = _get_institution_data()
-    inst_name = inst["name"]
-
-    # ── SVG Icons ──
-    IC = {
-        "file":   '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M14 2H6a2 2 0 00-2 2v16a2 2 0 002 2h12a2 2 0 002-2V8z"/><polyline points="14 2 14 8 20 8"/></svg>',
-        "search": '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="11" cy="11" r="8"/><line x1="21" y1="21" x2="16.65" y2="16.65"/></svg>',
-        "check":  '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M9 12l2 2 4-4m5.618-4.016A11.955 11.955 0 0112 2.944a11.955 11.955 0 01-8.618 3.04A12.02 12.02 0 003 9c0 5.591 3.824 10.29 9 11.622 5.176-1.332 9-6.03 9-11.622 0-1.042-.133-2.052-.382-3.016z"/></svg>',
-        "alert":  '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="12" cy="12" r="10"/><line x1="12" y1="8" x2="12" y2="12"/><line x1="12" y1="16" x2="12.01" y2="16"/></svg>',
-        "clock":  '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="12" cy="12" r="10"/><polyline points="12 6 12 12 16 14"/></svg>',
-        "user":   '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M20 21v-2a4 4 0 00-4-4H8a4 4 0 00-4 4v2"/><circle cx="12" cy="7" r="4"/></svg>',
-        "id":     '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="2" y="5" width="20" height="14" rx="2"/><line x1="2" y1="10" x2="22" y2="10"/></svg>',
-        "office": '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M3 9l9-7 9 7v11a2 2 0 01-2 2H5a2 2 0 01-2-2z"/><polyline points="9 22 9 12 15 12 15 22"/></svg>',
-        "tag":    '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M20.59 13.41l-7.17 7.17a2 2 0 01-2.83 0L2 12V2h10l8.59 8.59a2 2 0 010 2.82z"/><line x1="7" y1="7" x2="7.01" y2="7"/></svg>',
-        "cal":    '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="3" y="4" width="18" height="18" rx="2"/><line x1="16" y1="2" x2="16" y2="6"/><line x1="8" y1="2" x2="8" y2="6"/><line x1="3" y1="10" x2="21" y2="10"/></svg>',
-        "dot":    '<svg viewBox="0 0 24 24" fill="currentColor"><circle cx="12" cy="12" r="5"/></svg>',
-    }
 
-    d = procedure_data  # shortcut
-
-    # ── Build detail fields ──
-    def _field(icon_svg, label, val, full_width=False):
-        if not val or val == "—":
-            return ""
-        w = "grid-column:1/-1;" if full_width else ""
-        return f'''<div class="fd" style="{w}">
-            <div class="fd-icon">{icon_svg}</div>
-            <div class="fd-txt"><span class="fd-lbl">{label}</span><span class="fd-val">{val}</span></div>
-        </div>'''
-
-    # ── Status badge ──
-    badge_html = ""
-    if d:
-        badge_html = f'<span class="badge" style="--bc:{d["status_color"]};--bg:{d["status_bg"]};">{d["status_label"]}</span>'
-
-    # ── Found banner ──
-    found_html = ""
-    if d:
-        found_html = f'''
-        <div class="verified-card fade-in">
-            <div class="verified-icon">{IC["check"]}</div>
-            <div class="verified-txt">
-                <strong>Trámite Localizado</strong>
-                <span>El expediente <b>{d["tracking_code"]}</b> se encuentra registrado en el sistema de Mesa de Partes.</span>
-            </div>
-            {badge_html}
-        </div>'''
-
-    # ── Detail card ──
-    detail_html = ""
-    if d:
-        fields = ""
-        fields += _field(IC["file"],   "N° Expediente", d["tracking_code"])
-        fields += _field(IC["tag"],    "Tipo de trámite", d["type"])
-        fields += _field(IC["office"], "Canal de ingreso", d["canal"])
-        fields += _field(IC["clock"],  "Urgencia", d["urgency"])
-        fields += _field(IC["cal"],    "Fecha de registro", d["created_at"])
-        fields += _field(IC["office"], "Oficina actual", d["office"])
-        fields += _field(IC["user"],   "Solicitante", d["applicant_name"], True)
-        fields += _field(IC["id"],     "N° Documento", d["applicant_document"])
-        fields += _field(IC["file"],   "Asunto", d["description"], True)
-
-        detail_html = f'''
-        <div class="card fade-in" style="animation-delay:.1s;">
-            <div class="card-head">
-                <div>
-                    <p class="card-title">{d["tracking_code"]}</p>
-                    <p class="card-sub">{d["type"]}</p>
-                </div>
-                {badge_html}
-            </div>
-            <div class="card-body">
-                <div class="fields-grid">
-                    {fields}
-                </div>
-            </div>
-        </div>'''
-
-    # ── Timeline ──
-    timeline_html = ""
-    if timeline_data:
-        items = ""
-        for i, ev in enumerate(timeline_data):
-            delay = f"animation-delay:{0.15 + i * 0.05:.2f}s;"
-            desc_html = f'<p class="tl-desc">{ev["description"]}</p>' if ev["description"] else ""
-            items += f'''
-            <div class="tl-item fade-in" style="{delay}">
-                <div class="tl-dot" style="background:{ev["color"]};"></div>
-                <div class="tl-content">
-                    <div class="tl-head">
-                        <span class="tl-label" style="color:{ev["color"]};background:{ev["bg"]};">{ev["label"]}</span>
-                        <span class="tl-date">{ev["date"]}</span>
-                    </div>
-                    {desc_html}
-                </div>
-            </div>'''
-        timeline_html = f'''
-        <div class="card fade-in" style="animation-delay:.2s;">
-            <div class="card-head">
-                <div>
-                    <p class="card-title">Trazabilidad</p>
-                    <p class="card-sub">Historial de movimientos del expediente</p>
-                </div>
-            </div>
-            <div class="card-body" style="flex-direction:column;gap:0;">
-                <div class="timeline">
-                    {items}
-                </div>
-            </div>
-        </div>'''
-
-    # ── Error ──
-    error_html = ""
-    if error_msg:
-        error_html = f'''
-        <div class="alert-card alert-warn fade-in">
-            <div class="alert-icon">{IC["alert"]}</div>
-            <div>
-                <strong>Trámite no encontrado</strong>
-                <p>{error_msg}</p>
-            </div>
-        </div>'''
-
-    # ── Empty state ──
-    empty_html = ""
-    if not d and not error_msg:
-        empty_html = f'''
-        <div class="empty-state">
-            <div class="empty-icon">{IC["search"]}</div>
-            <strong>Seguimiento de Trámite</strong>
-            <p>Ingrese el código de expediente (ej: MP-2026-XXXXXX) para consultar el estado de su trámite.</p>
-        </div>'''
-
-    html = f'''<!DOCTYPE html>
-<html lang="es">
-<head>
-<meta charset="utf-8">
-<meta name="viewport" content="width=device-width,initial-scale=1">
-<title>Seguimiento de Trámite — IESPP "{inst_name}"</title>
-<link rel="preconnect" href="https://fonts.googleapis.com">
-<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800;900&display=swap" rel="stylesheet">
-<style>
-*{{margin:0;padding:0;box-sizing:border-box}}
-body{{font-family:'Inter',system-ui,-apple-system,sans-serif;background:#f0f2f5;min-height:100vh;color:#1a1a2e}}
-
-/* Header */
-.hdr{{background:linear-gradient(135deg,#0f172a 0%,#1e293b 50%,#0f172a 100%);color:#fff;position:relative;overflow:hidden}}
-.hdr::before{{content:'';position:absolute;inset:0;background:radial-gradient(ellipse at 30% 0%,rgba(99,102,241,.25) 0%,transparent 60%),radial-gradient(ellipse at 80% 100%,rgba(59,130,246,.15) 0%,transparent 50%)}}
-.hdr-inner{{max-width:720px;margin:0 auto;padding:28px 20px 36px;position:relative;z-index:1}}
-.hdr-top{{display:flex;align-items:center;gap:14px}}
-.hdr-logo{{width:48px;height:48px;border-radius:14px;background:rgba(255,255,255,.1);border:1px solid rgba(255,255,255,.15);display:flex;align-items:center;justify-content:center;backdrop-filter:blur(8px)}}
-.hdr-logo svg{{width:24px;height:24px;color:#818cf8}}
-.hdr h1{{font-size:20px;font-weight:800;letter-spacing:-.03em}}
-.hdr p{{font-size:12px;color:#94a3b8;margin-top:2px}}
-.hdr-badge{{display:inline-flex;align-items:center;gap:6px;margin-top:14px;padding:6px 14px;border-radius:20px;background:rgba(99,102,241,.15);border:1px solid rgba(99,102,241,.25);font-size:11px;font-weight:700;color:#a5b4fc;letter-spacing:.03em;text-transform:uppercase}}
-.hdr-badge svg{{width:14px;height:14px}}
-.back-btn{{position:absolute;top:28px;right:20px;color:rgba(255,255,255,.4);text-decoration:none;font-size:13px;font-weight:600;display:flex;align-items:center;gap:4px;transition:color .15s}}
-.back-btn:hover{{color:#fff}}
-
-/* Container */
-.container{{max-width:720px;margin:-20px auto 0;padding:0 16px 48px;position:relative;z-index:2}}
-
-/* Search */
-.search-card{{background:#fff;border-radius:16px;padding:24px;box-shadow:0 1px 3px rgba(0,0,0,.08),0 8px 24px rgba(0,0,0,.04);border:1px solid #e5e7eb}}
-.search-label{{font-size:11px;font-weight:700;color:#6b7280;text-transform:uppercase;letter-spacing:.06em;margin-bottom:10px}}
-.search-form{{display:flex;gap:10px}}
-.search-input-wrap{{flex:1;position:relative}}
-.search-input-wrap svg{{position:absolute;left:14px;top:50%;transform:translateY(-50%);width:18px;height:18px;color:#9ca3af}}
-.search-input{{width:100%;height:48px;padding:0 14px 0 42px;border-radius:12px;border:2px solid #e5e7eb;background:#fafafa;font-size:15px;font-weight:500;color:#1a1a2e;transition:all .2s;font-family:inherit;text-transform:uppercase}}
-.search-input:focus{{outline:none;border-color:#6366f1;background:#fff;box-shadow:0 0 0 4px rgba(99,102,241,.1)}}
-.search-input::placeholder{{color:#9ca3af;font-weight:400;text-transform:none}}
-.search-btn{{height:48px;padding:0 24px;border-radius:12px;background:linear-gradient(135deg,#4f46e5,#6366f1);color:#fff;font-size:15px;font-weight:700;border:none;cursor:pointer;display:flex;align-items:center;gap:8px;transition:all .2s;font-family:inherit;box-shadow:0 2px 8px rgba(99,102,241,.3)}}
-.search-btn:hover{{background:linear-gradient(135deg,#4338ca,#4f46e5);transform:translateY(-1px);box-shadow:0 4px 12px rgba(99,102,241,.4)}}
-.search-btn:active{{transform:translateY(0)}}
-.search-btn svg{{width:16px;height:16px}}
-
-/* Verified banner */
-.verified-card{{background:linear-gradient(135deg,#ecfdf5,#d1fae5);border:1px solid #86efac;border-radius:14px;padding:18px 20px;display:flex;align-items:center;gap:14px;margin-top:20px}}
-.verified-icon{{width:44px;height:44px;border-radius:12px;background:#fff;border:1px solid #86efac;display:flex;align-items:center;justify-content:center;flex-shrink:0;box-shadow:0 2px 6px rgba(16,185,129,.15)}}
-.verified-icon svg{{width:22px;height:22px;color:#059669}}
-.verified-txt{{flex:1}}
-.verified-txt strong{{font-size:14px;color:#065f46;display:block}}
-.verified-txt span{{font-size:12px;color:#047857;margin-top:2px;display:block;line-height:1.4}}
-
-/* Badge */
-.badge{{padding:5px 14px;border-radius:20px;font-size:11px;font-weight:800;color:var(--bc);background:var(--bg);border:1.5px solid var(--bc);letter-spacing:.02em;white-space:nowrap;flex-shrink:0}}
-
-/* Card */
-.card{{background:#fff;border-radius:16px;overflow:hidden;box-shadow:0 1px 3px rgba(0,0,0,.08),0 8px 24px rgba(0,0,0,.04);border:1px solid #e5e7eb;margin-top:16px}}
-.card-head{{background:linear-gradient(135deg,#0f172a,#1e293b);padding:20px 24px;display:flex;align-items:center;justify-content:space-between;gap:12px}}
-.card-title{{color:#fff;font-size:18px;font-weight:800;letter-spacing:-.02em}}
-.card-sub{{color:#94a3b8;font-size:12px;margin-top:3px}}
-.card-body{{padding:24px;display:flex;gap:24px;flex-wrap:wrap}}
-
-/* Fields grid */
-.fields-grid{{flex:1;min-width:280px;display:grid;grid-template-columns:1fr 1fr;gap:0}}
-.fd{{display:flex;align-items:flex-start;gap:10px;padding:12px 8px;border-bottom:1px solid #f1f5f9;transition:background .15s}}
-.fd:hover{{background:#fafbff}}
-.fd-icon{{width:28px;height:28px;border-radius:8px;background:#f0f0ff;display:flex;align-items:center;justify-content:center;flex-shrink:0;margin-top:1px}}
-.fd-icon svg{{width:14px;height:14px;color:#6366f1}}
-.fd-txt{{min-width:0}}
-.fd-lbl{{display:block;font-size:10px;font-weight:700;color:#9ca3af;text-transform:uppercase;letter-spacing:.05em}}
-.fd-val{{display:block;font-size:13px;font-weight:600;color:#1e293b;margin-top:1px;word-break:break-word}}
-
-/* Timeline */
-.timeline{{width:100%;position:relative;padding-left:20px}}
-.tl-item{{display:flex;gap:12px;padding:14px 0;border-bottom:1px solid #f1f5f9;position:relative}}
-.tl-item:last-child{{border-bottom:none}}
-.tl-item::before{{content:'';position:absolute;left:-14px;top:0;bottom:0;width:2px;background:#e5e7eb}}
-.tl-item:first-child::before{{top:22px}}
-.tl-item:last-child::before{{bottom:50%}}
-.tl-dot{{width:10px;height:10px;border-radius:50%;flex-shrink:0;margin-top:5px;position:relative;z-index:1;margin-left:-19px;border:2px solid #fff;box-shadow:0 0 0 2px currentColor}}
-.tl-content{{flex:1;min-width:0}}
-.tl-head{{display:flex;align-items:center;gap:8px;flex-wrap:wrap}}
-.tl-label{{font-size:11px;font-weight:700;padding:2px 10px;border-radius:12px;white-space:nowrap}}
-.tl-date{{font-size:11px;color:#94a3b8;font-weight:500}}
-.tl-desc{{font-size:12px;color:#64748b;margin-top:4px;line-height:1.4}}
-
-/* Alert */
-.alert-card{{border-radius:14px;padding:18px 20px;display:flex;align-items:flex-start;gap:12px;margin-top:20px}}
-.alert-warn{{background:#fffbeb;border:1px solid #fcd34d}}
-.alert-icon{{width:36px;height:36px;border-radius:10px;display:flex;align-items:center;justify-content:center;flex-shrink:0}}
-.alert-warn .alert-icon{{background:#fef3c7}}
-.alert-warn .alert-icon svg{{width:18px;height:18px;color:#d97706}}
-.alert-card strong{{font-size:14px;color:#92400e;display:block}}
-.alert-card p{{font-size:12px;color:#a16207;margin-top:3px;line-height:1.4}}
-
-/* Empty state */
-.empty-state{{text-align:center;padding:64px 24px;margin-top:20px;background:#fff;border-radius:16px;border:2px dashed #e5e7eb}}
-.empty-icon{{width:64px;height:64px;border-radius:18px;background:linear-gradient(135deg,#f1f5f9,#e2e8f0);display:flex;align-items:center;justify-content:center;margin:0 auto 18px}}
-.empty-icon svg{{width:28px;height:28px;color:#94a3b8}}
-.empty-state strong{{display:block;font-size:16px;color:#64748b}}
-.empty-state p{{font-size:13px;color:#94a3b8;margin-top:6px;max-width:360px;margin-left:auto;margin-right:auto;line-height:1.5}}
-
-/* Footer */
-.footer{{text-align:center;padding:24px 16px;margin-top:8px}}
-.footer p{{font-size:11px;color:#94a3b8}}
-.footer a{{color:#6366f1;text-decoration:none;font-weight:600}}
-.footer a:hover{{text-decoration:underline}}
-
-/* Animation */
-@keyframes fadeUp{{from{{opacity:0;transform:translateY(12px)}}to{{opacity:1;transform:none}}}}
-.fade-in{{animation:fadeUp .4s ease both}}
-
-/* Mobile */
-@media(max-width:640px){{
-    .hdr-inner{{padding:20px 16px 28px}}
-    .hdr h1{{font-size:17px}}
-    .search-form{{flex-direction:column}}
-    .search-btn{{width:100%;justify-content:center}}
-    .fields-grid{{grid-template-columns:1fr}}
-    .card-head{{flex-direction:column;align-items:flex-start;gap:8px}}
-    .verified-card{{flex-direction:column;text-align:center;gap:10px}}
-    .badge{{align-self:center}}
-    .back-btn{{display:none}}
-}}
-</style>
-</head>
-<body>
-
-<div class="hdr">
-    <div class="hdr-inner">
-        <a href="https://academico.iesppallende.edu.pe" class="back-btn">&#8592; Volver al inicio</a>
-        <div class="hdr-top">
-            <div class="hdr-logo">{IC["file"]}</div>
-            <div>
-                <h1>Seguimiento de Trámite</h1>
-                <p>IESPP "{inst_name}" — Mesa de Partes Virtual</p>
-            </div>
-        </div>
-        <div class="hdr-badge">{IC["check"]} Consulta pública</div>
-    </div>
-</div>
-
-<div class="container">
-    <div class="search-card fade-in">
-        <div class="search-label">Buscar expediente por código</div>
-        <form method="get" action="/public/procedures/track" class="search-form">
-            <div class="search-input-wrap">
-                {IC["search"]}
-                <input type="text" name="code" value="{code}" placeholder="Ej: MP-2026-XXXXXX"
-                       class="search-input" autocomplete="off">
-            </div>
-            <button type="submit" class="search-btn">{IC["search"]} Buscar</button>
-        </form>
-    </div>
-
-    {found_html}
-    {detail_html}
-    {timeline_html}
-    {error_html}
-    {empty_html}
-
-    <div class="footer">
-        <p>IESPP "{inst_name}" &mdash; Mesa de Partes Virtual<br>
-        <a href="https://academico.iesppallende.edu.pe">Volver al portal principal</a></p>
-    </div>
-</div>
-
-</body>
-</html>'''
-
-    return HR(html, content_type="text/html; charset=utf-8")
+    return procedure_data, timeline_data, error_msg
+
+
+def _render_tracking(code):
+    d, timeline, error_msg = _datos_tramite(code) if code else (None, [], None)
+    html = render_to_string("public/seguimiento_tramite.html", {
+        "d": d,
+        "timeline": timeline,
+        "error_msg": error_msg,
+        "code": code,
+        "inst": _get_institution_data(),
+        "ic": _TRACK_IC,
+    })
+    return html, "text/html; charset=utf-8"
+
+
+def track_procedure_page(request, code=""):
+    """
+    Página HTML pública para seguimiento de trámite (accesible vía QR).
+    No depende del frontend React — renderiza HTML completo desde Django.
+    GET /public/procedures/track/<code>
+
+    Plantilla: mesa_partes/templates/public/seguimiento_tramite.html.
+    Se cachea por código (common/public_cache.py) y mesa_partes/signals.py
+    la invalida cuando cambia el trámite o se le agrega un evento.
+    """
+    code = (code or request.GET.get("code", "")).strip().upper()
+    return respuesta_cacheada(request, TRACK_CACHE_NS, code, "", lambda: _render_tracking(code))
 
 
 # ════════════════════════════════════════════════════════════════════
@@ -1716,52 +1505,41 @@ body{{font-family:'Inter',system-ui,-apple-system,sans-serif;background:#f0f2f5;
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def procedures_summary(request):
-    qs           = Procedure.objects.all()
+    """Resumen del tablero, desde el rollup diario (mesa_partes/estadisticas.py)."""
     q            = request.query_params
     d_from       = parse_date(q.get("from") or "")
     d_to         = parse_date(q.get("to") or "")
     status_param = q.get("status")
 
-    if d_from:        qs = qs.filter(created_at__date__gte=d_from)
-    if d_to:          qs = qs.filter(created_at__date__lte=d_to)
-    if status_param:  qs = qs.filter(status=status_param)
-
-    total = qs.count()
-    if total > 0:
-        rows     = list(qs.values_list("created_at", "updated_at"))
-        avg_days = round(sum((u - c).total_seconds() for c, u in rows) / total / 86400, 2)
-    else:
-        avg_days = None
-
-    now          = timezone.now()
-    overdue      = qs.filter(deadline_at__isnull=False, deadline_at__lt=F("updated_at")).exclude(status="COMPLETED").count()
-    in_review    = qs.filter(status="IN_REVIEW").count()
-    open_count   = qs.exclude(status__in=["COMPLETED", "REJECTED"]).count()
-    sla_breached = qs.filter(deadline_at__isnull=False, deadline_at__lt=now).exclude(status__in=["COMPLETED", "REJECTED"]).count()
-
-    # Desglose por estado
-    by_status = [
-        {"name": r["status"], "value": r["count"]}
-        for r in qs.values("status").annotate(count=Count("id")).order_by("-count")
-    ]
-    # Desglose por tipo de trámite
-    by_type = [
-        {"name": r["procedure_type__name"] or "Sin tipo", "value": r["count"]}
-        for r in qs.values("procedure_type__name").annotate(count=Count("id")).order_by("-count")[:10]
-    ]
-    # Desglose por canal de ingreso
-    by_canal = [
-        {"name": r["canal_ingreso"] or "—", "value": r["count"]}
-        for r in qs.values("canal_ingreso").annotate(count=Count("id")).order_by("-count")
-    ] if hasattr(Procedure, "canal_ingreso") else []
-
-    since = now.date() - dt.timedelta(days=29)
-    trend = [
-        {"date": str(r["d"]), "value": r["count"]}
-        for r in qs.filter(created_at__date__gte=since)
-            .annotate(d=TruncDate("created_at"))
-            .values("d").annotate(count=Count("id")).order_by("d")
-    ]
+    now   = timezone.now()
+    since = timezone.localdate(now) - dt.timedelta(days=29)
+
+    total = seconds = overdue = 0
+    por_estado, por_tipo, por_canal, por_dia = Counter(), Counter(), Counter(), Counter()
+    for r in (estadisticas.filas(d_from, d_to, status_param)
+              .values_list("day", "procedure_type_id", "status", "canal")
+              .annotate(n=Sum("count"), seg=Sum("seconds_total"), venc=Sum("breached"))):
+        day, ptype, st, canal, n, seg, venc = r
+        total   += n
+        seconds += seg
+        overdue += venc
+        por_estado[st]     += n
+        por_tipo[ptype]    += n
+        por_canal[canal]   += n
+        if day >= since:
+            por_dia[day] += n
+
+    avg_days     = round(seconds / total / 86400, 2) if total else None
+    in_review    = por_estado.get("IN_REVIEW", 0)
+    open_count   = sum(n for st, n in por_estado.items() if st not in estadisticas.CERRADOS)
+    sla_breached = estadisticas.vencidos_ahora(d_from, d_to, status_param)
+
+    nombres = dict(ProcedureType.objects.filter(id__in=list(por_tipo)).values_list("id", "name"))
+    # Desglose por estado / tipo de trámite / canal de ingreso
+    by_status = [{"name": st, "value": n} for st, n in por_estado.most_common()]
+    by_type   = [{"name": nombres.get(t) or "Sin tipo", "value": n} for t, n in por_tipo.most_common(10)]
+    by_canal  = [{"name": c or "—", "value": n} for c, n in por_canal.most_common()]
+    trend     = [{"date": str(d), "value": por_dia[d]} for d in sorted(por_dia)]
 
     return Response({
         "summary":   {
@@ -1778,45 +1556,84 @@ def procedures_summary(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def procedures_report_sla(request):
-    """Exporta datos SLA en formato XLSX."""
+    """
+    Exporta datos SLA en formato XLSX: detalle de TODOS los trámites (hoja
+    "SLA", escrita en streaming) + resumen por oficina y tipo desde el rollup.
+    Acepta los mismos filtros ?from=&to=&status= que el resumen.
+    """
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "SLA"
+    q            = request.query_params
+    d_from       = parse_date(q.get("from") or "")
+    d_to         = parse_date(q.get("to") or "")
+    status_param = q.get("status")
 
-    headers = ["ID", "Código", "Tipo", "Estado", "Fecha Registro",
-               "Fecha Actualización", "Días Transcurridos", "Plazo", "Vencido"]
+    wb = Workbook(write_only=True)
     header_font = Font(bold=True, color="FFFFFF", size=10)
     header_fill = PatternFill(start_color="1E3A5F", end_color="1E3A5F", fill_type="solid")
-    for col, h in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=h)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
 
-    now = timezone.now()
-    row_num = 2
-    for p in Procedure.objects.select_related("procedure_type").all()[:2000]:
-        dias = round((p.updated_at - p.created_at).total_seconds() / 86400, 1)
-        vencido = "Sí" if (p.deadline_at and p.deadline_at < now
-                           and p.status not in ["COMPLETED", "REJECTED"]) else "No"
-        ws.cell(row=row_num, column=1, value=p.id)
-        ws.cell(row=row_num, column=2, value=p.tracking_code)
-        ws.cell(row=row_num, column=3, value=getattr(p.procedure_type, "name", "—") if p.procedure_type else "—")
-        ws.cell(row=row_num, column=4, value=p.status)
-        ws.cell(row=row_num, column=5, value=p.created_at.strftime("%d/%m/%Y %H:%M") if p.created_at else "—")
-        ws.cell(row=row_num, column=6, value=p.updated_at.strftime("%d/%m/%Y %H:%M") if p.updated_at else "—")
-        ws.cell(row=row_num, column=7, value=dias)
-        ws.cell(row=row_num, column=8, value=p.deadline_at.strftime("%d/%m/%Y") if p.deadline_at else "—")
-        ws.cell(row=row_num, column=9, value=vencido)
-        row_num += 1
+    def _hoja(title, headers, widths):
+        ws = wb.create_sheet(title)
+        for i, w in enumerate(widths):
+            ws.column_dimensions[chr(ord("A") + i)].width = w
+        fila = []
+        for h in headers:
+            cell = WriteOnlyCell(ws, value=h)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal="center")
+            fila.append(cell)
+        ws.append(fila)
+        return ws
+
+    ws = _hoja("SLA",
+               ["ID", "Código", "Tipo", "Estado", "Fecha Registro",
+                "Fecha Actualización", "Días Transcurridos", "Plazo", "Vencido"],
+               [8, 20, 30, 14, 18, 20, 20, 12, 10])
+    qs = Procedure.objects.order_by("id")
+    if d_from:        qs = qs.filter(created_at__date__gte=d_from)
+    if d_to:          qs = qs.filter(created_at__date__lte=d_to)
+    if status_param:  qs = qs.filter(status=status_param)
 
-    # Auto-ancho
-    for col in ws.columns:
-        max_len = max((len(str(c.value or "")) for c in col), default=10)
-        ws.column_dimensions[col[0].column_letter].width = min(max_len + 3, 35)
+    tz  = timezone.get_current_timezone()
+    now = timezone.now()
+    for pid, code, tname, st, created, updated, deadline in qs.values_list(
+        "id", "tracking_code", "procedure_type__name", "status",
+        "created_at", "updated_at", "deadline_at",
+    ).iterator(chunk_size=2000):
+        dias = round((updated - created).total_seconds() / 86400, 1)
+        vencido = "Sí" if (deadline and deadline < now and st not in estadisticas.CERRADOS) else "No"
+        ws.append([
+            pid, code, tname or "—", st,
+            created.astimezone(tz).strftime("%d/%m/%Y %H:%M") if created else "—",
+            updated.astimezone(tz).strftime("%d/%m/%Y %H:%M") if updated else "—",
+            dias,
+            deadline.astimezone(tz).strftime("%d/%m/%Y") if deadline else "—",
+            vencido,
+        ])
+
+    # Resumen por oficina y tipo (rollup)
+    ws = _hoja("Resumen",
+               ["Oficina", "Tipo", "Trámites", "Días Promedio", "Vencidos"],
+               [30, 30, 12, 16, 12])
+    grupos = list(
+        estadisticas.filas(d_from, d_to, status_param)
+        .values_list("office_id", "procedure_type_id")
+        .annotate(n=Sum("count"), seg=Sum("seconds_total"), venc=Sum("breached"))
+        .order_by("office_id", "procedure_type_id")
+    )
+    oficinas = dict(Office.objects.filter(id__in={g[0] for g in grupos}).values_list("id", "name"))
+    tipos    = dict(ProcedureType.objects.filter(id__in={g[1] for g in grupos}).values_list("id", "name"))
+    for office_id, ptype, n, seg, venc in grupos:
+        if not n:
+            continue
+        ws.append([
+            oficinas.get(office_id) or "Sin oficina",
+            tipos.get(ptype) or "Sin tipo",
+            n, round(seg / n / 86400, 1), venc,
+        ])
 
     buf = io.BytesIO()
     wb.save(buf)
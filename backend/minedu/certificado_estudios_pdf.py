@@ -38,6 +38,8 @@ def generate_certificado_estudios_pdf(period_code):
     from reportlab.lib.colors import HexColor, white
     from reportlab.pdfgen import canvas as cv_mod
 
+    from common.pdf_templates import draw_form
+
     try:
         from reportlab.graphics.barcode import qr as qr_module
         from reportlab.graphics.shapes import Drawing
@@ -133,21 +135,26 @@ def generate_certificado_estudios_pdf(period_code):
 
     def _watermark(y_top, y_bottom):
         """Marca de agua entre dos alturas (coordenadas desde abajo)."""
+        def _trama(cv):
+            # Trama hasta el borde superior; el clip la corta en y_top.
+            cv.setFillColor(MARCA_AGUA)
+            cv.setFont("Helvetica", 5.5)
+            wm_w = cv.stringWidth(wm_text, "Helvetica", 5.5)
+            y_wm, row = y_bottom + 4, 0
+            while y_wm < ph:
+                x_wm = M - 10 - (row % 2) * (wm_w / 3)
+                while x_wm < pw - M:
+                    cv.drawString(x_wm, y_wm, wm_text)
+                    x_wm += wm_w
+                y_wm += 15
+                row += 1
+
         c.saveState()
         p = c.beginPath()
         p.rect(M - 4, y_bottom, pw - 2 * M + 8, y_top - y_bottom)
         c.clipPath(p, stroke=0)
-        c.setFillColor(MARCA_AGUA)
-        c.setFont("Helvetica", 5.5)
-        wm_w = c.stringWidth(wm_text, "Helvetica", 5.5)
-        y_wm, row = y_bottom + 4, 0
-        while y_wm < y_top:
-            x_wm = M - 10 - (row % 2) * (wm_w / 3)
-            while x_wm < pw - M:
-                c.drawString(x_wm, y_wm, wm_text)
-                x_wm += wm_w
-            y_wm += 15
-            row += 1
+        # Una sola definición por archivo: todas las páginas la reutilizan
+        draw_form(c, f"marca_agua_{int(y_bottom)}", _trama)
         c.restoreState()
 
     def _footer_pagina():
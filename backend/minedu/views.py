@@ -2,13 +2,14 @@ import traceback
 from django.core.files.base import ContentFile
 from django.utils import timezone
 from django.db.models import Count, Q
-from django.http import FileResponse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView, ListCreateAPIView, UpdateAPIView
 
+from common.entrega import entregar
+
 from .models import (
     MineduCode,
     MineduExportBatch,
@@ -250,12 +251,7 @@ class ExportBatchDownloadView(APIView):
             "filename", f"export_{batch.id}.{ext}"
         )
 
-        return FileResponse(
-            batch.file.open("rb"),
-            content_type=ct,
-            as_attachment=True,
-            filename=filename,
-        )
+        return entregar(batch.file, content_type=ct, as_attachment=True, filename=filename)
 
 
 # =================================================================
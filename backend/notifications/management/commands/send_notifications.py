@@ -0,0 +1,44 @@
+"""
+send_notifications — worker del outbox de notificaciones
+(notifications/outbox.py): entrega los correos QUEUED por lotes, con una
+conexión SMTP por lote y reintentos con backoff.
+
+Uso:
+    python manage.py send_notifications            # bucle (servicio/systemd)
+    python manage.py send_notifications --once     # un lote (cron)
+    python manage.py send_notifications --batch 100 --sleep 5
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import procesar_lote
+
+
+class Command(BaseCommand):
+    help = "Entrega las notificaciones en cola (outbox)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Procesa lo pendiente y termina.")
+        parser.add_argument("--batch", type=int, default=None, help="Tamaño de lote (NOTIFY_BATCH_SIZE).")
+        parser.add_argument("--sleep", type=float, default=10.0,
+                            help="Segundos de espera cuando la cola está vacía.")
+
+    def handle(self, *args, **opts):
+        total = {"sent": 0, "retry": 0, "error": 0}
+        try:
+            while True:
+                stats = procesar_lote(opts["batch"])
+                for k, v in stats.items():
+                    total[k] += v
+                if any(stats.values()):
+                    self.stdout.write(f"Lote: {stats}")
+                    continue
+                if opts["once"]:
+                    break
+                time.sleep(opts["sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f"Enviados: {total['sent']} · reprogramados: {total['retry']} · con error: {total['error']}"
+        ))
@@ -35,6 +35,15 @@ class NotificationLog(models.Model):
     subject = models.CharField(max_length=200, blank=True, default="")
     payload = models.JSONField(blank=True, default=dict)               # variables usadas
     rendered = models.JSONField(blank=True, default=dict)              # {subject, html|text}
-    status = models.CharField(max_length=12, default="QUEUED")         # QUEUED|SENT|ERROR
+    status = models.CharField(max_length=12, default="QUEUED")         # QUEUED|SENDING|SENT|ERROR
     error = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    # Outbox (notifications/outbox.py): reintentos y entrega
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)     # None = cuanto antes
+    claimed_by = models.CharField(max_length=32, blank=True, default="")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='notif_outbox_idx')]
@@ -0,0 +1,176 @@
+"""
+Outbox de notificaciones sobre NotificationLog.
+
+Los requests ya no hablan con el SMTP: `encolar()` solo inserta una fila
+QUEUED (en la transacción del request, si la hay) y el worker
+`manage.py send_notifications` las entrega por lotes:
+
+  * reclama el lote marcándolo SENDING con un token propio, así dos workers
+    no envían el mismo correo (uno que muere deja filas SENDING que se
+    vuelven a reclamar pasado el plazo del reclamo);
+  * justo antes de enviar cada correo confirma que la fila sigue siendo
+    suya y renueva el reclamo: un lote lento (50 correos × EMAIL_TIMEOUT)
+    puede durar más que el plazo, y si otro worker ya reclamó una fila
+    pendiente, esa se salta en vez de enviarse dos veces. El plazo es
+    NOTIFY_CLAIM_SECONDS, pero nunca menos de lo que puede tardar UN correo
+    (apertura + diálogo SMTP, cada paso acotado por EMAIL_TIMEOUT);
+  * abre UNA conexión SMTP por lote;
+  * un fallo reprograma la fila con backoff exponencial
+    (NOTIFY_RETRY_BASE_SECONDS · 2^(intentos-1), tope NOTIFY_RETRY_MAX_SECONDS)
+    hasta NOTIFY_MAX_ATTEMPTS; después queda en ERROR. Un destinatario
+    rechazado por el servidor no se reintenta.
+
+    encolar("MP.NOTIFY", "ana@correo.pe", "Asunto", text="Cuerpo")
+    procesar_lote()   → {"sent": n, "retry": n, "error": n}
+"""
+import datetime as dt
+import smtplib
+import uuid
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import NotificationLog
+
+QUEUED, SENDING, SENT, ERROR = "QUEUED", "SENDING", "SENT", "ERROR"
+
+
+def _cfg(name, default):
+    return int(getattr(settings, name, default))
+
+
+def encolar(event_key, to, subject, text="", html="", payload=None):
+    """Registra un correo para el worker. Retorna el NotificationLog."""
+    rendered = {"subject": subject, "text": text}
+    if html:
+        rendered["html"] = html
+    return NotificationLog.objects.create(
+        event_key=event_key, channel="EMAIL", to=(to or "").strip(),
+        subject=(subject or "")[:200], payload=payload or {}, rendered=rendered,
+        status=QUEUED,
+    )
+
+
+def reencolar(log):
+    """Vuelve a poner en cola un envío (reintento manual)."""
+    NotificationLog.objects.filter(pk=log.pk).update(
+        status=QUEUED, attempts=0, next_attempt_at=None, error="",
+        claimed_by="", claimed_at=None,
+    )
+
+
+# ── Worker ───────────────────────────────────────────────────
+
+def _plazo_reclamo() -> int:
+    """Segundos tras los que un reclamo sin renovar se da por abandonado."""
+    return max(_cfg("NOTIFY_CLAIM_SECONDS", 600), 6 * _cfg("EMAIL_TIMEOUT", 30) + 60)
+
+
+def _pendientes(now):
+    abandonadas = now - dt.timedelta(seconds=_plazo_reclamo())
+    return NotificationLog.objects.filter(channel="EMAIL").filter(
+        Q(status=QUEUED, next_attempt_at__isnull=True)
+        | Q(status=QUEUED, next_attempt_at__lte=now)
+        | Q(status=SENDING, claimed_at__lt=abandonadas)
+    )
+
+
+def reclamar(limite=None):
+    """Marca hasta `limite` filas pendientes como SENDING y las retorna."""
+    limite = limite or _cfg("NOTIFY_BATCH_SIZE", 50)
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    ids = list(_pendientes(now).order_by("id").values_list("id", flat=True)[:limite])
+    if not ids:
+        return []
+    # El UPDATE condicional es el candado: otro worker que reclamó primero
+    # ya cambió el estado y estas filas dejan de calzar con el filtro.
+    _pendientes(now).filter(id__in=ids).update(status=SENDING, claimed_by=token, claimed_at=now)
+    return list(NotificationLog.objects.filter(claimed_by=token, status=SENDING).order_by("id"))
+
+
+def _mensaje(log, connection):
+    r = log.rendered or {}
+    html = r.get("html") or ""
+    msg = EmailMultiAlternatives(
+        subject=r.get("subject") or log.subject,
+        body=r.get("text") or strip_tags(html),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[log.to],
+        connection=connection,
+    )
+    if html and html != r.get("text"):
+        msg.attach_alternative(html, "text/html")
+    return msg
+
+
+def _registrar(log, **campos):
+    NotificationLog.objects.filter(pk=log.pk, claimed_by=log.claimed_by).update(**campos)
+
+
+def _renovar(log) -> bool:
+    """Renueva el reclamo de la fila; False si otro worker ya la reclamó."""
+    return bool(NotificationLog.objects
+                .filter(pk=log.pk, claimed_by=log.claimed_by, status=SENDING)
+                .update(claimed_at=timezone.now()))
+
+
+def _fallo(log, exc, definitivo=False):
+    intentos = log.attempts + 1
+    if definitivo or intentos >= _cfg("NOTIFY_MAX_ATTEMPTS", 5):
+        _registrar(log, status=ERROR, attempts=intentos, error=str(exc)[:2000], next_attempt_at=None)
+        return "error"
+    espera = min(_cfg("NOTIFY_RETRY_BASE_SECONDS", 60) * 2 ** (intentos - 1),
+                 _cfg("NOTIFY_RETRY_MAX_SECONDS", 3600))
+    _registrar(log, status=QUEUED, attempts=intentos, error=str(exc)[:2000],
+               next_attempt_at=timezone.now() + dt.timedelta(seconds=espera))
+    return "retry"
+
+
+def procesar_lote(limite=None, connection=None):
+    """Entrega un lote por una sola conexión. Retorna el conteo por resultado."""
+    stats = {"sent": 0, "retry": 0, "error": 0}
+    lote = reclamar(limite)
+    if not lote:
+        return stats
+
+    validos = []
+    for log in lote:
+        if "@" not in log.to:
+            stats[_fallo(log, "Destinatario inválido", definitivo=True)] += 1
+        else:
+            validos.append(log)
+    if not validos:
+        return stats
+
+    conn = connection or get_connection(fail_silently=False)
+    try:
+        conn.open()
+    except Exception as exc:        # SMTP caído: todo el lote a backoff
+        for log in validos:
+            stats[_fallo(log, exc)] += 1
+        return stats
+
+    try:
+        for log in validos:
+            if not _renovar(log):
+                continue            # la reclamó otro worker: él la envía
+            try:
+                conn.send_messages([_mensaje(log, conn)])
+            except smtplib.SMTPRecipientsRefused as exc:
+                stats[_fallo(log, exc, definitivo=True)] += 1
+            except Exception as exc:
+                stats[_fallo(log, exc)] += 1
+            else:
+                _registrar(log, status=SENT, attempts=log.attempts + 1, error="",
+                           sent_at=timezone.now(), next_attempt_at=None)
+                stats["sent"] += 1
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    return stats
@@ -18,4 +18,5 @@ class EventBindingSerializer(serializers.ModelSerializer):
 class NotificationLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = NotificationLog
-        fields = ['id','event_key','channel','to','subject','payload','rendered','status','error','created_at']
+        fields = ['id','event_key','channel','to','subject','payload','rendered','status','error','created_at',
+                  'attempts','next_attempt_at','sent_at']
@@ -1,3 +1,82 @@
-from django.test import TestCase
+import datetime as dt
+import smtplib
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import NotificationLog
+from .outbox import encolar, procesar_lote
+
+
+class _Conexion(EmailBackend):
+    """Backend locmem que cuenta aperturas y puede fallar a pedido."""
+    def __init__(self, falla=None, **kw):
+        super().__init__(**kw)
+        self.falla = falla
+        self.aperturas = 0
+
+    def open(self):
+        self.aperturas += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if self.falla:
+            raise self.falla
+        return super().send_messages(messages)
+
+
+@override_settings(NOTIFY_RETRY_BASE_SECONDS=60, NOTIFY_MAX_ATTEMPTS=2)
+class OutboxTest(TestCase):
+    def test_lote_con_una_conexion(self):
+        for i in range(3):
+            encolar("TEST", f"a{i}@correo.pe", "Asunto", text="Hola")
+        conn = _Conexion()
+        self.assertEqual(procesar_lote(connection=conn), {"sent": 3, "retry": 0, "error": 0})
+        self.assertEqual(conn.aperturas, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(NotificationLog.objects.exclude(status="SENT").exists())
+        # Nada pendiente: el siguiente lote no reenvía
+        self.assertEqual(procesar_lote(connection=_Conexion())["sent"], 0)
+
+    def test_backoff_y_error_final(self):
+        log = encolar("TEST", "b@correo.pe", "Asunto", text="Hola")
+        falla = smtplib.SMTPServerDisconnected("caído")
+        self.assertEqual(procesar_lote(connection=_Conexion(falla))["retry"], 1)
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.attempts), ("QUEUED", 1))
+        self.assertGreater(log.next_attempt_at, timezone.now() + dt.timedelta(seconds=50))
+
+        # Aún en espera: no se reclama
+        self.assertEqual(procesar_lote(connection=_Conexion(falla)), {"sent": 0, "retry": 0, "error": 0})
+
+        NotificationLog.objects.filter(pk=log.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(procesar_lote(connection=_Conexion(falla))["error"], 1)
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.attempts), ("ERROR", 2))
+        self.assertIn("caído", log.error)
+
+    def test_lote_lento_no_reenvia_lo_reclamado_por_otro(self):
+        logs = [encolar("TEST", f"d{i}@correo.pe", "Asunto", text="Hola") for i in range(2)]
+
+        class _Lenta(_Conexion):
+            def send_messages(self, messages):
+                # Mientras se envía el primero, otro worker reclama el segundo
+                NotificationLog.objects.filter(pk=logs[1].pk).update(claimed_by="otro")
+                return super().send_messages(messages)
+
+        self.assertEqual(procesar_lote(connection=_Lenta())["sent"], 1)
+        self.assertEqual([m.to for m in mail.outbox], [["d0@correo.pe"]])
+        self.assertEqual(NotificationLog.objects.get(pk=logs[1].pk).status, "SENDING")
+
+    @override_settings(NOTIFY_CLAIM_SECONDS=60, EMAIL_TIMEOUT=30)
+    def test_plazo_del_reclamo_cubre_un_correo(self):
+        from .outbox import _plazo_reclamo
+        self.assertGreaterEqual(_plazo_reclamo(), 6 * 30)
+
+    def test_worker_caido_se_reclama(self):
+        log = encolar("TEST", "c@correo.pe", "Asunto", text="Hola")
+        NotificationLog.objects.filter(pk=log.pk).update(
+            status="SENDING", claimed_by="muerto", claimed_at=timezone.now() - dt.timedelta(hours=1))
+        self.assertEqual(procesar_lote(connection=_Conexion())["sent"], 1)
@@ -9,6 +9,7 @@ from rest_framework.response import Response
 
 from .models import *
 from .serializers import *
+from .outbox import encolar, reencolar
 from .utils import render_template
 
 # ========= Templates =========
@@ -103,7 +104,12 @@ def send_test(request):
         tpl = request.data.get('template') or {}
 
     rendered = render_template(tpl, data, channel)
-    # Stub envío: lo marcamos como SENT y guardamos log
+    if channel == 'EMAIL':
+        # El correo real lo entrega el worker del outbox (send_notifications)
+        log = encolar("TEST", to, rendered.get('subject', ''), html=rendered.get('html', ''), payload=data)
+        return Response({"ok": True, "log_id": log.id, "rendered": rendered, "status": log.status})
+
+    # Stub envío (SMS/IN_APP sin proveedor): lo marcamos como SENT y guardamos log
     log = NotificationLog.objects.create(
         event_key="TEST",
         channel=channel,
@@ -138,6 +144,17 @@ def logs_retry(request, id: int):
         log = NotificationLog.objects.get(pk=id)
     except NotificationLog.DoesNotExist:
         return Response({"detail":"Not found"}, status=404)
+    if log.channel == 'EMAIL':
+        # Lo envía el worker: un fallido vuelve a la cola; uno ya enviado se reenvía como nuevo
+        if log.status == 'SENDING':
+            return Response({"detail": "El envío está en curso."}, status=409)
+        if log.status == 'SENT':
+            r = log.rendered or {}
+            log = encolar(log.event_key, log.to, log.subject, text=r.get('text', ''),
+                          html=r.get('html', ''), payload=log.payload)
+        else:
+            reencolar(log)
+        return Response({"ok": True, "log_id": log.id})
     # “reintento” simple: duplicamos log como SENT
     newlog = NotificationLog.objects.create(
         event_key=log.event_key, channel=log.channel, to=log.to,
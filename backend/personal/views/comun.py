@@ -2,6 +2,7 @@
 from django.contrib.auth import get_user_model
 from django.utils.crypto import get_random_string
 
+from acl.authz import contexto
 from acl.models import Role, UserRole
 from personal.models import JefeLinea, Personal
 
@@ -26,23 +27,14 @@ def tiene_rol(user, nombres) -> bool:
     """¿El usuario tiene alguno de esos roles?
 
     Los roles viven en DOS tablas según cómo se asignaron (acl.UserRole y la
-    M2M directa User.roles); se consultan ambas, igual que el resto del
-    sistema.
+    M2M directa User.roles); el contexto de autorización (acl/authz.py) ya
+    junta ambas y se calcula una vez por usuario.
     """
     if not user or not getattr(user, "is_authenticated", False):
         return False
     if getattr(user, "is_superuser", False):
         return True
-    nombres = list(nombres)
-    try:
-        if UserRole.objects.filter(user=user, role__name__in=nombres).exists():
-            return True
-    except Exception:
-        pass
-    try:
-        return user.roles.filter(name__in=nombres).exists()
-    except Exception:
-        return False
+    return contexto(user).tiene_alguno(nombres)
 
 
 def es_admin_personal(user) -> bool:
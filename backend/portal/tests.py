@@ -1,3 +1,50 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import AdmissionCall, NewsItem
+
+
+class PortalPublicCacheTest(TestCase):
+    URL = "/api/portal/public/admission-calls"
+
+    def setUp(self):
+        cache.clear()
+        self.cli = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            AdmissionCall.objects.create(title="Admisión 2027", published=True)
+
+    def test_cache_y_304(self):
+        r = self.cli.get(self.URL)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([c["title"] for c in r.json()], ["Admisión 2027"])
+        etag = r["ETag"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.cli.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 304)
+        # Solo la lectura de versiones (viven en la base, no en el cache)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_guardar_invalida(self):
+        etag = self.cli.get(self.URL)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            AdmissionCall.objects.create(title="Segunda convocatoria", published=True)
+        r = self.cli.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.json()), 2)
+
+        # Despublicar (save con update_fields, como publish_toggle) también
+        with self.captureOnCommitCallbacks(execute=True):
+            call = AdmissionCall.objects.get(title="Segunda convocatoria")
+            call.published = False
+            call.save(update_fields=["published"])
+        self.assertEqual(len(self.cli.get(self.URL).json()), 1)
+
+        r = self.cli.get("/api/portal/announcements/active")
+        self.assertEqual(r.json(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            NewsItem.objects.create(title="Inicio de clases", slug="inicio", summary="Lunes", published=True)
+        self.assertEqual(self.cli.get("/api/portal/announcements/active").json()[0]["title"], "Inicio de clases")
@@ -7,10 +7,29 @@ from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.renderers import JSONRenderer
+
+from common.condicional import condicional, versiones
+from common.public_cache import respuesta_cacheada
 
 from .models import *
 from .serializers import *
 
+# Contenido público cacheado (common/public_cache.py) bajo la versión de las
+# tablas que muestra (catalogs.TableVersion, common/condicional.py): vive en
+# la base, así que publicar o despublicar lo ven todos los workers al toque.
+PORTAL_CACHE_NS = "portal"
+
+
+def _json_cacheado(request, variante, modelos, construir):
+    """Payload JSON público servido desde cache con ETag/Last-Modified."""
+    token, _u = versiones(modelos)
+    return respuesta_cacheada(
+        request, PORTAL_CACHE_NS, variante, variante,
+        lambda: (JSONRenderer().render(construir()), "application/json"),
+        version=token,
+    )
+
 # --------- Páginas ---------
 class PagesViewSet(viewsets.ModelViewSet):
     queryset = Page.objects.all().order_by('-updated_at')
@@ -18,6 +37,7 @@ class PagesViewSet(viewsets.ModelViewSet):
     http_method_names = ['get','post','patch','delete']
     permission_classes = [IsAuthenticated]
 
+    @condicional("portal.Page")
     def list(self, request, *args, **kwargs):
         qs = self.queryset
         q = request.query_params.get('q')
@@ -53,6 +73,7 @@ class NewsViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]  # por si subes cover como multipart
 
+    @condicional("portal.NewsItem")
     def list(self, request, *args, **kwargs):
         qs = self.queryset
         published = request.query_params.get('published')
@@ -80,6 +101,10 @@ class DocumentsViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
+    @condicional("portal.Document")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
         # soporta multipart: title, category, file
         title = request.data.get('title','')
@@ -154,6 +179,10 @@ class AdmissionCallsViewSet(viewsets.ModelViewSet):
     http_method_names = ["get","post","patch","delete"]
     permission_classes = [IsAuthenticated]
 
+    @condicional("portal.AdmissionCall")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=True, methods=["post"], url_path="publish")
     def publish_toggle(self, request, pk=None):
         obj = self.get_object()
@@ -165,19 +194,23 @@ class AdmissionCallsViewSet(viewsets.ModelViewSet):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def public_admission_calls(request):
-    qs = AdmissionCall.objects.filter(published=True).order_by("-updated_at")
-    return Response(AdmissionCallSerializer(qs[:100], many=True).data)
+    def construir():
+        qs = AdmissionCall.objects.filter(published=True).order_by("-updated_at")
+        return AdmissionCallSerializer(qs[:100], many=True).data
+    return _json_cacheado(request, "admission-calls", ["portal.AdmissionCall"], construir)
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def active_announcements(request):
     """GET /api/portal/announcements/active — Noticias publicadas como anuncios"""
-    qs = NewsItem.objects.filter(published=True).order_by("-publish_at", "-created_at")[:5]
-    items = []
-    for n in qs:
-        items.append({
-            "title": n.title,
-            "date": str((n.publish_at or n.created_at).date()) if (n.publish_at or n.created_at) else "",
-            "excerpt": (n.summary or n.body or "")[:150],
-        })
-    return Response(items)
\ No newline at end of file
+    def construir():
+        qs = NewsItem.objects.filter(published=True).order_by("-publish_at", "-created_at")[:5]
+        items = []
+        for n in qs:
+            items.append({
+                "title": n.title,
+                "date": str((n.publish_at or n.created_at).date()) if (n.publish_at or n.created_at) else "",
+                "excerpt": (n.summary or n.body or "")[:150],
+            })
+        return items
+    return _json_cacheado(request, "announcements", ["portal.NewsItem"], construir)
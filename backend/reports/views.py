@@ -1,14 +1,17 @@
 from django.shortcuts import render
 
 # Create your views here.
+import os
 from pathlib import Path
-from django.http import FileResponse, HttpResponse
+from django.http import HttpResponse
 from django.utils.timezone import now
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from common.entrega import entregar
+
 from .models import ReportJob
 from .serializers import ReportJobSerializer
 from .pdf_utils import write_dummy_pdf
@@ -120,8 +123,8 @@ def report_job_download(request, job_id: int):
         return Response({"detail":"Not found"}, status=404)
     if job.status != "READY" or not job.file_path:
         return Response({"detail":"Not ready"}, status=409)
-    return FileResponse(open(job.file_path, "rb"), content_type="application/pdf",
-                        as_attachment=True, filename=f"report_{job_id}.pdf")
+    return entregar(os.path.abspath(job.file_path), content_type="application/pdf",
+                    as_attachment=True, filename=f"report_{job_id}.pdf")
 
 # =================== EXPORTS EXCEL ===================
 @api_view(['GET'])
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import PersonEntry
+
+
+@admin.register(PersonEntry)
+class PersonEntryAdmin(admin.ModelAdmin):
+    list_display = ["label", "kind", "dni", "detail", "updated_at"]
+    list_filter = ["kind"]
+    search_fields = ["label", "dni"]
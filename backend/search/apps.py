@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "search"
+    verbose_name = "Búsqueda de personas"
+
+    def ready(self):
+        # Mantiene el índice al guardar/borrar (ver search/signals.py)
+        from . import signals  # noqa: F401
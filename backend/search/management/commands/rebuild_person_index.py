@@ -0,0 +1,34 @@
+"""
+rebuild_person_index — reconstruye el índice del buscador de personas.
+
+Las señales lo mantienen al día en cada save()/delete(); este comando es
+para después de cargas masivas (queryset.update, bulk_create, loaddata).
+
+Uso:
+    python manage.py rebuild_person_index
+    python manage.py rebuild_person_index --kind STUDENT --kind GRADUATE
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from search.models import PersonEntry
+from search.services import rebuild
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de personas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", action="append", default=[],
+                            help="Fuente a reconstruir (repetible). Por defecto, todas.")
+
+    def handle(self, *args, **opts):
+        validos = {k for k, _ in PersonEntry.KINDS}
+        kinds = [k.upper() for k in opts["kind"]]
+        malos = [k for k in kinds if k not in validos]
+        if malos:
+            raise CommandError(f"Fuente desconocida: {', '.join(malos)}")
+
+        stats = rebuild(kinds=kinds or None)
+        for kind, n in stats.items():
+            self.stdout.write(f"  {kind:<10} {n}")
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruido: {sum(stats.values())} personas."))
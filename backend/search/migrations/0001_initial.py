@@ -0,0 +1,43 @@
+# Generated by Django 5.2.10 on 2026-10-19 02:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('STUDENT', 'Estudiante'), ('GRADUATE', 'Egresado'), ('USER', 'Usuario'), ('APPLICANT', 'Postulante'), ('PERSONAL', 'Personal')], max_length=12)),
+                ('object_id', models.BigIntegerField()),
+                ('dni', models.CharField(blank=True, db_index=True, default='', max_length=30)),
+                ('label', models.CharField(max_length=255)),
+                ('detail', models.CharField(blank=True, default='', max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='uniq_person_entry')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PersonToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=20)),
+                ('whole', models.BooleanField(default=False)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='search.personentry')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'entry'], name='person_token_idx')],
+                'constraints': [models.UniqueConstraint(fields=('entry', 'token'), name='uniq_person_token')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def poblar(apps, schema_editor):
+    from search.services import rebuild
+    rebuild(get_model=apps.get_model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+        ("students", "0005_student_search_text"),
+        ("graduates", "0004_graduate_search_text"),
+        ("accounts", "0003_user_must_change_password"),
+        ("admission", "0008_admissionmodality"),
+        ("personal", "0005_jefelinea_careers"),
+    ]
+
+    operations = [
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
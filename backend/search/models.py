@@ -0,0 +1,53 @@
+from django.db import models
+
+
+class PersonEntry(models.Model):
+    """Una persona indexada (estudiante, egresado, usuario, postulante o personal)."""
+
+    STUDENT = "STUDENT"
+    GRADUATE = "GRADUATE"
+    USER = "USER"
+    APPLICANT = "APPLICANT"
+    PERSONAL = "PERSONAL"
+    KINDS = [
+        (STUDENT, "Estudiante"),
+        (GRADUATE, "Egresado"),
+        (USER, "Usuario"),
+        (APPLICANT, "Postulante"),
+        (PERSONAL, "Personal"),
+    ]
+
+    kind = models.CharField(max_length=12, choices=KINDS)
+    object_id = models.BigIntegerField()
+    dni = models.CharField(max_length=30, blank=True, default="", db_index=True)
+    label = models.CharField(max_length=255)
+    detail = models.CharField(max_length=255, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="uniq_person_entry"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.label}"
+
+
+class PersonToken(models.Model):
+    """
+    Índice invertido. Cada palabra normalizada se guarda con todos sus
+    prefijos ("perez" → pe, per, pere, perez) para que buscar mientras se
+    escribe sea una igualdad sobre índice y no un LIKE.
+    `whole` marca la palabra completa, que puntúa más al ordenar.
+    """
+    entry = models.ForeignKey(PersonEntry, on_delete=models.CASCADE, related_name="tokens")
+    token = models.CharField(max_length=20)
+    whole = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["entry", "token"], name="uniq_person_token"),
+        ]
+        indexes = [
+            models.Index(fields=["token", "entry"], name="person_token_idx"),
+        ]
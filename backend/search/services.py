@@ -0,0 +1,283 @@
+"""
+Índice unificado de personas.
+
+Cada fuente (estudiantes, egresados, usuarios, postulantes y personal) se
+describe en FUENTES: qué modelo es, qué DNI, rótulo y detalle mostrar, y qué
+texto es buscable. Las señales (search/signals.py) mantienen el índice al
+guardar/borrar; `manage.py rebuild_person_index` lo reconstruye completo
+(para cargas que se saltan save(), como queryset.update o bulk_create).
+
+    buscar_personas("nuñez ana")               → ranking de todas las fuentes
+    ids_coincidentes(PersonEntry.USER, "ana")  → subquery de ids para filtrar
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Max, Value, When
+
+from common.busqueda import normalizar
+
+from .models import PersonEntry, PersonToken
+
+MIN_PREFIJO = 2
+MAX_TOKEN = 20
+MAX_TERMINOS = 6
+_NO_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _s(v):
+    return str(v or "").strip()
+
+
+def _unir(*partes):
+    return " ".join(p for p in (_s(x) for x in partes) if p)
+
+
+# ── Fuentes ──────────────────────────────────────────────────
+# Solo leen campos (no propiedades) para que sirvan también con los
+# modelos históricos de las migraciones.
+
+def _doc_student(st):
+    ap = _unir(st.apellido_paterno, st.apellido_materno)
+    label = f"{ap}, {_s(st.nombres)}" if ap and _s(st.nombres) else (ap or _s(st.nombres))
+    return {
+        "dni": _s(st.num_documento),
+        "label": label.upper(),
+        "detail": _s(st.programa_carrera),
+        "text": _unir(st.num_documento, st.apellido_paterno, st.apellido_materno,
+                      st.nombres, st.email),
+    }
+
+
+def _doc_graduate(g):
+    if not g.is_active:
+        return None
+    return {
+        "dni": _s(g.dni),
+        "label": _s(g.apellidos_nombres),
+        "detail": _unir(g.especialidad, g.anio_egreso),
+        "text": _unir(g.dni, g.apellidos_nombres),
+    }
+
+
+def _doc_user(u):
+    return {
+        "dni": _s(u.username) if _s(u.username).isdigit() else "",
+        "label": _s(u.full_name) or _s(u.username),
+        "detail": _s(u.email),
+        "text": _unir(u.username, u.full_name, u.email),
+    }
+
+
+def _doc_applicant(a):
+    return {
+        "dni": _s(a.dni),
+        "label": _s(a.names),
+        "detail": _s(a.email),
+        "text": _unir(a.dni, a.names, a.email),
+    }
+
+
+def _doc_personal(p):
+    armado = _unir(p.apellido_paterno, p.apellido_materno, p.nombres)
+    return {
+        "dni": _s(p.document),
+        "label": armado or _s(p.full_name),
+        "detail": _unir(p.cargo, p.area),
+        "text": _unir(p.document, armado, p.full_name, p.email),
+    }
+
+
+FUENTES = {
+    PersonEntry.STUDENT: ("students.Student", _doc_student),
+    PersonEntry.GRADUATE: ("graduates.Graduate", _doc_graduate),
+    PersonEntry.USER: ("accounts.User", _doc_user),
+    PersonEntry.APPLICANT: ("admission.Applicant", _doc_applicant),
+    PersonEntry.PERSONAL: ("personal.Personal", _doc_personal),
+}
+
+# Campos que lee cada fuente: un save(update_fields=...) que no toca ninguno
+# (p.ej. el last_login de cada ingreso) no reindexa
+CAMPOS = {
+    PersonEntry.STUDENT: {"num_documento", "apellido_paterno", "apellido_materno", "nombres",
+                          "email", "programa_carrera"},
+    PersonEntry.GRADUATE: {"is_active", "dni", "apellidos_nombres", "especialidad", "anio_egreso"},
+    PersonEntry.USER: {"username", "full_name", "email"},
+    PersonEntry.APPLICANT: {"dni", "names", "email"},
+    PersonEntry.PERSONAL: {"document", "apellido_paterno", "apellido_materno", "nombres",
+                           "full_name", "cargo", "area", "email"},
+}
+
+
+# ── Tokens ───────────────────────────────────────────────────
+
+def palabras(texto) -> list:
+    return [w for w in _NO_ALNUM.split(normalizar(texto)) if w]
+
+
+def tokens_de(texto) -> dict:
+    """{token: es_palabra_completa} con los prefijos de cada palabra."""
+    out = {}
+    for w in palabras(texto):
+        w = w[:MAX_TOKEN]
+        for k in range(min(MIN_PREFIJO, len(w)), len(w) + 1):
+            t = w[:k]
+            out[t] = out.get(t, False) or k == len(w)
+    return out
+
+
+def _terminos(q) -> list:
+    vistos = []
+    for w in palabras(q):
+        w = w[:MAX_TOKEN]
+        if w not in vistos:
+            vistos.append(w)
+    return vistos[:MAX_TERMINOS]
+
+
+# ── Mantenimiento ────────────────────────────────────────────
+
+def _tokens_rows(entry, doc):
+    return [PersonToken(entry=entry, token=t, whole=w)
+            for t, w in tokens_de(doc["text"]).items()]
+
+
+def indexar(kind, obj):
+    """Crea/actualiza la entrada de `obj`; si la fuente lo excluye, la borra.
+    Si la entrada ya está igual (rótulo y tokens), no escribe nada."""
+    doc = FUENTES[kind][1](obj)
+    if doc is None:
+        desindexar(kind, obj.pk)
+        return None
+    campos = {"dni": doc["dni"][:30], "label": doc["label"][:255],
+              "detail": doc["detail"][:255]}
+    actual = PersonEntry.objects.filter(kind=kind, object_id=obj.pk).first()
+    if (actual is not None
+            and all(getattr(actual, k) == v for k, v in campos.items())
+            and set(actual.tokens.values_list("token", "whole"))
+            == set(tokens_de(doc["text"]).items())):
+        return actual
+    with transaction.atomic():
+        entry, _ = PersonEntry.objects.update_or_create(
+            kind=kind, object_id=obj.pk, defaults=campos)
+        entry.tokens.all().delete()
+        PersonToken.objects.bulk_create(_tokens_rows(entry, doc))
+    return entry
+
+
+def desindexar(kind, pk):
+    PersonEntry.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def rebuild(kinds=None, get_model=None, chunk=500):
+    """
+    Reconstruye el índice (todas las fuentes o las indicadas).
+    `get_model` permite usarlo desde una migración con apps.get_model.
+    Retorna {kind: entradas}.
+    """
+    if get_model is None:
+        from django.apps import apps
+        get_model = apps.get_model
+
+    Entry = get_model("search", "PersonEntry")
+    Token = get_model("search", "PersonToken")
+    stats = {}
+    for kind, (label, doc_fn) in FUENTES.items():
+        if kinds and kind not in kinds:
+            continue
+        Model = get_model(*label.split("."))
+        with transaction.atomic():
+            Entry.objects.filter(kind=kind).delete()
+            n = 0
+            lote = []
+
+            def _flush():
+                creadas = Entry.objects.bulk_create([e for e, _ in lote])
+                tokens = []
+                for entry, doc in zip(creadas, [d for _, d in lote]):
+                    tokens += [Token(entry_id=entry.pk, token=t, whole=w)
+                               for t, w in tokens_de(doc["text"]).items()]
+                Token.objects.bulk_create(tokens, batch_size=2000)
+                lote.clear()
+
+            for obj in Model.objects.all().iterator(chunk_size=chunk):
+                doc = doc_fn(obj)
+                if doc is None:
+                    continue
+                lote.append((Entry(kind=kind, object_id=obj.pk,
+                                   dni=doc["dni"][:30], label=doc["label"][:255],
+                                   detail=doc["detail"][:255]), doc))
+                n += 1
+                if len(lote) >= chunk:
+                    _flush()
+            if lote:
+                _flush()
+        stats[kind] = n
+    return stats
+
+
+# ── Consulta ─────────────────────────────────────────────────
+
+def buscar_personas(q, kinds=None, limit=20):
+    """
+    Ranking de personas que tienen TODOS los términos (como palabra o
+    prefijo de palabra). Palabra completa puntúa 3, prefijo 2; empata el
+    rótulo alfabético. Una sola consulta agrupada sobre el índice.
+    """
+    terms = _terminos(q)
+    if not terms:
+        return []
+
+    qs = PersonToken.objects.filter(token__in=terms)
+    if kinds:
+        qs = qs.filter(entry__kind__in=list(kinds))
+
+    puntos = {
+        f"t{i}": Max(Case(
+            When(token=t, whole=True, then=Value(3)),
+            When(token=t, then=Value(2)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+        for i, t in enumerate(terms)
+    }
+    filas = (
+        qs.values("entry_id", "entry__label")
+        .annotate(**puntos)
+        .filter(**{f"t{i}__gt": 0 for i in range(len(terms))})
+    )
+    total = sum((F(f"t{i}") for i in range(len(terms))), Value(0))
+    filas = list(
+        filas.annotate(score=total).order_by("-score", "entry__label", "entry_id")[:limit]
+    )
+
+    entries = PersonEntry.objects.in_bulk([f["entry_id"] for f in filas])
+    out = []
+    for f in filas:
+        e = entries.get(f["entry_id"])
+        if e is None:
+            continue
+        out.append({
+            "kind": e.kind,
+            "id": e.object_id,
+            "dni": e.dni,
+            "label": e.label,
+            "detail": e.detail,
+            "score": f["score"],
+        })
+    return out
+
+
+def ids_coincidentes(kind, q):
+    """
+    Subquery con los object_id de `kind` que tienen todos los términos.
+    Para filtrar listados existentes: qs.filter(id__in=ids_coincidentes(...)).
+    """
+    terms = _terminos(q)
+    qs = PersonToken.objects.filter(entry__kind=kind, token__in=terms)
+    return (
+        qs.values("entry__object_id")
+        .annotate(n=Count("token", distinct=True))
+        .filter(n=len(terms))
+        .values("entry__object_id")
+    )
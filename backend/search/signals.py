@@ -0,0 +1,55 @@
+"""
+Mantiene el índice de personas (search/services.py) al guardar o borrar
+cualquiera de las fuentes. Las escrituras masivas que se saltan save()
+(queryset.update, bulk_create) se corrigen con `rebuild_person_index`.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import services
+
+log = logging.getLogger(__name__)
+
+
+def _on_save(kind):
+    def handler(sender, instance, raw=False, update_fields=None, **kwargs):
+        # `raw=True` en loaddata/fixtures: se reindexa luego con el comando
+        if raw:
+            return
+        if update_fields and not set(update_fields) & services.CAMPOS[kind]:
+            return
+        try:
+            # Todo el indexado (lecturas incluidas) en un savepoint: si algo
+            # falla se revierte solo eso y la transacción del guardado sigue
+            with transaction.atomic():
+                services.indexar(kind, instance)
+        except Exception:      # nunca romper el guardado por el índice
+            log.exception("No se pudo indexar %s %s", kind, instance.pk)
+    return handler
+
+
+def _on_delete(kind):
+    def handler(sender, instance, **kwargs):
+        try:
+            with transaction.atomic():
+                services.desindexar(kind, instance.pk)
+        except Exception:
+            log.exception("No se pudo desindexar %s %s", kind, instance.pk)
+    return handler
+
+
+def connect():
+    from django.apps import apps
+
+    for kind, (label, _) in services.FUENTES.items():
+        model = apps.get_model(label)
+        uid = f"search_person_{kind.lower()}"
+        post_save.connect(_on_save(kind), sender=model, weak=False,
+                          dispatch_uid=f"{uid}_save")
+        post_delete.connect(_on_delete(kind), sender=model, weak=False,
+                            dispatch_uid=f"{uid}_delete")
+
+
+connect()
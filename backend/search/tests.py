@@ -0,0 +1,104 @@
+"""Tests del índice unificado de personas."""
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from admission.models import Applicant
+from graduates.models import Graduate
+from students.models import Student
+
+from .models import PersonEntry, PersonToken
+from .services import buscar_personas, ids_coincidentes, rebuild
+
+User = get_user_model()
+
+
+class PersonIndexTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin_idx", "admin_idx@t.pe", "x")
+        cls.admin.is_staff = True
+        cls.admin.save()
+        cls.st = Student.objects.create(num_documento="71000001", nombres="ANA MARÍA",
+                                        apellido_paterno="NÚÑEZ", apellido_materno="QUISPE")
+        Student.objects.create(num_documento="71000002", nombres="ANABEL",
+                               apellido_paterno="NUNEZ", apellido_materno="ROJAS")
+        cls.grad = Graduate.objects.create(dni="71000003", apellidos_nombres="NÚÑEZ PAREDES, LUIS",
+                                           especialidad="EDUCACIÓN INICIAL", anio_egreso="2020",
+                                           fecha_sustentacion=datetime.date(2020, 12, 1))
+        Applicant.objects.create(dni="71000004", names="Ana Núñez Vela", email="ana.v@t.pe")
+        User.objects.create_user("71000005", "jose@t.pe", "x", full_name="José Ñahui")
+
+    def test_sin_tildes_y_por_prefijo(self):
+        res = buscar_personas("nunez")
+        self.assertEqual({r["kind"] for r in res},
+                         {PersonEntry.STUDENT, PersonEntry.GRADUATE, PersonEntry.APPLICANT})
+        self.assertEqual(len(buscar_personas("ÑAHUI jo")), 1)
+        self.assertEqual(buscar_personas("71000003")[0]["id"], self.grad.pk)
+
+    def test_palabra_completa_rankea_antes_que_prefijo(self):
+        res = buscar_personas("ana nunez", kinds=[PersonEntry.STUDENT])
+        self.assertEqual([r["dni"] for r in res], ["71000001", "71000002"])
+        self.assertGreater(res[0]["score"], res[1]["score"])
+
+    def test_senales_actualizan_y_borran(self):
+        self.st.apellido_paterno = "VARGAS"
+        self.st.save()
+        self.assertFalse(buscar_personas("nunez quispe"))
+        self.assertEqual(len(buscar_personas("vargas quispe")), 1)
+
+        self.grad.is_active = False
+        self.grad.save()
+        self.assertFalse(buscar_personas("paredes"))
+
+        pk = self.st.pk
+        self.st.delete()
+        self.assertFalse(PersonEntry.objects.filter(kind=PersonEntry.STUDENT, object_id=pk).exists())
+
+    def test_guardados_que_no_cambian_el_indice_no_escriben(self):
+        u = User.objects.get(username="71000005")
+        tokens = set(PersonToken.objects.filter(entry__kind=PersonEntry.USER,
+                                                entry__object_id=u.pk).values_list("id", flat=True))
+        # El last_login de cada ingreso: solo el UPDATE del usuario
+        with self.assertNumQueries(1):
+            u.save(update_fields=["last_login"])
+        u.save()
+        self.assertEqual(set(PersonToken.objects.filter(entry__kind=PersonEntry.USER,
+                                                        entry__object_id=u.pk)
+                             .values_list("id", flat=True)), tokens)
+
+    def test_falla_del_indice_no_toca_el_guardado(self):
+        from unittest import mock
+
+        def a_medias(kind, obj):
+            PersonEntry.objects.filter(kind=kind, object_id=obj.pk).delete()
+            raise RuntimeError("índice caído")
+
+        with mock.patch("search.services.indexar", side_effect=a_medias), \
+                self.assertLogs("search.signals", "ERROR"):
+            self.st.nombres = "ANA LUCÍA"
+            self.st.save()
+        # Lo que alcanzó a hacer el índice se revierte; el guardado queda
+        self.assertTrue(PersonEntry.objects.filter(kind=PersonEntry.STUDENT, object_id=self.st.pk).exists())
+        self.assertEqual(Student.objects.get(pk=self.st.pk).nombres, "ANA LUCÍA")
+
+    def test_rebuild_e_ids_coincidentes(self):
+        PersonEntry.objects.all().delete()
+        stats = rebuild()
+        self.assertEqual(stats[PersonEntry.STUDENT], 2)
+        self.assertTrue(PersonToken.objects.filter(token="nu", whole=False).exists())
+        ids = list(Student.objects.filter(id__in=ids_coincidentes(PersonEntry.STUDENT, "rojas an"))
+                   .values_list("num_documento", flat=True))
+        self.assertEqual(ids, ["71000002"])
+
+    def test_api_requiere_rol(self):
+        cli = APIClient()
+        cli.force_authenticate(User.objects.create_user("nadie", "n@t.pe", "x"))
+        self.assertEqual(cli.get("/api/search/people", {"q": "ana"}).status_code, 403)
+
+        cli.force_authenticate(self.admin)
+        r = cli.get("/api/search/people", {"q": "ana", "kinds": "applicant"})
+        self.assertEqual(r.status_code, 200, r.data)
+        self.assertEqual([x["label"] for x in r.data["results"]], ["Ana Núñez Vela"])
@@ -0,0 +1,37 @@
+"""
+GET /api/search/people?q=nunez ana&kinds=STUDENT,GRADUATE&limit=20
+
+Buscador único de personas sobre el índice de search/services.py.
+"""
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from academic.views.utils import _can_admin_enroll
+
+from .models import PersonEntry
+from .services import buscar_personas
+
+_KINDS = {k for k, _ in PersonEntry.KINDS}
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def people_search(request):
+    if not _can_admin_enroll(request.user):
+        return Response({"detail": "No autorizado."}, status=status.HTTP_403_FORBIDDEN)
+
+    q = (request.query_params.get("q") or "").strip()
+    kinds = [
+        k.strip().upper()
+        for k in (request.query_params.get("kinds") or "").split(",")
+        if k.strip().upper() in _KINDS
+    ]
+    try:
+        limit = min(100, max(1, int(request.query_params.get("limit") or 20)))
+    except ValueError:
+        limit = 20
+
+    if len(q) < 2:
+        return Response({"results": []})
+    return Response({"results": buscar_personas(q, kinds=kinds or None, limit=limit)})
@@ -97,6 +97,7 @@ INSTALLED_APPS = [
     "research",
     "security_mfa",
     "audit",
+    "search",
 ]
 
 MIDDLEWARE = [
@@ -164,11 +165,28 @@ if DB_ENGINE == "postgres":
         }
     }
 else:
+    # SQLite con varios workers (common/sqlite/): WAL para que las lecturas no
+    # esperen a las escrituras, BEGIN IMMEDIATE y fila por proceso en los
+    # caminos de escritura (common.sqlite.escritura). SQLITE_WAL=0 vuelve al
+    # journal de rollback; SQLITE_TRANSACTION_MODE fuerza un modo para todo.
+    SQLITE_WAL = os.getenv("SQLITE_WAL", "1") == "1"
+    SQLITE_PRAGMAS = [
+        f"PRAGMA journal_mode={'WAL' if SQLITE_WAL else 'DELETE'}",
+        f"PRAGMA synchronous={'NORMAL' if SQLITE_WAL else 'FULL'}",
+        f"PRAGMA cache_size=-{int(os.getenv('SQLITE_CACHE_MB', '64')) * 1024}",
+        f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_MB', '256')) * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+    ]
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.sqlite3",
+            "ENGINE": "common.sqlite",
             "NAME": BASE_DIR / "db.sqlite3",
-            "OPTIONS": {"timeout": 30},
+            "OPTIONS": {
+                "timeout": int(os.getenv("SQLITE_TIMEOUT", "30")),
+                "transaction_mode": os.getenv("SQLITE_TRANSACTION_MODE", "") or None,
+                "init_command": ";".join(SQLITE_PRAGMAS),
+                "write_lock": os.getenv("SQLITE_WRITE_LOCK", "1") == "1",
+            },
         }
     }
 
@@ -201,6 +219,23 @@ STATICFILES_DIRS = [STATIC_DIR] if STATIC_DIR.exists() else []
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Descargas protegidas (vouchers, backups, adjuntos): Django valida permisos y
+# el servidor web hace la transferencia. "nginx" → X-Accel-Redirect hacia la
+# location interna PROTECTED_MEDIA_PREFIX (alias de MEDIA_ROOT); "sendfile" →
+# X-Sendfile (Apache/lighttpd); vacío → FileResponse (desarrollo).
+PROTECTED_MEDIA_BACKEND = os.getenv("PROTECTED_MEDIA_BACKEND", "").strip().lower()
+PROTECTED_MEDIA_PREFIX = os.getenv("PROTECTED_MEDIA_PREFIX", "/protected/")
+
+# Conversión DOCX → PDF (common/libreoffice.py): instancias de LibreOffice por
+# proceso (0 = una por CPU, hasta 4) y reinicio tras N conversiones.
+LIBREOFFICE_BINARY = os.getenv("LIBREOFFICE_BINARY", "")
+LIBREOFFICE_POOL_SIZE = int(os.getenv("LIBREOFFICE_POOL_SIZE", "0"))
+LIBREOFFICE_MAX_CONVERSIONS = int(os.getenv("LIBREOFFICE_MAX_CONVERSIONS", "200"))
+
+# Hojas de vida en PDF ya renderizadas (catalogs/cache_cv.py). Bajo MEDIA_ROOT
+# para que common/entrega.py pueda delegar la descarga al servidor web.
+CV_PDF_CACHE_DIR = os.getenv("CV_PDF_CACHE_DIR", str(MEDIA_ROOT / "cache" / "cv"))
+
 # -----------------------
 # I18N / TZ
 # -----------------------
@@ -221,3 +256,5 @@ EMAIL_USE_TLS       = os.getenv("EMAIL_USE_TLS", "1") == "1"
 EMAIL_HOST_USER     = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL  = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER or "noreply@iesppallende.edu.pe")
+# Un SMTP colgado no debe bloquear al worker del outbox (manage.py send_notifications)
+EMAIL_TIMEOUT       = int(os.getenv("EMAIL_TIMEOUT", "30"))
@@ -48,6 +48,7 @@ urlpatterns = [
     path("api/", include("mesa_partes.urls")),
     path("api/", include("notifications.urls")),
     path("api/", include("portal.urls")),
+    path("api/", include("search.urls")),
     path("api/", include("rest_framework.urls")),
 ]
 
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+from common.busqueda import (
+    borrar_indice_trigram, crear_indice_trigram, texto_busqueda,
+)
+
+CAMPOS = ("num_documento", "apellido_paterno", "apellido_materno", "nombres", "email")
+
+
+def backfill(apps, schema_editor):
+    Student = apps.get_model("students", "Student")
+    lote = []
+    for st in Student.objects.only("id", *CAMPOS).iterator(chunk_size=1000):
+        st.search_text = texto_busqueda(*(getattr(st, f) for f in CAMPOS))
+        lote.append(st)
+        if len(lote) >= 1000:
+            Student.objects.bulk_update(lote, ["search_text"])
+            lote = []
+    if lote:
+        Student.objects.bulk_update(lote, ["search_text"])
+
+
+def trigram(apps, schema_editor):
+    crear_indice_trigram(schema_editor, "students_student", "search_text",
+                         "student_search_trgm")
+
+
+def trigram_reverse(apps, schema_editor):
+    borrar_indice_trigram(schema_editor, "student_search_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("students", "0004_student_estado_academico"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="student",
+            name="search_text",
+            field=models.CharField(blank=True, db_index=True, default="", editable=False, max_length=700),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(trigram, trigram_reverse),
+    ]
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.db import models
 from academic.models import Plan
+from common.busqueda import texto_busqueda
 
 User = settings.AUTH_USER_MODEL
 
@@ -77,11 +78,29 @@ class Student(models.Model):
     celular = models.CharField(max_length=30, blank=True, default="")
     photo = models.ImageField(upload_to="students/photos/", null=True, blank=True)
 
+    # Derivado: DNI + apellidos + nombres + email, en minúsculas y sin tildes
+    # (ver common/busqueda.py). Lo mantiene save(); no se edita a mano.
+    search_text = models.CharField(max_length=700, blank=True, default="",
+                                   db_index=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    CAMPOS_BUSQUEDA = ("num_documento", "apellido_paterno", "apellido_materno",
+                       "nombres", "email")
+
     class Meta:
         ordering = ["id"]
 
     def __str__(self):
         return f"{self.apellido_paterno} {self.apellido_materno} {self.nombres} ({self.num_documento})"
+
+    def build_search_text(self):
+        return texto_busqueda(*(getattr(self, f) for f in self.CAMPOS_BUSQUEDA))
+
+    def save(self, *args, **kwargs):
+        self.search_text = self.build_search_text()
+        fields = kwargs.get("update_fields")
+        if fields is not None and set(fields) & set(self.CAMPOS_BUSQUEDA):
+            kwargs["update_fields"] = set(fields) | {"search_text"}
+        super().save(*args, **kwargs)
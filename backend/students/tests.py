@@ -1,3 +1,69 @@
+"""Tests del directorio de estudiantes (/api/students)."""
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from academic.services.mesa_control import buscar_alumnos
+from .models import Student
+
+User = get_user_model()
+
+
+class DirectorioTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user("admin_dir", "admin_dir@t.pe", "x")
+        admin.is_staff = True
+        admin.save()
+        cls.admin = admin
+        Student.objects.create(num_documento="70000001", nombres="JOSÉ",
+                               apellido_paterno="NÚÑEZ", apellido_materno="QUISPE")
+        Student.objects.create(num_documento="70000002", nombres="ANA",
+                               apellido_paterno="NUNEZ", apellido_materno="ROJAS",
+                               sexo="F")
+        for i in range(3, 8):
+            Student.objects.create(num_documento=f"7000000{i}", nombres=f"ALUMNO {i}",
+                                   apellido_paterno="PEREZ")
+
+    def setUp(self):
+        self.cli = APIClient()
+        self.cli.force_authenticate(self.admin)
+
+    def test_search_text_se_mantiene_al_guardar(self):
+        st = Student.objects.get(num_documento="70000001")
+        self.assertEqual(st.search_text, "70000001 nunez quispe jose")
+        st.apellido_materno = "Ñaupari"
+        st.save(update_fields=["apellido_materno"])
+        st.refresh_from_db()
+        self.assertIn("naupari", st.search_text)
+
+    def test_busqueda_sin_tildes(self):
+        r = self.cli.get("/api/students", {"q": "nuñez"})
+        self.assertEqual(r.status_code, 200, r.data)
+        self.assertEqual(r.data["total"], 2)
+        self.assertEqual(len(buscar_alumnos("NUNEZ jose")), 1)
+
+    def test_paginacion_keyset(self):
+        r = self.cli.get("/api/students", {"limit": 3})
+        self.assertEqual(r.status_code, 200, r.data)
+        self.assertEqual(len(r.data["students"]), 3)
+        self.assertEqual(r.data["total"], 7)
+        # sin sexo ni fecha_nac → todos incompletos
+        self.assertEqual(r.data["total_incomplete"], 7)
+        fila = r.data["students"][0]
+        self.assertIn("fecha_nac", fila["missing_fields"])
+        self.assertNotIn("semestreLabel", fila)
+
+        vistos = [s["id"] for s in r.data["students"]]
+        cursor = r.data["next_cursor"]
+        while cursor:
+            r = self.cli.get("/api/students", {"limit": 3, "cursor": cursor})
+            self.assertNotIn("total", r.data)
+            vistos += [s["id"] for s in r.data["students"]]
+            cursor = r.data["next_cursor"]
+        self.assertEqual(vistos, sorted(Student.objects.values_list("id", flat=True)))
+
+    def test_sin_limit_respuesta_completa(self):
+        r = self.cli.get("/api/students")
+        self.assertEqual(r.data["total"], 7)
+        self.assertIn("semestreLabel", r.data["students"][0])
@@ -9,7 +9,10 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 
+from acl.authz import contexto
 from acl.models import Role
+from common.busqueda import filtrar_terminos
+from common.condicional import condicional
 from .models import Student
 from .name_utils import nombre_oficial, partir_nombre_completo
 from .serializers import StudentSerializer, StudentUpdateSerializer, StudentMeUpdateSerializer
@@ -122,19 +125,9 @@ def _require_staff(request):
     # ✅ permitir roles
     allowed = {"ADMIN_ACADEMIC", "ADMIN_ACADEMICO", "ADMIN_SYSTEM", "REGISTRAR"}
 
-    try:
-        # si tu User tiene ManyToMany roles
-        if hasattr(u, "roles") and u.roles.filter(name__in=list(allowed)).exists():
-            return None
-    except Exception:
-        pass
-
-    try:
-        # si manejas roles por tabla acl_userrole
-        if UserRole.objects.filter(user=u, role__name__in=list(allowed)).exists():
-            return None
-    except Exception:
-        pass
+    # M2M User.roles + tabla acl_userrole (acl/authz.py)
+    if contexto(u).tiene_alguno(allowed):
+        return None
 
     return Response({"detail": "No autorizado."}, status=status.HTTP_403_FORBIDDEN)
 
@@ -152,9 +145,105 @@ def _split_full_name(full_name: str, fallback: str = ""):
     return partir_nombre_completo(full_name, fallback)
 
 
+# Alumno con datos personales incompletos (fecha_nac, sexo, nombres, apellido)
+_Q_INCOMPLETO = (
+    Q(fecha_nac__isnull=True)
+    | Q(sexo__isnull=True) | Q(sexo="")
+    | Q(nombres__isnull=True) | Q(nombres="")
+    | Q(apellido_paterno__isnull=True) | Q(apellido_paterno="")
+)
+
+# Proyección del listado paginado: solo lo que pinta la grilla
+_LIST_FIELDS = {
+    "id": "id",
+    "numDocumento": "num_documento",
+    "nombres": "nombres",
+    "apellidoPaterno": "apellido_paterno",
+    "apellidoMaterno": "apellido_materno",
+    "sexo": "sexo",
+    "fechaNac": "fecha_nac",
+    "email": "email",
+    "celular": "celular",
+    "programaCarrera": "programa_carrera",
+    "ciclo": "ciclo",
+    "turno": "turno",
+    "seccion": "seccion",
+    "periodo": "periodo",
+    "estadoAcademico": "estado_academico",
+    "planId": "plan_id",
+    "userId": "user_id",
+    "photo": "photo",
+}
+
+_PAGE_DEFAULT = 50
+_PAGE_MAX = 200
+
+
+def _missing_fields(st) -> list:
+    """Campos personales vacíos; acepta el modelo o una fila de .values()."""
+    get = st.get if isinstance(st, dict) else (lambda k: getattr(st, k, None))
+    missing = []
+    if not get("fecha_nac"):
+        missing.append("fecha_nac")
+    if not (get("sexo") or "").strip():
+        missing.append("sexo")
+    if not (get("nombres") or "").strip():
+        missing.append("nombres")
+    if not (get("apellido_paterno") or "").strip():
+        missing.append("apellido_paterno")
+    return missing
+
+
+def _students_page(request, qs):
+    """
+    Página keyset del directorio: ?limit=50&cursor=<último id>.
+    Trae una fila de más para saber si hay siguiente página; el total solo
+    se cuenta en la primera (sin cursor), que es cuando la UI lo muestra.
+    """
+    try:
+        limit = max(1, min(int(request.query_params.get("limit") or _PAGE_DEFAULT), _PAGE_MAX))
+    except (TypeError, ValueError):
+        limit = _PAGE_DEFAULT
+    cursor = request.query_params.get("cursor")
+
+    page_qs = qs.order_by("id")
+    if cursor:
+        try:
+            page_qs = page_qs.filter(id__gt=int(cursor))
+        except (TypeError, ValueError):
+            return Response({"detail": "cursor inválido."}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = list(page_qs.values(*_LIST_FIELDS.values())[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    storage = Student._meta.get_field("photo").storage
+    out = []
+    for r in rows:
+        item = {k: r[v] for k, v in _LIST_FIELDS.items() if k != "photo"}
+        item["planId"] = item["planId"] or ""
+        item["userId"] = item["userId"] or ""
+        photo = r["photo"]
+        item["photoUrl"] = request.build_absolute_uri(storage.url(photo)) if photo else ""
+        missing = _missing_fields(r)
+        item["data_incomplete"] = bool(missing)
+        item["missing_fields"] = missing
+        out.append(item)
+
+    payload = {
+        "students": out,
+        "next_cursor": out[-1]["id"] if has_more else None,
+    }
+    if not cursor:
+        payload["total"] = qs.count()
+        payload["total_incomplete"] = qs.filter(_Q_INCOMPLETO).count()
+    return Response(payload)
+
+
 # ✅ ADMIN: /students
 @api_view(["GET", "POST"])
 @permission_classes([permissions.IsAuthenticated])
+@condicional("students.Student", "academic.Plan", "catalogs.Career", "acl.UserRole", "acl.Role")
 def students_collection(request):
     not_ok = _require_staff(request)
     if not_ok:
@@ -192,36 +281,20 @@ def students_collection(request):
         # útil para auditar quién necesita completar datos
         incomplete = (request.query_params.get("incomplete") or "").lower() in ("1", "true", "yes")
         if incomplete:
-            qs = qs.filter(
-                Q(fecha_nac__isnull=True)
-                | Q(sexo__isnull=True) | Q(sexo="")
-                | Q(nombres__isnull=True) | Q(nombres="")
-                | Q(apellido_paterno__isnull=True) | Q(apellido_paterno="")
-            )
+            qs = qs.filter(_Q_INCOMPLETO)
 
         if q:
-            terms = [t for t in q.split() if t]
-            for term in terms:
-                qs = qs.filter(
-                Q(num_documento__icontains=term) |
-                Q(nombres__icontains=term) |
-                Q(apellido_paterno__icontains=term) |
-                Q(apellido_materno__icontains=term) |
-                Q(email__icontains=term)
-            )
+            qs = filtrar_terminos(qs, q)
+
+        # Con ?limit= (o ?cursor=) responde la página compacta
+        if "limit" in request.query_params or "cursor" in request.query_params:
+            return _students_page(request, qs)
 
-        data = StudentSerializer(qs, many=True, context={"request": request}).data
+        students = list(qs)
+        data = StudentSerializer(students, many=True, context={"request": request}).data
         # Anotar cuáles tienen datos incompletos (para badges en UI)
-        for st_data, st_obj in zip(data, qs):
-            missing = []
-            if not getattr(st_obj, "fecha_nac", None):
-                missing.append("fecha_nac")
-            if not (getattr(st_obj, "sexo", "") or "").strip():
-                missing.append("sexo")
-            if not (getattr(st_obj, "nombres", "") or "").strip():
-                missing.append("nombres")
-            if not (getattr(st_obj, "apellido_paterno", "") or "").strip():
-                missing.append("apellido_paterno")
+        for st_data, st_obj in zip(data, students):
+            missing = _missing_fields(st_obj)
             st_data["data_incomplete"] = bool(missing)
             st_data["missing_fields"] = missing
 
@@ -399,20 +472,12 @@ def students_missing_data(request):
     if periodo:
         qs = qs.filter(periodo=periodo)
 
-    incomplete = qs.filter(
-        Q(fecha_nac__isnull=True)
-        | Q(sexo__isnull=True) | Q(sexo="")
-        | Q(nombres__isnull=True) | Q(nombres="")
-        | Q(apellido_paterno__isnull=True) | Q(apellido_paterno="")
-    ).order_by("plan__career__name", "ciclo", "apellido_paterno")
+    incomplete = qs.filter(_Q_INCOMPLETO).order_by(
+        "plan__career__name", "ciclo", "apellido_paterno")
 
     out = []
     for st in incomplete:
-        missing = []
-        if not st.fecha_nac: missing.append("fecha_nac")
-        if not (st.sexo or "").strip(): missing.append("sexo")
-        if not (st.nombres or "").strip(): missing.append("nombres")
-        if not (st.apellido_paterno or "").strip(): missing.append("apellido_paterno")
+        missing = _missing_fields(st)
         out.append({
             "id": st.id,
             "dni": st.num_documento,
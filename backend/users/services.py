@@ -0,0 +1,196 @@
+"""
+Purga masiva de usuarios (POST /api/users/purge).
+
+Antes se purgaba usuario por usuario: una docena de DELETE/UPDATE por
+persona y, por cada una, un recorrido de los SectionGrades para quitar su
+llave del JSON con un save por acta. Purgar una promoción completa por rol
+tomaba minutos con los bloqueos tomados todo ese tiempo. Ahora `purgar(ids)`
+resuelve los ids una vez y borra por tramos de CHUNK con sentencias por
+conjunto; cada acta tocada se reescribe una sola vez sin todas las llaves
+purgadas (las actas con esas llaves se encuentran por las celdas indexadas,
+SectionGradeEntry, cuyas filas se borran por conjunto). `contar(ids)` da los
+mismos conteos sin borrar (vista previa).
+
+Notas y matrículas se borran sin pasar por sus señales (academic/signals.py
+recalcularía o invalidaría fila por fila): lo que esas señales mantienen se
+repone en bloque al confirmar — el orden de mérito de los períodos afectados
+y las páginas de verificación de los DNI purgados. El snapshot del dashboard
+y los puntajes de mérito se van en cascada con el Student.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from academic.models import (
+    AcademicGradeRecord,
+    AcademicProcess,
+    AttendanceRow,
+    AttendanceTally,
+    Enrollment,
+    EnrollmentItem,
+    EnrollmentPayment,
+    ProcessFile,
+    SectionGradeEntry,
+    SectionGrades,
+)
+from acl.models import UserRole
+from common import condicional
+from students.models import Student
+
+User = get_user_model()
+
+CHUNK = 500
+
+CATEGORIAS = (
+    "grade_records",
+    "enrollments",
+    "enrollment_payments",
+    "processes",
+    "process_files",
+    "attendance_rows",
+    "section_grades_touched",
+    "student_profiles",
+    "teachers_unlinked",
+    "user_roles",
+    "users",
+)
+
+
+def _tramos(ids):
+    ids = list(ids)
+    for i in range(0, len(ids), CHUNK):
+        yield ids[i:i + CHUNK]
+
+
+def _borrar_sin_senales(qs) -> int:
+    """DELETE directo por conjunto (solo para modelos sin dependientes)."""
+    condicional.tocar(qs.model)
+    return qs._raw_delete(qs.db)
+
+
+def _actas_con_llaves(keys):
+    """{id: SectionGrades} de las actas que tienen alguna de las llaves."""
+    from academic.services import actas as celdas
+
+    section_ids = set()
+    for tramo in _tramos(keys):
+        section_ids |= celdas.secciones_con(tramo)
+    actas = {}
+    for tramo in _tramos(section_ids):
+        for b in SectionGrades.objects.filter(section_id__in=tramo):
+            actas[b.id] = b
+    return actas
+
+
+def _teachers(uids, contar=False) -> int:
+    """Docentes (catalogs y academic) vinculados: los desvincula, o solo los cuenta."""
+    from academic.models import Teacher as AcademicTeacher
+    from catalogs import directorio_docentes
+    from catalogs.models import Teacher as CatalogTeacher
+
+    n = 0
+    if not contar:
+        # El update() no pasa por las señales: el directorio se marca a mano
+        directorio_docentes.marcar(
+            CatalogTeacher.objects.filter(user_id__in=uids).values_list("id", flat=True))
+    for model in (CatalogTeacher, AcademicTeacher):
+        qs = model.objects.filter(user_id__in=uids)
+        n += qs.count() if contar else qs.update(user=None)
+    if not contar:
+        condicional.tocar(CatalogTeacher, AcademicTeacher)
+    return n
+
+
+def contar(user_ids):
+    """Conteos por categoría que produciría purgar esos usuarios (sin borrar)."""
+    uids = list(user_ids)
+    sids = list(Student.objects.filter(user_id__in=uids).values_list("id", flat=True))
+    c = dict.fromkeys(CATEGORIAS, 0)
+    for t in _tramos(sids):
+        c["grade_records"] += AcademicGradeRecord.objects.filter(student_id__in=t).count()
+        c["enrollments"] += (Enrollment.objects.filter(student_id__in=t).count()
+                             + EnrollmentItem.objects.filter(enrollment__student_id__in=t).count())
+        c["enrollment_payments"] += EnrollmentPayment.objects.filter(student_id__in=t).count()
+        c["processes"] += AcademicProcess.objects.filter(student_id__in=t).count()
+        c["process_files"] += ProcessFile.objects.filter(process__student_id__in=t).count()
+    c["student_profiles"] = len(sids)
+    for t in _tramos(uids):
+        c["attendance_rows"] += AttendanceRow.objects.filter(student_id__in=t).count()
+        c["user_roles"] += UserRole.objects.filter(user_id__in=t).count()
+        c["teachers_unlinked"] += _teachers(t, contar=True)
+        c["users"] += User.objects.filter(id__in=t).count()
+    c["section_grades_touched"] = len(_actas_con_llaves([str(u) for u in uids]))
+    return c
+
+
+def purgar(user_ids):
+    """
+    Elimina todo lo de esos usuarios (perfil de estudiante, notas, matrículas,
+    trámites, asistencia, llaves en actas, roles y el usuario) en una sola
+    transacción. Retorna los conteos por categoría.
+    """
+    from academic.services import ranking_merito
+    from academic.views.enrollment_verify import CACHE_NS
+    from admission.models import Applicant
+    from common.public_cache import invalidar
+
+    uids = list(user_ids)
+    c = dict.fromkeys(CATEGORIAS, 0)
+
+    with transaction.atomic():
+        estudiantes = list(Student.objects.filter(user_id__in=uids).values_list("id", "num_documento"))
+        sids = [sid for sid, _dni in estudiantes]
+        terms = set()
+
+        for t in _tramos(sids):
+            # ── Notas y matrículas (sin dependientes: DELETE directo) ──
+            notas = AcademicGradeRecord.objects.filter(student_id__in=t)
+            terms.update(notas.values_list("term", flat=True).distinct())
+            c["grade_records"] += _borrar_sin_senales(notas)
+            c["enrollments"] += _borrar_sin_senales(
+                EnrollmentItem.objects.filter(enrollment__student_id__in=t))
+            c["enrollments"] += _borrar_sin_senales(Enrollment.objects.filter(student_id__in=t))
+            c["enrollment_payments"] += EnrollmentPayment.objects.filter(student_id__in=t).delete()[0]
+
+            # ── Trámites y sus archivos ──
+            c["process_files"] += ProcessFile.objects.filter(process__student_id__in=t).delete()[0]
+            c["processes"] += AcademicProcess.objects.filter(student_id__in=t).delete()[0]
+
+        # ── Actas: cada una se reescribe una vez sin todas las llaves ──
+        keys = {str(u) for u in uids}
+        actas = list(_actas_con_llaves(keys).values())
+        ahora = timezone.now()
+        for b in actas:
+            b.grades = {k: v for k, v in (b.grades or {}).items() if k not in keys}
+            b.updated_at = ahora
+        SectionGrades.objects.bulk_update(actas, ["grades", "updated_at"], batch_size=CHUNK)
+        for t in _tramos(keys):
+            SectionGradeEntry.objects.filter(student_key__in=t).delete()
+        c["section_grades_touched"] = len(actas)
+
+        for t in _tramos(sids):
+            c["student_profiles"] += Student.objects.filter(id__in=t).delete()[0]
+
+        for t in _tramos(uids):
+            # ── Asistencia (AttendanceRow.student_id = user.id) ──
+            c["attendance_rows"] += AttendanceRow.objects.filter(student_id__in=t).delete()[0]
+            AttendanceTally.objects.filter(student_id__in=t).delete()
+
+            # ── Desvincular docentes y postulantes ──
+            c["teachers_unlinked"] += _teachers(t)
+            Applicant.objects.filter(user_id__in=t).update(user=None)
+
+            c["user_roles"] += UserRole.objects.filter(user_id__in=t).delete()[0]
+            c["users"] += User.objects.filter(id__in=t).delete()[0]
+
+        # Lo que mantenían las señales de notas y matrículas
+        dnis = [dni for _sid, dni in estudiantes if dni]
+
+        def _reponer():
+            ranking_merito.invalidar(terms)
+            for dni in dnis:
+                invalidar(CACHE_NS, dni)
+
+        transaction.on_commit(_reponer)
+
+    return c
@@ -0,0 +1,72 @@
+"""Tests de la purga masiva de usuarios."""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from academic.models import (
+    AcademicGradeRecord, AttendanceRow, AttendanceSession, Course, Enrollment, EnrollmentItem,
+    Plan, PlanCourse, Section, SectionGrades,
+)
+from acl.models import Role, UserRole
+from catalogs.models import Career
+from students.models import Student
+
+User = get_user_model()
+
+
+class PurgaMasivaTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@t.pe", "x")
+        rol = Role.objects.create(name="STUDENT")
+        plan = Plan.objects.create(career=Career.objects.create(name="EDUCACIÓN INICIAL", code="EI"),
+                                   name="Plan 2020")
+        pc = PlanCourse.objects.create(plan=plan, semester=1, credits=3,
+                                       course=Course.objects.create(code="DP1", name="Desarrollo Personal I"))
+        secs = [Section.objects.create(plan_course=pc, label=l, period="2026-I") for l in "AB"]
+        ses = AttendanceSession.objects.create(section=secs[0])
+        cls.alumnos = []
+        for i in range(3):
+            u = User.objects.create_user(f"6100000{i}", f"a{i}@t.pe", "x")
+            UserRole.objects.create(user=u, role=rol)
+            st = Student.objects.create(user=u, num_documento=f"6100000{i}", nombres="ANA",
+                                        apellido_paterno=f"PEREZ {i}", plan=plan)
+            AcademicGradeRecord.objects.create(student=st, course=pc.course, plan_course=pc,
+                                               term="2026-I", final_grade=14)
+            enr = Enrollment.objects.create(student=st, period="2026-I")
+            EnrollmentItem.objects.create(enrollment=enr, plan_course=pc, credits=3)
+            AttendanceRow.objects.create(session=ses, student_id=u.id, status="P")
+            cls.alumnos.append(u)
+        # El tercero no es estudiante: su llave en el acta debe quedar
+        UserRole.objects.filter(user=cls.alumnos[2]).delete()
+        for sec in secs:
+            SectionGrades.objects.create(section=sec, grades={
+                str(u.id): {"PROMEDIO_FINAL": 14} for u in cls.alumnos})
+
+    def _purge(self, **body):
+        cli = APIClient()
+        cli.force_authenticate(self.admin)
+        r = cli.post("/api/users/purge", {"mode": "role", "role": "STUDENT", **body}, format="json")
+        self.assertEqual(r.status_code, 200, r.data)
+        return r.data
+
+    def test_vista_previa_no_borra(self):
+        d = self._purge(dry_run=True)
+        self.assertEqual(d["targets"], 2)
+        self.assertEqual(d["would_delete"]["grade_records"], 2)
+        self.assertEqual(d["would_delete"]["section_grades_touched"], 2)
+        self.assertEqual(User.objects.filter(id__in=[u.id for u in self.alumnos]).count(), 3)
+
+    def test_purga_por_conjuntos(self):
+        d = self._purge(dry_run=False)
+        c = d["deleted"]
+        self.assertEqual((c["users"], c["grade_records"], c["enrollments"]), (2, 2, 4))
+        self.assertEqual((c["attendance_rows"], c["user_roles"], c["section_grades_touched"]), (2, 2, 2))
+
+        self.assertEqual(list(User.objects.filter(id__in=[u.id for u in self.alumnos])),
+                         [self.alumnos[2]])
+        self.assertEqual(Student.objects.count(), 1)
+        self.assertEqual((Enrollment.objects.count(), EnrollmentItem.objects.count()), (1, 1))
+        queda = str(self.alumnos[2].id)
+        for b in SectionGrades.objects.all():
+            self.assertEqual(list(b.grades), [queda])
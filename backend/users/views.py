@@ -9,7 +9,10 @@ from rest_framework import permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
+from acl.authz import contexto
 from acl.models import UserRole, Role
+from common import condicional
+from . import services as purga
 from .serializers import UserSerializer, UserCreateSerializer, UserUpdateSerializer
 from django.db import transaction
 from django.http import HttpResponse
@@ -19,15 +22,9 @@ from django.db import IntegrityError
 
 import io
 
-from academic.models import (
-    AcademicGradeRecord,
-    AcademicProcess,
-    ProcessFile,
-    AttendanceRow,
-    SectionGrades,
-)
-
 from students.models import Student
+from search.models import PersonEntry
+from search.services import ids_coincidentes
 
 User = get_user_model()
 
@@ -65,16 +62,7 @@ def _has_role(user, role_name: str) -> bool:
     if getattr(user, "is_superuser", False) or getattr(user, "is_staff", False):
         return True
 
-    try:
-        if hasattr(user, "roles") and user.roles.filter(name__iexact=role_name).exists():
-            return True
-    except Exception:
-        pass
-
-    try:
-        return UserRole.objects.filter(user=user, role__name__iexact=role_name).exists()
-    except Exception:
-        return False
+    return contexto(user).tiene_alguno_iexact([role_name])
 
 
 def _require_staff(request):
@@ -211,18 +199,13 @@ def change_password(request):
 def auth_me(request):
     u = request.user
 
-    # roles seguros
-    try:
-        roles = list(u.roles.values_list("name", flat=True))
-    except Exception:
-        roles = []
-
-    # permissions seguros (NO rompe auth/me)
-    perm_codes = []
+    # roles y permisos (con alias) del contexto de autorización cacheado
     try:
-        perm_codes = list(u.roles.values_list("permissions__code", flat=True).distinct())
+        ctx = contexto(u)
+        roles = sorted(ctx.roles)
+        perm_codes = sorted(ctx.permisos)
     except Exception:
-        perm_codes = []
+        roles, perm_codes = [], []
 
     # student_profile seguro
     student_id = None
@@ -371,6 +354,7 @@ def users_detail(request, pk: int):
                     AcademicTeacher.objects.filter(user_id=pk).update(user=None)
                 except Exception:
                     pass
+                condicional.tocar("catalogs.Teacher", "academic.Teacher")
 
                 user.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
@@ -415,10 +399,13 @@ def users_search(request):
 
     qs = User.objects.all().order_by("id")
     if q:
+        # El índice de personas agrega coincidencias sin tildes y por palabras
+        # en cualquier orden ("nunez ana" → "Ana Núñez")
         qs = qs.filter(
             Q(username__icontains=q) |
             Q(email__icontains=q) |
-            Q(full_name__icontains=q)
+            Q(full_name__icontains=q) |
+            Q(id__in=ids_coincidentes(PersonEntry.USER, q))
         )
 
     pag = _paginate_queryset(request, qs, default_page_size=10, max_page_size=100)
@@ -581,118 +568,6 @@ def users_set_password(request, pk: int):
     return Response({"status": "password_set", "must_change_password": getattr(user, "must_change_password", False)})
 
 
-def _purge_one_student(user_obj: User):
-    """
-    Borra todo lo de un estudiante (eliminación total):
-    - AcademicGradeRecord por student_profile
-    - Enrollment + EnrollmentItem + EnrollmentPayment (por student)
-    - AcademicProcess + ProcessFile (por student_id = Student.id)
-    - AttendanceRow (por student_id = user.id)
-    - SectionGrades.grades: elimina llave str(user.id)
-    - Student profile
-    - Teacher records (catalogs + academic) si existen
-    - UserRole
-    - User
-    Retorna conteos.
-    """
-    counts = {
-        "grade_records": 0,
-        "enrollments": 0,
-        "enrollment_payments": 0,
-        "processes": 0,
-        "process_files": 0,
-        "attendance_rows": 0,
-        "section_grades_touched": 0,
-        "student_profiles": 0,
-        "teachers_unlinked": 0,
-        "user_roles": 0,
-        "users": 0,
-    }
-
-    uid = int(user_obj.id)
-
-    st = None
-    try:
-        st = user_obj.student_profile
-    except Exception:
-        st = None
-
-    # ── 1. Grade records ──
-    if st:
-        counts["grade_records"] = AcademicGradeRecord.objects.filter(student=st).delete()[0]
-
-    # ── 2. Enrollments (y sus items / payments) ──
-    if st:
-        try:
-            from academic.models import Enrollment, EnrollmentPayment
-            counts["enrollment_payments"] = EnrollmentPayment.objects.filter(student=st).delete()[0]
-            counts["enrollments"] = Enrollment.objects.filter(student=st).delete()[0]
-        except Exception:
-            pass
-
-    # ── 3. Processes + files ──
-    if st:
-        proc_ids = list(AcademicProcess.objects.filter(student_id=st.id).values_list("id", flat=True))
-        if proc_ids:
-            counts["process_files"] = ProcessFile.objects.filter(process_id__in=proc_ids).delete()[0]
-        counts["processes"] = AcademicProcess.objects.filter(student_id=st.id).delete()[0]
-
-    # ── 4. Attendance rows ──
-    counts["attendance_rows"] = AttendanceRow.objects.filter(student_id=uid).delete()[0]
-
-    # ── 5. Section grades (JSON key) ──
-    key = str(uid)
-    touched = 0
-    try:
-        bundles = SectionGrades.objects.filter(grades__has_key=key)  # noqa
-    except Exception:
-        bundles = SectionGrades.objects.all()
-
-    for b in bundles:
-        g = b.grades or {}
-        if key in g:
-            g.pop(key, None)
-            b.grades = g
-            b.save(update_fields=["grades", "updated_at"])
-            touched += 1
-
-    counts["section_grades_touched"] = touched
-
-    # ── 6. Student profile ──
-    if st:
-        counts["student_profiles"] = Student.objects.filter(id=st.id).delete()[0]
-
-    # ── 7. Desvincular Teacher records (PROTECT → SET_NULL ya aplicado,
-    #        pero por seguridad desvinculamos explícitamente) ──
-    try:
-        from catalogs.models import Teacher as CatalogTeacher
-        n = CatalogTeacher.objects.filter(user_id=uid).update(user=None)
-        counts["teachers_unlinked"] += n
-    except Exception:
-        pass
-    try:
-        from academic.models import Teacher as AcademicTeacher
-        n = AcademicTeacher.objects.filter(user_id=uid).update(user=None)
-        counts["teachers_unlinked"] += n
-    except Exception:
-        pass
-
-    # ── 8. Desvincular Applicant (admission) ──
-    try:
-        from admission.models import Applicant
-        Applicant.objects.filter(user_id=uid).update(user=None)
-    except Exception:
-        pass
-
-    # ── 9. UserRole ──
-    counts["user_roles"] = UserRole.objects.filter(user_id=uid).delete()[0]
-
-    # ── 10. User (final) ──
-    counts["users"] = User.objects.filter(id=uid).delete()[0]
-
-    return counts
-
-
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
 def users_purge(request):
@@ -738,9 +613,9 @@ def users_purge(request):
 
     qs = qs.exclude(id=request.user.id)
 
-    safe_targets = list(qs)
+    target_ids = list(qs.values_list("id", flat=True))
 
-    if not safe_targets:
+    if not target_ids:
         return Response({
             "dry_run": dry_run,
             "targets": 0,
@@ -748,64 +623,36 @@ def users_purge(request):
         })
 
     if dry_run:
-        preview = []
-        for u in safe_targets[:200]:
-            preview.append({
-                "id": u.id,
-                "username": getattr(u, "username", ""),
-                "email": getattr(u, "email", ""),
-                "full_name": getattr(u, "full_name", ""),
-            })
+        preview = [
+            {"id": u.id, "username": getattr(u, "username", ""),
+             "email": getattr(u, "email", ""), "full_name": getattr(u, "full_name", "")}
+            for u in User.objects.filter(id__in=target_ids[:200]).order_by("id")
+        ]
         return Response({
             "dry_run": True,
-            "targets": len(safe_targets),
+            "targets": len(target_ids),
             "sample": preview,
+            "would_delete": purga.contar(target_ids),
             "message": "Vista previa. Enviar dry_run=false para ejecutar."
         })
 
-    totals = {
-        "grade_records": 0,
-        "enrollments": 0,
-        "enrollment_payments": 0,
-        "processes": 0,
-        "process_files": 0,
-        "attendance_rows": 0,
-        "section_grades_touched": 0,
-        "student_profiles": 0,
-        "teachers_unlinked": 0,
-        "user_roles": 0,
-        "users": 0,
-    }
-
-    errors = []
-
-    with transaction.atomic():
-        for u in safe_targets:
-            try:
-                c = _purge_one_student(u)
-                for k in totals:
-                    totals[k] += int(c.get(k, 0) or 0)
-            except Exception as ex:
-                errors.append({
-                    "user_id": u.id,
-                    "username": getattr(u, "username", ""),
-                    "error": str(ex),
-                })
-
-    if errors and totals["users"] == 0:
+    # Todo o nada: una sola transacción por conjuntos (users/services.py)
+    try:
+        totals = purga.purgar(target_ids)
+    except Exception as ex:
         return Response({
             "dry_run": False,
-            "targets": len(safe_targets),
-            "deleted": totals,
-            "errors": errors,
-            "message": f"Purge falló para {len(errors)} usuario(s). Revisa los errores."
+            "targets": len(target_ids),
+            "deleted": dict.fromkeys(purga.CATEGORIAS, 0),
+            "errors": [{"error": str(ex)}],
+            "message": "Purge falló; no se eliminó nada. Revisa los errores."
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     return Response({
         "dry_run": False,
-        "targets": len(safe_targets),
+        "targets": len(target_ids),
         "deleted": totals,
-        "errors": errors if errors else None,
+        "errors": None,
         "message": f"Purge ejecutado. {totals['users']} usuario(s) eliminado(s)."
     })
 
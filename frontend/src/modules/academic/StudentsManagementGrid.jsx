@@ -5,7 +5,7 @@
    edición inline de fecha_nac y sexo · badges de datos faltantes ·
    buscador por DNI/nombre.
    ═══════════════════════════════════════════════════════════════ */
-import React, { useCallback, useEffect, useMemo, useState } from "react";
+import React, { useCallback, useEffect, useState } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
@@ -82,7 +82,11 @@ export default function StudentsManagementGrid({
         }).catch(() => setCareers([]));
     }, []);
 
-    const load = useCallback(async () => {
+    const [nextCursor, setNextCursor] = useState(null);
+    const [counts, setCounts] = useState({ total: 0, incomplete: 0 });
+
+    // Página keyset: sin cursor reemplaza la lista, con cursor la extiende
+    const load = useCallback(async (cursor = null) => {
         setLoading(true);
         try {
             const params = { only_students: 1 };
@@ -91,8 +95,14 @@ export default function StudentsManagementGrid({
             if (filters.periodo)   params.periodo = filters.periodo;
             if (filters.incomplete) params.incomplete = 1;
             if (filters.q.trim())  params.q = filters.q.trim();
-            const data = await StudentsService.list(params);
-            setStudents(Array.isArray(data?.students) ? data.students : []);
+            if (cursor)            params.cursor = cursor;
+            const data = await StudentsService.page(params);
+            const rows = Array.isArray(data?.students) ? data.students : [];
+            setStudents((prev) => (cursor ? [...prev, ...rows] : rows));
+            setNextCursor(data?.next_cursor ?? null);
+            if (!cursor) {
+                setCounts({ total: data?.total ?? rows.length, incomplete: data?.total_incomplete ?? 0 });
+            }
         } catch (e) {
             toast.error(e?.response?.data?.detail || "Error cargando alumnos");
         } finally {
@@ -102,10 +112,7 @@ export default function StudentsManagementGrid({
 
     useEffect(() => { load(); }, [load]);
 
-    const totals = useMemo(() => {
-        const incomp = students.filter((s) => s.data_incomplete).length;
-        return { total: students.length, incomplete: incomp };
-    }, [students]);
+    const totals = counts;
 
     const startEdit = (s) => {
         setEditingId(s.id);
@@ -255,7 +262,7 @@ export default function StudentsManagementGrid({
                                 <Filter className="w-3.5 h-3.5" />
                                 {filters.incomplete ? "Solo incompletos" : "Todos"}
                             </Button>
-                            <Button size="icon" variant="ghost" className="h-9 w-9" onClick={load} title="Recargar">
+                            <Button size="icon" variant="ghost" className="h-9 w-9" onClick={() => load()} title="Recargar">
                                 <RefreshCw className={`w-4 h-4 ${loading ? "animate-spin" : ""}`} />
                             </Button>
                         </div>
@@ -414,6 +421,14 @@ export default function StudentsManagementGrid({
                         </tbody>
                     </table>
                 </div>
+                {nextCursor && (
+                    <div className="flex justify-center">
+                        <Button variant="outline" size="sm" disabled={loading} onClick={() => load(nextCursor)}>
+                            {loading && <Loader2 className="w-4 h-4 animate-spin mr-2" />}
+                            Cargar más ({students.length} de {totals.total})
+                        </Button>
+                    </div>
+                )}
             </CardContent>
         </Card>
     );
@@ -671,6 +671,11 @@ const ProcedureDetailDialog = ({ open, onOpenChange, procedureId, onChanged }) =
     catch (err) { toast.error(formatApiError(err, "No se pudo eliminar el archivo")); }
   };
 
+  const downloadFile = async f => {
+    try { await ProcedureFiles.download(f); }
+    catch (err) { toast.error(formatApiError(err, "No se pudo descargar el archivo")); }
+  };
+
   const [routeForm, setRouteForm] = useState({ to_office_id: "", assignee_id: "", deadline_at: "", note: "" });
   const [statusForm, setStatusForm] = useState({ status: "IN_REVIEW", note: "" });
   const [notifyForm, setNotifyForm] = useState({ channels: ["EMAIL"], subject: "", message: "" });
@@ -726,6 +731,7 @@ const ProcedureDetailDialog = ({ open, onOpenChange, procedureId, onChanged }) =
       const res = await ProcSvc.notify(proc.id, notifyForm);
       const r = res?.results || {};
       if (r.email === "sent") toast.success("Email enviado al solicitante");
+      else if (r.email === "queued") toast.success("Email en cola de envío al solicitante");
       else if (r.email === "sin_correo") toast.warning("El solicitante no tiene correo registrado");
       else if (typeof r.email === "string" && r.email.startsWith("error")) toast.error(`Error email: ${r.email}`);
       else toast.success("Notificación registrada");
@@ -874,10 +880,10 @@ const ProcedureDetailDialog = ({ open, onOpenChange, procedureId, onChanged }) =
                             <div key={f.id} className="flex items-center justify-between rounded-xl border border-slate-100 bg-slate-50/60 px-3 py-2">
                               <div className="flex items-center gap-2 min-w-0">
                                 <Paperclip size={12} className="text-slate-400 shrink-0" />
-                                <a href={f.url} target="_blank" rel="noreferrer"
-                                  className="text-xs text-blue-600 hover:underline truncate">
+                                <button type="button" onClick={() => downloadFile(f)}
+                                  className="text-xs text-blue-600 hover:underline truncate text-left">
                                   {f.filename || f.original_name || "archivo"}
-                                </a>
+                                </button>
                                 {f.size && <span className="text-[10px] text-slate-400 shrink-0">{Math.round(f.size / 1024)} KB</span>}
                               </div>
                               {canUpload && (
@@ -1042,6 +1048,8 @@ const ProceduresManagement = forwardRef(({ initialFilter }, ref) => {
   const canReview = hasPerm(PERMS["mpv.processes.review"]);
 
   const [procedures, setProcedures] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
   const [procedureTypes, setProcedureTypes] = useState([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState("");
@@ -1092,20 +1100,33 @@ const ProceduresManagement = forwardRef(({ initialFilter }, ref) => {
     },
   }));
 
-  const fetchProcedures = useCallback(async () => {
+  // Página keyset filtrada en el servidor: sin cursor reemplaza la lista, con cursor la extiende
+  const fetchProcedures = useCallback(async (cursor = null) => {
     if (!canReview) return;
     try {
       setLoading(true);
-      setProcedures((await ProcSvc.list())?.procedures ?? []);
+      const params = {};
+      if (searchTerm.trim())      params.q = searchTerm.trim();
+      if (statusFilter !== "ALL")  params.status = statusFilter;
+      if (urgencyFilter !== "ALL") params.urgency_level = urgencyFilter;
+      if (dateFrom)               params.date_from = dateFrom;
+      if (dateTo)                 params.date_to = dateTo;
+      if (cursor)                 params.cursor = cursor;
+      const data = await ProcSvc.page(params);
+      const rows = data?.procedures ?? [];
+      setProcedures(prev => (cursor ? [...prev, ...rows] : rows));
+      setNextCursor(data?.next_cursor ?? null);
+      if (!cursor) setTotal(data?.total ?? rows.length);
     } catch (e) { toast.error(formatApiError(e, "Error al cargar trámites")); }
     finally { setLoading(false); }
-  }, [canReview]);
+  }, [canReview, searchTerm, statusFilter, urgencyFilter, dateFrom, dateTo]);
 
   const fetchTypes = useCallback(async () => {
     try { setProcedureTypes((await ProcedureTypes.list())?.procedure_types ?? []); } catch { }
   }, []);
 
-  useEffect(() => { fetchProcedures(); fetchTypes(); }, [fetchProcedures, fetchTypes]);
+  useEffect(() => { fetchProcedures(); }, [fetchProcedures]);
+  useEffect(() => { fetchTypes(); }, [fetchTypes]);
 
   // Apply initial filter from dashboard (e.g. "show overdue")
   useEffect(() => {
@@ -1129,18 +1150,8 @@ const ProceduresManagement = forwardRef(({ initialFilter }, ref) => {
 
   const onFormSubmit = e => { e.preventDefault(); if (validateForm()) handleSubmitData(); };
 
-  const filtered = procedures.filter(p => {
-    const q = searchTerm.toLowerCase();
-    const match = (p?.tracking_code?.toLowerCase?.() || "").includes(q)
-      || (p?.applicant_name?.toLowerCase?.() || "").includes(q)
-      || (p?.procedure_type_name?.toLowerCase?.() || "").includes(q)
-      || (p?.applicant_document || "").includes(q);
-    const statusOk = statusFilter === "ALL" || p.status === statusFilter;
-    const urgencyOk = urgencyFilter === "ALL" || p.urgency_level === urgencyFilter;
-    const dateFromOk = !dateFrom || new Date(p.created_at) >= new Date(dateFrom);
-    const dateToOk = !dateTo || new Date(p.created_at) <= new Date(dateTo + "T23:59:59");
-    return match && statusOk && urgencyOk && dateFromOk && dateToOk;
-  });
+  // Los filtros ya se aplicaron en el servidor
+  const filtered = procedures;
 
   const overdueCount = filtered.filter(p => isOverdue(p.deadline_at) && !["COMPLETED", "REJECTED"].includes(p.status)).length;
   const urgentCount = filtered.filter(p => p.urgency_level === "URGENT").length;
@@ -1205,7 +1216,7 @@ const ProceduresManagement = forwardRef(({ initialFilter }, ref) => {
             {hasFilters && <span className="h-1.5 w-1.5 rounded-full bg-blue-500" />}
           </Button>
           <Button size="sm" variant="outline" className="h-9 w-9 p-0 rounded-xl border-slate-200"
-            onClick={fetchProcedures} title="Refrescar">
+            onClick={() => fetchProcedures()} title="Refrescar">
             <RefreshCw size={13} />
           </Button>
           <Button size="sm" className="h-9 rounded-xl gap-1.5 font-extrabold bg-slate-800 hover:bg-slate-900"
@@ -1284,7 +1295,7 @@ const ProceduresManagement = forwardRef(({ initialFilter }, ref) => {
       )}
 
       {/* Table */}
-      {loading ? <LoadingCenter /> : filtered.length === 0 ? (
+      {loading && procedures.length === 0 ? <LoadingCenter /> : filtered.length === 0 ? (
         <EmptyState icon={ClipboardList} title="Sin resultados"
           subtitle={hasFilters ? "Prueba con otros filtros" : "Aún no hay trámites registrados"} />
       ) : (
@@ -1393,10 +1404,18 @@ const ProceduresManagement = forwardRef(({ initialFilter }, ref) => {
             </table>
           </div>
           <div className="px-5 py-3 border-t border-slate-100 bg-slate-50/40 flex items-center justify-between">
-            <p className="text-xs text-slate-400 font-semibold">
-              {filtered.length} trámite{filtered.length !== 1 ? "s" : ""}
-              {hasFilters && ` (filtrado de ${procedures.length})`}
-            </p>
+            <div className="flex items-center gap-3">
+              <p className="text-xs text-slate-400 font-semibold">
+                {procedures.length} de {total} trámite{total !== 1 ? "s" : ""}
+                {hasFilters && " (filtrado)"}
+              </p>
+              {nextCursor && (
+                <Button size="sm" variant="outline" className="h-7 rounded-xl text-xs font-semibold border-slate-200"
+                  disabled={loading} onClick={() => fetchProcedures(nextCursor)}>
+                  Cargar más
+                </Button>
+              )}
+            </div>
             {overdueCount > 0 && (
               <p className="text-xs font-bold text-red-500 flex items-center gap-1">
                 <AlertTriangle size={11} /> {overdueCount} vencido{overdueCount !== 1 ? "s" : ""}
@@ -1511,7 +1530,7 @@ const ProceduresManagement = forwardRef(({ initialFilter }, ref) => {
       </Dialog>
 
       <ProcedureDetailDialog open={detailOpen} onOpenChange={setDetailOpen}
-        procedureId={detailId} onChanged={fetchProcedures} />
+        procedureId={detailId} onChanged={() => fetchProcedures()} />
     </div>
   );
 });
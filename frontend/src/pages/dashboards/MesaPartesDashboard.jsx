@@ -206,7 +206,7 @@ export default function MesaPartesDashboard({ roles }) {
 
     const recentProcs = useMemo(() => {
         const r = data.recent || {};
-        const arr = pickArray(r, ["results", "items"]);
+        const arr = pickArray(r, ["procedures", "results", "items"]);
         return (arr.length > 0 ? arr : Array.isArray(r) ? r : []).slice(0, 6);
     }, [data.recent]);
 
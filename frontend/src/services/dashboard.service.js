@@ -149,9 +149,9 @@ export const FinanceDashboardSvc = {
    MESA DE PARTES — ✅ usa Procedures.list
    ═══════════════════════════════════════════════════════════════ */
 export const MpvDashboardSvc = {
-    /** ✅ Procedures.list con ordering */
+    /** ✅ Página keyset de /procedures: los 6 más recientes */
     recentProcedures: () =>
-        safe(api.get("/procedures", { params: { page_size: 6, ordering: "-created_at" } }).then(unwrap)),
+        safe(api.get("/procedures", { params: { limit: 6 } }).then(unwrap)),
 };
 
 /* ═══════════════════════════════════════════════════════════════
@@ -151,6 +151,8 @@ export const PublicProcedureTypes = {
 ------------------------------------------------------- */
 export const Procedures = {
     list: async (params = {}) => asJson(api, "GET", "/procedures", null, { params }),
+    // Página keyset: { procedures, next_cursor, total? (solo en la primera) }
+    page: async (params = {}) => asJson(api, "GET", "/procedures", null, { params: { limit: 50, ...params } }),
     create: async (payload) => asJson(api, "POST", "/procedures", payload),
     get: async (id) => asJson(api, "GET", `/procedures/${id}`),
     getByCode: async (code) => asJson(api, "GET", `/procedures/code`, null, { params: { code } }),
@@ -213,6 +215,22 @@ export const ProcedureFiles = {
     },
     remove: async (procedureId, fileId) =>
         asJson(api, "DELETE", `/procedures/${procedureId}/files/${fileId}`),
+
+    /**
+     * Descarga un adjunto. `file.url` apunta a la vista con chequeo de permisos
+     * (requiere auth), así que se pide como blob en vez de un enlace directo.
+     */
+    download: async (file) => {
+        const res = await api.get(file.url, { responseType: "blob" });
+        const objUrl = URL.createObjectURL(res.data);
+        const a = document.createElement("a");
+        a.href = objUrl;
+        a.download = file.filename || file.original_name || "archivo";
+        document.body.appendChild(a);
+        a.click();
+        a.remove();
+        setTimeout(() => URL.revokeObjectURL(objUrl), 2000);
+    },
 };
 
 /* -------------------------------------------------------
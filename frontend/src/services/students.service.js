@@ -2,6 +2,8 @@ import api from "../lib/api";
 
 export const StudentsService = {
     list: (params) => api.get("/students", { params }).then(r => r.data),
+    // Página keyset compacta: { students, next_cursor, total?, total_incomplete? }
+    page: (params) => api.get("/students", { params: { limit: 50, ...params } }).then(r => r.data),
     matrix: (params) => api.get("/students/matrix", { params }).then(r => r.data),
     missingData: (params) => api.get("/students/missing-data", { params }).then(r => r.data),
     get: (id) => api.get(`/students/${id}`).then(r => r.data),